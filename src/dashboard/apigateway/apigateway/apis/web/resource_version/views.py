@@ -40,6 +40,7 @@ from apigateway.biz.resource_version import (
     ResourceDocVersionHandler,
     ResourceVersionArtifactHandler,
     ResourceVersionHandler,
+    resource_version_diff_cache,
 )
 from apigateway.biz.sdk import GatewaySDKHandler
 from apigateway.common.error_codes import error_codes
@@ -289,29 +290,38 @@ class ResourceVersionDiffRetrieveApi(generics.RetrieveAPIView):
         source_resource_version_id = data.get("source_resource_version_id")
         target_resource_version_id = data.get("target_resource_version_id")
 
-        version = ResourceVersionHandler.get_latest_version_by_gateway(request.gateway.id)
+        def diff() -> dict:
+            version = ResourceVersionHandler.get_latest_version_by_gateway(request.gateway.id)
 
-        source_resource_data = []
-        # 如果 source_resource_version_id不为空，并且不是第一次生成版本
-        if source_resource_version_id and version != "":
-            source_resource_data = ResourceVersionHandler.get_data_by_id_or_new(
-                request.gateway, source_resource_version_id
+            source_resource_data = []
+            # 如果 source_resource_version_id不为空，并且不是第一次生成版本
+            if source_resource_version_id and version != "":
+                source_resource_data = ResourceVersionHandler.get_data_by_id_or_new(
+                    request.gateway, source_resource_version_id
+                )
+
+            target_resource_data = ResourceVersionHandler.get_data_by_id_or_new(
+                request.gateway, target_resource_version_id
             )
 
-        target_resource_data = ResourceVersionHandler.get_data_by_id_or_new(
-            request.gateway, target_resource_version_id
-        )
+            return ResourceDifferHandler.diff_resource_version_data(
+                source_resource_data,
+                target_resource_data,
+                source_resource_doc_updated_time=ResourceDocVersionHandler().get_doc_updated_time(
+                    request.gateway.id, source_resource_version_id
+                ),
+                target_resource_doc_updated_time=ResourceDocVersionHandler().get_doc_updated_time(
+                    request.gateway.id, target_resource_version_id
+                ),
+            )
 
-        data = ResourceDifferHandler.diff_resource_version_data(
-            source_resource_data,
-            target_resource_data,
-            source_resource_doc_updated_time=ResourceDocVersionHandler().get_doc_updated_time(
-                request.gateway.id, data.get("source_resource_version_id")
-            ),
-            target_resource_doc_updated_time=ResourceDocVersionHandler().get_doc_updated_time(
-                request.gateway.id, data.get("target_resource_version_id")
-            ),
-        )
+        # 对比编辑区的资源时，数据随时可能变化，不缓存对比结果
+        if target_resource_version_id:
+            data = resource_version_diff_cache.get_or_diff(
+                request.gateway.id, source_resource_version_id, target_resource_version_id, diff
+            )
+        else:
+            data = diff()
 
         return OKJsonResponse(
             data=data,
@@ -392,7 +402,8 @@ class ResourceVersionExportApi(generics.CreateAPIView):
             api_version=instance.version,
             title=f"the openapi of {request.gateway.name}",
         )
-        content = exporter.export_resource_version_openapi(instance, file_type=file_type)
+        # 资源版本数据不可变，重复导出时直接读取缓存，并流式输出导出内容
+        content = exporter.iter_resource_version_openapi(instance, file_type=file_type)
         # 导出的文件名，需满足规范：bk_产品名_功能名_文件名.后缀
         export_filename = f"bk_apigw_resources_{self.request.gateway.name}_{instance.version}.{file_type}"
         return DownloadableResponse(content, filename=export_filename)
@@ -0,0 +1,51 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import logging
+from typing import Any, Dict, List
+
+from django.db import models, transaction
+
+logger = logging.getLogger(__name__)
+
+# 批量写入审计日志时，每批次的记录数
+BULK_BATCH_SIZE = 100
+
+
+class AuditEventLogManager(models.Manager):
+    def bulk_record(self, events: List[Dict[str, Any]]) -> None:
+        """批量写入审计日志
+
+        批量写入失败时，逐条重新写入，仅丢弃写入失败的审计日志，并在日志中记录其完整内容
+        """
+        for i in range(0, len(events), BULK_BATCH_SIZE):
+            batch = events[i : i + BULK_BATCH_SIZE]
+            try:
+                # 使用 savepoint，写入失败时不影响调用方所在的事务
+                with transaction.atomic(using=self.db):
+                    self.bulk_create([self.model(**event) for event in batch])
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("bulk create audit event logs fail, retry one by one, count=%d", len(batch))
+                for event in batch:
+                    self._record(event)
+
+    def _record(self, event: Dict[str, Any]) -> None:
+        try:
+            with transaction.atomic(using=self.db):
+                self.create(**event)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("log audit event log fail, kwargs=%s", event)
@@ -0,0 +1,30 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+from django.utils.deprecation import MiddlewareMixin
+
+from apigateway.apps.audit.writer import audit_event_log_writer
+
+
+class AuditEventLogBufferMiddleware(MiddlewareMixin):
+    """
+    请求内记录的审计日志，在请求结束时批量写入
+    """
+
+    def __call__(self, request):
+        with audit_event_log_writer.buffered():
+            return self.get_response(request)
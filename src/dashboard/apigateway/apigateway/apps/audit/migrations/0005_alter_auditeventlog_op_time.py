@@ -0,0 +1,19 @@
+# Generated by Django 5.2.15 on 2026-10-19
+
+from django.db import migrations, models
+
+import apigateway.utils.time
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("audit", "0004_auto_20200305_0955"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="auditeventlog",
+            name="op_time",
+            field=models.DateTimeField(db_index=True, default=apigateway.utils.time.now_datetime, editable=False),
+        ),
+    ]
@@ -17,11 +17,14 @@
 # to the current version of the project delivered to anyone in the future.
 #
 import uuid
+from typing import ClassVar
 
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from apigateway.apps.audit import managers
 from apigateway.apps.audit.constants import OpStatusEnum, OpTypeEnum
+from apigateway.utils.time import now_datetime
 
 
 class AuditEventLog(models.Model):
@@ -29,7 +32,8 @@ class AuditEventLog(models.Model):
     system = models.CharField(max_length=64, blank=False, null=False)
     username = models.CharField(max_length=64, blank=False, null=False)
 
-    op_time = models.DateTimeField(auto_now_add=True, db_index=True)
+    # 审计日志可能延后批量写入，操作时间在记录时确定，而不是写入时
+    op_time = models.DateTimeField(default=now_datetime, editable=False, db_index=True)
     op_type = models.CharField(max_length=32, choices=OpTypeEnum.get_choices(), blank=False, null=False, db_index=True)
     op_status = models.CharField(max_length=32, choices=OpStatusEnum.get_choices(), blank=False, null=False)
 
@@ -43,6 +47,8 @@ class AuditEventLog(models.Model):
 
     comment = models.TextField(null=True, blank=True)
 
+    objects: ClassVar[managers.AuditEventLogManager] = managers.AuditEventLogManager()
+
     def __str__(self):
         return f"<AuditEventLog: {self.event_id}>"
 
@@ -20,7 +20,7 @@ import logging
 
 from django.dispatch import Signal, receiver
 
-from apigateway.apps.audit.models import AuditEventLog
+from apigateway.apps.audit.writer import audit_event_log_writer
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +32,8 @@ _record_audit_log_signal = Signal()
 def _record_audit_log(sender, **kwargs):
     kwargs.pop("signal", None)
 
+    # 请求内的审计日志缓存后批量写入，写入失败时记录日志，不影响请求
     try:
-        AuditEventLog.objects.create(**kwargs)
+        audit_event_log_writer.record(kwargs)
     except Exception:  # pylint: disable=broad-except
         logger.exception("log audit event log fail, kwargs=%s", kwargs)
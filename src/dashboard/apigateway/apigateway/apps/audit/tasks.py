@@ -0,0 +1,28 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+from typing import Any, Dict, List
+
+from celery import shared_task
+
+from apigateway.apps.audit.models import AuditEventLog
+
+
+@shared_task(name="apigateway.apps.audit.tasks.record_audit_event_logs", ignore_result=True)
+def record_audit_event_logs(events: List[Dict[str, Any]]):
+    """异步批量写入审计日志"""
+    AuditEventLog.objects.bulk_record(events)
@@ -0,0 +1,143 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""
+审计日志写入：请求内记录的审计日志先缓存，请求结束时批量写入，减少请求中逐条写入审计日志的开销
+"""
+
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import router, transaction
+from werkzeug.local import Local
+
+from apigateway.apps.audit.models import AuditEventLog
+from apigateway.apps.audit.tasks import record_audit_event_logs
+from apigateway.utils.time import now_datetime
+
+logger = logging.getLogger(__name__)
+
+_local = Local()
+
+
+class _PendingAuditEvent:
+    """缓存的审计日志，记录其所在的事务是否已提交"""
+
+    def __init__(self, event: Dict[str, Any]):
+        self.event = event
+        self.committed = False
+
+    def __call__(self):
+        # 作为 on_commit 回调，所在事务提交时执行
+        self.committed = True
+
+
+class AuditEventLogBuffer:
+    """缓存审计日志
+
+    与直接写入审计日志的行为保持一致：在事务中记录的审计日志，随事务提交而写入，随事务（或所在 savepoint）回滚而丢弃
+    """
+
+    def __init__(self, using: str):
+        self.using = using
+        self.events: List[_PendingAuditEvent] = []
+
+    def __len__(self):
+        return len(self.events)
+
+    def add(self, event: Dict[str, Any]):
+        pending_event = _PendingAuditEvent(event)
+        if transaction.get_connection(self.using).in_atomic_block:
+            transaction.on_commit(pending_event, using=self.using)
+        else:
+            pending_event.committed = True
+
+        self.events.append(pending_event)
+
+    def pop_writable_events(self) -> List[Dict[str, Any]]:
+        """取出可写入的审计日志：所在事务已提交，或所在事务仍未结束（写入的记录随事务一同提交或回滚）
+
+        事务或 savepoint 回滚时，Django 会从 run_on_commit 中移除其中注册的回调，据此丢弃已回滚的审计日志
+        """
+        connection = transaction.get_connection(self.using)
+        pending_callback_ids = {id(func) for _, func, _ in connection.run_on_commit}
+
+        events = [
+            pending_event.event
+            for pending_event in self.events
+            if pending_event.committed or id(pending_event) in pending_callback_ids
+        ]
+        self.events = []
+        return events
+
+
+class AuditEventLogWriter:
+    def __init__(self):
+        self.using = router.db_for_write(AuditEventLog)
+
+    @property
+    def _buffer(self) -> Optional[AuditEventLogBuffer]:
+        return getattr(_local, "buffer", None)
+
+    def record(self, event: Dict[str, Any]):
+        # 延后写入时，操作时间仍为记录时的时间
+        event.setdefault("op_time", now_datetime())
+
+        buffer = self._buffer
+        if buffer is None:
+            AuditEventLog.objects.bulk_record([event])
+            return
+
+        buffer.add(event)
+        if len(buffer) >= settings.AUDIT_LOG_BUFFER_MAX_SIZE:
+            self.flush(buffer.pop_writable_events())
+
+    @contextmanager
+    def buffered(self):
+        """在上下文中记录的审计日志，在退出上下文时批量写入；嵌套使用时，由最外层统一写入"""
+        if self._buffer is not None:
+            yield
+            return
+
+        _local.buffer = AuditEventLogBuffer(self.using)
+        try:
+            yield
+        finally:
+            buffer = _local.buffer
+            _local.buffer = None
+            # 上下文中出现异常时，已记录的审计日志同样需要写入
+            self.flush(buffer.pop_writable_events())
+
+    def flush(self, events: List[Dict[str, Any]]):
+        if not events:
+            return
+
+        threshold = settings.AUDIT_LOG_ASYNC_THRESHOLD
+        # 事务中的审计日志需随事务一同提交或回滚，只有不在事务中时，才可交由异步任务写入
+        if threshold and len(events) >= threshold and not transaction.get_connection(self.using).in_atomic_block:
+            try:
+                record_audit_event_logs.delay([{**event, "op_time": event["op_time"].isoformat()} for event in events])
+                return
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("send audit event logs to celery fail, write them directly, count=%d", len(events))
+
+        AuditEventLog.objects.bulk_record(events)
+
+
+audit_event_log_writer = AuditEventLogWriter()
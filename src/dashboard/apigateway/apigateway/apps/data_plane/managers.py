@@ -15,11 +15,11 @@
 # We undertake not to change the open source license (MIT license) applicable
 # to the current version of the project delivered to anyone in the future.
 #
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 from django.db import models
 
-from apigateway.core.models import Gateway
+from apigateway.core.models import Gateway, Stage
 
 from .constants import (
     DEFAULT_DATA_PLANE_NAME,
@@ -28,7 +28,7 @@ from .constants import (
 )
 
 if TYPE_CHECKING:
-    from .models import DataPlane, GatewayDataPlaneBinding
+    from .models import DataPlane, DataPlaneReleaseManifest, GatewayDataPlaneBinding
 
 
 class DataPlaneManager(models.Manager):
@@ -92,3 +92,60 @@ class GatewayDataPlaneBindingManager(models.Manager):
         """Get all gateways that are not bound to any data plane"""
         bound_gateway_ids = self.values_list("gateway_id", flat=True).distinct()
         return list(Gateway.objects.exclude(id__in=bound_gateway_ids))
+
+
+class DataPlaneReleaseManifestManager(models.Manager):
+    def save_manifest(
+        self,
+        data_plane: "DataPlane",
+        stage: Stage,
+        key_prefix: str,
+        digests: Dict[str, bytes],
+        **fields,
+    ) -> "DataPlaneReleaseManifest":
+        """全量同步后，使用 key_prefix 下全部 key 的摘要替换已记录的摘要
+
+        :param fields: publish_id、resource_version_id 等发布信息
+        """
+        manifest = self.filter(data_plane=data_plane, stage=stage).first() or self.model(
+            data_plane=data_plane, gateway_id=stage.gateway_id, stage=stage
+        )
+        for name, value in fields.items():
+            setattr(manifest, name, value)
+        manifest.key_prefix = key_prefix
+        manifest.digests = digests
+        manifest.save()
+        return manifest
+
+    def patch_manifest(
+        self,
+        data_plane: "DataPlane",
+        stage: Stage,
+        key_prefix: str,
+        changed_digests: Dict[str, Optional[bytes]],
+        **fields,
+    ) -> Optional["DataPlaneReleaseManifest"]:
+        """增量写入后，更新写入、删除的 key 的摘要，删除的 key 摘要为 None
+
+        未记录过摘要，或 key_prefix 已变化时，无法得到完整的摘要，删除已记录的摘要并返回 None，等待下一次全量同步
+        """
+        manifest = self.filter(data_plane=data_plane, stage=stage).first()
+        if manifest is None or manifest.key_prefix != key_prefix:
+            self.delete_manifest(data_plane, stage)
+            return None
+
+        digests = manifest.digests
+        for key, digest in changed_digests.items():
+            if digest is None:
+                digests.pop(key, None)
+            else:
+                digests[key] = digest
+
+        for name, value in fields.items():
+            setattr(manifest, name, value)
+        manifest.digests = digests
+        manifest.save()
+        return manifest
+
+    def delete_manifest(self, data_plane: "DataPlane", stage: Stage):
+        self.filter(data_plane=data_plane, stage=stage).delete()
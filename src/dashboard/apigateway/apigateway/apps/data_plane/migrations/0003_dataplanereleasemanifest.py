@@ -0,0 +1,44 @@
+# Generated by Django 4.2.20 on 2026-10-18 00:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0058_releasedresourcebody"),
+        ("data_plane", "0002_dataplane_apisix_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DataPlaneReleaseManifest",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_time", models.DateTimeField(auto_now_add=True, null=True)),
+                ("updated_time", models.DateTimeField(auto_now=True, null=True)),
+                ("key_prefix", models.CharField(help_text="ETCD key prefix of the release", max_length=512)),
+                ("publish_id", models.IntegerField(help_text="Publish id of the release")),
+                ("resource_version_id", models.IntegerField(help_text="Resource version id of the release")),
+                ("stage_config_digest", models.CharField(blank=True, default="", max_length=64)),
+                ("key_count", models.IntegerField(default=0)),
+                ("_digests", models.TextField(db_column="digests", default="")),
+                (
+                    "data_plane",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="release_manifests",
+                        to="data_plane.dataplane",
+                    ),
+                ),
+                ("gateway", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="core.gateway")),
+                ("stage", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="core.stage")),
+            ],
+            options={
+                "verbose_name": "DataPlaneReleaseManifest",
+                "verbose_name_plural": "DataPlaneReleaseManifest",
+                "db_table": "data_plane_release_manifest",
+                "unique_together": {("data_plane", "stage")},
+            },
+        ),
+    ]
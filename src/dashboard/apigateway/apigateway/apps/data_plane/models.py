@@ -23,8 +23,9 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 from apigateway.common.mixins.models import OperatorModelMixin, TimestampedModelMixin
-from apigateway.core.models import Gateway
+from apigateway.core.models import Gateway, Stage
 from apigateway.utils.crypto import get_crypto
+from apigateway.utils.payload import dump_json_payload, load_json_payload
 
 from .constants import (
     CURRENT_DATA_PLANE_APISIX_VERSION,
@@ -32,7 +33,7 @@ from .constants import (
     DataPlaneApisixVersionEnum,
     DataPlaneStatusEnum,
 )
-from .managers import DataPlaneManager, GatewayDataPlaneBindingManager
+from .managers import DataPlaneManager, DataPlaneReleaseManifestManager, GatewayDataPlaneBindingManager
 
 logger = logging.getLogger(__name__)
 
@@ -160,3 +161,51 @@ class GatewayDataPlaneBinding(TimestampedModelMixin, OperatorModelMixin):
         verbose_name_plural = _("GatewayDataPlaneBinding")
         db_table = "gateway_data_plane_binding"
         unique_together = ("gateway", "data_plane")
+
+
+class DataPlaneReleaseManifest(TimestampedModelMixin):
+    """网关环境最近一次发布到数据面时，etcd 中各 key 的目标内容摘要，用于检测数据面中的配置漂移
+
+    - 漂移：etcd 中的内容被手工修改、etcd 从备份恢复、部分批次写入失败等，导致 etcd 中的内容与最近一次发布的内容不一致
+    - 摘要按 key_prefix 之后的相对 key 存储，见 EtcdRegistry 中的 get_payload_digest
+    """
+
+    data_plane = models.ForeignKey(DataPlane, on_delete=models.CASCADE, related_name="release_manifests")
+    gateway = models.ForeignKey(Gateway, on_delete=models.CASCADE)
+    stage = models.ForeignKey(Stage, on_delete=models.CASCADE)
+    key_prefix = models.CharField(max_length=512, help_text=_("ETCD key prefix of the release"))
+    publish_id = models.IntegerField(help_text=_("Publish id of the release"))
+    # 发布时的资源版本及环境级配置摘要，修复漂移前据此判断发布的内容是否已变化
+    resource_version_id = models.IntegerField(help_text=_("Resource version id of the release"))
+    stage_config_digest = models.CharField(max_length=64, blank=True, default="")
+    key_count = models.IntegerField(default=0)
+    # json 格式的 {相对 key: 十六进制摘要}，按 utils.payload 的格式压缩存储
+    _digests = models.TextField(db_column="digests", default="")
+
+    objects: ClassVar[DataPlaneReleaseManifestManager] = DataPlaneReleaseManifestManager()
+
+    def __str__(self):
+        return f"<DataPlaneReleaseManifest: data_plane={self.data_plane_id}, stage={self.stage_id}>"
+
+    class Meta:
+        verbose_name = _("DataPlaneReleaseManifest")
+        verbose_name_plural = _("DataPlaneReleaseManifest")
+        db_table = "data_plane_release_manifest"
+        unique_together = ("data_plane", "stage")
+
+    @property
+    def digests(self) -> Dict[str, bytes]:
+        """完整 key 到二进制摘要的映射"""
+        if not self._digests:
+            return {}
+
+        return {
+            f"{self.key_prefix}{key}": bytes.fromhex(digest)
+            for key, digest in load_json_payload(self._digests).items()
+        }
+
+    @digests.setter
+    def digests(self, value: Dict[str, bytes]):
+        relative_digests = {key[len(self.key_prefix) :]: digest.hex() for key, digest in sorted(value.items())}
+        self._digests = dump_json_payload(relative_digests, compress=True)
+        self.key_count = len(relative_digests)
@@ -0,0 +1,57 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""
+将存量资源版本的 OpenAPI schema 按资源拆分写入 OpenAPIResourceSchemaVersionItem，获取单个资源的 schema 时无需解析整个版本的 schema
+"""
+
+from typing import Optional
+
+from django.core.management.base import BaseCommand
+
+from apigateway.apps.openapi.models import OpenAPIResourceSchemaVersion
+from apigateway.service.resource_version import create_resource_schema_version_items
+
+BATCH_SIZE = 100
+
+
+class Command(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument("--gateway-id", type=int, dest="gateway_id")
+        parser.add_argument("--batch-size", type=int, dest="batch_size", default=BATCH_SIZE)
+        parser.add_argument("--dry-run", dest="dry_run", action="store_true", help="dry run")
+
+    def handle(self, gateway_id: Optional[int], batch_size: int, dry_run: bool, **options) -> None:
+        queryset = OpenAPIResourceSchemaVersion.objects.filter(has_resource_items=False)
+        if gateway_id:
+            queryset = queryset.filter(resource_version__gateway_id=gateway_id)
+
+        schema_version_ids = list(queryset.order_by("id").values_list("id", flat=True))
+        for i in range(0, len(schema_version_ids), batch_size):
+            # 逐批加载版本 schema，避免一次性加载全部大字段
+            for schema_version in OpenAPIResourceSchemaVersion.objects.filter(
+                id__in=schema_version_ids[i : i + batch_size]
+            ):
+                if dry_run:
+                    print(
+                        f"backfill resource_schema_version[resource_version_id={schema_version.resource_version_id}]"
+                    )
+                    continue
+
+                create_resource_schema_version_items(schema_version)
+
+        print(f"total {len(schema_version_ids)} resource schema versions backfilled")
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.15 on 2026-10-19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0059_resourceversion_used_stage_vars"),
+        ("openapi", "0003_alter_openapifileresourceschemaversion_gateway_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="openapiresourceschemaversion",
+            name="has_resource_items",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.CreateModel(
+            name="OpenAPIResourceSchemaVersionItem",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_time", models.DateTimeField(auto_now_add=True, null=True, blank=True)),
+                ("updated_time", models.DateTimeField(auto_now=True, null=True, blank=True)),
+                ("resource_id", models.IntegerField()),
+                ("schema", models.JSONField(blank=True, null=True)),
+                (
+                    "resource_version",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="core.resourceversion"),
+                ),
+            ],
+            options={
+                "db_table": "openapi_resource_schema_version_item",
+                "unique_together": {("resource_version", "resource_id")},
+            },
+        ),
+    ]
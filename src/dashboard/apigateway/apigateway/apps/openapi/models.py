@@ -44,6 +44,9 @@ class OpenAPIResourceSchemaVersion(TimestampedModelMixin, OperatorModelMixin):
 
     resource_version = models.OneToOneField(ResourceVersion, on_delete=models.CASCADE)
     schema = models.JSONField(blank=True, null=True)
+    # 是否已将各资源的 schema 拆分写入 OpenAPIResourceSchemaVersionItem；存量数据为 False，
+    # 获取单个资源的 schema 时需解析完整的 schema，可执行 backfill_resource_schema_version_items 补全
+    has_resource_items = models.BooleanField(default=False)
 
     class Meta:
         db_table = "openapi_resource_schema_version"
@@ -52,6 +55,23 @@ class OpenAPIResourceSchemaVersion(TimestampedModelMixin, OperatorModelMixin):
         return f"<OpenAPIResourceSchemaVersion: {self.id}/{self.resource_version.version}>"
 
 
+class OpenAPIResourceSchemaVersionItem(TimestampedModelMixin):
+    """
+    openapi_resource_schema_version_item: 资源版本中单个资源的接口协议，获取单个资源的 schema 时无需解析整个版本的 schema
+    """
+
+    resource_version = models.ForeignKey(ResourceVersion, on_delete=models.CASCADE)
+    resource_id = models.IntegerField()
+    schema = models.JSONField(blank=True, null=True)
+
+    class Meta:
+        db_table = "openapi_resource_schema_version_item"
+        unique_together = ("resource_version", "resource_id")
+
+    def __str__(self):
+        return f"<OpenAPIResourceSchemaVersionItem: {self.resource_version_id}/{self.resource_id}>"
+
+
 class OpenAPIFileResourceSchemaVersion(TimestampedModelMixin, OperatorModelMixin):
     """
     openapi_gateway_resource_version_spec: resource openapi 文件接口协议版本表
@@ -16,7 +16,7 @@
 # We undertake not to change the open source license (MIT license) applicable
 # to the current version of the project delivered to anyone in the future.
 #
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
 
 from django.db import models
 
@@ -32,6 +32,9 @@ from apigateway.utils.time import now_datetime, to_datetime_from_now
 if TYPE_CHECKING:
     import datetime
 
+# 批量写入权限时，每批次的记录数
+BULK_BATCH_SIZE = 500
+
 
 class AppGatewayPermissionManager(models.Manager):
     def filter_public_permission_by_app(self, bk_app_code: str):
@@ -68,7 +71,7 @@ class AppGatewayPermissionManager(models.Manager):
         update_fields = ["expires", "updated_time"]
         if handled_by:
             update_fields.append("handled_by")
-        self.bulk_update(queryset, update_fields)
+        self.bulk_update(queryset, update_fields, batch_size=BULK_BATCH_SIZE)
 
 
 class AppResourcePermissionManager(models.Manager):
@@ -86,7 +89,7 @@ class AppResourcePermissionManager(models.Manager):
         update_fields = ["expires", "updated_time"]
         if handled_by:
             update_fields.append("handled_by")
-        self.bulk_update(queryset, update_fields)
+        self.bulk_update(queryset, update_fields, batch_size=BULK_BATCH_SIZE)
 
     def renew_by_resource_ids(
         self,
@@ -101,7 +104,7 @@ class AppResourcePermissionManager(models.Manager):
             obj.expires = calculate_renew_time(obj.expires, expire_days)
             obj.grant_type = grant_type
 
-        self.bulk_update(queryset, ["expires", "grant_type"])
+        self.bulk_update(queryset, ["expires", "grant_type"], batch_size=BULK_BATCH_SIZE)
 
     def renew_not_expired_permissions(
         self,
@@ -124,25 +127,57 @@ class AppResourcePermissionManager(models.Manager):
             grant_type=grant_type,
         )
 
+    def bulk_create_missing_permissions(
+        self,
+        gateway_id: int,
+        bk_app_code: str,
+        resource_ids: Iterable[int],
+        defaults: Dict[str, Any],
+    ) -> List[int]:
+        """为尚无权限的资源批量创建权限，已有的权限保持不变，返回需新建权限的资源 id
+
+        其它请求并发添加了相同的权限时，忽略冲突的记录，以已添加的权限为准
+        """
+        resource_ids = set(resource_ids)
+        if not resource_ids:
+            return []
+
+        has_perm_resource_ids = set(
+            self.filter(gateway_id=gateway_id, bk_app_code=bk_app_code, resource_id__in=resource_ids).values_list(
+                "resource_id", flat=True
+            )
+        )
+        missing_resource_ids = sorted(resource_ids - has_perm_resource_ids)
+        if not missing_resource_ids:
+            return []
+
+        self.bulk_create(
+            [
+                self.model(gateway_id=gateway_id, bk_app_code=bk_app_code, resource_id=resource_id, **defaults)
+                for resource_id in missing_resource_ids
+            ],
+            batch_size=BULK_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        return missing_resource_ids
+
     def save_permissions(self, gateway, resource_ids, bk_app_code, grant_type, expire_days=None, handled_by=""):
         expires = calculate_expires(expire_days)
+        now = now_datetime()
+        values = {
+            "expires": expires,
+            "grant_type": grant_type,
+            "handled_by": handled_by,
+            "created_time": now,
+            "updated_time": now,
+        }
 
         # 此处不再重复校验 resource_id 属于网关
         # - 在接口 serializer 处校验 resource_id 是否有效
         # - 对于已删除，但线上版本中包含的资源，也无法通过 Resource 模型中数据判断 resource_id 是否有效
-        for resource_id in resource_ids:
-            self.update_or_create(
-                gateway=gateway,
-                resource_id=resource_id,
-                bk_app_code=bk_app_code,
-                defaults={
-                    "expires": expires,
-                    "grant_type": grant_type,
-                    "handled_by": handled_by,
-                    "created_time": now_datetime(),
-                    "updated_time": now_datetime(),
-                },
-            )
+        self.bulk_create_missing_permissions(gateway.id, bk_app_code, resource_ids, defaults=values)
+        # 已有的权限，以及并发创建而被忽略的权限，统一更新为本次授权的数据
+        self.filter(gateway_id=gateway.id, bk_app_code=bk_app_code, resource_id__in=resource_ids).update(**values)
 
     def get_permission_or_none(self, gateway, resource_id, bk_app_code):
         try:
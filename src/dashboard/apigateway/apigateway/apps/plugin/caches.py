@@ -0,0 +1,64 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""
+插件配置 yaml 解析结果的进程内缓存
+
+发布、插件列表等需读取大量插件配置，每次都解析 yaml 耗时较多；按 (插件配置 id, yaml 内容) 缓存解析结果，
+配置变更后 key 随之变化，无需主动清理
+"""
+
+import copy
+import threading
+from typing import Any, Dict, Optional
+
+from cachetools import LRUCache
+
+from apigateway.utils.yaml import yaml_fast_loads
+
+PARSED_PLUGIN_CONFIG_CACHE_SIZE = 4096
+
+
+class ParsedPluginConfigCache:
+    def __init__(self, maxsize: int = PARSED_PLUGIN_CONFIG_CACHE_SIZE):
+        self._cache: LRUCache = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def get_or_parse(self, plugin_config_id: Optional[int], content: Optional[str]) -> Dict[str, Any]:
+        """获取解析后的配置，返回副本，调用方可直接修改"""
+        # 未保存的插件配置没有 id，不缓存
+        if plugin_config_id is None:
+            return yaml_fast_loads(content)
+
+        # key 中包含完整的 yaml 内容，不会因摘要冲突而读取到其它内容的解析结果
+        key = (plugin_config_id, content)
+        with self._lock:
+            config = self._cache.get(key)
+
+        if config is None:
+            config = yaml_fast_loads(content)
+            with self._lock:
+                self._cache[key] = config
+
+        return copy.deepcopy(config)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+parsed_plugin_config_cache = ParsedPluginConfigCache()
@@ -21,6 +21,7 @@ from typing import Any, ClassVar, Dict, List
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from apigateway.apps.plugin.caches import parsed_plugin_config_cache
 from apigateway.apps.plugin.constants import (
     PluginBindingScopeEnum,
     PluginBindingSourceEnum,
@@ -31,7 +32,6 @@ from apigateway.common.i18n.field import I18nProperty
 from apigateway.common.mixins.models import OperatorModelMixin, TimestampedModelMixin
 from apigateway.core.models import Gateway
 from apigateway.schema.models import Schema
-from apigateway.utils.yaml import yaml_loads
 
 logger = logging.getLogger(__name__)
 
@@ -113,8 +113,7 @@ class PluginConfig(OperatorModelMixin, TimestampedModelMixin):
         Return the apisix plugin configuration.
         YAML is a superset of JSON, so we loads the config by yaml directly.
         """
-
-        return yaml_loads(self.yaml)
+        return parsed_plugin_config_cache.get_or_parse(self.pk, self.yaml)
 
     @config.setter
     def config(self, yaml_: str):
@@ -43,7 +43,16 @@ from apigateway.core.constants import (
     GatewayTypeEnum,
 )
 from apigateway.core.gateway_auth import GatewayAuthConfig
-from apigateway.core.models import Backend, BackendConfig, Context, Gateway, Release, Resource, Stage
+from apigateway.core.models import (
+    Backend,
+    BackendConfig,
+    Context,
+    Gateway,
+    GatewayMaintainer,
+    Release,
+    Resource,
+    Stage,
+)
 from apigateway.service.alarm_strategy import create_default_alarm_strategy
 from apigateway.service.contexts import GatewayAuthContext
 from apigateway.service.data_plane import validate_gateway_data_plane_compatibility
@@ -100,12 +109,11 @@ class GatewayHandler:
     @staticmethod
     def list_gateways_by_user(username: str, tenant_id: str = "") -> List[Gateway]:
         """获取用户有权限的网关列表"""
-        queryset = Gateway.objects.filter(_maintainers__contains=username)
+        queryset = Gateway.objects.filter(id__in=GatewayMaintainer.objects.filter_gateway_ids(username))
         if tenant_id:
             queryset = gateway_filter_by_maintainer_tenant_id(queryset, tenant_id)
 
-        # 使用 _maintainers 过滤的数据并不准确，需要根据其中人员列表二次过滤
-        return [gateway for gateway in queryset if gateway.has_permission(username)]
+        return list(queryset)
 
     @staticmethod
     def get_stages_with_release_status(gateway_ids: List[int]) -> Dict[int, list]:
@@ -375,6 +375,20 @@ class MCPServerHandler:
 
         return release.resource_version
 
+    @staticmethod
+    def _get_standard_resource_ids(resource_version: ResourceVersion, resource_names: List[str]) -> List[int]:
+        """按资源名称从版本中查找普通资源的 ID，版本中不存在或非普通资源的名称将被忽略"""
+        resource_index = resource_version.resource_index
+        resource_ids = []
+        for resource_name in set(resource_names):
+            resource = resource_index.get_by_name(resource_name)
+            if (
+                resource is not None
+                and (resource.get("kind") or ResourceKindEnum.STANDARD.value) == ResourceKindEnum.STANDARD.value
+            ):
+                resource_ids.append(resource["id"])
+        return resource_ids
+
     @staticmethod
     @transaction.atomic
     def sync_permissions(
@@ -424,13 +438,7 @@ class MCPServerHandler:
             logger.debug("no release, skip sync the permissions of the mcp_server %d", mcp_server_id)
             return
 
-        resource_name_set = set(resource_names)
-        resource_ids = [
-            resource["id"]
-            for resource in resource_version.data
-            if resource["name"] in resource_name_set
-            and (resource.get("kind") or ResourceKindEnum.STANDARD.value) == ResourceKindEnum.STANDARD.value
-        ]
+        resource_ids = MCPServerHandler._get_standard_resource_ids(resource_version, resource_names)
 
         # 3. sync the permission
         newest_virtual_app_code_resource_id_set = {
@@ -615,8 +623,10 @@ class MCPServerHandler:
         for gateway_stage_key, release in releases.items():
             tool_names = gateway_stage_tools.get(gateway_stage_key, [])
             least_privilege = MCPServerLeastPrivilegeEnum.APPLICATION.value
-            for resource in release.resource_version.data:
-                if resource["name"] not in tool_names:
+            resource_index = release.resource_version.resource_index
+            for tool_name in tool_names:
+                resource = resource_index.get_by_name(tool_name)
+                if resource is None:
                     continue
                 auth_config = json.loads(resource.get("contexts", {}).get("resource_auth", {}).get("config", "{}"))
                 verified_user_required = not auth_config.get("skip_auth_verification", False) and bool(
@@ -1278,8 +1288,10 @@ class MCPServerHandler:
 
             tool_names = server_tool_names.get(mcp_server.id, [])
             least_privilege = MCPServerLeastPrivilegeEnum.APPLICATION.value
-            for resource in release.resource_version.data:
-                if resource["name"] not in tool_names:
+            resource_index = release.resource_version.resource_index
+            for tool_name in tool_names:
+                resource = resource_index.get_by_name(tool_name)
+                if resource is None:
                     continue
                 auth_config = json.loads(resource.get("contexts", {}).get("resource_auth", {}).get("config", "{}"))
                 verified_user_required = not auth_config.get("skip_auth_verification", False) and bool(
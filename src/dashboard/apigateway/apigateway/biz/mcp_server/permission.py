@@ -34,7 +34,7 @@ from apigateway.common.tenant.query import (
     gateway_mcp_server_filter_by_user_tenant_id,
 )
 from apigateway.core.constants import GatewayStatusEnum, StageStatusEnum
-from apigateway.core.models import Gateway
+from apigateway.core.models import Gateway, GatewayMaintainer
 from apigateway.service.bk_itsm import ItsmPermissionApplyHelper
 from apigateway.utils.time import now_datetime
 
@@ -48,11 +48,11 @@ class MCPServerPermissionHandler:
     @staticmethod
     def get_pending_apply_queryset_for_gateway_maintainer(username: str, tenant_id: str):
         """获取指定用户作为网关管理员待审批的 MCP Server 权限申请列表"""
-        queryset = Gateway.objects.filter(_maintainers__contains=username)
+        queryset = Gateway.objects.filter(id__in=GatewayMaintainer.objects.filter_gateway_ids(username))
         if tenant_id:
             queryset = gateway_filter_by_maintainer_tenant_id(queryset, tenant_id)
 
-        gateway_ids = [gateway.id for gateway in queryset if gateway.has_permission(username)]
+        gateway_ids = queryset.values_list("id", flat=True)
         return MCPServerAppPermissionApply.objects.filter(
             mcp_server__gateway_id__in=gateway_ids,
             status=MCPServerAppPermissionApplyStatusEnum.PENDING.value,
@@ -42,7 +42,7 @@ from apigateway.common.tenant.query import gateway_filter_by_maintainer_tenant_i
 from apigateway.common.tenant.request import get_tenant_id_for_gateway_maintainers
 from apigateway.components.bkauth import get_app_tenant_info_cached
 from apigateway.components.bkuser import query_display_names_cached, query_display_names_for_readonly
-from apigateway.core.models import Gateway, Resource
+from apigateway.core.models import Gateway, GatewayMaintainer, Resource
 
 
 class ResourcePermissionHandler:
@@ -66,11 +66,11 @@ class ResourcePermissionHandler:
     @staticmethod
     def get_pending_apply_queryset_for_maintainer(username: str, tenant_id: str):
         """获取指定用户作为网关管理员待审批的 API 网关权限申请列表"""
-        queryset = Gateway.objects.filter(_maintainers__contains=username)
+        queryset = Gateway.objects.filter(id__in=GatewayMaintainer.objects.filter_gateway_ids(username))
         if tenant_id:
             queryset = gateway_filter_by_maintainer_tenant_id(queryset, tenant_id)
 
-        gateway_ids = [gateway.id for gateway in queryset if gateway.has_permission(username)]
+        gateway_ids = queryset.values_list("id", flat=True)
         return AppPermissionApply.objects.filter(
             gateway_id__in=gateway_ids,
             status=ApplyStatusEnum.PENDING.value,
@@ -103,36 +103,30 @@ class ResourcePermissionHandler:
         if not api_perm:
             return
 
-        has_perm_resource_ids = list(
-            AppResourcePermission.objects.filter(
-                bk_app_code=bk_app_code, gateway_id=gateway.id, resource_id__in=resource_ids
-            ).values_list("resource_id", flat=True)
+        # 其它功能同时添加权限时，以已添加的权限为准，跳过此处的同步
+        AppResourcePermission.objects.bulk_create_missing_permissions(
+            gateway_id=gateway.id,
+            bk_app_code=bk_app_code,
+            resource_ids=resource_ids,
+            defaults={
+                "expires": api_perm.expires,
+                "grant_type": GrantTypeEnum.SYNC.value,
+            },
         )
 
-        for resource_id in set(resource_ids) - set(has_perm_resource_ids):
-            # 此处使用 get_or_create, 其它功能同时添加权限时，可跳过此处的同步
-            AppResourcePermission.objects.get_or_create(
-                gateway=gateway,
-                resource_id=resource_id,
-                bk_app_code=bk_app_code,
-                defaults={
-                    "expires": api_perm.expires,
-                    "grant_type": GrantTypeEnum.SYNC.value,
-                },
-            )
-
     @staticmethod
     def renew_resource_permissions_by_resource_ids(
         bk_app_code: str,
         resource_ids: List[int],
         expire_days: int,
     ):
-        grouped_resources = (
+        grouped_resources = list(
             Resource.objects.filter(id__in=resource_ids).values("gateway_id", "id").order_by("gateway_id")
         )
+        gateways = Gateway.objects.in_bulk({item["gateway_id"] for item in grouped_resources})
         for gateway_id, grouped in itertools.groupby(grouped_resources, key=operator.itemgetter("gateway_id")):
             grouped_resource_ids = [item["id"] for item in grouped]
-            gateway = Gateway.objects.get(id=gateway_id)
+            gateway = gateways[gateway_id]
             ResourcePermissionHandler.sync_from_gateway_permission(
                 gateway=gateway,
                 bk_app_code=bk_app_code,
@@ -92,11 +92,15 @@ def get_released_resource_data(gateway: Gateway, stage: Stage, resource_id: int)
     if not resource_version_id:
         return None
 
-    released_resource = ReleasedResource.objects.filter(
-        gateway=gateway,
-        resource_version_id=resource_version_id,
-        resource_id=resource_id,
-    ).first()
+    released_resource = (
+        ReleasedResource.objects.filter(
+            gateway=gateway,
+            resource_version_id=resource_version_id,
+            resource_id=resource_id,
+        )
+        .select_related("body")
+        .first()
+    )
     if not released_resource:
         return None
 
@@ -146,7 +150,7 @@ class ReleasedResourceHandler:
         # 按照资源版本从小到大排序，可使最新版本数据覆盖前面版本的数据
         released_resources = (
             ReleasedResource.objects.filter(resource_id__in=resource_ids)
-            .select_related("gateway")
+            .select_related("gateway", "body")
             .order_by("resource_id", "resource_version_id")
         )
 
@@ -212,11 +216,15 @@ class ReleasedResourceHandler:
         if not resource_version_id:
             return None
 
-        resource = ReleasedResource.objects.filter(
-            gateway_id=gateway_id,
-            resource_version_id=resource_version_id,
-            resource_name=resource_name,
-        ).first()
+        resource = (
+            ReleasedResource.objects.filter(
+                gateway_id=gateway_id,
+                resource_version_id=resource_version_id,
+                resource_name=resource_name,
+            )
+            .select_related("body")
+            .first()
+        )
         if not resource:
             return None
 
@@ -24,6 +24,7 @@ from .diff import (
     ResourceHTTPProxy,
     ResourceMockProxy,
     ResourcePluginConfig,
+    resource_version_diff_cache,
 )
 from .resource_doc_version import ResourceDocVersionHandler
 from .resource_version import ResourceVersionHandler
@@ -43,4 +44,5 @@ __all__ = [
     "ResourceVersionHandler",
     # functions
     # others
+    "resource_version_diff_cache",
 ]
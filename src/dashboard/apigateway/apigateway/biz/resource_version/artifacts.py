@@ -53,10 +53,13 @@ class ResourceVersionArtifactHandler:
             api_version=resource_version.version,
             title=f"the openapi of {gateway.name}",
         )
+        schema = exporter.export_resource_version_openapi(resource_version)
         OpenAPIFileResourceSchemaVersion.objects.create(
             gateway=gateway,
             resource_version=resource_version,
-            schema=exporter.export_resource_version_openapi(resource_version),
+            schema=schema,
         )
+        # 与版本导出使用相同的导出参数，预热导出缓存，版本创建后首次导出 yaml 时无需重新生成
+        transaction.on_commit(lambda: exporter.warm_up_resource_version_openapi(resource_version, schema))
 
         return resource_version
@@ -16,10 +16,13 @@
 # We undertake not to change the open source license (MIT license) applicable
 # to the current version of the project delivered to anyone in the future.
 #
-from typing import Any, Dict, List, Literal, Optional, Text, Tuple, Union
+import threading
+from typing import Any, Callable, Dict, List, Literal, Optional, Text, Tuple, Union
 
+from cachetools import TTLCache
 from pydantic import BaseModel, Field, Json, ValidationInfo, field_validator
 
+from apigateway.common.constants import CACHE_TIME_5_MINUTES
 from apigateway.core.constants import ResourceKindEnum
 
 
@@ -229,6 +232,11 @@ class ResourceDifferHandler(BaseModel, DiffMixin):
         source_resource_doc_updated_time: dict,
         target_resource_doc_updated_time: dict,
     ) -> dict:
+        """对比两个版本的资源数据
+
+        先判断资源数据是否完全相同，相同的资源无需解析、对比；只有新增、删除及数据不同的资源，
+        才构造 ResourceDifferHandler 进行结构化对比
+        """
         source_key_to_value_map = {}
         target_data_map = {}
         for item in source_data:
@@ -247,14 +255,18 @@ class ResourceDifferHandler(BaseModel, DiffMixin):
         resource_update = []
 
         for resource_id, source_resource_data_raw in source_key_to_value_map.items():
-            source_resource_differ = ResourceDifferHandler.model_validate(source_resource_data_raw)
             target_resource_data = target_data_map.pop(resource_id, None)
 
             # 目标版本中资源不存在，资源被删除
             if not target_resource_data:
-                resource_delete.append(source_resource_differ.model_dump())
+                resource_delete.append(ResourceDifferHandler.model_validate(source_resource_data_raw).model_dump())
+                continue
+
+            # 资源数据完全相同，对比结果必然无差异，忽略此资源；直接比较解析后的数据，与比较数据摘要等价，且无需序列化
+            if source_resource_data_raw == target_resource_data:
                 continue
 
+            source_resource_differ = ResourceDifferHandler.model_validate(source_resource_data_raw)
             target_resource_differ = ResourceDifferHandler.model_validate(target_resource_data)
             source_diff_value, target_diff_value = source_resource_differ.diff(target_resource_differ)
 
@@ -285,3 +297,47 @@ class ResourceDifferHandler(BaseModel, DiffMixin):
             "delete": sorted(resource_delete, key=lambda x: x["path"]),
             "update": sorted(resource_update, key=lambda x: x["target"]["path"]),
         }
+
+
+class ResourceVersionDiffCache:
+    """缓存两个资源版本的对比结果，key 为 (gateway_id, source_resource_version_id, target_resource_version_id)
+
+    资源版本创建后，资源数据、文档更新时间及 schema 不再变化，对比结果只需在版本删除时清理
+    """
+
+    def __init__(self, maxsize: int, ttl: int):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get_or_diff(
+        self,
+        gateway_id: int,
+        source_resource_version_id: Optional[int],
+        target_resource_version_id: int,
+        differ: Callable[[], dict],
+    ) -> dict:
+        key = (gateway_id, source_resource_version_id or 0, target_resource_version_id)
+        with self._lock:
+            result = self._cache.get(key)
+        if result is not None:
+            return result
+
+        result = differ()
+        with self._lock:
+            self._cache[key] = result
+        return result
+
+    def invalidate(self, resource_version_id: int):
+        """清理与该版本相关的对比结果"""
+        with self._lock:
+            keys = [key for key in self._cache if resource_version_id in key[1:]]
+            for key in keys:
+                self._cache.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+# 版本对比结果可能较大，只缓存少量最近对比的版本
+resource_version_diff_cache = ResourceVersionDiffCache(maxsize=32, ttl=CACHE_TIME_5_MINUTES)
@@ -41,12 +41,17 @@ from apigateway.service.resource import (
     snapshot_resource,
 )
 from apigateway.service.resource_version import (
+    calculate_used_stage_vars,
     get_resource_id_to_schema_by_resource_version,
+    get_resource_name_to_id,
     make_resource_schema_version,
+    resource_version_openapi_export_cache,
 )
 from apigateway.utils import time as time_utils
 from apigateway.utils.version import max_version
 
+from .diff import resource_version_diff_cache
+
 if TYPE_CHECKING:
     import datetime
 
@@ -122,10 +127,13 @@ class ResourceVersionHandler:
     @classmethod
     def create_resource_version(cls, gateway: Gateway, data: Dict[str, Any], username: str = "") -> ResourceVersion:
         now = time_utils.now_datetime()
+        version_data = ResourceVersionHandler.make_version(gateway)
 
         data.update(
             {
-                "data": ResourceVersionHandler.make_version(gateway),
+                "data": version_data,
+                # 记录版本中资源引用的环境变量，发布校验时无需解析版本数据
+                "used_stage_vars": calculate_used_stage_vars(version_data),
                 "gateway": gateway,
                 "version": data.get("version"),
                 "created_time": now,
@@ -210,7 +218,7 @@ class ResourceVersionHandler:
         # 版本中资源数量是否发生变化
         # some resource could be deleted
         resource_count = Resource.objects.filter(gateway_id=gateway_id).count()
-        if resource_count != len(latest_version.data):
+        if resource_count != latest_version.get_resource_count():
             return True
 
         return False
@@ -242,27 +250,20 @@ class ResourceVersionHandler:
         ).first()
         if resources_version_schema is None:
             return {}
-        resource_id_to_name = {
-            resource["id"]: resource["name"]
-            for resource in resources_version_schema.resource_version.data
-            if (resource.get("kind") or ResourceKindEnum.STANDARD.value) == ResourceKindEnum.STANDARD.value
-        }
-
-        return {
-            resource_id_to_name[schema_info["resource_id"]]: schema_info["schema"]
-            for schema_info in resources_version_schema.schema
-            if schema_info["resource_id"] in resource_id_to_name
-        }
+        resource_index = resources_version_schema.resource_version.resource_index
+        resource_name_to_schema = {}
+        for schema_info in resources_version_schema.schema:
+            resource = resource_index.get_by_id(schema_info["resource_id"])
+            if (
+                resource is not None
+                and (resource.get("kind") or ResourceKindEnum.STANDARD.value) == ResourceKindEnum.STANDARD.value
+            ):
+                resource_name_to_schema[resource["name"]] = schema_info["schema"]
+        return resource_name_to_schema
 
     @staticmethod
     def get_resource_id(resource_version_id: int, resource_name: str) -> int:
-        resource_version = ResourceVersion.objects.filter(id=resource_version_id).first()
-        if not resource_version:
-            return -1
-        for resource in resource_version.data:
-            if resource["name"] == resource_name:
-                return resource["id"]
-        return -1
+        return get_resource_name_to_id(resource_version_id).get(resource_name, -1)
 
     @staticmethod
     def get_backend_id_to_resources(resource_version: ResourceVersion) -> Dict[int, list]:
@@ -291,4 +292,6 @@ class ResourceVersionHandler:
         ReleasedResource.objects.filter(resource_version_id=resource_version_id).delete()
         # ResourceDocVersion, OpenAPIResourceSchemaVersion, OpenAPIFileResourceSchemaVersion
         # use FK/OneToOne with on_delete=CASCADE, auto-deleted with ResourceVersion
-        ResourceVersion.objects.filter(id=resource_version_id).delete()
+        ResourceVersion.objects.delete_with_resources_cache(ResourceVersion.objects.filter(id=resource_version_id))
+        resource_version_diff_cache.invalidate(resource_version_id)
+        resource_version_openapi_export_cache.invalidate([resource_version_id])
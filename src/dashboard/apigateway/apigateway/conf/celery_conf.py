@@ -37,6 +37,7 @@ CELERY_IMPORTS = [
     "apigateway.apps.gateway.tasks",
     "apigateway.apps.mcp_server.tasks",
     "apigateway.controller.tasks",
+    "apigateway.controller.publisher.publish",
 ]
 
 if os.getenv("ENABLE_MULTI_TENANT_MODE", "False").lower() not in ("true", "on", "ok", "y", "yes", "1"):
@@ -79,6 +80,10 @@ CELERY_BEAT_SCHEDULE = {
         "task": "apigateway.controller.tasks.clean_task.delete_old_app_resource_permission_records",
         "schedule": crontab(day_of_week="*", hour=1, minute=30),
     },
+    "apigateway.controller.tasks.clean_task.delete_unreferenced_released_resource_bodies": {
+        "task": "apigateway.controller.tasks.clean_task.delete_unreferenced_released_resource_bodies",
+        "schedule": crontab(day_of_week="*", hour=1, minute=35),
+    },
     "apigateway.apps.mcp_server.tasks.sync_mcp_server_prompts": {
         "task": "apigateway.apps.mcp_server.tasks.sync_mcp_server_prompts",
         "schedule": crontab(minute="*/10"),
@@ -141,6 +141,7 @@ MIDDLEWARE = [
     # 这个必须在最前
     "django_prometheus.middleware.PrometheusBeforeMiddleware",
     "apigateway.common.middlewares.request_id.RequestIDMiddleware",
+    "apigateway.apps.audit.middlewares.AuditEventLogBufferMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -390,6 +391,9 @@ DEFAULT_REDIS_CONFIG = CHANNEL_REDIS_CONFIG = {
     "tls_check_hostname": REDIS_TLS_CHECK_HOSTNAME,
 }
 
+# 滚动发布触发合并窗口（秒），窗口内同一网关环境的多次触发只执行一次发布；为 0 时不合并
+PUBLISH_COALESCE_WINDOW_SECONDS = env.int("BK_APIGW_PUBLISH_COALESCE_WINDOW_SECONDS", default=0)
+
 # redis lock 配置
 REDIS_PUBLISH_LOCK_TIMEOUT = env.int("BK_APIGW_PUBLISH_LOCK_TIMEOUT", 5)
 REDIS_PUBLISH_LOCK_RETRY_GET_TIMES = env.int("BK_APIGW_PUBLISH_LOCK_RETRY_GET_TIMES", 3)
@@ -407,6 +411,53 @@ ETCD_CONFIG = {
     "cert_key": env.str("BK_ETCD_KEY_PATH", default=None),
 }
 
+# etcd client 池：空闲超过该时间（秒）的 client 将被关闭；距上次健康检查超过该时间（秒）的 client，使用前需再次检查
+ETCD_CLIENT_POOL_IDLE_TIMEOUT = env.int("BK_ETCD_CLIENT_POOL_IDLE_TIMEOUT", default=600)
+ETCD_CLIENT_POOL_HEALTH_CHECK_INTERVAL = env.int("BK_ETCD_CLIENT_POOL_HEALTH_CHECK_INTERVAL", default=30)
+
+# 同步资源到 etcd 时，单个事务的最大操作数，不能超过 etcd 的 --max-txn-ops（默认 128）
+ETCD_SYNC_TXN_MAX_OPS = env.int("BK_ETCD_SYNC_TXN_MAX_OPS", default=128)
+# 同步资源到 etcd 时，单个事务中 key、value 的最大字节数；不包含 protobuf 编码开销，
+# 依赖与 etcd --max-request-bytes（默认 1.5 MiB）之间预留的 0.5 MiB 空间
+ETCD_SYNC_TXN_MAX_BYTES = env.int("BK_ETCD_SYNC_TXN_MAX_BYTES", default=1024 * 1024)
+# 同步资源到 etcd 时，分页读取已存在资源的每页 key 数量，需保证单页响应不超过 grpc 默认的 4 MiB 接收限制
+ETCD_SYNC_RANGE_PAGE_SIZE = env.int("BK_ETCD_SYNC_RANGE_PAGE_SIZE", default=500)
+# 增量发布：环境级配置未变化时，只重新生成、写入版本间有变化的资源对应的路由；否则回退为全量同步
+INCREMENTAL_RELEASE_ENABLED = env.bool("BK_APIGW_INCREMENTAL_RELEASE_ENABLED", default=False)
+# 流式全量同步：路由边转换边分批写入 etcd，内存占用不随网关资源数量增长，适用于资源数量很大的网关；
+# 转换过程中出错时，已写入的批次不会回滚（BkRelease 最后写入，apisix 仍以上一次发布的版本为准）
+RELEASE_STREAMING_SYNC_ENABLED = env.bool("BK_APIGW_RELEASE_STREAMING_SYNC_ENABLED", default=False)
+# 批量重新同步全部网关（sync_releases_to_gateway_parallel）：并发同步的网关数量，每秒写入 etcd 的最大 key 数量（0 为不限速）
+BULK_RESYNC_CONCURRENCY = env.int("BK_APIGW_BULK_RESYNC_CONCURRENCY", default=10)
+BULK_RESYNC_ETCD_WRITE_RATE = env.int("BK_APIGW_BULK_RESYNC_ETCD_WRITE_RATE", default=2000)
+# 数据面配置漂移检测：发布时记录 etcd 中各 key 的内容摘要，定期与 etcd 中的实际内容比对；
+# 开启自动修复时，只重新写入、删除漂移的 key
+RELEASE_DRIFT_DETECTION_ENABLED = env.bool("BK_APIGW_RELEASE_DRIFT_DETECTION_ENABLED", default=False)
+RELEASE_DRIFT_AUTO_REPAIR_ENABLED = env.bool("BK_APIGW_RELEASE_DRIFT_AUTO_REPAIR_ENABLED", default=False)
+# 并发下发资源到多个数据面时，最大并发数，及单个数据面的下发超时时间（秒）
+DATA_PLANE_DISTRIBUTE_MAX_WORKERS = env.int("BK_APIGW_DATA_PLANE_DISTRIBUTE_MAX_WORKERS", default=8)
+DATA_PLANE_DISTRIBUTE_TIMEOUT = env.int("BK_APIGW_DATA_PLANE_DISTRIBUTE_TIMEOUT", default=60)
+# 资源版本数据是否压缩存储；core-api 等组件会直接读取 core_resource_version.data，需确认其均支持压缩格式后再开启
+RESOURCE_VERSION_DATA_COMPRESS_ENABLED = env.bool("BK_APIGW_RESOURCE_VERSION_DATA_COMPRESS_ENABLED", default=False)
+# 资源版本中资源数据的缓存：进程内缓存的总字节数上限，及 redis 共享缓存中单个版本压缩后的字节数上限
+RESOURCE_VERSION_CACHE_LOCAL_MAX_BYTES = env.int(
+    "BK_APIGW_RESOURCE_VERSION_CACHE_LOCAL_MAX_BYTES", default=64 * 1024 * 1024
+)
+RESOURCE_VERSION_CACHE_REDIS_MAX_ENTRY_BYTES = env.int(
+    "BK_APIGW_RESOURCE_VERSION_CACHE_REDIS_MAX_ENTRY_BYTES", default=4 * 1024 * 1024
+)
+# 资源版本 openapi 导出内容的缓存：过期时间（秒），及单个导出内容压缩后的字节数上限
+RESOURCE_VERSION_OPENAPI_EXPORT_CACHE_TTL = env.int(
+    "BK_APIGW_RESOURCE_VERSION_OPENAPI_EXPORT_CACHE_TTL", default=24 * 3600
+)
+RESOURCE_VERSION_OPENAPI_EXPORT_CACHE_MAX_ENTRY_BYTES = env.int(
+    "BK_APIGW_RESOURCE_VERSION_OPENAPI_EXPORT_CACHE_MAX_ENTRY_BYTES", default=4 * 1024 * 1024
+)
+# 审计日志：请求内的审计日志缓存后批量写入，缓存数量达到上限时提前写入；
+# 单次写入的审计日志数量达到阈值时，交由 celery 任务异步写入（0 为不启用），投递任务失败时仍直接写入
+AUDIT_LOG_BUFFER_MAX_SIZE = env.int("BK_APIGW_AUDIT_LOG_BUFFER_MAX_SIZE", default=500)
+AUDIT_LOG_ASYNC_THRESHOLD = env.int("BK_APIGW_AUDIT_LOG_ASYNC_THRESHOLD", default=0)
+
 # ==============================================================================
 # celery 配置
 # ==============================================================================
@@ -879,6 +930,16 @@ if ENABLE_RUN_DATA_METRICS:
             }
         )
 
+if RELEASE_DRIFT_DETECTION_ENABLED:
+    CELERY_BEAT_SCHEDULE.update(
+        {
+            "apigateway.controller.tasks.drift.detect_release_drift": {
+                "task": "apigateway.controller.tasks.drift.detect_release_drift",
+                "schedule": crontab(minute="*/30"),
+            },
+        }
+    )
+
 # ==============================================================================
 # 提供给前端的环境变量值
 # ==============================================================================
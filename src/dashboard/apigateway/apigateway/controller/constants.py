@@ -22,3 +22,6 @@ DELETE_PUBLISH_ID = -2
 
 # global resource publish id
 GLOBAL_PUBLISH_ID = -3
+
+# 合并后的滚动发布任务
+COALESCED_ROLLING_UPDATE_RELEASE_TASK_NAME = "apigateway.controller.publisher.publish.coalesced_rolling_update_release"
@@ -23,7 +23,7 @@ from apigateway.controller.models import ApisixModel, Labels
 from .constants import LABEL_KEY_APISIX_VERSION, LABEL_KEY_GATEWAY, LABEL_KEY_PUBLISH_ID, LABEL_KEY_STAGE
 
 if TYPE_CHECKING:
-    from apigateway.controller.release_data import ReleaseData
+    from apigateway.controller.release_data import ReleaseConvertCache, ReleaseData
 
 
 class BaseResourceConvertor(ABC):
@@ -83,6 +83,10 @@ class GatewayResourceConvertor(BaseResourceConvertor):
     def stage_id(self) -> int:
         return self._release_data.stage.pk
 
+    @property
+    def convert_cache(self) -> ReleaseConvertCache:
+        return self._release_data.convert_cache
+
     @abstractmethod
     def convert(self) -> List[ApisixModel]:
         raise NotImplementedError()
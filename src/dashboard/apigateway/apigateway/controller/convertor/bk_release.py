@@ -27,6 +27,10 @@ if TYPE_CHECKING:
     from apigateway.controller.release_data import ReleaseData
 
 
+def get_bk_release_id(gateway_name: str, stage_name: str) -> str:
+    return f"bk.release.{gateway_name}.{stage_name}"
+
+
 class BkReleaseConvertor(GatewayResourceConvertor):
     def __init__(self, release_data: ReleaseData, publish_id: int, apisix_version: str):
         super().__init__(release_data=release_data, publish_id=publish_id, apisix_version=apisix_version)
@@ -34,7 +38,7 @@ class BkReleaseConvertor(GatewayResourceConvertor):
     def convert(self) -> List[GatewayApisixModel]:
         return [
             BkRelease(
-                id=f"bk.release.{self.gateway_name}.{self.stage_name}",
+                id=get_bk_release_id(self.gateway_name, self.stage_name),
                 publish_id=self._publish_id,
                 publish_time=now_str(),
                 apisix_version=self._apisix_version,
@@ -23,6 +23,8 @@ LABEL_KEY_APISIX_VERSION = f"{LABEL_KEY_PREFIX}/apisix-version"
 
 LABEL_KEY_PUBLISH_ID = f"{LABEL_KEY_PREFIX}/publish-id"
 LABEL_KEY_BACKEND_ID = f"{LABEL_KEY_PREFIX}/backend-id"
+# 记录在 BkRelease 上的环境级配置摘要，用于增量发布时判断环境级配置是否变化
+LABEL_KEY_STAGE_CONFIG_DIGEST = f"{LABEL_KEY_PREFIX}/stage-config-digest"
 
 SUBPATH_PARAM_NAME = "bk_api_subpath_match_param_name"
 
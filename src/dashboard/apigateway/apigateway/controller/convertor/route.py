@@ -18,12 +18,12 @@
 
 import json
 import logging
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 from apigateway.controller.constants import DELETE_PUBLISH_ID
 from apigateway.controller.models import GatewayApisixModel, Plugin, Route, Timeout
 from apigateway.controller.models.constants import HttpMethodEnum
-from apigateway.controller.uri_render import UpstreamURIRender, URIRender
+from apigateway.controller.release_tracer import trace_phase
 from apigateway.core.constants import ProxyTypeEnum, ResourceKindEnum
 from apigateway.utils.time import now_str
 
@@ -37,6 +37,11 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+def get_route_id(gateway_name: str, stage_name: str, resource_id: int) -> str:
+    # example: bk-esb.prod.996, 30+20+2+N < 64, so N <= 12
+    return f"{gateway_name}.{stage_name}.{resource_id}"
+
+
 class RouteConvertor(GatewayResourceConvertor):
     def __init__(
         self,
@@ -45,10 +50,15 @@ class RouteConvertor(GatewayResourceConvertor):
         publish_id: int,
         apisix_version: str,
         revoke_flag: Union[bool, None] = False,
+        resource_ids: Optional[Set[int]] = None,
     ):
+        """
+        :param resource_ids: 只转换指定 id 的资源，为 None 时转换全部资源；用于增量发布
+        """
         super().__init__(release_data=release_data, publish_id=publish_id, apisix_version=apisix_version)
         self._revoke_flag = revoke_flag
         self._backend_service_mapping = backend_service_mapping
+        self._resource_ids = resource_ids
 
     def _get_service_id(self, backend_id: int) -> str:
         service_id = self._backend_service_mapping.get(backend_id)
@@ -57,19 +67,22 @@ class RouteConvertor(GatewayResourceConvertor):
         return service_id
 
     def convert(self) -> List[GatewayApisixModel]:
-        routes: List[GatewayApisixModel] = []
+        return list(self.iter_convert())
 
+    def iter_convert(self) -> Iterator[GatewayApisixModel]:
+        """逐个转换并返回路由，不在内存中保留全部路由；用于流式发布"""
         if not self._revoke_flag:
             for resource in self._release_data.resource_configs:
+                if self._resource_ids is not None and resource["id"] not in self._resource_ids:
+                    continue
+
                 route = self._convert_http_route(resource)
                 if route:
-                    routes.append(route)
+                    yield route
         # 如果是版本发布需要加上版本路由，版本发布需要新增一个版本路由，方便查询发布结果探测
         # NOTE: delete gateway don't need to add detect route
         if self._publish_id and self._publish_id != DELETE_PUBLISH_ID:
-            routes.append(self._get_release_version_detect_route())
-
-        return routes
+            yield self._get_release_version_detect_route()
 
     def _convert_http_route(self, resource: Dict[str, Any]) -> Optional[Route]:
         if resource["proxy"]["type"] not in [ProxyTypeEnum.HTTP.value]:
@@ -92,7 +105,7 @@ class RouteConvertor(GatewayResourceConvertor):
         return self._convert_standard_route(resource, service_id)
 
     def _convert_standard_route(self, resource: Dict[str, Any], service_id: str) -> Route:
-        resource_proxy = json.loads(resource["proxy"]["config"])
+        resource_proxy = self.convert_cache.load_json_config(resource["proxy"]["config"])
 
         methods = []
         if resource["method"] != "ANY":
@@ -118,21 +131,21 @@ class RouteConvertor(GatewayResourceConvertor):
             match_subpath=match_subpath,
         )
 
-        route = Route(
-            # example: bk-esb.prod.996, 30+20+2+N < 64, so N <= 12
-            id=f"{self.gateway_name}.{self.stage_name}.{resource['id']}",
-            # example: bk-esb-prod-helloworld
-            # the resource_name max length is 256, while the apisix name max length is 100
-            name=truncate_string(f"{self.gateway_name}.{self.stage_name}.{resource['name']}", 100),
-            # NOTE: no desc for route, save memory
-            # desc=resource["description"],
-            uris=uris,
-            methods=methods,
-            plugins=plugins,
-            service_id=service_id,
-            # NOTE: should not set upstream here!
-            labels=self.get_labels(),
-        )
+        with trace_phase("validate_routes"):
+            route = Route(
+                id=get_route_id(self.gateway_name, self.stage_name, resource["id"]),
+                # example: bk-esb-prod-helloworld
+                # the resource_name max length is 256, while the apisix name max length is 100
+                name=truncate_string(f"{self.gateway_name}.{self.stage_name}.{resource['name']}", 100),
+                # NOTE: no desc for route, save memory
+                # desc=resource["description"],
+                uris=uris,
+                methods=methods,
+                plugins=plugins,
+                service_id=service_id,
+                # NOTE: should not set upstream here!
+                labels=self.get_labels(),
+            )
         if priority:
             route.priority = priority
         if resource.get("enable_websocket", False):
@@ -159,21 +172,22 @@ class RouteConvertor(GatewayResourceConvertor):
         )
         plugins.update(self._build_oauth2_plugins(resource))
 
-        return Route(
-            id=f"{self.gateway_name}.{self.stage_name}.{resource['id']}",
-            name=truncate_string(f"{self.gateway_name}.{self.stage_name}.{resource['name']}", 100),
-            uris=uris,
-            methods=[HttpMethodEnum.POST],
-            plugins=plugins,
-            service_id=service_id,
-            labels=self.get_labels(),
-        )
+        with trace_phase("validate_routes"):
+            return Route(
+                id=get_route_id(self.gateway_name, self.stage_name, resource["id"]),
+                name=truncate_string(f"{self.gateway_name}.{self.stage_name}.{resource['name']}", 100),
+                uris=uris,
+                methods=[HttpMethodEnum.POST],
+                plugins=plugins,
+                service_id=service_id,
+                labels=self.get_labels(),
+            )
 
     def _convert_uris(self, path: str, match_subpath: bool) -> Tuple[List[str], int]:
         uri = f"/api/{self.gateway_name}/{self.stage_name}/" + path.lstrip("/")
         uri_without_suffix_slash = uri.rstrip("/")
 
-        rendered_uri_without_suffix_slash = URIRender().render(uri_without_suffix_slash, self.stage.vars)
+        rendered_uri_without_suffix_slash = self.convert_cache.render_uri(uri_without_suffix_slash)
         if match_subpath:
             priority = self._calculate_match_subpath_route_priority(rendered_uri_without_suffix_slash)
             return [
@@ -203,7 +217,7 @@ class RouteConvertor(GatewayResourceConvertor):
         )
 
     def _build_resource_context_plugin(self, resource: Dict[str, Any]) -> Plugin:
-        resource_auth_config = json.loads(resource["contexts"]["resource_auth"]["config"])
+        resource_auth_config = self.convert_cache.load_json_config(resource["contexts"]["resource_auth"]["config"])
         return Plugin(
             bk_resource_id=resource["id"],
             bk_resource_name=resource["name"],
@@ -217,7 +231,7 @@ class RouteConvertor(GatewayResourceConvertor):
         )
 
     def _build_oauth2_plugins(self, resource: Dict[str, Any]) -> Dict[str, Plugin]:
-        resource_auth_config = json.loads(resource["contexts"]["resource_auth"]["config"])
+        resource_auth_config = self.convert_cache.load_json_config(resource["contexts"]["resource_auth"]["config"])
         support_public = resource_auth_config.get("oauth2_public_client_enabled", False)
         support_personal = resource_auth_config.get("oauth2_personal_client_enabled", False)
         if not support_public and not support_personal:
@@ -241,7 +255,7 @@ class RouteConvertor(GatewayResourceConvertor):
 
         config: Dict[str, Any] = {}
         if path:
-            upstream_uri = UpstreamURIRender().render(path, self.stage.vars)
+            upstream_uri = self.convert_cache.render_upstream_uri(path)
             if match_subpath:
                 config["match_subpath"] = True
                 config["subpath_param_name"] = SUBPATH_PARAM_NAME
@@ -47,7 +47,6 @@ from apigateway.controller.models.constants import (
     UpstreamSchemeEnum,
     UpstreamTypeEnum,
 )
-from apigateway.controller.uri_render import URIRender
 from apigateway.core.ai_backend import get_ai_backend_provider_config
 from apigateway.core.backend_config import AIBackendConfig
 from apigateway.core.constants import BackendKindEnum, LoadBalanceTypeEnum
@@ -169,7 +168,7 @@ class ServiceConvertor(GatewayResourceConvertor):
             if host == "":
                 host = DEFAULT_BACKEND_HOST_FOR_MISSING
             # render the host with stage variables
-            host = URIRender().render(host, self.stage.vars)
+            host = self.convert_cache.render_uri(host)
 
             if "scheme" in node:
                 host = node["scheme"] + "://" + host
@@ -16,19 +16,26 @@
 # to the current version of the project delivered to anyone in the future.
 #
 import logging
-from typing import TYPE_CHECKING, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from django.conf import settings
 
 if TYPE_CHECKING:
     import etcd3
 
     from apigateway.apps.data_plane.models import DataPlane
+    from apigateway.controller.models import ApisixModel
+from apigateway.apps.data_plane.models import DataPlaneReleaseManifest
+from apigateway.controller.convertor.route import get_route_id
 from apigateway.controller.distributor.base import BaseDistributor
+from apigateway.controller.models import Route
 from apigateway.controller.registry.etcd import EtcdRegistry
 from apigateway.controller.release_logger import ReleaseProcedureLogger
 from apigateway.controller.transformer import GatewayApisixResourceTransformer, GlobalApisixResourceTransformer
 from apigateway.core.models import Gateway, Release, Stage
-from apigateway.utils.etcd import new_etcd_client
+from apigateway.utils.etcd import get_pooled_etcd_client
 
+from .incremental import IncrementalReleasePlan, IncrementalReleasePlanner
 from .key_prefix import GatewayKeyPrefixHandler, GlobalKeyPrefixHandler
 
 logger = logging.getLogger(__name__)
@@ -44,11 +51,18 @@ class SyncFail(Exception):
         return f"sync resources failed: {self.resources}"
 
 
+def transform_global_resources(apisix_version: str) -> List[ApisixModel]:
+    """全局资源只与数据面的 apisix 版本相关，相同版本的数据面可共用转换结果"""
+    transformer = GlobalApisixResourceTransformer(apisix_version)
+    transformer.transform()
+    return list(transformer.get_transformed_resources())
+
+
 # global distributor is full sync
 class GlobalResourceDistributor(BaseDistributor):
     def __init__(self, data_plane: DataPlane):
         self.data_plane = data_plane
-        self._etcd_client: "etcd3.Etcd3Client" = new_etcd_client(data_plane.etcd_configs)
+        self._etcd_client: "etcd3.Etcd3Client" = get_pooled_etcd_client(data_plane.etcd_configs)
 
     def _get_registry(self) -> EtcdRegistry:
         if not self.data_plane.etcd_namespace_prefix:
@@ -61,9 +75,12 @@ class GlobalResourceDistributor(BaseDistributor):
         self,
         release_task_id: str,
         publish_id: int,
+        resources: Optional[List[ApisixModel]] = None,
     ) -> Tuple[bool, str]:
-        """将 release 发布到 global registry 中"""
-        transformer = GlobalApisixResourceTransformer(self.data_plane.apisix_version)
+        """将 release 发布到 global registry 中
+
+        :param resources: 已转换好的全局资源，需与数据面的 apisix 版本一致；为 None 时，按数据面的 apisix 版本转换
+        """
         registry = self._get_registry()
 
         gateway = Gateway(id=-1, name="global")
@@ -80,16 +97,18 @@ class GlobalResourceDistributor(BaseDistributor):
 
         try:
             # step 1: 将网关资源转换为 apisix 资源
-            with procedure_logger.step("convert to global apisix resources"):
-                transformer.transform()
-
-            resources = list(transformer.get_transformed_resources())
+            if resources is None:
+                with procedure_logger.step("convert to global apisix resources"):
+                    resources = transform_global_resources(self.data_plane.apisix_version)
 
             # step 2: 将 apisix 资源同步到 etcd
             with procedure_logger.step(f"sync global resources(count={len(resources)}) to etcd"):
                 fail_resources = registry.sync_resources_by_key_prefix(resources)
                 if fail_resources:
                     raise SyncFail(fail_resources)
+
+            sync_msg = f"sync resources to etcd finished: {registry.sync_stats}"
+            procedure_logger.info(sync_msg)
         except Exception as e:  # pylint: disable=broad-except
             fail_msg = f"distribute global resources to etcd failed: {type(e).__name__}: {str(e)}"
             procedure_logger.exception(fail_msg)
@@ -108,7 +127,7 @@ class GatewayResourceDistributor(BaseDistributor):
     def __init__(self, release: Release, data_plane: DataPlane):
         self.release = release
         self.data_plane = data_plane
-        self._etcd_client: "etcd3.Etcd3Client" = new_etcd_client(data_plane.etcd_configs)
+        self._etcd_client: "etcd3.Etcd3Client" = get_pooled_etcd_client(data_plane.etcd_configs)
 
     @property
     def gateway(self) -> Gateway:
@@ -125,7 +144,11 @@ class GatewayResourceDistributor(BaseDistributor):
         key_prefix = GatewayKeyPrefixHandler(prefix=self.data_plane.etcd_namespace_prefix).get_release_key_prefix(
             gateway.name, stage.name
         )
-        return EtcdRegistry(key_prefix=key_prefix, etcd_client=self._etcd_client)
+        return EtcdRegistry(
+            key_prefix=key_prefix,
+            etcd_client=self._etcd_client,
+            record_digests=settings.RELEASE_DRIFT_DETECTION_ENABLED,
+        )
 
     def distribute(
         self,
@@ -150,21 +173,21 @@ class GatewayResourceDistributor(BaseDistributor):
         )
 
         try:
-            # step 1: 将网关资源转换为 apisix 资源
-            with procedure_logger.step("convert to gateway apisix resources"):
-                transformer.transform()
-
-            resources = list(transformer.get_transformed_resources())
-
-            # step 2: 将 apisix 资源同步到 etcd
-            with procedure_logger.step(f"sync gateway resources(count={len(resources)}) to etcd"):
-                fail_resources = registry.sync_resources_by_key_prefix(resources)
-                if fail_resources:
-                    raise SyncFail(fail_resources)
+            plan = self._plan_incremental_release(transformer, registry, publish_id, procedure_logger)
+            if plan is None:
+                self._sync_all(transformer, registry, procedure_logger)
+            else:
+                self._sync_incremental(transformer, registry, plan, procedure_logger)
+
+            sync_msg = f"sync resources to etcd finished: {registry.sync_stats}"
+            procedure_logger.info(sync_msg)
         except Exception as e:  # pylint: disable=broad-except
             fail_msg = f"distribute gateway resources to etcd failed: {type(e).__name__}: {str(e)}"
             procedure_logger.exception(fail_msg)
             return False, fail_msg
+        finally:
+            # 同步失败时也记录目标内容的摘要，部分写入失败的 key 将作为漂移被检测、修复
+            self._save_release_manifest(transformer, registry, publish_id)
 
         # FIXME: enable this part after v1.20, in v1.21 or v1.22
         # try:
@@ -183,6 +206,129 @@ class GatewayResourceDistributor(BaseDistributor):
 
         return True, ""
 
+    def _plan_incremental_release(
+        self,
+        transformer: GatewayApisixResourceTransformer,
+        registry: EtcdRegistry,
+        publish_id: int,
+        procedure_logger: ReleaseProcedureLogger,
+    ) -> Optional[IncrementalReleasePlan]:
+        if not settings.INCREMENTAL_RELEASE_ENABLED:
+            return None
+
+        with procedure_logger.step("plan incremental release"):
+            planner = IncrementalReleasePlanner(self.release, self.data_plane, registry, publish_id)
+            plan, reason = planner.plan(transformer.get_stage_config_digest())
+
+        plan_msg = f"fallback to full sync: {reason}" if plan is None else f"incremental release: {plan}"
+        procedure_logger.info(plan_msg)
+        return plan
+
+    def _sync_all(
+        self,
+        transformer: GatewayApisixResourceTransformer,
+        registry: EtcdRegistry,
+        procedure_logger: ReleaseProcedureLogger,
+    ):
+        if settings.RELEASE_STREAMING_SYNC_ENABLED:
+            self._sync_all_streaming(transformer, registry, procedure_logger)
+            return
+
+        # step 1: 将网关资源转换为 apisix 资源
+        with procedure_logger.step("convert to gateway apisix resources"):
+            transformer.transform()
+
+        resources = list(transformer.get_transformed_resources())
+
+        # step 2: 将 apisix 资源同步到 etcd
+        with procedure_logger.step(f"sync gateway resources(count={len(resources)}) to etcd"):
+            fail_resources = registry.sync_resources_by_key_prefix(resources)
+            if fail_resources:
+                raise SyncFail(fail_resources)
+
+    def _sync_all_streaming(
+        self,
+        transformer: GatewayApisixResourceTransformer,
+        registry: EtcdRegistry,
+        procedure_logger: ReleaseProcedureLogger,
+    ):
+        # 边转换边写入，不在内存中保留全部资源
+        with procedure_logger.step("convert and sync gateway resources to etcd in streaming"):
+            fail_resources = registry.sync_resources_by_key_prefix(
+                transformer.iter_transformed_resources(), streaming=True
+            )
+            if fail_resources:
+                raise SyncFail(fail_resources)
+
+    def _sync_incremental(
+        self,
+        transformer: GatewayApisixResourceTransformer,
+        registry: EtcdRegistry,
+        plan: IncrementalReleasePlan,
+        procedure_logger: ReleaseProcedureLogger,
+    ):
+        # step 1: 只转换受影响资源的路由
+        with procedure_logger.step("convert changed gateway resources to apisix resources"):
+            transformer.transform(resource_ids=plan.affected_resource_ids)
+
+        resources = list(transformer.get_incremental_resources())
+
+        # 已删除的资源，以及变更后不再生成路由的资源（如代理类型变更、在当前环境禁用），需删除其路由
+        route_ids = {resource.id for resource in resources}
+        deleted_resources = []
+        for resource_id in sorted(plan.affected_resource_ids):
+            route_id = get_route_id(self.gateway.name, self.stage.name, resource_id)
+            if route_id not in route_ids:
+                deleted_resources.append((Route.kind, route_id))
+
+        # step 2: 只写入变化的路由及 BkRelease
+        with procedure_logger.step(
+            f"patch gateway resources(count={len(resources)}, deleted={len(deleted_resources)}) to etcd"
+        ):
+            fail_resources = registry.patch_resources(resources, deleted_resources)
+            if fail_resources:
+                raise SyncFail(fail_resources)
+
+    def _save_release_manifest(
+        self,
+        transformer: GatewayApisixResourceTransformer,
+        registry: EtcdRegistry,
+        publish_id: int,
+    ):
+        """记录本次同步中各 key 目标内容的摘要，供数据面配置漂移检测使用，见 controller/drift.py"""
+        if not settings.RELEASE_DRIFT_DETECTION_ENABLED:
+            return
+
+        published_digests = registry.published_digests
+        if published_digests is None:
+            return
+
+        try:
+            if not published_digests.is_complete:
+                DataPlaneReleaseManifest.objects.delete_manifest(self.data_plane, self.stage)
+                return
+
+            fields = {
+                "publish_id": publish_id,
+                "resource_version_id": self.release.resource_version_id,
+                "stage_config_digest": transformer.get_stage_config_digest(),
+            }
+            if published_digests.is_full:
+                DataPlaneReleaseManifest.objects.save_manifest(
+                    self.data_plane, self.stage, registry.key_prefix, published_digests.digests, **fields
+                )
+            else:
+                DataPlaneReleaseManifest.objects.patch_manifest(
+                    self.data_plane, self.stage, registry.key_prefix, published_digests.digests, **fields
+                )
+        except Exception:  # pylint: disable=broad-except
+            logger.exception(
+                "save release manifest failed: gateway=%s, stage=%s, data_plane=%s",
+                self.gateway.name,
+                self.stage.name,
+                self.data_plane.name,
+            )
+
     def revoke(
         self,
         release_task_id: str,
@@ -190,6 +336,9 @@ class GatewayResourceDistributor(BaseDistributor):
     ) -> Tuple[bool, str]:
         """撤销已发布到 micro-gateway 对应的 registry 中的配置"""
         registry = self._get_registry(self.gateway, self.stage)
+        if settings.RELEASE_DRIFT_DETECTION_ENABLED:
+            # 已撤销的环境不再检测配置漂移
+            DataPlaneReleaseManifest.objects.delete_manifest(self.data_plane, self.stage)
 
         procedure_logger = ReleaseProcedureLogger(
             f"gateway-revoking (data_plane={self.data_plane.name})",
@@ -230,9 +379,13 @@ class GatewayResourceDistributor(BaseDistributor):
                 transformer.transform()
                 resources = list(transformer.get_transformed_resources())
                 with procedure_logger.step(f"sync gateway version resources(count={len(resources)}) to etcd"):
-                    fail_resources = registry.sync_resources_by_key_prefix(resources)
+                    # key_prefix 下的数据刚被清空，无需再读取已存在的资源
+                    fail_resources = registry.sync_resources_by_key_prefix(resources, prefix_cleared=True)
                     if fail_resources:
                         raise SyncFail(fail_resources)
+
+            sync_msg = f"sync resources to etcd finished: {registry.sync_stats}"
+            procedure_logger.info(sync_msg)
         except Exception as e:  # pylint: disable=broad-except
             fail_msg = f"revoke gateway resources from etcd failed: {type(e).__name__}: {str(e)}"
             procedure_logger.exception(fail_msg)
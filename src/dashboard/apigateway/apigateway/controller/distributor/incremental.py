@@ -0,0 +1,142 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+
+from apigateway.controller.convertor.bk_release import get_bk_release_id
+from apigateway.controller.convertor.constants import LABEL_KEY_STAGE_CONFIG_DIGEST
+from apigateway.controller.models import BkRelease
+from apigateway.core.models import ReleaseHistory, ResourceVersion
+
+if TYPE_CHECKING:
+    from apigateway.apps.data_plane.models import DataPlane
+    from apigateway.controller.registry.base import Registry
+    from apigateway.core.models import Release
+
+logger = logging.getLogger(__name__)
+
+
+def get_resource_config_digests(resource_configs: List[Dict[str, Any]]) -> Dict[int, str]:
+    """获取版本中各资源配置的摘要，key 为资源 id"""
+    return {
+        resource["id"]: hashlib.sha1(json.dumps(resource, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        for resource in resource_configs
+    }
+
+
+@dataclass
+class IncrementalReleasePlan:
+    """增量发布计划"""
+
+    # 新增或配置变化的资源 id
+    changed_resource_ids: Set[int] = field(default_factory=set)
+    # 目标版本中已不存在的资源 id
+    deleted_resource_ids: Set[int] = field(default_factory=set)
+
+    @property
+    def affected_resource_ids(self) -> Set[int]:
+        return self.changed_resource_ids | self.deleted_resource_ids
+
+    def __str__(self):
+        return f"changed={len(self.changed_resource_ids)}, deleted={len(self.deleted_resource_ids)}"
+
+
+class IncrementalReleasePlanner:
+    """根据数据面上已发布的 BkRelease，计算增量发布计划
+
+    以下情况无法增量发布，需回退为全量同步：
+    - 发布没有对应的发布历史，如 CLI 同步
+    - 数据面上没有 BkRelease，或 BkRelease 的 apisix 版本、环境级配置摘要与本次发布不一致
+    - 数据面上的 BkRelease 不是该数据面上一次发布写入的，即上一次发布失败，数据面上可能存在部分写入的数据
+    - 已发布的资源版本已不存在
+    """
+
+    def __init__(self, release: Release, data_plane: DataPlane, registry: Registry, publish_id: int):
+        self.release = release
+        self.data_plane = data_plane
+        self.registry = registry
+        self.publish_id = publish_id
+
+    def plan(self, stage_config_digest: str) -> Tuple[Optional[IncrementalReleasePlan], str]:
+        """返回增量发布计划；无法增量发布时，返回 None 及原因"""
+        published = self._get_published_release()
+        reason = self._get_fallback_reason(published, stage_config_digest)
+        if reason:
+            return None, reason
+
+        published_resource_version = ResourceVersion.objects.filter(
+            gateway_id=self.release.gateway_id,
+            version=published.resource_version,
+        ).first()
+        if published_resource_version is None:
+            return None, f"published resource version {published.resource_version} not found"
+
+        published_digests = get_resource_config_digests(published_resource_version.data)
+        target_digests = get_resource_config_digests(self.release.resource_version.data)
+
+        plan = IncrementalReleasePlan(
+            changed_resource_ids={
+                resource_id
+                for resource_id, digest in target_digests.items()
+                if published_digests.get(resource_id) != digest
+            },
+            deleted_resource_ids=set(published_digests) - set(target_digests),
+        )
+        return plan, "ok"
+
+    def _get_published_release(self) -> Optional[BkRelease]:
+        if self.publish_id <= 0:
+            return None
+
+        return self.registry.get_resource(
+            BkRelease, get_bk_release_id(self.release.gateway.name, self.release.stage.name)
+        )
+
+    def _get_fallback_reason(self, published: Optional[BkRelease], stage_config_digest: str) -> str:
+        if self.publish_id <= 0:
+            return "publish has no release history"
+
+        if published is None:
+            return "no release marker found in data plane"
+
+        if published.apisix_version != self.data_plane.apisix_version:
+            return "apisix version changed"
+
+        if published.labels.get_label(LABEL_KEY_STAGE_CONFIG_DIGEST) != stage_config_digest:
+            return "stage config changed"
+
+        if published.publish_id != self._get_previous_publish_id():
+            return "previous publish to the data plane was not applied completely"
+
+        return ""
+
+    def _get_previous_publish_id(self) -> Optional[int]:
+        return (
+            ReleaseHistory.objects.filter(
+                gateway_id=self.release.gateway_id,
+                stage_id=self.release.stage_id,
+                data_plane_id=self.data_plane.id,
+                id__lt=self.publish_id,
+            )
+            .order_by("-id")
+            .values_list("id", flat=True)
+            .first()
+        )
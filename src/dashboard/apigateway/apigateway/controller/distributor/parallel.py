@@ -0,0 +1,97 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import logging
+import math
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+if TYPE_CHECKING:
+    from apigateway.apps.data_plane.models import DataPlane
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DataPlaneDistributeResult:
+    data_plane: DataPlane
+    is_success: bool
+    message: str
+
+
+class ParallelDistributeExecutor:
+    """将资源并发下发到多个数据面
+
+    - 使用有界线程池，同时下发的数据面数量不超过 max_workers
+    - 每个数据面的下发耗时不超过 timeout 秒，超时的数据面记为失败；线程无法被中断，超时的下发会在后台继续执行直至结束
+    - 部分数据面失败不影响其它数据面，调用方根据各数据面的结果自行汇总
+
+    NOTE: distribute 在工作线程中执行，不应访问 db（线程不共享调用方的事务，且需自行关闭数据库连接），
+    应在调用方线程中完成资源转换等需要访问 db 的操作
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, timeout: Optional[float] = None):
+        self.max_workers = max_workers or settings.DATA_PLANE_DISTRIBUTE_MAX_WORKERS
+        self.timeout = timeout or settings.DATA_PLANE_DISTRIBUTE_TIMEOUT
+
+    def run(
+        self,
+        data_planes: List[DataPlane],
+        distribute: Callable[[DataPlane], Tuple[bool, str]],
+    ) -> List[DataPlaneDistributeResult]:
+        """并发执行 distribute，返回各数据面的下发结果，顺序与 data_planes 一致"""
+        if not data_planes:
+            return []
+
+        max_workers = min(self.max_workers, len(data_planes))
+        # 数据面需排队等待空闲线程，总的等待时间按批次计算
+        deadline = time.monotonic() + self.timeout * math.ceil(len(data_planes) / max_workers)
+
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="distribute")
+        try:
+            futures: Dict[int, Future] = {
+                data_plane.id: executor.submit(self._distribute, distribute, data_plane) for data_plane in data_planes
+            }
+            return [
+                self._get_result(data_plane, futures[data_plane.id], deadline - time.monotonic())
+                for data_plane in data_planes
+            ]
+        finally:
+            # 不等待超时的下发结束，未开始的下发直接取消
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _distribute(
+        self, distribute: Callable[[DataPlane], Tuple[bool, str]], data_plane: DataPlane
+    ) -> Tuple[bool, str]:
+        try:
+            return distribute(data_plane)
+        except Exception as err:  # pylint: disable=broad-except
+            logger.exception("distribute to data_plane[id=%s,name=%s] failed", data_plane.id, data_plane.name)
+            return False, f"{type(err).__name__}: {err}"
+
+    def _get_result(self, data_plane: DataPlane, future: Future, timeout: float) -> DataPlaneDistributeResult:
+        try:
+            is_success, message = future.result(timeout=max(timeout, 0))
+        except FutureTimeoutError:
+            is_success, message = False, f"distribute to data_plane[{data_plane.name}] timeout"
+
+        return DataPlaneDistributeResult(data_plane=data_plane, is_success=is_success, message=message)
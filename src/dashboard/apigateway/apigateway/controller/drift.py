@@ -0,0 +1,251 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""数据面配置漂移检测与修复
+
+发布时，EtcdRegistry 记录 key_prefix 下各 key 目标内容的摘要，保存为 DataPlaneReleaseManifest；
+检测时，在同一个 revision 下分页读取 etcd 中的内容并计算摘要，与记录的摘要比对，得到漂移的 key；
+修复时，重新转换当前发布，只写入缺失、被修改的 key，删除多余的 key，无需全量重新发布
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from apigateway.apps.data_plane.models import DataPlaneReleaseManifest
+from apigateway.controller.metrics import (
+    release_drift_check_counter,
+    release_drift_keys_counter,
+    release_drift_repaired_keys_counter,
+)
+from apigateway.controller.registry.etcd import EtcdRegistry
+from apigateway.controller.transformer import GatewayApisixResourceTransformer
+from apigateway.core.models import Release, ReleaseHistory
+from apigateway.utils.etcd import get_pooled_etcd_client
+
+if TYPE_CHECKING:
+    import etcd3
+
+    from apigateway.controller.models import ApisixModel
+
+logger = logging.getLogger(__name__)
+
+
+class DriftCheckResultEnum:
+    CLEAN = "clean"
+    DRIFTED = "drifted"
+    REPAIRED = "repaired"
+    REPAIR_SKIPPED = "repair_skipped"
+    REPAIR_FAILED = "repair_failed"
+    ERROR = "error"
+
+
+@dataclass
+class DriftReport:
+    """etcd 中的内容与发布时记录的摘要的差异"""
+
+    # 记录了摘要，但 etcd 中不存在的 key
+    missing_keys: List[str] = field(default_factory=list)
+    # etcd 中的内容与记录的摘要不一致的 key
+    modified_keys: List[str] = field(default_factory=list)
+    # etcd 中存在，但未记录摘要的 key
+    extra_keys: List[str] = field(default_factory=list)
+    # 读取 etcd 时的 revision
+    revision: Optional[int] = None
+
+    @property
+    def drifted_count(self) -> int:
+        return len(self.missing_keys) + len(self.modified_keys) + len(self.extra_keys)
+
+    @property
+    def is_drifted(self) -> bool:
+        return self.drifted_count > 0
+
+    def __str__(self):
+        return (
+            f"missing={len(self.missing_keys)}, modified={len(self.modified_keys)}, "
+            f"extra={len(self.extra_keys)}, revision={self.revision}"
+        )
+
+
+@dataclass
+class DriftCheckResult:
+    manifest: DataPlaneReleaseManifest
+    result: str
+    report: Optional[DriftReport] = None
+    repaired_count: int = 0
+    message: str = ""
+
+    def __str__(self):
+        manifest = self.manifest
+        return (
+            f"[{self.result}] gateway={manifest.gateway.name}, stage={manifest.stage.name}, "
+            f"data_plane={manifest.data_plane.name}: {self.report or ''} {self.message}".rstrip()
+        )
+
+
+def detect_drift(manifest: DataPlaneReleaseManifest, registry: EtcdRegistry) -> DriftReport:
+    """比对 etcd 中 key_prefix 下的内容与记录的摘要"""
+    expected_digests = manifest.digests
+    actual_digests, revision = registry.scan_digests_by_key_prefix()
+
+    return DriftReport(
+        missing_keys=sorted(key for key in expected_digests if key not in actual_digests),
+        modified_keys=sorted(
+            key for key, digest in expected_digests.items() if key in actual_digests and actual_digests[key] != digest
+        ),
+        extra_keys=sorted(key for key in actual_digests if key not in expected_digests),
+        revision=revision,
+    )
+
+
+class ReleaseDriftReconciler:
+    """检测网关环境在数据面中的配置漂移，并只修复漂移的 key
+
+    修复前确认发布的内容未发生变化，否则跳过修复，由下一次发布覆盖：
+    - 记录摘要之后，没有新的发布任务（发布中的内容与记录的摘要不一致，修复会覆盖正在发布的内容）
+    - 当前发布的资源版本、环境级配置与记录摘要时一致
+    - 重新转换得到的资源包含所有漂移的 key
+    """
+
+    def __init__(self, manifest: DataPlaneReleaseManifest, etcd_client: Optional[etcd3.Etcd3Client] = None):
+        self.manifest = manifest
+        self.data_plane = manifest.data_plane
+        self._etcd_client = etcd_client or get_pooled_etcd_client(self.data_plane.etcd_configs)
+
+    def _get_registry(self) -> EtcdRegistry:
+        return EtcdRegistry(key_prefix=self.manifest.key_prefix, etcd_client=self._etcd_client, record_digests=True)
+
+    def check(self, repair: bool = False) -> DriftCheckResult:
+        try:
+            result = self._check(repair)
+        except Exception as err:  # pylint: disable=broad-except
+            logger.exception("check release drift failed: manifest=%s", self.manifest)
+            result = DriftCheckResult(
+                self.manifest, DriftCheckResultEnum.ERROR, message=f"{type(err).__name__}: {err}"
+            )
+
+        release_drift_check_counter.labels(data_plane=self.data_plane.name, result=result.result).inc()
+        if result.report:
+            for drift_type, keys in [
+                ("missing", result.report.missing_keys),
+                ("modified", result.report.modified_keys),
+                ("extra", result.report.extra_keys),
+            ]:
+                if keys:
+                    release_drift_keys_counter.labels(data_plane=self.data_plane.name, drift_type=drift_type).inc(
+                        len(keys)
+                    )
+        if result.repaired_count:
+            release_drift_repaired_keys_counter.labels(data_plane=self.data_plane.name).inc(result.repaired_count)
+
+        return result
+
+    def _check(self, repair: bool) -> DriftCheckResult:
+        report = detect_drift(self.manifest, self._get_registry())
+        if not report.is_drifted:
+            return DriftCheckResult(self.manifest, DriftCheckResultEnum.CLEAN, report=report)
+
+        logger.warning("release drift detected: manifest=%s, %s", self.manifest, report)
+        if not repair:
+            return DriftCheckResult(self.manifest, DriftCheckResultEnum.DRIFTED, report=report)
+
+        return self._repair(report)
+
+    def _get_repair_skipped_reason(self, release: Optional[Release]) -> str:
+        manifest = self.manifest
+        if not DataPlaneReleaseManifest.objects.filter(id=manifest.id, updated_time=manifest.updated_time).exists():
+            return "manifest changed during detection"
+
+        if ReleaseHistory.objects.filter(
+            gateway_id=manifest.gateway_id,
+            stage_id=manifest.stage_id,
+            data_plane_id=manifest.data_plane_id,
+            created_time__gt=manifest.updated_time,
+        ).exists():
+            return "new publish found after manifest recorded"
+
+        if release is None:
+            return "release not found"
+
+        if release.resource_version_id != manifest.resource_version_id:
+            return "resource version changed since manifest recorded"
+
+        return ""
+
+    def _repair(self, report: DriftReport) -> DriftCheckResult:
+        manifest = self.manifest
+        release = Release.objects.filter(stage_id=manifest.stage_id).first()
+
+        skipped_reason = self._get_repair_skipped_reason(release)
+        if skipped_reason:
+            return DriftCheckResult(
+                manifest, DriftCheckResultEnum.REPAIR_SKIPPED, report=report, message=skipped_reason
+            )
+
+        transformer = GatewayApisixResourceTransformer(
+            release, self.data_plane.apisix_version, publish_id=manifest.publish_id
+        )
+        if transformer.get_stage_config_digest() != manifest.stage_config_digest:
+            return DriftCheckResult(
+                manifest,
+                DriftCheckResultEnum.REPAIR_SKIPPED,
+                report=report,
+                message="stage config changed since manifest recorded",
+            )
+
+        transformer.transform()
+        registry = self._get_registry()
+        key_to_resource: Dict[str, ApisixModel] = {
+            registry.get_resource_key(resource): resource for resource in transformer.get_transformed_resources()
+        }
+
+        drifted_keys = report.missing_keys + report.modified_keys
+        if any(key not in key_to_resource for key in drifted_keys) or any(
+            key in key_to_resource for key in report.extra_keys
+        ):
+            return DriftCheckResult(
+                manifest,
+                DriftCheckResultEnum.REPAIR_SKIPPED,
+                report=report,
+                message="transformed resources mismatch manifest",
+            )
+
+        fail_resources = registry.repair_keys([key_to_resource[key] for key in drifted_keys], report.extra_keys)
+        if fail_resources:
+            return DriftCheckResult(
+                manifest,
+                DriftCheckResultEnum.REPAIR_FAILED,
+                report=report,
+                message=f"repair failed: {registry.sync_stats}",
+            )
+
+        # BkRelease 等资源中包含发布时间，重新转换后内容与记录的摘要不同，以修复后写入的内容为准
+        DataPlaneReleaseManifest.objects.patch_manifest(
+            self.data_plane,
+            manifest.stage,
+            manifest.key_prefix,
+            registry.published_digests.digests,
+        )
+
+        return DriftCheckResult(
+            manifest,
+            DriftCheckResultEnum.REPAIRED,
+            report=report,
+            repaired_count=report.drifted_count,
+            message=f"repaired: {registry.sync_stats}",
+        )
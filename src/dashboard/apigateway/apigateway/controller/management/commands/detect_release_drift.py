@@ -0,0 +1,63 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import logging
+from typing import List, Optional
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apigateway.controller.drift import DriftCheckResultEnum
+from apigateway.controller.tasks.drift import check_release_drift
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """检测已发布的网关环境在数据面 etcd 中的配置漂移，指定 --repair 时只修复漂移的 key"""
+
+    def add_arguments(self, parser):
+        parser.add_argument("--gateway-names", dest="gateway_names", nargs="*", help="gateway names, default is all")
+        parser.add_argument(
+            "--data-plane-names", dest="data_plane_names", nargs="*", help="data plane names, default is all"
+        )
+        parser.add_argument("--repair", action="store_true", default=False, help="repair the drifted keys")
+
+    def handle(
+        self,
+        gateway_names: Optional[List[str]],
+        data_plane_names: Optional[List[str]],
+        repair: bool,
+        *args,
+        **options,
+    ):
+        results = check_release_drift(repair=repair, data_plane_names=data_plane_names, gateway_names=gateway_names)
+
+        counts = {}
+        for result in results:
+            counts[result.result] = counts.get(result.result, 0) + 1
+            if result.result != DriftCheckResultEnum.CLEAN:
+                print(result)
+
+        print(f"checked {len(results)} stages: {counts}")
+
+        failed_results = [
+            result
+            for result in results
+            if result.result in [DriftCheckResultEnum.ERROR, DriftCheckResultEnum.REPAIR_FAILED]
+        ]
+        if failed_results:
+            raise CommandError(f"check release drift failed for {len(failed_results)} stages")
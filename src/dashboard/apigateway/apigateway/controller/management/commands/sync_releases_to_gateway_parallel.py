@@ -16,63 +16,91 @@
 # to the current version of the project delivered to anyone in the future.
 #
 import logging
-from multiprocessing import Pool
 from typing import List, Optional
 
+from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 
-from apigateway.controller.publisher import publish
-from apigateway.core.constants import GatewayStatusEnum, PublishSourceEnum
+from apigateway.controller.resync import (
+    BulkResyncEngine,
+    GatewayResyncOutcome,
+    ResyncCheckpoint,
+    ResyncStatusEnum,
+)
+from apigateway.core.constants import GatewayStatusEnum
 from apigateway.core.models import Gateway
 
 logger = logging.getLogger(__name__)
 
-POOL_SIZE = 10
-
-
-def sync_gateway(gateway):
-    # https://groups.google.com/g/django-users/c/eCAIY9DAfG0
-    from django.db import connection  # noqa
-
-    connection.close()
-
-    print(f"syncing release for gateway {gateway.name} ...")
-    try:
-        ok = publish.trigger_gateway_publish(
-            PublishSourceEnum.CLI_SYNC, author="cli", gateway_id=gateway.id, is_sync=True
-        )
-    except Exception:
-        logger.exception("syncing release for gateway %s failed with exception", gateway.name)
-        print(f"[ERROR] syncing release for gateway {gateway.name} failed")
-        return gateway.name
-
-    if not ok:
-        print(f"[ERROR] syncing release for gateway {gateway.name} failed")
-        return gateway.name
-
-    print(f"[INFO] syncing release for gateway {gateway.name} success")
-    return None
-
 
 class Command(BaseCommand):
-    """同步已发布的资源到共享网关，只对存在且Activate状态的stage进行同步处理，非Activate stage与曾被删除的stage将忽略"""
+    """同步已发布的资源到共享网关，只对存在且Activate状态的stage进行同步处理，非Activate stage与曾被删除的stage将忽略
+
+    指定 --checkpoint 时，各网关的同步结果写入该文件；中断后使用相同的文件再次执行，跳过已同步成功的网关
+    """
 
     def add_arguments(self, parser):
         parser.add_argument(
             "--gateway-names", dest="gateway_names", nargs="*", help="gateway names, default is all micro apis"
         )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.BULK_RESYNC_CONCURRENCY,
+            help="number of gateways synced concurrently",
+        )
+        parser.add_argument(
+            "--etcd-write-rate",
+            type=int,
+            default=settings.BULK_RESYNC_ETCD_WRITE_RATE,
+            help="max etcd keys written per second for all gateways, 0 means unlimited",
+        )
+        parser.add_argument(
+            "--checkpoint", default="", help="checkpoint file, resume from it if exists, and record outcomes into it"
+        )
+        parser.add_argument(
+            "--restart", action="store_true", default=False, help="ignore the outcomes in the checkpoint file"
+        )
 
-    def handle(self, gateway_names: Optional[List[str]], *args, **options):
-        gateways = Gateway.objects.filter(status=GatewayStatusEnum.ACTIVE.value)
+    def handle(
+        self,
+        gateway_names: Optional[List[str]],
+        concurrency: int,
+        etcd_write_rate: int,
+        checkpoint: str,
+        restart: bool,
+        *args,
+        **options,
+    ):
+        gateways = Gateway.objects.filter(status=GatewayStatusEnum.ACTIVE.value).order_by("id")
         if gateway_names:
             gateways = gateways.filter(name__in=gateway_names)
 
-        failed_gateway_names = []
-        with Pool(POOL_SIZE) as pool:
-            failed_gateway_names = pool.map(sync_gateway, gateways)
-            failed_gateway_names = [name for name in failed_gateway_names if name is not None]
+        resync_checkpoint = ResyncCheckpoint(checkpoint) if restart else ResyncCheckpoint.load(checkpoint)
+        engine = BulkResyncEngine(
+            concurrency=concurrency,
+            etcd_write_rate=etcd_write_rate,
+            checkpoint=resync_checkpoint,
+            on_outcome=self._print_outcome,
+        )
+        outcomes = engine.run(list(gateways))
 
+        counts = {}
+        for outcome in outcomes:
+            counts[outcome.status] = counts.get(outcome.status, 0) + 1
+        print(f"syncing {len(outcomes)} gateways finished: {counts}")
+
+        failed_gateway_names = [outcome.gateway_name for outcome in outcomes if not outcome.is_success]
         if len(failed_gateway_names) != 0:
             raise CommandError("failed gateway: {}".format(", ".join(failed_gateway_names)))
 
         print("syncing gateway succeeded")
+
+    def _print_outcome(self, outcome: GatewayResyncOutcome):
+        if outcome.status == ResyncStatusEnum.FAILED:
+            print(f"[ERROR] syncing release for gateway {outcome.gateway_name} failed: {outcome.message}")
+        else:
+            print(
+                f"[INFO] syncing release for gateway {outcome.gateway_name} {outcome.status} "
+                f"({outcome.duration}s) {outcome.message}".rstrip()
+            )
@@ -0,0 +1,74 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+from django.conf import settings
+from prometheus_client import Counter, Gauge, Histogram
+
+_prefix = settings.PROMETHEUS_METRIC_NAME_PREFIX
+
+# 滚动发布触发合并：收到的触发次数、被合并的触发次数、实际执行的发布次数
+publish_trigger_received_counter = Counter(
+    f"{_prefix}publish_trigger_received_total",
+    "Number of rolling update publish triggers received",
+    ["source"],
+)
+publish_trigger_coalesced_counter = Counter(
+    f"{_prefix}publish_trigger_coalesced_total",
+    "Number of rolling update publish triggers merged into a pending release",
+    ["source"],
+)
+publish_release_executed_counter = Counter(
+    f"{_prefix}publish_release_executed_total",
+    "Number of coalesced rolling update releases executed",
+    ["source"],
+)
+
+# 发布各阶段的耗时，阶段的划分见 controller/release_tracer.py
+_release_duration_buckets = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+release_phase_duration_histogram = Histogram(
+    f"{_prefix}release_phase_duration_seconds",
+    "Self time of each phase of distributing a gateway release to a data plane",
+    ["phase"],
+    buckets=_release_duration_buckets,
+)
+release_duration_histogram = Histogram(
+    f"{_prefix}release_duration_seconds",
+    "Total time of distributing a gateway release to a data plane",
+    buckets=_release_duration_buckets,
+)
+
+# 数据面配置漂移检测：检测结果、漂移的 key 数量、修复的 key 数量，见 controller/drift.py
+release_drift_check_counter = Counter(
+    f"{_prefix}release_drift_check_total",
+    "Number of release drift checks of gateway stages in data planes",
+    ["data_plane", "result"],
+)
+release_drift_keys_counter = Counter(
+    f"{_prefix}release_drift_keys_total",
+    "Number of drifted etcd keys detected in data planes",
+    ["data_plane", "drift_type"],
+)
+release_drift_repaired_keys_counter = Counter(
+    f"{_prefix}release_drift_repaired_keys_total",
+    "Number of drifted etcd keys repaired in data planes",
+    ["data_plane"],
+)
+release_drift_stages_gauge = Gauge(
+    f"{_prefix}release_drift_stages",
+    "Number of gateway stages with drifted etcd keys found in the latest drift detection of a data plane",
+    ["data_plane"],
+)
@@ -38,6 +38,7 @@ from .base import (
     Route,
     Service,
     Timeout,
+    dump_apisix_model_json,
 )
 
 __all__ = [
@@ -62,4 +63,5 @@ __all__ = [
     "SSL",
     "Service",
     "Timeout",
+    "dump_apisix_model_json",
 ]
@@ -0,0 +1,105 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import logging
+
+from celery import current_app
+from django.conf import settings
+
+from apigateway.controller.constants import COALESCED_ROLLING_UPDATE_RELEASE_TASK_NAME
+from apigateway.controller.metrics import publish_trigger_coalesced_counter, publish_trigger_received_counter
+from apigateway.utils.redis_utils import get_default_redis_client, get_redis_key
+
+logger = logging.getLogger(__name__)
+
+
+class PublishCoalescer:
+    """合并同一网关环境在时间窗口内的多次滚动发布触发
+
+    - 网关环境的第一次触发，会在 redis 中设置待发布标记，并调度一个延迟 window_seconds 执行的发布任务
+    - 窗口内的后续触发，只累加待发布标记的计数，不再调度新的任务
+    - 发布任务执行时，先清除待发布标记，再从 db 读取最新的配置发布；
+      清除标记后的触发会调度新的任务，因此最后一次变更总会被发布
+    """
+
+    def __init__(self, window_seconds: int):
+        self.window_seconds = window_seconds
+
+    @property
+    def enabled(self) -> bool:
+        return self.window_seconds > 0
+
+    @property
+    def marker_timeout(self) -> int:
+        # 标记需在任务执行前一直有效；任务丢失时，标记过期后的触发可以重新调度任务
+        return max(self.window_seconds * 10, 60)
+
+    def _get_marker_key(self, gateway_id: int, stage_id: int) -> str:
+        return get_redis_key(f"publish_coalesce:{gateway_id}:{stage_id}")
+
+    def submit(self, source: str, author: str, gateway_id: int, stage_id: int) -> bool:
+        """提交一次滚动发布触发，返回是否调度了新的发布任务"""
+        publish_trigger_received_counter.labels(source=source).inc()
+
+        countdown = self.window_seconds
+        redis_client = get_default_redis_client()
+        if redis_client is None:
+            # redis 不可用时，不做合并，立即发布
+            countdown = 0
+        else:
+            key = self._get_marker_key(gateway_id, stage_id)
+            pipe = redis_client.pipeline()
+            pipe.incr(key)
+            pipe.expire(key, self.marker_timeout)
+            pending_count, _ = pipe.execute()
+            if pending_count > 1:
+                publish_trigger_coalesced_counter.labels(source=source).inc()
+                logger.info(
+                    "publish trigger coalesced: gateway_id=%s, stage_id=%s, pending_count=%s",
+                    gateway_id,
+                    stage_id,
+                    pending_count,
+                )
+                return False
+
+        current_app.send_task(
+            COALESCED_ROLLING_UPDATE_RELEASE_TASK_NAME,
+            kwargs={
+                "source": source,
+                "author": author,
+                "gateway_id": gateway_id,
+                "stage_id": stage_id,
+            },
+            countdown=countdown,
+        )
+        return True
+
+    def pop_pending(self, gateway_id: int, stage_id: int) -> int:
+        """清除待发布标记，返回被合并到本次发布中的触发次数"""
+        redis_client = get_default_redis_client()
+        if redis_client is None:
+            return 1
+
+        key = self._get_marker_key(gateway_id, stage_id)
+        pipe = redis_client.pipeline()
+        pipe.get(key)
+        pipe.delete(key)
+        pending_count, _ = pipe.execute()
+        return int(pending_count or 1)
+
+
+publish_coalescer = PublishCoalescer(window_seconds=settings.PUBLISH_COALESCE_WINDOW_SECONDS)
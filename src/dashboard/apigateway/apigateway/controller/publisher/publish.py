@@ -16,16 +16,24 @@
 # to the current version of the project delivered to anyone in the future.
 #
 import logging
+from functools import partial
 from typing import TYPE_CHECKING, List, Optional
 
 from blue_krill.async_utils.django_utils import delay_on_commit
+from celery import shared_task
+from django.db import transaction
 
 from apigateway.apps.data_plane.constants import (
     get_oauth2_resource_data_planes_compatibility_error,
     resource_version_uses_oauth2,
 )
 from apigateway.apps.data_plane.models import GatewayDataPlaneBinding
-from apigateway.controller.constants import DELETE_PUBLISH_ID, NO_NEED_REPORT_EVENT_PUBLISH_ID
+from apigateway.controller.constants import (
+    COALESCED_ROLLING_UPDATE_RELEASE_TASK_NAME,
+    DELETE_PUBLISH_ID,
+    NO_NEED_REPORT_EVENT_PUBLISH_ID,
+)
+from apigateway.controller.metrics import publish_release_executed_counter
 from apigateway.controller.tasks import revoke_release, rolling_update_release
 from apigateway.controller.tasks.oauth2_builtin import OAuth2BuiltinPermissionReconciler
 from apigateway.core.constants import (
@@ -36,6 +44,7 @@ from apigateway.core.constants import (
 from apigateway.core.models import Release, ReleaseHistory
 from apigateway.service.event import PublishEventReporter
 
+from .coalesce import publish_coalescer
 from .hooks import (
     _pre_publish_check_is_gateway_ready_for_releasing,
     _pre_publish_programmable_gateway_offline,
@@ -246,6 +255,20 @@ def _trigger_revoke_deleting(
     return not has_failure
 
 
+def _submit_coalesced_rolling_update(
+    source: PublishSourceEnum,
+    author: str,
+    release_list: List[Release],
+):
+    """提交合并的滚动更新，同一网关环境在合并窗口内的多次触发只执行一次发布"""
+    for release in release_list:
+        # 事务提交后再提交触发，保证合并后的发布任务能读取到本次变更
+        transaction.on_commit(
+            partial(publish_coalescer.submit, source.value, author, release.gateway_id, release.stage_id)
+        )
+    return True
+
+
 def trigger_gateway_publish(
     source: PublishSourceEnum,
     author: str,
@@ -281,6 +304,9 @@ def trigger_gateway_publish(
 
     # rolling update release
     if trigger_publish_type == TriggerPublishTypeEnum.TRIGGER_ROLLING_UPDATE_RELEASE:
+        if not is_sync and publish_coalescer.enabled:
+            return _submit_coalesced_rolling_update(source, author, release_list)
+
         return _trigger_rolling_update(
             source,
             author,
@@ -304,3 +330,26 @@ def trigger_gateway_publish(
 
     # do nothing
     return None
+
+
+@shared_task(name=COALESCED_ROLLING_UPDATE_RELEASE_TASK_NAME, ignore_result=True)
+def coalesced_rolling_update_release(source: str, author: str, gateway_id: int, stage_id: int):
+    """执行合并后的滚动发布，发布网关环境当前最新的配置"""
+    # 先清除待发布标记，之后的触发将调度新的任务，保证最后一次变更总会被发布
+    trigger_count = publish_coalescer.pop_pending(gateway_id, stage_id)
+
+    release_list = list(
+        Release.objects.filter(gateway_id=gateway_id, stage_id=stage_id).prefetch_related("gateway", "stage")
+    )
+    if not release_list:
+        return True
+
+    logger.info(
+        "coalesced rolling update release: gateway_id=%s, stage_id=%s, trigger_count=%s",
+        gateway_id,
+        stage_id,
+        trigger_count,
+    )
+    publish_release_executed_counter.labels(source=source).inc()
+
+    return _trigger_rolling_update(PublishSourceEnum(source), author, release_list)
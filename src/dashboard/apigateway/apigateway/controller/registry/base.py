@@ -17,7 +17,7 @@
 #
 import logging
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, ClassVar, Iterable, List, Type
+from typing import TYPE_CHECKING, ClassVar, Iterable, List, Optional, Tuple, Type
 
 if TYPE_CHECKING:
     from apigateway.controller.models import ApisixModel
@@ -43,13 +43,32 @@ class Registry(ABC):
         raise NotImplementedError()
 
     @abstractmethod
-    def sync_resources_by_key_prefix(self, resources: List[ApisixModel]) -> List[ApisixModel]:
+    def sync_resources_by_key_prefix(
+        self, resources: List[ApisixModel], prefix_cleared: bool = False
+    ) -> List[ApisixModel]:
         """按 key_prefix 同步资源，若 key_prefix 下的资源不在待同步资源列表中，将被删除
 
+        :param prefix_cleared: key_prefix 下的数据已被清空，实现可据此跳过已存在资源的读取
         :return: 返回同步失败的资源列表
         """
         raise NotImplementedError()
 
+    @abstractmethod
+    def patch_resources(
+        self, resources: List[ApisixModel], deleted_resources: List[Tuple[str, str]]
+    ) -> List[ApisixModel]:
+        """只写入指定的资源、删除指定的资源，key_prefix 下的其它资源保持不变；写入的资源中，最后一个资源最后写入
+
+        :param deleted_resources: 待删除资源的 (kind, id) 列表
+        :return: 返回写入失败的资源列表
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def get_resource(self, resource_type: Type[ApisixModel], id: str) -> Optional[ApisixModel]:
+        """获取 key_prefix 下指定类型、id 的资源，不存在时返回 None"""
+        raise NotImplementedError()
+
     @abstractmethod
     def delete_resources_by_key_prefix(self):
         """删除 key_prefix 下的所有资源"""
@@ -60,6 +79,10 @@ class Registry(ABC):
         """获取 key_prefix 下，指定类型的资源"""
         raise NotImplementedError()
 
+    def get_resource_key(self, resource: ApisixModel) -> str:
+        """获取资源在配置中心中完整的 key"""
+        return self._get_key(resource.kind, resource.id)
+
     def _get_kind_key_prefix(self, kind: str) -> str:
         """获取到 kind 的 key 前缀
 
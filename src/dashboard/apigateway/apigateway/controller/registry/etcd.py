@@ -15,14 +15,21 @@
 # We undertake not to change the open source license (MIT license) applicable
 # to the current version of the project delivered to anyone in the future.
 #
+import hashlib
 import json
 import logging
-from typing import TYPE_CHECKING, ClassVar, Dict, Iterable, List, Type
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, ClassVar, Dict, Iterable, Iterator, List, Optional, Tuple, Type
 
-from django.utils.encoding import force_str
+from django.conf import settings
+from django.utils.encoding import force_bytes, force_str
 
+from apigateway.controller.models import dump_apisix_model_json
 from apigateway.controller.registry.base import Registry
+from apigateway.controller.release_tracer import trace_phase
 from apigateway.utils.etcd import get_etcd_client
+from apigateway.utils.rate_limit import TokenBucket
 
 if TYPE_CHECKING:
     import etcd3
@@ -32,52 +39,382 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+class _WriteRateLimit:
+    """本进程写入 etcd 的限速器，按每秒写入、删除的 key 数量限速，见 limit_etcd_write_rate"""
+
+    limiter: Optional[TokenBucket] = None
+
+    @classmethod
+    def acquire(cls, key_count: int):
+        limiter = cls.limiter
+        if limiter is not None:
+            with trace_phase("etcd_write_throttle"):
+                limiter.acquire(key_count)
+
+
+def get_payload_digest(payload: str | bytes) -> bytes:
+    """计算写入 etcd 的 value 的摘要，用于判断资源内容是否发生变化
+
+    使用 20 字节的二进制摘要，而不是 40 个字符的十六进制字符串，减小全量同步时已存在资源摘要集合的内存占用
+    """
+    return hashlib.sha1(force_bytes(payload)).digest()
+
+
+@contextmanager
+def limit_etcd_write_rate(keys_per_second: int):
+    """在上下文中，限制本进程中所有 EtcdRegistry 写入 etcd 的速率，多个线程共享同一个速率
+
+    用于批量重新同步全部网关等大量写入的场景，避免 etcd 过载；keys_per_second 不大于 0 时不限速
+    """
+    if keys_per_second <= 0:
+        yield
+        return
+
+    # 至少允许一个完整的事务批次突发写入
+    _WriteRateLimit.limiter = TokenBucket(
+        rate=keys_per_second, capacity=max(keys_per_second, settings.ETCD_SYNC_TXN_MAX_OPS)
+    )
+    try:
+        yield
+    finally:
+        _WriteRateLimit.limiter = None
+
+
+def _get_range_end(key: str) -> bytes:
+    """获取紧随 key 之后的 key，作为 range 请求的 range_end（不包含），使得 range 中包含 key 本身"""
+    return force_bytes(key) + b"\x00"
+
+
+@dataclass
+class SyncStats:
+    """一次按 key_prefix 同步的统计数据"""
+
+    unchanged: int = 0
+    put: int = 0
+    deleted: int = 0
+    # 写入的 value 字节数，不包含 key
+    payload_bytes_written: int = 0
+    txn_count: int = 0
+
+    def __str__(self):
+        return (
+            f"unchanged={self.unchanged}, put={self.put}, deleted={self.deleted}, "
+            f"payload_bytes_written={self.payload_bytes_written}, txn_count={self.txn_count}"
+        )
+
+
+@dataclass
+class PublishedDigests:
+    """一次同步中，各 key 目标内容的摘要，发布后据此检测数据面中的配置漂移
+
+    - 全量同步：digests 为 key_prefix 下的全部 key，is_full 为 True
+    - 增量写入：digests 只包含写入、删除的 key，删除的 key 摘要为 None
+    """
+
+    digests: Dict[str, Optional[bytes]] = field(default_factory=dict)
+    is_full: bool = False
+    # 所有资源的摘要均已计算；流式同步中途失败时，后续资源不再生成，摘要不完整
+    is_complete: bool = False
+
+
+@dataclass
+class _TxnOperation:
+    key: str
+    value: Optional[str] = None
+    resource: Optional[ApisixModel] = None
+
+    @property
+    def is_delete(self) -> bool:
+        return self.value is None
+
+    @property
+    def payload_size(self) -> int:
+        return len(force_bytes(self.value)) if self.value is not None else 0
+
+    @property
+    def size(self) -> int:
+        # 仅统计 key 和 value 的字节数，不包含 protobuf 编码开销
+        return len(force_bytes(self.key)) + self.payload_size
+
+
+@dataclass
+class _TxnBatch:
+    operations: List[_TxnOperation] = field(default_factory=list)
+    keys: set = field(default_factory=set)
+    size: int = 0
+
+    def can_add(self, operation: _TxnOperation, max_ops: int, max_bytes: int) -> bool:
+        if not self.operations:
+            return True
+
+        # etcd 不允许同一个事务中出现重复的 key
+        if operation.key in self.keys:
+            return False
+
+        return len(self.operations) < max_ops and self.size + operation.size <= max_bytes
+
+    def add(self, operation: _TxnOperation):
+        self.operations.append(operation)
+        self.keys.add(operation.key)
+        self.size += operation.size
+
+
 class EtcdRegistry(Registry):
     """Etcd 注册配置中心，数据实际存储在 etcd 中"""
 
     registry_type: ClassVar[str] = "etcd"
 
-    def __init__(self, key_prefix: str, etcd_client: etcd3.Etcd3Client = None):
+    def __init__(
+        self,
+        key_prefix: str,
+        etcd_client: etcd3.Etcd3Client = None,
+        txn_max_ops: Optional[int] = None,
+        txn_max_bytes: Optional[int] = None,
+        range_page_size: Optional[int] = None,
+        record_digests: bool = False,
+    ):
+        """
+        :param txn_max_ops: 单个事务中的最大操作数，不能超过 etcd 的 --max-txn-ops（默认 128）
+        :param txn_max_bytes: 单个事务中 key、value 的最大字节数；此值不包含 protobuf 编码开销，
+            需依赖其与 etcd --max-request-bytes（默认 1.5 MiB）之间预留的空间（默认 0.5 MiB）
+        :param range_page_size: 分页读取已存在资源时，每页的 key 数量，需保证单页响应不超过 grpc 的 4 MiB 接收限制
+        :param record_digests: 同步时记录各 key 目标内容的摘要，见 published_digests
+        """
         super().__init__(key_prefix)
         self._etcd_client = etcd_client or get_etcd_client()
-
-    def _delete_by_key(self, key: str) -> bool:
-        return self._etcd_client.delete(key)
+        self.txn_max_ops = txn_max_ops or settings.ETCD_SYNC_TXN_MAX_OPS
+        self.txn_max_bytes = txn_max_bytes or settings.ETCD_SYNC_TXN_MAX_BYTES
+        self.range_page_size = range_page_size or settings.ETCD_SYNC_RANGE_PAGE_SIZE
+        self.record_digests = record_digests
+        self.sync_stats = SyncStats()
+        self.published_digests: Optional[PublishedDigests] = None
 
     def apply_resource(self, resource: ApisixModel) -> bool:
-        payload = resource.model_dump_json(exclude_none=True)
+        payload = dump_apisix_model_json(resource)
+        _WriteRateLimit.acquire(1)
         self._etcd_client.put(self._get_key(resource.kind, resource.id), payload)
         return True
 
-    def sync_resources_by_key_prefix(self, resources: List[ApisixModel]) -> List[ApisixModel]:
-        """按 key_prefix 同步资源，若 key_prefix 下的资源不在待同步资源列表中，将被删除；返回同步失败的资源列表"""
+    def sync_resources_by_key_prefix(
+        self, resources: Iterable[ApisixModel], prefix_cleared: bool = False, streaming: bool = False
+    ) -> List[ApisixModel]:
+        """按 key_prefix 同步资源，若 key_prefix 下的资源不在待同步资源列表中，将被删除；返回同步失败的资源列表
+
+        - 先分页获取 key_prefix 下已存在资源的内容摘要，计算出需写入、删除的变更集，内容未变化的资源不再写入，
+          避免无意义的 revision 变更触发 apisix watch
+        - 变更集按操作数、字节数分批，以 etcd 事务的方式写入；某一批次写入失败时，停止写入，
+          该批次及后续批次的资源均作为同步失败的资源返回
+
+        :param prefix_cleared: key_prefix 下的数据已被清空，此时无需再读取已存在的资源
+        :param streaming: 流式同步，resources 可以是逐个生成资源的迭代器；每凑满一个批次即写入，
+            内存中只保留当前批次及已存在资源的 key、摘要；资源生成过程中出错时，已写入的批次不会回滚，
+            写入失败时，只返回失败批次中的资源，后续资源不再生成
+        """
+        self.sync_stats = SyncStats()
+        self.published_digests = PublishedDigests(is_full=True) if self.record_digests else None
+        remaining_digests = {} if prefix_cleared else self._get_exist_digests_by_key_prefix()
+
+        operations: Iterable[_TxnOperation] = self._iter_sync_operations(resources, remaining_digests)
+        if not streaming:
+            operations = list(operations)
+
+        sync_fail_resources = self._apply_operations(operations, streaming=streaming)
+
+        logger.debug(
+            "sync resources to registry %s by key_prefix %s: %s", self.registry_type, self.key_prefix, self.sync_stats
+        )
 
-        sync_fail_resources = []
-        remaining_keys = self._get_exist_keys_by_key_prefix()
+        return sync_fail_resources
 
+    def _iter_sync_operations(
+        self, resources: Iterable[ApisixModel], remaining_digests: Dict[str, bytes]
+    ) -> Iterator[_TxnOperation]:
+        """生成同步所需的变更操作，写入操作之后，再删除 remaining_digests 中不在待同步资源列表中的 key"""
         for resource in resources:
             key = self._get_key(resource.kind, resource.id)
-            remaining_keys.pop(key, None)
-            if not self.apply_resource(resource):
-                sync_fail_resources.append(resource)
-
-        for key in remaining_keys:
-            if not self._delete_by_key(key):
-                logger.warning(
-                    "failed to remove key [%s] from registry %s",
-                    key,
-                    self.registry_type,
+            with trace_phase("serialize"):
+                payload = dump_apisix_model_json(resource)
+            digest = get_payload_digest(payload)
+            if self.published_digests is not None:
+                self.published_digests.digests[key] = digest
+            if remaining_digests.pop(key, None) == digest:
+                self.sync_stats.unchanged += 1
+                continue
+
+            yield _TxnOperation(key=key, value=payload, resource=resource)
+
+        if self.published_digests is not None:
+            self.published_digests.is_complete = True
+
+        # 待同步资源已全部处理，剩余的 key 均需删除
+        yield from (_TxnOperation(key=key) for key in remaining_digests)
+
+    def patch_resources(
+        self, resources: List[ApisixModel], deleted_resources: List[Tuple[str, str]]
+    ) -> List[ApisixModel]:
+        """只写入指定的资源、删除指定的资源，返回写入失败的资源列表
+
+        删除操作在写入操作之前执行，保证最后一个资源（如 BkRelease）在最后一个批次中写入
+        """
+        return self._patch_keys(
+            resources, [self._get_key(kind, id_) for kind, id_ in deleted_resources], action="patch resources"
+        )
+
+    def repair_keys(self, resources: List[ApisixModel], deleted_keys: List[str]) -> List[ApisixModel]:
+        """修复漂移的 key：写入指定的资源、删除指定的 key，返回写入失败的资源列表
+
+        与 patch_resources 不同，待删除的 key 可能不是由本系统写入的（如手工写入的 key），无法对应到资源的 kind、id
+        """
+        return self._patch_keys(resources, deleted_keys, action="repair keys")
+
+    def _patch_keys(self, resources: List[ApisixModel], deleted_keys: List[str], action: str) -> List[ApisixModel]:
+        self.sync_stats = SyncStats()
+        self.published_digests = PublishedDigests(is_complete=True) if self.record_digests else None
+
+        operations = [_TxnOperation(key=key) for key in deleted_keys]
+        with trace_phase("serialize"):
+            operations.extend(
+                _TxnOperation(
+                    key=self._get_key(resource.kind, resource.id),
+                    value=dump_apisix_model_json(resource),
+                    resource=resource,
                 )
+                for resource in resources
+            )
+
+        if self.published_digests is not None:
+            self.published_digests.digests.update(
+                (operation.key, None if operation.is_delete else get_payload_digest(operation.value))
+                for operation in operations
+            )
+
+        sync_fail_resources = self._apply_operations(operations)
+
+        logger.debug(
+            "%s to registry %s by key_prefix %s: %s", action, self.registry_type, self.key_prefix, self.sync_stats
+        )
 
         return sync_fail_resources
 
-    def _get_exist_keys_by_key_prefix(self) -> Dict[str, bool]:
-        exist_keys: Dict[str, bool] = {}
+    def get_resource(self, resource_type: Type[ApisixModel], id: str) -> Optional[ApisixModel]:
+        with trace_phase("etcd_read"):
+            payload, _ = self._etcd_client.get(self._get_key(resource_type.kind, id))
+        if payload is None:
+            return None
+
+        # json 模式下，strict 模型也能将字符串解析为枚举等类型
+        return resource_type.model_validate_json(payload)
+
+    def _iter_batches(self, operations: Iterable[_TxnOperation]) -> Iterator[_TxnBatch]:
+        batch = _TxnBatch()
+        for operation in operations:
+            if not batch.can_add(operation, self.txn_max_ops, self.txn_max_bytes):
+                yield batch
+                batch = _TxnBatch()
+
+            batch.add(operation)
+
+        if batch.operations:
+            yield batch
+
+    def _apply_operations(self, operations: Iterable[_TxnOperation], streaming: bool = False) -> List[ApisixModel]:
+        """将变更操作按批次以事务的方式写入 etcd，返回写入失败的资源列表
+
+        :param streaming: 为 True 时，写入失败后不再消费后续的变更操作，只返回失败批次中的资源
+        """
+        batches = self._iter_batches(operations)
+
+        for index, batch in enumerate(batches, start=1):
+            try:
+                with trace_phase("etcd_write"):
+                    self._commit_batch(batch)
+            except Exception:  # pylint: disable=broad-except
+                # 已提交的批次不会回滚，记录已写入的部分，便于排查
+                logger.exception(
+                    "commit txn batch %s to registry %s by key_prefix %s failed, partially synced: %s",
+                    index,
+                    self.registry_type,
+                    self.key_prefix,
+                    self.sync_stats,
+                )
+                failed_batches = [batch] if streaming else [batch, *batches]
+                return [
+                    operation.resource
+                    for failed_batch in failed_batches
+                    for operation in failed_batch.operations
+                    if operation.resource is not None
+                ]
+
+        return []
+
+    def _commit_batch(self, batch: _TxnBatch):
+        _WriteRateLimit.acquire(len(batch.operations))
+
+        success_ops = []
+        for operation in batch.operations:
+            if operation.is_delete:
+                success_ops.append(self._etcd_client.transactions.delete(operation.key))
+            else:
+                success_ops.append(self._etcd_client.transactions.put(operation.key, operation.value))
+
+        # 没有 compare 条件，事务总是执行 success 分支，失败时由 client 抛出异常
+        self._etcd_client.transaction(compare=[], success=success_ops, failure=[])
+        self.sync_stats.txn_count += 1
+
+        for operation in batch.operations:
+            if operation.is_delete:
+                self.sync_stats.deleted += 1
+            else:
+                self.sync_stats.put += 1
+                self.sync_stats.payload_bytes_written += operation.payload_size
+
+    def _get_exist_keys_by_key_prefix(self) -> List[str]:
+        return sorted(
+            force_str(kv_metadata.key)
+            for _, kv_metadata in self._etcd_client.get_prefix(self.key_prefix, keys_only=True)
+        )
+
+    def _get_exist_digests_by_key_prefix(self) -> Dict[str, bytes]:
+        """获取 key_prefix 下已存在的 key 及其 value 的摘要
+
+        先仅获取 key 列表，再按 key 分页读取 value，避免单次读取的响应超过 grpc 的接收限制；
+        每页只保留 value 的摘要
+        """
+        exist_digests: Dict[str, bytes] = {}
+
+        with trace_phase("etcd_read"):
+            keys = self._get_exist_keys_by_key_prefix()
+            for offset in range(0, len(keys), self.range_page_size):
+                page_keys = keys[offset : offset + self.range_page_size]
+                for value, kv_metadata in self._etcd_client.get_range(page_keys[0], _get_range_end(page_keys[-1])):
+                    exist_digests[force_str(kv_metadata.key)] = get_payload_digest(value or b"")
+
+        return exist_digests
+
+    def scan_digests_by_key_prefix(self) -> Tuple[Dict[str, bytes], Optional[int]]:
+        """在同一个 revision 下分页读取 key_prefix 下的 key 及其 value 的摘要，返回摘要及读取时的 revision
+
+        各分页均读取首个请求所在 revision 的快照，扫描期间的写入不会导致各分页的内容不一致；
+        key_prefix 下没有 key 时，revision 为 None
+        """
+        exist_digests: Dict[str, bytes] = {}
+
+        with trace_phase("etcd_read"):
+            revision = None
+            keys = []
+            for _, kv_metadata in self._etcd_client.get_prefix(self.key_prefix, keys_only=True):
+                revision = kv_metadata.response_header.revision
+                keys.append(force_str(kv_metadata.key))
+            keys.sort()
 
-        for _, kv_metadata in self._etcd_client.get_prefix(self.key_prefix, keys_only=True):
-            exist_keys[force_str(kv_metadata.key)] = True
+            for offset in range(0, len(keys), self.range_page_size):
+                page_keys = keys[offset : offset + self.range_page_size]
+                for value, kv_metadata in self._etcd_client.get_range(
+                    page_keys[0], _get_range_end(page_keys[-1]), revision=revision
+                ):
+                    exist_digests[force_str(kv_metadata.key)] = get_payload_digest(value or b"")
 
-        return exist_keys
+        return exist_digests, revision
 
     def delete_resources_by_key_prefix(self):
         """删除 key_prefix 下的所有资源"""
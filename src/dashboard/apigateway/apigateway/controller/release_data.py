@@ -15,15 +15,19 @@
 # We undertake not to change the open source license (MIT license) applicable
 # to the current version of the project delivered to anyone in the future.
 #
+import json
 import logging
 from collections import defaultdict
 from dataclasses import dataclass
+from functools import lru_cache, partial
 from typing import Any, ClassVar, Dict, List
 
 from django.utils.functional import cached_property
 
 from apigateway.apps.plugin.constants import PluginBindingScopeEnum
 from apigateway.apps.plugin.models import PluginBinding
+from apigateway.controller.release_tracer import trace_phase
+from apigateway.controller.uri_render import UpstreamURIRender, URIRender
 from apigateway.core.models import BackendConfig, Gateway, Release, ResourceVersion, Stage
 from apigateway.service.contexts import GatewayAuthContext
 from apigateway.service.gateway_jwt import GatewayJWTHandler
@@ -31,6 +35,9 @@ from apigateway.service.plugin import PluginConvertorFactory
 
 logger = logging.getLogger(__name__)
 
+# 一次发布中，每种缓存保留的最大条目数；超出后淘汰最久未使用的条目，避免超大网关的缓存占用过多内存
+RELEASE_CONVERT_CACHE_MAX_SIZE = 4096
+
 
 @dataclass
 class PluginData:
@@ -62,6 +69,37 @@ class StageBackendConfig:
     config: Dict[str, Any]
 
 
+class ReleaseConvertCache:
+    """一次发布中，各转换器共享的配置解析、路径渲染结果
+
+    大量资源使用相同的认证配置、后端地址、路径，相同的内容在一次发布中只解析、渲染一次；
+    一次发布中环境变量不变，路径的渲染结果只与路径本身相关
+
+    NOTE: 解析后的配置为多个资源共享的对象，调用方不能修改
+    """
+
+    def __init__(self, stage_vars: Dict[str, str]):
+        self._load_json = lru_cache(maxsize=RELEASE_CONVERT_CACHE_MAX_SIZE)(json.loads)
+        self._render_uri = lru_cache(maxsize=RELEASE_CONVERT_CACHE_MAX_SIZE)(
+            partial(URIRender().render, vars=stage_vars)
+        )
+        self._render_upstream_uri = lru_cache(maxsize=RELEASE_CONVERT_CACHE_MAX_SIZE)(
+            partial(UpstreamURIRender().render, vars=stage_vars)
+        )
+
+    def load_json_config(self, config: str) -> Dict[str, Any]:
+        """解析 json 格式的配置，如资源的 proxy.config、contexts.resource_auth.config"""
+        return self._load_json(config)
+
+    def render_uri(self, source: str) -> str:
+        """使用环境变量渲染路由的路径、后端的 host，见 URIRender"""
+        return self._render_uri(source)
+
+    def render_upstream_uri(self, source: str) -> str:
+        """使用环境变量渲染后端的路径，见 UpstreamURIRender"""
+        return self._render_upstream_uri(source)
+
+
 @dataclass
 class ReleaseData:
     _release: Release
@@ -78,9 +116,14 @@ class ReleaseData:
     def resource_version(self) -> ResourceVersion:
         return self._release.resource_version
 
+    @cached_property
+    def convert_cache(self) -> ReleaseConvertCache:
+        return ReleaseConvertCache(self.stage.vars)
+
     @cached_property
     def resource_configs(self) -> List[Dict[str, Any]]:
-        return self.resource_version.data
+        with trace_phase("load_resource_version"):
+            return self.resource_version.data
 
     @cached_property
     def jwt_private_key(self) -> str:
@@ -144,16 +187,17 @@ class ReleaseData:
         resource_id_to_plugins: Dict[int, List[PluginData]] = defaultdict(list)
 
         # 插件
-        for resource in self.resource_configs:
-            resource_id_to_plugins[resource["id"]].extend(
-                [
-                    PluginData(
-                        type_code=binding["type"],
-                        config=PluginConvertorFactory.get_convertor(binding["type"]).convert(binding["config"]),
-                        binding_scope_type=PluginBindingScopeEnum.RESOURCE.value,
-                    )
-                    for binding in resource.get("plugins", [])
-                ]
-            )
+        with trace_phase("convert_plugins"):
+            for resource in self.resource_configs:
+                resource_id_to_plugins[resource["id"]].extend(
+                    [
+                        PluginData(
+                            type_code=binding["type"],
+                            config=PluginConvertorFactory.get_convertor(binding["type"]).convert(binding["config"]),
+                            binding_scope_type=PluginBindingScopeEnum.RESOURCE.value,
+                        )
+                        for binding in resource.get("plugins", [])
+                    ]
+                )
 
         return resource_id_to_plugins
@@ -0,0 +1,124 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""发布过程的分阶段耗时记录
+
+在 ReleasePhaseTracer 的上下文中，发布链路各处通过 trace_phase 记录阶段耗时；不在上下文中时，trace_phase 不做任何记录。
+阶段可以嵌套，每个阶段只记录自身的耗时（不包含嵌套的子阶段），因此各阶段的耗时之和即为发布的总耗时。
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from apigateway.controller.metrics import release_duration_histogram, release_phase_duration_histogram
+
+_current_tracer: ContextVar[Optional["ReleasePhaseTracer"]] = ContextVar("release_phase_tracer", default=None)
+
+# 未被任何阶段覆盖的耗时
+OTHER_PHASE = "other"
+
+
+class _Phase:
+    __slots__ = ("_tracer", "child_seconds", "name", "started_at")
+
+    def __init__(self, tracer: "ReleasePhaseTracer", name: str):
+        self._tracer = tracer
+        self.name = name
+        self.child_seconds = 0.0
+        self.started_at = 0.0
+
+    def __enter__(self):
+        self.started_at = time.perf_counter()
+        self._tracer._stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._tracer._end_phase(self, time.perf_counter() - self.started_at)
+        return False
+
+
+class _NoopPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_noop_phase = _NoopPhase()
+
+
+class ReleasePhaseTracer:
+    """记录一次发布中各阶段的耗时，退出上下文时上报 prometheus 指标
+
+    with ReleasePhaseTracer() as tracer:
+        distributor.distribute(...)
+
+    timings = tracer.get_timings()
+    """
+
+    def __init__(self):
+        self._stack: List[_Phase] = []
+        self._phase_seconds: Dict[str, float] = {}
+        self._started_at = 0.0
+        self.total_seconds = 0.0
+        self._token = None
+
+    def __enter__(self):
+        self._token = _current_tracer.set(self)
+        self._started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.total_seconds = time.perf_counter() - self._started_at
+        _current_tracer.reset(self._token)
+
+        for name, seconds in self._get_phase_seconds().items():
+            release_phase_duration_histogram.labels(phase=name).observe(seconds)
+        release_duration_histogram.observe(self.total_seconds)
+        return False
+
+    def phase(self, name: str) -> _Phase:
+        return _Phase(self, name)
+
+    def _end_phase(self, phase: _Phase, elapsed: float):
+        self._stack.pop()
+        self._phase_seconds[phase.name] = self._phase_seconds.get(phase.name, 0.0) + elapsed - phase.child_seconds
+        if self._stack:
+            self._stack[-1].child_seconds += elapsed
+
+    def _get_phase_seconds(self) -> Dict[str, float]:
+        phase_seconds = dict(self._phase_seconds)
+        phase_seconds[OTHER_PHASE] = max(self.total_seconds - sum(self._phase_seconds.values()), 0.0)
+        return phase_seconds
+
+    def get_timings(self) -> Dict[str, float]:
+        """各阶段耗时（秒），total 为总耗时"""
+        timings = {name: round(seconds, 4) for name, seconds in self._get_phase_seconds().items()}
+        timings["total"] = round(self.total_seconds, 4)
+        return timings
+
+
+def trace_phase(name: str):
+    """记录发布阶段的耗时，用法：with trace_phase("etcd_write"): ..."""
+    tracer = _current_tracer.get()
+    if tracer is None:
+        return _noop_phase
+    return tracer.phase(name)
@@ -0,0 +1,186 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""批量重新同步网关的已发布资源到数据面，用于 etcd 故障恢复等场景
+
+- 使用有界线程池并发同步，同一进程中的线程共享 etcd 写入限速，见 registry.etcd.limit_etcd_write_rate
+- 每个网关同步结束后，将结果写入检查点文件；中断后再次执行时，跳过已同步成功的网关，只同步剩余、失败的网关
+"""
+
+import json
+import logging
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+from django.db import connection
+
+from apigateway.controller.publisher import publish
+from apigateway.controller.registry.etcd import limit_etcd_write_rate
+from apigateway.core.constants import PublishSourceEnum
+
+if TYPE_CHECKING:
+    from apigateway.core.models import Gateway
+
+logger = logging.getLogger(__name__)
+
+
+class ResyncStatusEnum:
+    SUCCESS = "success"
+    FAILED = "failed"
+    # 检查点中已同步成功，本次跳过
+    SKIPPED = "skipped"
+
+
+@dataclass
+class GatewayResyncOutcome:
+    gateway_id: int
+    gateway_name: str
+    status: str
+    message: str = ""
+    # 同步耗时（秒）
+    duration: float = 0
+
+    @property
+    def is_success(self) -> bool:
+        return self.status != ResyncStatusEnum.FAILED
+
+
+def sync_gateway(gateway: Gateway) -> GatewayResyncOutcome:
+    """同步单个网关已发布的资源，在工作线程中执行"""
+    started_at = time.monotonic()
+    try:
+        ok = publish.trigger_gateway_publish(
+            PublishSourceEnum.CLI_SYNC, author="cli", gateway_id=gateway.id, is_sync=True
+        )
+        status, message = (ResyncStatusEnum.SUCCESS, "") if ok else (ResyncStatusEnum.FAILED, "publish failed")
+    except Exception as err:  # pylint: disable=broad-except
+        logger.exception("syncing release for gateway %s failed with exception", gateway.name)
+        status, message = ResyncStatusEnum.FAILED, f"{type(err).__name__}: {err}"
+    finally:
+        # 工作线程各自持有数据库连接，同步结束后关闭，避免线程复用时使用已失效的连接
+        connection.close()
+
+    return GatewayResyncOutcome(
+        gateway_id=gateway.id,
+        gateway_name=gateway.name,
+        status=status,
+        message=message,
+        duration=round(time.monotonic() - started_at, 3),
+    )
+
+
+class ResyncCheckpoint:
+    """批量同步的检查点，记录各网关的同步结果，每次记录后即写入文件
+
+    文件为 json 格式，可直接作为各网关的同步结果报告；path 为空时只保存在内存中
+    """
+
+    def __init__(self, path: str = ""):
+        self.path = path
+        self.outcomes: Dict[int, GatewayResyncOutcome] = {}
+
+    @classmethod
+    def load(cls, path: str) -> "ResyncCheckpoint":
+        checkpoint = cls(path)
+        if path and os.path.exists(path):
+            with open(path) as fp:
+                data = json.load(fp)
+            for outcome in data.get("outcomes", []):
+                checkpoint.outcomes[outcome["gateway_id"]] = GatewayResyncOutcome(**outcome)
+        return checkpoint
+
+    def is_synced(self, gateway_id: int) -> bool:
+        outcome = self.outcomes.get(gateway_id)
+        return outcome is not None and outcome.status != ResyncStatusEnum.FAILED
+
+    def record(self, outcome: GatewayResyncOutcome):
+        self.outcomes[outcome.gateway_id] = outcome
+        self.save()
+
+    def save(self):
+        if not self.path:
+            return
+
+        # 先写入临时文件再替换，中断时不会留下不完整的检查点
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as fp:
+            json.dump({"outcomes": [asdict(outcome) for outcome in self.outcomes.values()]}, fp, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class BulkResyncEngine:
+    """有界并发、限速、可断点续传的网关批量同步"""
+
+    def __init__(
+        self,
+        concurrency: int,
+        etcd_write_rate: int,
+        checkpoint: ResyncCheckpoint,
+        sync: Optional[Callable[[Gateway], GatewayResyncOutcome]] = None,
+        on_outcome: Optional[Callable[[GatewayResyncOutcome], None]] = None,
+    ):
+        """
+        :param concurrency: 同时同步的网关数量
+        :param etcd_write_rate: 每秒写入 etcd 的最大 key 数量，所有并发的同步共享；不大于 0 时不限速
+        :param sync: 同步单个网关的函数，默认为 sync_gateway
+        :param on_outcome: 每个网关同步结束后的回调，如输出进度
+        """
+        self.concurrency = max(concurrency, 1)
+        self.etcd_write_rate = etcd_write_rate
+        self.checkpoint = checkpoint
+        self._sync = sync or sync_gateway
+        self._on_outcome = on_outcome
+
+    def run(self, gateways: List[Gateway]) -> List[GatewayResyncOutcome]:
+        """同步 gateways，返回各网关的同步结果，顺序与 gateways 一致"""
+        outcomes: Dict[int, GatewayResyncOutcome] = {}
+        pending_gateways = []
+        for gateway in gateways:
+            if self.checkpoint.is_synced(gateway.id):
+                outcomes[gateway.id] = GatewayResyncOutcome(
+                    gateway_id=gateway.id,
+                    gateway_name=gateway.name,
+                    status=ResyncStatusEnum.SKIPPED,
+                    message="synced in previous run",
+                )
+                self._notify(outcomes[gateway.id])
+            else:
+                pending_gateways.append(gateway)
+
+        with limit_etcd_write_rate(self.etcd_write_rate):
+            executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="resync")
+            try:
+                futures: Dict[Future, Gateway] = {
+                    executor.submit(self._sync, gateway): gateway for gateway in pending_gateways
+                }
+                for future in as_completed(futures):
+                    outcome = future.result()
+                    outcomes[outcome.gateway_id] = outcome
+                    self.checkpoint.record(outcome)
+                    self._notify(outcome)
+            finally:
+                # 中断（如 Ctrl-C）时，未开始的同步直接取消，已完成的同步结果已写入检查点
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        return [outcomes[gateway.id] for gateway in gateways]
+
+    def _notify(self, outcome: GatewayResyncOutcome):
+        if self._on_outcome:
+            self._on_outcome(outcome)
@@ -21,7 +21,7 @@ from datetime import timedelta
 from celery import shared_task
 from dateutil.relativedelta import relativedelta
 from django.conf import settings
-from django.db.models import Count
+from django.db.models import Count, Exists, OuterRef
 from django.utils import timezone
 
 from apigateway.apps.api_debug.models import APIDebugHistory
@@ -30,7 +30,7 @@ from apigateway.apps.monitor.models import AlarmRecord
 from apigateway.apps.permission.models import AppResourcePermission
 from apigateway.apps.support.models import ReleasedResourceDoc, ResourceDocVersion
 from apigateway.core.constants import ResourceVersionSchemaEnum
-from apigateway.core.models import PublishEvent, Release, ReleasedResource, ResourceVersion
+from apigateway.core.models import PublishEvent, Release, ReleasedResource, ReleasedResourceBody, ResourceVersion
 
 logger = logging.getLogger(__name__)
 
@@ -212,7 +212,9 @@ def delete_legacy_resource_version():
     ReleasedResource.objects.filter(resource_version_id__in=to_delete_legacy_resource_version_ids).delete()
 
     # delete the resource version
-    ResourceVersion.objects.filter(id__in=to_delete_legacy_resource_version_ids).delete()
+    ResourceVersion.objects.delete_with_resources_cache(
+        ResourceVersion.objects.filter(id__in=to_delete_legacy_resource_version_ids)
+    )
 
 
 @shared_task(ignore_result=True)
@@ -249,3 +251,27 @@ def delete_old_stats_records():
         count, _ = StatisticsAppRequestByDay.objects.filter(id__in=stats_app_ids_to_delete).delete()
 
         logger.info("deleted metrics_stats_app_request_by_day %s stats records older than %s", count, delete_end_time)
+
+
+@shared_task(ignore_result=True)
+def delete_unreferenced_released_resource_bodies():
+    """清理不再被 ReleasedResource 引用的资源配置数据
+    1. 发布时会刷新被复用数据的 updated_time，只清理 1 天内未被复用的数据，避免与正在进行的发布冲突
+    2. max 10000 records per time
+    """
+    logger.info("begin clean unreferenced released resource bodies")
+
+    max_records_per_time = 10000
+    delete_end_time = timezone.now() - timedelta(days=1)
+
+    ids_to_delete = list(
+        ReleasedResourceBody.objects.filter(updated_time__lt=delete_end_time)
+        .exclude(Exists(ReleasedResource.objects.filter(body_id=OuterRef("id"))))
+        .values_list("id", flat=True)[:max_records_per_time]
+    )
+    if not ids_to_delete:
+        return
+
+    count, _ = ReleasedResourceBody.objects.filter(id__in=ids_to_delete).delete()
+
+    logger.info("deleted %s unreferenced released resource bodies", count)
@@ -0,0 +1,77 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import logging
+from typing import List, Optional
+
+from celery import shared_task
+from django.conf import settings
+
+from apigateway.apps.data_plane.constants import DataPlaneStatusEnum
+from apigateway.apps.data_plane.models import DataPlaneReleaseManifest
+from apigateway.controller.drift import DriftCheckResult, DriftCheckResultEnum, ReleaseDriftReconciler
+from apigateway.controller.metrics import release_drift_stages_gauge
+from apigateway.core.constants import StageStatusEnum
+
+logger = logging.getLogger(__name__)
+
+
+def check_release_drift(
+    repair: bool,
+    data_plane_names: Optional[List[str]] = None,
+    gateway_names: Optional[List[str]] = None,
+) -> List[DriftCheckResult]:
+    """检测已记录摘要的网关环境在数据面中的配置漂移，按数据面更新漂移的环境数量指标"""
+    manifests = DataPlaneReleaseManifest.objects.filter(
+        data_plane__status=DataPlaneStatusEnum.ACTIVE.value,
+        stage__status=StageStatusEnum.ACTIVE.value,
+    ).select_related("data_plane", "gateway", "stage")
+    if data_plane_names:
+        manifests = manifests.filter(data_plane__name__in=data_plane_names)
+    if gateway_names:
+        manifests = manifests.filter(gateway__name__in=gateway_names)
+
+    results = []
+    drifted_stage_counts = {}
+    for manifest in manifests.order_by("data_plane_id", "id"):
+        result = ReleaseDriftReconciler(manifest).check(repair=repair)
+        results.append(result)
+
+        drifted = result.result not in [DriftCheckResultEnum.CLEAN, DriftCheckResultEnum.ERROR]
+        drifted_stage_counts.setdefault(manifest.data_plane.name, 0)
+        drifted_stage_counts[manifest.data_plane.name] += int(drifted)
+
+    for data_plane_name, count in drifted_stage_counts.items():
+        release_drift_stages_gauge.labels(data_plane=data_plane_name).set(count)
+
+    return results
+
+
+@shared_task(ignore_result=True)
+def detect_release_drift():
+    """定期检测数据面中的配置漂移，开启自动修复时只修复漂移的 key"""
+    results = check_release_drift(repair=settings.RELEASE_DRIFT_AUTO_REPAIR_ENABLED)
+
+    for result in results:
+        if result.result != DriftCheckResultEnum.CLEAN:
+            logger.warning("detect release drift: %s", result)
+
+    logger.info(
+        "detect release drift finished: checked=%s, clean=%s",
+        len(results),
+        sum(1 for result in results if result.result == DriftCheckResultEnum.CLEAN),
+    )
@@ -17,8 +17,7 @@
 #
 import logging
 import time
-from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from celery import current_app, shared_task
 
@@ -28,10 +27,10 @@ from apigateway.apps.support.models import ReleasedResourceDoc, ResourceDocVersi
 from apigateway.common.constants import RELEASE_GATEWAY_INTERVAL_SECOND
 from apigateway.controller.distributor.etcd import GatewayResourceDistributor
 from apigateway.controller.release_logger import ReleaseProcedureLogger
+from apigateway.controller.release_tracer import ReleasePhaseTracer
 from apigateway.controller.tasks.oauth2_builtin import OAuth2BuiltinPermissionReconciler
 from apigateway.core.constants import ReleaseHistoryStatusEnum, StageStatusEnum
 from apigateway.core.models import (
-    PublishEvent,
     Release,
     ReleasedResource,
     ReleaseHistory,
@@ -40,6 +39,7 @@ from apigateway.core.models import (
 )
 from apigateway.service.event import PublishEventReporter
 from apigateway.service.mcp import update_stage_mcp_server_related_resource_names
+from apigateway.service.release import get_release_status
 from apigateway.service.resource_doc import clear_unreleased_resource_doc
 from apigateway.utils.time import now_datetime
 
@@ -50,6 +50,9 @@ logger = logging.getLogger(__name__)
 
 MCP_SERVER_PERMISSION_CLEANUP_DELAY_SECONDS = 120
 
+# 发布状态检查任务的最大调度间隔（秒）
+RELEASE_STATUS_CHECK_MAX_COUNTDOWN = 8
+
 
 def _release_gateway(
     distributor: BaseDistributor,
@@ -63,25 +66,33 @@ def _release_gateway(
     # add publish event
     PublishEventReporter.report_create_publish_task_success(release_history)
     PublishEventReporter.report_distribute_config_doing(release_history)
+    # 记录下发各阶段的耗时，随下发配置事件一起保存，便于定位发布慢的阶段
+    tracer = ReleasePhaseTracer()
     try:
-        is_success, fail_msg = distributor.distribute(
-            release_task_id=procedure_logger.release_task_id,
-            publish_id=release_history.id,
-        )
+        with tracer:
+            is_success, fail_msg = distributor.distribute(
+                release_task_id=procedure_logger.release_task_id,
+                publish_id=release_history.id,
+            )
     except Exception as err:  # pylint: disable=broad-except
         # 记录失败原因
         procedure_logger.exception("release failed")
         # 上报失败事件
-        PublishEventReporter.report_distribute_config_failure(release_history, f"error: {err}")
+        PublishEventReporter.report_distribute_config_failure(
+            release_history, f"error: {err}", phase_timings=tracer.get_timings()
+        )
         # 异常抛出，让 celery 停止编排
         raise
 
+    phase_timings = tracer.get_timings()
+    procedure_logger.info(f"release phase timings: {phase_timings}")  # noqa: G004
     if not is_success:
-        PublishEventReporter.report_distribute_config_failure(release_history, fail_msg)
+        PublishEventReporter.report_distribute_config_failure(release_history, fail_msg, phase_timings=phase_timings)
         raise RuntimeError(fail_msg)
 
     PublishEventReporter.report_distribute_config_success(
         release_history,
+        phase_timings=phase_timings,
     )
     return True
 
@@ -133,52 +144,63 @@ def release_gateway_by_registry(publish_id: int, data_plane_id: int):
 
 @shared_task(ignore_result=True)
 def update_release_data_after_success(
-    publish_id: int, release_id: int, resource_version_id: int, author: str, comment: str
+    publish_id: int,
+    release_id: int,
+    resource_version_id: int,
+    author: str,
+    comment: str,
+    deadline: Optional[float] = None,
+    check_times: int = 0,
 ):
     """
-    发布后不断检查发布状态如果成功才更新相关数据
+    发布后检查发布状态，如果成功才更新相关数据
+
+    发布仍在进行中时，不在 worker 中阻塞等待，而是延迟重新调度本任务继续检查，直至发布结束或超时
     """
+    # 如果等待时间超过 10*RELEASE_GATEWAY_INTERVAL_SECOND 就不再检查
+    if deadline is None:
+        deadline = time.time() + 10 * RELEASE_GATEWAY_INTERVAL_SECOND
 
     # 检测发布状态，只有最终发布成功才更新
-    doing = True
-    start_time = datetime.now().timestamp()
-    wait_times = 0
-    while doing:
-        # 如果等待时间超过 10*RELEASE_GATEWAY_INTERVAL_SECOND 就退出等待
-        now = datetime.now().timestamp()
-        if now - start_time > 10 * RELEASE_GATEWAY_INTERVAL_SECOND:
+    publish_status = get_release_status(publish_id)
+    if publish_status == ReleaseHistoryStatusEnum.FAILURE.value:
+        logger.error(
+            "release[publish_id=%d,resource_version_id=%d] publish failed, skip updating release data",
+            publish_id,
+            resource_version_id,
+        )
+        return
+
+    if publish_status != ReleaseHistoryStatusEnum.SUCCESS.value:
+        countdown = min(2**check_times, RELEASE_STATUS_CHECK_MAX_COUNTDOWN)
+        if time.time() + countdown > deadline:
             logger.error(
-                "release[publish_id=%d,resource_version_id=%d}] check publish status timeout",
+                "release[publish_id=%d,resource_version_id=%d] check publish status timeout",
                 publish_id,
                 resource_version_id,
             )
             return
 
-        time.sleep(1 * wait_times)
-        wait_times += 1
-        latest_release_event_map = PublishEvent.objects.get_release_history_id_to_latest_publish_event_map(
-            [publish_id]
+        logger.debug(
+            "release[publish_id=%d,resource_version_id=%d] current status is %s, check again after %ds",
+            publish_id,
+            resource_version_id,
+            publish_status,
+            countdown,
         )
-        latest_event = latest_release_event_map.get(publish_id)
-
-        if not latest_event:
-            logger.error(
-                "release[publish_id=%d,resource_version_id=%d get latest event  fail", publish_id, resource_version_id
-            )
-            continue
-
-        # 判断状态
-        publish_status = latest_event.get_release_history_status()
-
-        if publish_status == ReleaseHistoryStatusEnum.SUCCESS.value:
-            doing = False
-        else:
-            logger.debug(
-                "release[publish_id=%d,resource_version_id=%d current status is %s",
-                publish_id,
-                resource_version_id,
-                publish_status,
-            )
+        update_release_data_after_success.apply_async(
+            kwargs={
+                "publish_id": publish_id,
+                "release_id": release_id,
+                "resource_version_id": resource_version_id,
+                "author": author,
+                "comment": comment,
+                "deadline": deadline,
+                "check_times": check_times + 1,
+            },
+            countdown=countdown,
+        )
+        return
 
     release = Release.objects.get(id=release_id)
     if not release:
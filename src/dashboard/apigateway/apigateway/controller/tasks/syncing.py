@@ -17,14 +17,21 @@
 #
 import logging
 import uuid
+from typing import Dict, List
 
 from celery import shared_task
 
 from apigateway.apps.data_plane.models import DataPlane
 from apigateway.common.constants import RELEASE_GATEWAY_INTERVAL_SECOND
 from apigateway.controller.constants import DELETE_PUBLISH_ID, GLOBAL_PUBLISH_ID, NO_NEED_REPORT_EVENT_PUBLISH_ID
-from apigateway.controller.distributor.etcd import GatewayResourceDistributor, GlobalResourceDistributor
+from apigateway.controller.distributor.etcd import (
+    GatewayResourceDistributor,
+    GlobalResourceDistributor,
+    transform_global_resources,
+)
+from apigateway.controller.distributor.parallel import ParallelDistributeExecutor
 from apigateway.controller.release_logger import ReleaseProcedureLogger
+from apigateway.controller.release_tracer import ReleasePhaseTracer
 from apigateway.controller.tasks.oauth2_builtin import OAuth2BuiltinPermissionReconciler
 from apigateway.core.constants import (
     PublishSourceEnum,
@@ -48,17 +55,32 @@ def distribute_global_resources():
         logger.warning("no active data planes found, skip distribute_global_resources")
         return False
 
-    failed_data_plane_ids = []
+    # 在当前线程中完成转换，相同 apisix 版本的数据面只转换一次，再并发下发到各数据面
+    version_to_resources: Dict[str, List] = {}
+    distributors: Dict[int, GlobalResourceDistributor] = {}
     for data_plane in data_planes:
-        distributor = GlobalResourceDistributor(data_plane=data_plane)
-        is_success, err_msg = distributor.distribute(release_task_id=str(uuid.uuid4()), publish_id=GLOBAL_PUBLISH_ID)
-        if not is_success:
-            failed_data_plane_ids.append(data_plane.id)
+        if data_plane.apisix_version not in version_to_resources:
+            version_to_resources[data_plane.apisix_version] = transform_global_resources(data_plane.apisix_version)
+        distributors[data_plane.id] = GlobalResourceDistributor(data_plane=data_plane)
+
+    results = ParallelDistributeExecutor().run(
+        data_planes,
+        lambda data_plane: distributors[data_plane.id].distribute(
+            release_task_id=str(uuid.uuid4()),
+            publish_id=GLOBAL_PUBLISH_ID,
+            resources=version_to_resources[data_plane.apisix_version],
+        ),
+    )
+
+    failed_data_plane_ids = []
+    for result in results:
+        if not result.is_success:
+            failed_data_plane_ids.append(result.data_plane.id)
             logger.error(
                 "distribute global resources failed for data_plane[id=%s,name=%s]: %s",
-                data_plane.id,
-                data_plane.name,
-                err_msg,
+                result.data_plane.id,
+                result.data_plane.name,
+                result.message,
             )
 
     if failed_data_plane_ids:
@@ -120,14 +142,20 @@ def rolling_update_release(gateway_id: int, publish_id: int, release_id: int, da
     PublishEventReporter.report_distribute_config_doing(release_history)
     procedure_logger.info("distribute begin")
 
-    is_success, err_msg = distributor.distribute(
-        release_task_id=release_task_id,
-        publish_id=publish_id,
-    )
+    with ReleasePhaseTracer() as tracer:
+        is_success, err_msg = distributor.distribute(
+            release_task_id=release_task_id,
+            publish_id=publish_id,
+        )
+    phase_timings = tracer.get_timings()
+    procedure_logger.info(f"release phase timings: {phase_timings}")  # noqa: G004
+
     if not is_success:
         msg = f"distribute failed: {err_msg}"
         if not is_cli_sync:
-            PublishEventReporter.report_distribute_config_failure(release_history, err_msg)
+            PublishEventReporter.report_distribute_config_failure(
+                release_history, err_msg, phase_timings=phase_timings
+            )
         procedure_logger.info(msg)
     else:
         # 更新 release 的发布时间和发布人
@@ -146,7 +174,7 @@ def rolling_update_release(gateway_id: int, publish_id: int, release_id: int, da
             stage.status = StageStatusEnum.ACTIVE.value
             stage.save()
 
-        PublishEventReporter.report_distribute_config_success(release_history)
+        PublishEventReporter.report_distribute_config_success(release_history, phase_timings=phase_timings)
         procedure_logger.info("distribute succeeded")
         try:
             OAuth2BuiltinPermissionReconciler().reconcile_gateway(release.gateway)
@@ -15,9 +15,11 @@
 # We undertake not to change the open source license (MIT license) applicable
 # to the current version of the project delivered to anyone in the future.
 #
+import hashlib
+import json
 import logging
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Set
 
 from apigateway.apps.data_plane.constants import get_ai_gateway_apisix_version_error
 from apigateway.controller.convertor import (
@@ -25,9 +27,10 @@ from apigateway.controller.convertor import (
     RouteConvertor,
     ServiceConvertor,
 )
-from apigateway.controller.convertor.constants import LABEL_KEY_BACKEND_ID
+from apigateway.controller.convertor.constants import LABEL_KEY_BACKEND_ID, LABEL_KEY_STAGE_CONFIG_DIGEST
 from apigateway.controller.convertor.plugin_metadata import PluginMetadataConvertor
 from apigateway.controller.release_data import ReleaseData
+from apigateway.controller.release_tracer import trace_phase
 
 if TYPE_CHECKING:
     from apigateway.controller.models import ApisixModel, GatewayApisixModel
@@ -85,7 +88,11 @@ class GatewayApisixResourceTransformer(BaseTransformer):
             if compatibility_error:
                 raise ValueError(compatibility_error)
 
-        if release.resource_version.is_schema_v2 or revoke_flag:
+        # 资源版本数据较大，首次访问时从 db 加载
+        with trace_phase("load_resource_version"):
+            resource_version = release.resource_version
+
+        if resource_version.is_schema_v2 or revoke_flag:
             # note: revoke_flag is True, allow to use schema v1 to revoke resources
             self._release_data = ReleaseData(release)
         else:
@@ -104,11 +111,13 @@ class GatewayApisixResourceTransformer(BaseTransformer):
         self._converted_protos: List[GatewayApisixModel] = []
         self._converted_bk_releases: List[GatewayApisixModel] = []
 
-    def transform(self):
-        # FIXME:
-        # 1. should check the proto_id of route plugins are all exists
-        # 2. should check the ssl_id of service.upstream are all exists
-        # 3. distribute the ssl/proto
+        self._services_converted = False
+        # 环境级配置摘要，仅在增量发布需要时计算
+        self._stage_config_digest: Optional[str] = None
+
+    def _convert_services(self):
+        if self._services_converted:
+            return
 
         service_convertor = ServiceConvertor(
             self._release_data,
@@ -116,7 +125,33 @@ class GatewayApisixResourceTransformer(BaseTransformer):
             self.apisix_version,
             self.revoke_flag,
         )
-        self._converted_services = service_convertor.convert()
+        with trace_phase("convert_services"):
+            self._converted_services = service_convertor.convert()
+        self._services_converted = True
+
+    def get_stage_config_digest(self) -> str:
+        """获取环境级配置的摘要
+
+        环境级配置包括后端服务、环境插件、环境变量、数据面 apisix 版本等，会影响环境下所有的路由；
+        摘要不变时，路由的内容只取决于资源本身的配置
+        """
+        if self._stage_config_digest is None:
+            self._convert_services()
+
+            content = {
+                # service 的 labels 中包含 publish_id，每次发布都会变化，不计入摘要
+                "services": [svc.model_dump(mode="json", exclude={"labels"}) for svc in self._converted_services],
+                "stage_vars": self._release_data.stage.vars,
+                "apisix_version": self.apisix_version,
+            }
+            self._stage_config_digest = hashlib.sha1(
+                json.dumps(content, sort_keys=True, default=str).encode("utf-8")
+            ).hexdigest()
+
+        return self._stage_config_digest
+
+    def _get_route_convertor(self, resource_ids: Optional[Set[int]] = None) -> RouteConvertor:
+        self._convert_services()
 
         backend_service_mapping: Dict[int, str] = {}
         for svc in self._converted_services:
@@ -128,14 +163,42 @@ class GatewayApisixResourceTransformer(BaseTransformer):
         logger.debug("the mapping: %s", backend_service_mapping)
 
         # 协议类型为 http 的资源，与 grpc 等协议区分，而不是后端 proxy 类型为 http 的资源
-        route_convertor = RouteConvertor(
+        return RouteConvertor(
             self._release_data,
             backend_service_mapping,
             self.publish_id,
             self.apisix_version,
             self.revoke_flag,
+            resource_ids=resource_ids,
         )
-        self._converted_routes = route_convertor.convert()
+
+    def _convert_bk_releases(self) -> List[GatewayApisixModel]:
+        bk_release_convertor = BkReleaseConvertor(
+            self._release_data,
+            self.publish_id,
+            self.apisix_version,
+        )
+        bk_releases = bk_release_convertor.convert()
+
+        # 记录环境级配置摘要，供下次增量发布判断环境级配置是否变化
+        if self._stage_config_digest is not None:
+            for bk_release in bk_releases:
+                bk_release.labels.add_label(LABEL_KEY_STAGE_CONFIG_DIGEST, self._stage_config_digest)
+
+        return bk_releases
+
+    def transform(self, resource_ids: Optional[Set[int]] = None):
+        """
+        :param resource_ids: 只转换指定 id 的资源对应的路由，为 None 时转换全部资源；用于增量发布
+        """
+        # FIXME:
+        # 1. should check the proto_id of route plugins are all exists
+        # 2. should check the ssl_id of service.upstream are all exists
+        # 3. distribute the ssl/proto
+
+        route_convertor = self._get_route_convertor(resource_ids)
+        with trace_phase("convert_routes"):
+            self._converted_routes = route_convertor.convert()
 
         # NOTE: other resource should care about the revoke_flag too
 
@@ -147,12 +210,35 @@ class GatewayApisixResourceTransformer(BaseTransformer):
         # proto_convertor = ProtoConvertor(self._release_data, self.publish_id, self.apisix_version)
         # self._converted_protos = proto_convertor.convert()
 
-        bk_release_convertor = BkReleaseConvertor(
-            self._release_data,
-            self.publish_id,
-            self.apisix_version,
-        )
-        self._converted_bk_releases = bk_release_convertor.convert()
+        self._converted_bk_releases = self._convert_bk_releases()
+
+    def iter_transformed_resources(self) -> Iterator[ApisixModel]:
+        """流式转换全部资源，资源顺序与 get_transformed_resources 一致
+
+        service、BkRelease 数量少，预先转换；路由在迭代时逐个转换，不保留已返回的路由，
+        内存占用只取决于调用方每批处理的资源数量，而不是网关的资源数量；调用前无需执行 transform
+        """
+        route_convertor = self._get_route_convertor()
+        # 预先转换 BkRelease，使其转换失败时尚未写入任何资源
+        bk_releases = self._convert_bk_releases()
+
+        yield from self._converted_ssls
+
+        yield from self._converted_protos
+
+        yield from self._converted_services
+
+        routes = route_convertor.iter_convert()
+        while True:
+            # 只统计路由转换本身的耗时，不包含调用方在两次迭代之间写入 etcd 等的耗时
+            with trace_phase("convert_routes"):
+                route = next(routes, None)
+            if route is None:
+                break
+            yield route
+
+        # NOTE: this should be the last resource
+        yield from bk_releases
 
     def get_transformed_resources(self) -> Iterable[ApisixModel]:
         yield from self._converted_ssls
@@ -165,3 +251,10 @@ class GatewayApisixResourceTransformer(BaseTransformer):
 
         # NOTE: this should be the last resource
         yield from self._converted_bk_releases
+
+    def get_incremental_resources(self) -> Iterable[ApisixModel]:
+        """增量发布时需写入的资源：变化的路由及 BkRelease；环境级配置未变化，无需写入 service"""
+        yield from self._converted_routes
+
+        # NOTE: this should be the last resource
+        yield from self._converted_bk_releases
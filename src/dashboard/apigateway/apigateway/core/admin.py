@@ -113,6 +113,7 @@ class ReleasedResourceAdmin(AuditFieldsDisplayAdminMixin, DjangoQLSearchMixin, a
     ]
     list_filter = ["gateway"]
     search_fields = ["resource_version_id", "resource_id", "resource_name", "gateway_name"]
+    raw_id_fields = ["body"]
 
 
 class ReleaseHistoryAdmin(AuditFieldsDisplayAdminMixin, DjangoQLSearchMixin, admin.ModelAdmin):
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+"""
+资源版本中资源数据的两级缓存
+
+- 进程内缓存：按数据序列化后的字节数限制总大小
+- redis 共享缓存：存储压缩后的数据，各进程共享，避免每个进程都解析一次完整的版本数据
+
+资源版本创建后数据不再变化，因此只需在版本删除时清理缓存；其它进程的进程内缓存在过期后自然失效，
+已删除的版本不会再被发布引用
+"""
+
+import functools
+import json
+import logging
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from cachetools import TTLCache
+from django.conf import settings
+
+from apigateway.common.constants import CACHE_TIME_24_HOURS
+from apigateway.core.metrics import resource_version_cache_counter
+from apigateway.utils.redis_utils import get_default_redis_client, get_redis_key
+
+logger = logging.getLogger(__name__)
+
+Resources = Dict[int, dict]
+
+REDIS_DELETE_BATCH_SIZE = 500
+
+
+class _LocalEntry:
+    __slots__ = ("size", "value")
+
+    def __init__(self, value: Resources, size: int):
+        self.value = value
+        self.size = size
+
+
+class ResourceVersionResourcesCache:
+    def __init__(self, local_max_bytes: int, redis_max_entry_bytes: int, ttl: int = CACHE_TIME_24_HOURS):
+        self.redis_max_entry_bytes = redis_max_entry_bytes
+        self.ttl = ttl
+        self._local: TTLCache = TTLCache(maxsize=local_max_bytes, ttl=ttl, getsizeof=lambda entry: entry.size)
+
+    def get_or_load(self, gateway_id: int, resource_version_id: int, loader: Callable[[], Resources]) -> Resources:
+        key = (gateway_id, resource_version_id)
+        entry = self._local.get(key)
+        if entry is not None:
+            resource_version_cache_counter.labels(tier="local", result="hit").inc()
+            return entry.value
+        resource_version_cache_counter.labels(tier="local", result="miss").inc()
+
+        payload = self._get_from_redis(gateway_id, resource_version_id)
+        if payload is not None:
+            resource_version_cache_counter.labels(tier="redis", result="hit").inc()
+            raw = zlib.decompress(payload)
+            value = self._deserialize(raw)
+        else:
+            resource_version_cache_counter.labels(tier="redis", result="miss").inc()
+            value = loader()
+            raw = self._serialize(value)
+            # 版本不存在时不写入共享缓存
+            if value:
+                self._set_to_redis(gateway_id, resource_version_id, zlib.compress(raw))
+
+        # 以序列化后的数据大小估算内存占用
+        self._set_to_local(key, value, len(raw))
+        return value
+
+    def invalidate(self, keys: List[Tuple[int, int]]):
+        """清理缓存，keys 为 (gateway_id, resource_version_id) 列表"""
+        if not keys:
+            return
+
+        for key in keys:
+            self._local.pop(key, None)
+
+        redis_client = get_default_redis_client()
+        if redis_client is None:
+            return
+
+        redis_keys = [self._get_redis_key(gateway_id, resource_version_id) for gateway_id, resource_version_id in keys]
+        try:
+            for i in range(0, len(redis_keys), REDIS_DELETE_BATCH_SIZE):
+                redis_client.delete(*redis_keys[i : i + REDIS_DELETE_BATCH_SIZE])
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("delete resource version cache from redis failed, keys=%s", keys)
+
+    def clear(self):
+        """清空进程内缓存"""
+        self._local.clear()
+
+    def _set_to_local(self, key, value: Resources, size: int):
+        try:
+            self._local[key] = _LocalEntry(value, size)
+        except ValueError:
+            # 单个版本的数据超过进程内缓存上限，不缓存
+            logger.warning("resource version %s is too large to cache in local, size=%s", key[1], size)
+
+    def _get_from_redis(self, gateway_id: int, resource_version_id: int) -> Optional[bytes]:
+        redis_client = get_default_redis_client()
+        if redis_client is None:
+            return None
+
+        try:
+            return redis_client.get(self._get_redis_key(gateway_id, resource_version_id))
+        except Exception:  # pylint: disable=broad-except
+            logger.exception(
+                "get resource version cache from redis failed, resource_version_id=%s", resource_version_id
+            )
+            return None
+
+    def _set_to_redis(self, gateway_id: int, resource_version_id: int, payload: bytes):
+        if len(payload) > self.redis_max_entry_bytes:
+            return
+
+        redis_client = get_default_redis_client()
+        if redis_client is None:
+            return
+
+        try:
+            redis_client.set(self._get_redis_key(gateway_id, resource_version_id), payload, ex=self.ttl)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("set resource version cache to redis failed, resource_version_id=%s", resource_version_id)
+
+    def _get_redis_key(self, gateway_id: int, resource_version_id: int) -> str:
+        return get_redis_key(f"resource_version_resources:{gateway_id}:{resource_version_id}")
+
+    def _serialize(self, value: Resources) -> bytes:
+        # json 的 key 只能为字符串，因此只存储资源列表，读取时再按资源 id 重建
+        return json.dumps(list(value.values())).encode("utf-8")
+
+    def _deserialize(self, raw: bytes) -> Resources:
+        return {resource["id"]: resource for resource in json.loads(raw)}
+
+
+resource_version_resources_cache = ResourceVersionResourcesCache(
+    local_max_bytes=settings.RESOURCE_VERSION_CACHE_LOCAL_MAX_BYTES,
+    redis_max_entry_bytes=settings.RESOURCE_VERSION_CACHE_REDIS_MAX_ENTRY_BYTES,
+)
+
+
+def cached_resource_version_resources(func: Callable[[Any, int, int], Resources]):
+    """缓存 manager 方法 func(self, gateway_id, id) 的结果，兼容 cachetools.cached 的 cache_clear"""
+
+    @functools.wraps(func)
+    def wrapper(manager, gateway_id: int, id: int) -> Resources:  # noqa: A002
+        return resource_version_resources_cache.get_or_load(gateway_id, id, lambda: func(manager, gateway_id, id))
+
+    wrapper.cache_clear = resource_version_resources_cache.clear  # type: ignore[attr-defined]
+    return wrapper
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+"""
+补全资源版本的资源数量、数据摘要，并按 RESOURCE_VERSION_DATA_COMPRESS_ENABLED 将存量版本数据转为压缩或未压缩格式
+"""
+
+from typing import Optional
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from apigateway.core.models import ResourceVersion
+from apigateway.utils.payload import COMPRESSED_PAYLOAD_PREFIX, is_compressed_payload
+
+BATCH_SIZE = 100
+
+
+class Command(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument("--gateway-id", type=int, dest="gateway_id")
+        parser.add_argument("--batch-size", type=int, dest="batch_size", default=BATCH_SIZE)
+        parser.add_argument("--dry-run", dest="dry_run", action="store_true", help="dry run")
+
+    def handle(self, gateway_id: Optional[int], batch_size: int, dry_run: bool, **options) -> None:
+        compress = settings.RESOURCE_VERSION_DATA_COMPRESS_ENABLED
+
+        queryset = ResourceVersion.objects.all()
+        if gateway_id:
+            queryset = queryset.filter(gateway_id=gateway_id)
+        if not compress:
+            queryset = queryset.filter(
+                Q(resource_count__isnull=True) | Q(content_hash="") | Q(_data__startswith=COMPRESSED_PAYLOAD_PREFIX)
+            )
+
+        resource_version_ids = list(queryset.order_by("id").values_list("id", flat=True))
+        updated = 0
+        for i in range(0, len(resource_version_ids), batch_size):
+            batch_ids = resource_version_ids[i : i + batch_size]
+            # 逐批加载版本数据，避免一次性加载全部大字段
+            for resource_version in ResourceVersion.objects.filter(id__in=batch_ids).only(
+                "id", "_data", "resource_count", "content_hash"
+            ):
+                if not self._need_update(resource_version, compress):
+                    continue
+
+                updated += 1
+                if dry_run:
+                    print(f"backfill resource_version[id={resource_version.id}]")
+                    continue
+
+                # 通过 data 属性重新赋值，按当前配置编码，并计算资源数量、数据摘要
+                resource_version.data = resource_version.data
+                resource_version.save(update_fields=["_data", "resource_count", "content_hash"])
+
+        print(f"total {len(resource_version_ids)} resource versions checked, {updated} updated")
+
+    def _need_update(self, resource_version: ResourceVersion, compress: bool) -> bool:
+        if resource_version.resource_count is None or not resource_version.content_hash:
+            return True
+
+        return compress != is_compressed_payload(resource_version._data)
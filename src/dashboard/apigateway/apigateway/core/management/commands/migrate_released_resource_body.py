@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+"""
+将存量 ReleasedResource 中的资源配置数据，按内容摘要去重迁移到 ReleasedResourceBody
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apigateway.core.models import ReleasedResource, ReleasedResourceBody
+from apigateway.utils.payload import get_json_digest
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument("--gateway-id", type=int, dest="gateway_id")
+        parser.add_argument("--batch-size", type=int, dest="batch_size", default=BATCH_SIZE)
+        parser.add_argument("--dry-run", dest="dry_run", action="store_true", help="dry run")
+
+    def handle(self, gateway_id: Optional[int], batch_size: int, dry_run: bool, **options) -> None:
+        queryset = ReleasedResource.objects.filter(body__isnull=True)
+        if gateway_id:
+            queryset = queryset.filter(gateway_id=gateway_id)
+
+        ids = list(queryset.order_by("id").values_list("id", flat=True))
+        if dry_run:
+            print(f"{len(ids)} released resources to migrate")
+            return
+
+        for i in range(0, len(ids), batch_size):
+            self._migrate(ids[i : i + batch_size])
+
+        print(f"{len(ids)} released resources migrated")
+
+    def _migrate(self, ids: List[int]) -> None:
+        gateway_to_resources: Dict[int, List[ReleasedResource]] = defaultdict(list)
+        for released_resource in ReleasedResource.objects.filter(id__in=ids, body__isnull=True):
+            gateway_to_resources[released_resource.gateway_id].append(released_resource)
+
+        with transaction.atomic():
+            for gateway_id, released_resources in gateway_to_resources.items():
+                content_hashes = [get_json_digest(r._data) for r in released_resources]
+                hash_to_body_id = ReleasedResourceBody.objects.save_bodies(
+                    gateway_id, {h: r._data for h, r in zip(content_hashes, released_resources)}
+                )
+
+                for released_resource, content_hash in zip(released_resources, content_hashes):
+                    released_resource.body_id = hash_to_body_id[content_hash]
+                    released_resource._data = {}
+
+                ReleasedResource.objects.bulk_update(released_resources, ["body", "_data"])
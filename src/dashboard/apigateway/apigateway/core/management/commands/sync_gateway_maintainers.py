@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+"""
+根据网关的维护者字段，修复网关维护者索引 GatewayMaintainer，新增缺失的记录，删除多余的记录
+"""
+
+from typing import Optional
+
+from django.core.management.base import BaseCommand
+
+from apigateway.core.models import Gateway, GatewayMaintainer
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    def add_arguments(self, parser):
+        parser.add_argument("--gateway-id", type=int, dest="gateway_id")
+        parser.add_argument("--batch-size", type=int, dest="batch_size", default=BATCH_SIZE)
+        parser.add_argument("--dry-run", dest="dry_run", action="store_true", help="dry run")
+
+    def handle(self, gateway_id: Optional[int], batch_size: int, dry_run: bool, **options) -> None:
+        queryset = Gateway.objects.all()
+        if gateway_id:
+            queryset = queryset.filter(id=gateway_id)
+
+        gateway_ids = list(queryset.order_by("id").values_list("id", flat=True))
+        added = deleted = 0
+        for i in range(0, len(gateway_ids), batch_size):
+            batch_ids = gateway_ids[i : i + batch_size]
+
+            expected = set()
+            for gateway in Gateway.objects.filter(id__in=batch_ids).only("id", "_maintainers"):
+                expected.update((gateway.id, username) for username in gateway.maintainers if username)
+
+            existing = {
+                (gid, username): id_
+                for id_, gid, username in GatewayMaintainer.objects.filter(gateway_id__in=batch_ids).values_list(
+                    "id", "gateway_id", "username"
+                )
+            }
+
+            to_add = sorted(expected - existing.keys())
+            to_delete = [id_ for key, id_ in existing.items() if key not in expected]
+            added += len(to_add)
+            deleted += len(to_delete)
+            if dry_run:
+                for gid, username in to_add:
+                    print(f"add gateway_maintainer[gateway_id={gid}, username={username}]")
+                continue
+
+            if to_delete:
+                GatewayMaintainer.objects.filter(id__in=to_delete).delete()
+            if to_add:
+                GatewayMaintainer.objects.bulk_create(
+                    [GatewayMaintainer(gateway_id=gid, username=username) for gid, username in to_add],
+                    ignore_conflicts=True,
+                )
+
+        print(f"total {len(gateway_ids)} gateways checked, {added} maintainers added, {deleted} maintainers deleted")
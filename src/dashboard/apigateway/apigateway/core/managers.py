@@ -21,21 +21,22 @@ import json
 import operator
 from typing import Any, Dict, List, Optional
 
-from cachetools import TTLCache, cached
 from django.db import models
 
-from apigateway.common.constants import CACHE_MAXSIZE, CACHE_TIME_24_HOURS
+from apigateway.core.caches import cached_resource_version_resources, resource_version_resources_cache
 from apigateway.core.constants import (
     DEFAULT_STAGE_NAME,
     BackendKindEnum,
     ResourceKindEnum,
     StageStatusEnum,
 )
+from apigateway.utils.payload import get_json_digest
 from apigateway.utils.time import now_datetime
 
 # - managers.py 下面不能存在跨 models 的操作，每个 manager 只关心自己的逻辑 (避免循环引用)
 
 RELEASED_RESOURCE_CREATE_BATCH_SIZE = 50
+RELEASED_RESOURCE_BODY_QUERY_BATCH_SIZE = 500
 
 
 class BackendManager(models.Manager):
@@ -54,6 +55,29 @@ class ResourceManager(models.Manager):
         return self.filter(kind=ResourceKindEnum.AI.value)
 
 
+class GatewayMaintainerManager(models.Manager):
+    def sync_maintainers(self, gateway_id: int, maintainers: List[str]) -> None:
+        """同步网关的维护者索引，只写入、删除有变化的记录"""
+        usernames = {username for username in maintainers if username}
+        existing_usernames = set(self.filter(gateway_id=gateway_id).values_list("username", flat=True))
+
+        to_delete = existing_usernames - usernames
+        if to_delete:
+            self.filter(gateway_id=gateway_id, username__in=to_delete).delete()
+
+        to_add = usernames - existing_usernames
+        if to_add:
+            # 并发保存同一网关时，可能会存在冲突
+            self.bulk_create(
+                [self.model(gateway_id=gateway_id, username=username) for username in sorted(to_add)],
+                ignore_conflicts=True,
+            )
+
+    def filter_gateway_ids(self, username: str) -> models.QuerySet:
+        """获取用户维护的网关 id，返回 queryset 可直接用作子查询"""
+        return self.filter(username=username).values_list("gateway_id", flat=True)
+
+
 class StageManager(models.Manager):
     def get_names(self, gateway_id: int):
         return list(self.filter(gateway_id=gateway_id).values_list("name", flat=True))
@@ -75,7 +99,7 @@ class ResourceVersionManager(models.Manager):
         """
         return self.filter(gateway_id=gateway_id).last()
 
-    @cached(cache=TTLCache(maxsize=CACHE_MAXSIZE, ttl=CACHE_TIME_24_HOURS))
+    @cached_resource_version_resources
     def get_resources(self, gateway_id: int, id: int) -> Dict[int, dict]:
         resource_version = self.filter(gateway_id=gateway_id, id=id).first()
         if not resource_version:
@@ -105,6 +129,12 @@ class ResourceVersionManager(models.Manager):
             }
         return resources
 
+    def delete_with_resources_cache(self, queryset):
+        """删除资源版本，并清理 get_resources 的缓存"""
+        keys = list(queryset.values_list("gateway_id", "id"))
+        queryset.delete()
+        resource_version_resources_cache.invalidate(keys)
+
     def get_id_to_fields_map(
         self,
         gateway_id: Optional[int] = None,
@@ -277,7 +307,7 @@ class ReleasedResourceManager(models.Manager):
         )
 
     def save_released_resource(self, resource_version, force: bool = False) -> None:
-        """保存资源版本中的资源配置"""
+        """保存资源版本中的资源配置，配置数据按内容摘要去重存储在 ReleasedResourceBody 中"""
         queryset = self.filter(resource_version_id=resource_version.id)
         exists = queryset.exists()
 
@@ -287,8 +317,13 @@ class ReleasedResourceManager(models.Manager):
         if exists:
             queryset.delete()
 
+        resources = resource_version.data
+        content_hashes = [get_json_digest(resource) for resource in resources]
+        body_manager = self.model._meta.get_field("body").related_model.objects
+        hash_to_body_id = body_manager.save_bodies(resource_version.gateway_id, dict(zip(content_hashes, resources)))
+
         resource_to_add = []
-        for resource in resource_version.data:
+        for resource, content_hash in zip(resources, content_hashes):
             oauth2_public_enabled, oauth2_personal_enabled = get_released_resource_oauth2_flags(resource)
             resource_to_add.append(
                 self.model(
@@ -301,18 +336,23 @@ class ReleasedResourceManager(models.Manager):
                     is_public=resource.get("is_public") is True,
                     oauth2_public_client_enabled=oauth2_public_enabled,
                     oauth2_personal_client_enabled=oauth2_personal_enabled,
-                    data=resource,
+                    _data={},
+                    body_id=hash_to_body_id[content_hash],
                 )
             )
         # 异步同时(多个stage同时发布同一版本)更新会存在一些冲突问题
         self.bulk_create(resource_to_add, batch_size=RELEASED_RESOURCE_CREATE_BATCH_SIZE, ignore_conflicts=True)
 
     def get_released_resource(self, gateway_id: int, resource_version_id: int, resource_name: str) -> Optional[dict]:
-        released_resource = self.filter(
-            gateway_id=gateway_id,
-            resource_version_id=resource_version_id,
-            resource_name=resource_name,
-        ).first()
+        released_resource = (
+            self.filter(
+                gateway_id=gateway_id,
+                resource_version_id=resource_version_id,
+                resource_name=resource_name,
+            )
+            .select_related("body")
+            .first()
+        )
         if not released_resource:
             return None
 
@@ -328,7 +368,7 @@ class ReleasedResourceManager(models.Manager):
 
         ids = [next(group)["id"] for _, group in itertools.groupby(resources, key=operator.itemgetter("resource_id"))]
 
-        return [self._parse_released_resource(resource) for resource in self.filter(id__in=ids)]
+        return [self._parse_released_resource(resource) for resource in self.filter(id__in=ids).select_related("body")]
 
     def filter_resource_version_ids(self, resource_ids: List[int]) -> List[int]:
         """过滤出资源所属的资源版本号"""
@@ -372,6 +412,40 @@ class ReleasedResourceManager(models.Manager):
         }
 
 
+class ReleasedResourceBodyManager(models.Manager):
+    def save_bodies(self, gateway_id: int, hash_to_data: Dict[str, dict]) -> Dict[str, int]:
+        """保存资源配置数据，已存在的数据不重复写入，返回 content_hash -> id"""
+        hash_to_id = self._get_hash_to_id(gateway_id, list(hash_to_data))
+
+        # 刷新被复用数据的更新时间，避免被清理任务当作未引用的数据删除
+        if hash_to_id:
+            self.filter(id__in=list(hash_to_id.values())).update(updated_time=now_datetime())
+
+        to_add = [content_hash for content_hash in hash_to_data if content_hash not in hash_to_id]
+        if not to_add:
+            return hash_to_id
+
+        # 多个环境同时发布同一版本时，可能会存在冲突，忽略冲突后重新查询
+        self.bulk_create(
+            [self.model(gateway_id=gateway_id, content_hash=h, data=hash_to_data[h]) for h in to_add],
+            batch_size=RELEASED_RESOURCE_CREATE_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        hash_to_id.update(self._get_hash_to_id(gateway_id, to_add))
+        return hash_to_id
+
+    def _get_hash_to_id(self, gateway_id: int, content_hashes: List[str]) -> Dict[str, int]:
+        hash_to_id: Dict[str, int] = {}
+        for i in range(0, len(content_hashes), RELEASED_RESOURCE_BODY_QUERY_BATCH_SIZE):
+            hash_to_id.update(
+                self.filter(
+                    gateway_id=gateway_id,
+                    content_hash__in=content_hashes[i : i + RELEASED_RESOURCE_BODY_QUERY_BATCH_SIZE],
+                ).values_list("content_hash", "id")
+            )
+        return hash_to_id
+
+
 class PublishEventManager(models.Manager):
     def get_release_history_id_to_latest_publish_event_map(self, release_history_ids: List[int]):
         """通过 release_history_ids 查询最新的一个发布事件"""
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+from django.conf import settings
+from prometheus_client import Counter
+
+_prefix = settings.PROMETHEUS_METRIC_NAME_PREFIX
+
+# 资源版本中资源数据的缓存命中情况，tier 为 local（进程内缓存）或 redis（共享缓存）
+resource_version_cache_counter = Counter(
+    f"{_prefix}resource_version_cache_requests_total",
+    "Number of resource version resources cache lookups",
+    ["tier", "result"],
+)
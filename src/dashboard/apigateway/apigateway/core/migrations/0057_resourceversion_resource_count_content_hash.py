@@ -0,0 +1,22 @@
+# Generated by Django 5.2.15 on 2026-10-18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0056_releasedresource_oauth2_scope_fields"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="resourceversion",
+            name="resource_count",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="resourceversion",
+            name="content_hash",
+            field=models.CharField(blank=True, db_index=True, default="", max_length=64),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.15 on 2026-10-18
+
+import django.db.models.deletion
+import jsonfield.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0057_resourceversion_resource_count_content_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReleasedResourceBody",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_time", models.DateTimeField(auto_now_add=True, null=True, blank=True)),
+                ("updated_time", models.DateTimeField(auto_now=True, null=True, blank=True)),
+                ("content_hash", models.CharField(max_length=64)),
+                ("data", jsonfield.fields.JSONField(help_text="resource data in resource version")),
+                (
+                    "gateway",
+                    models.ForeignKey(
+                        db_column="api_id",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="core.gateway",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "ReleasedResourceBody",
+                "verbose_name_plural": "ReleasedResourceBody",
+                "db_table": "core_released_resource_body",
+                "unique_together": {("gateway", "content_hash")},
+            },
+        ),
+        # 只修改 python 中的字段名，数据库中的列名仍为 data
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RenameField(
+                    model_name="releasedresource",
+                    old_name="data",
+                    new_name="_data",
+                ),
+                migrations.AlterField(
+                    model_name="releasedresource",
+                    name="_data",
+                    field=jsonfield.fields.JSONField(db_column="data", help_text="resource data in resource version"),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="releasedresource",
+            name="body",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="core.releasedresourcebody",
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.15 on 2026-10-19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0058_releasedresourcebody"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="resourceversion",
+            name="used_stage_vars",
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.15 on 2026-10-18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def backfill_gateway_maintainers(apps, schema_editor):
+    """根据网关的 maintainers 字段生成维护者索引"""
+    Gateway = apps.get_model("core", "Gateway")
+    GatewayMaintainer = apps.get_model("core", "GatewayMaintainer")
+
+    objs = []
+    for gateway_id, maintainers in Gateway.objects.values_list("id", "_maintainers").iterator(chunk_size=BATCH_SIZE):
+        usernames = {username for username in (maintainers or "").rstrip(";,").split(";") if username}
+        objs.extend(GatewayMaintainer(gateway_id=gateway_id, username=username) for username in sorted(usernames))
+        if len(objs) >= BATCH_SIZE:
+            GatewayMaintainer.objects.bulk_create(objs, ignore_conflicts=True)
+            objs = []
+
+    if objs:
+        GatewayMaintainer.objects.bulk_create(objs, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0059_resourceversion_used_stage_vars"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GatewayMaintainer",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("username", models.CharField(db_index=True, max_length=128)),
+                (
+                    "gateway",
+                    models.ForeignKey(
+                        db_column="api_id",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="core.gateway",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "GatewayMaintainer",
+                "verbose_name_plural": "GatewayMaintainer",
+                "db_table": "core_gateway_maintainer",
+                "unique_together": {("gateway", "username")},
+            },
+        ),
+        migrations.RunPython(backfill_gateway_maintainers, migrations.RunPython.noop),
+    ]
@@ -22,6 +22,7 @@ from copy import deepcopy
 from datetime import datetime
 from typing import ClassVar, Dict, List
 
+from django.conf import settings
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from jsonfield import JSONField
@@ -52,9 +53,11 @@ from apigateway.core.constants import (
     ResourceVersionSchemaEnum,
     StageStatusEnum,
 )
+from apigateway.core.resource_index import ResourceVersionIndex
 from apigateway.core.utils import get_path_display
 from apigateway.schema.models import Schema
 from apigateway.utils.crypto import get_crypto
+from apigateway.utils.payload import dump_json_payload, get_json_digest, load_json_payload
 
 logger = logging.getLogger(__name__)
 
@@ -119,6 +122,24 @@ class Gateway(TimestampedModelMixin, OperatorModelMixin):
         verbose_name_plural = "Gateway"
         db_table = "core_api"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # 记录加载时的维护者，保存时据此判断是否需要同步维护者索引
+        instance._synced_maintainers = instance.__dict__.get("_maintainers")
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "_maintainers" not in update_fields:
+            return
+
+        if self._maintainers != getattr(self, "_synced_maintainers", None):
+            GatewayMaintainer.objects.sync_maintainers(self.pk, self.maintainers)
+            self._synced_maintainers = self._maintainers
+
     @property
     def maintainers(self) -> List[str]:
         if not self._maintainers:
@@ -204,6 +225,24 @@ class Gateway(TimestampedModelMixin, OperatorModelMixin):
         return self.is_public and self.is_active
 
 
+class GatewayMaintainer(models.Model):
+    """网关维护者索引，由 Gateway.save 在维护者变化时同步，用于按用户查询其维护的网关"""
+
+    gateway = models.ForeignKey(Gateway, db_column="api_id", on_delete=models.CASCADE)
+    username = models.CharField(max_length=128, db_index=True)
+
+    objects: ClassVar[managers.GatewayMaintainerManager] = managers.GatewayMaintainerManager()
+
+    def __str__(self):
+        return f"<GatewayMaintainer: {self.gateway_id}/{self.username}>"
+
+    class Meta:
+        verbose_name = "GatewayMaintainer"
+        verbose_name_plural = "GatewayMaintainer"
+        unique_together = ("gateway", "username")
+        db_table = "core_gateway_maintainer"
+
+
 class Stage(TimestampedModelMixin, OperatorModelMixin):
     """
     The running environment of an API
@@ -571,6 +610,7 @@ class ResourceVersion(TimestampedModelMixin, OperatorModelMixin):
     gateway = models.ForeignKey(Gateway, db_column="api_id", on_delete=models.PROTECT)
     version = models.CharField(max_length=128, default="", db_index=True, help_text=_("符合 semver 规范"))
     comment = models.CharField(max_length=512, blank=True, null=True)
+    # 版本数据，可能为压缩格式，应通过 data 属性读写
     _data = models.TextField(db_column="data")
     # 用于不同数据格式解析版本数据兼容历史数据
     schema_version = models.CharField(
@@ -578,6 +618,13 @@ class ResourceVersion(TimestampedModelMixin, OperatorModelMixin):
         choices=ResourceVersionSchemaEnum.get_choices(),
         default=ResourceVersionSchemaEnum.V1.value,
     )
+    # 版本中的资源数量及数据摘要，只需数量或判断数据是否相同时，无需解析版本数据；存量数据为 null，需执行
+    # backfill_resource_version_data 补全
+    resource_count = models.IntegerField(null=True, blank=True)
+    content_hash = models.CharField(max_length=64, default="", blank=True, db_index=True)
+    # 版本中资源引用的环境变量 {"in_path": [...], "in_host": [...]}，创建版本时计算，发布校验时无需解析版本数据；
+    # 存量数据为 null，首次使用时计算并回写
+    used_stage_vars = models.JSONField(null=True, blank=True)
 
     created_time = models.DateTimeField(null=True, blank=True)
 
@@ -585,11 +632,36 @@ class ResourceVersion(TimestampedModelMixin, OperatorModelMixin):
 
     @property
     def data(self) -> list:
-        return json.loads(self._data)
+        """解析后的版本数据，同一实例中只解析一次，_data 变化后重新解析
+
+        NOTE: 多次访问返回同一对象，调用方如需修改，应自行 deepcopy
+        """
+        cached = self.__dict__.get("_parsed_data")
+        if cached is None or cached[0] is not self._data:
+            cached = (self._data, load_json_payload(self._data))
+            self.__dict__["_parsed_data"] = cached
+        return cached[1]
 
     @data.setter
     def data(self, data: list):
-        self._data = json.dumps(data)
+        self._data = dump_json_payload(data, compress=settings.RESOURCE_VERSION_DATA_COMPRESS_ENABLED)
+        self.resource_count = len(data)
+        self.content_hash = get_json_digest(data)
+
+    @property
+    def resource_index(self) -> ResourceVersionIndex:
+        """版本数据中资源的索引，与解析后的版本数据一同缓存，版本数据重新解析后重建"""
+        data = self.data
+        cached = self.__dict__.get("_resource_index")
+        if cached is None or cached[0] is not data:
+            cached = (data, ResourceVersionIndex(data))
+            self.__dict__["_resource_index"] = cached
+        return cached[1]
+
+    def get_resource_count(self) -> int:
+        if self.resource_count is None:
+            return len(self.data)
+        return self.resource_count
 
     @property
     def object_display(self):
@@ -636,6 +708,25 @@ class Release(TimestampedModelMixin, OperatorModelMixin):
         db_table = "core_release"
 
 
+class ReleasedResourceBody(TimestampedModelMixin):
+    """已发布资源的配置数据，按内容摘要去重，多个版本中配置相同的资源共用同一条记录"""
+
+    gateway = models.ForeignKey(Gateway, db_column="api_id", on_delete=models.CASCADE)
+    content_hash = models.CharField(max_length=64)
+    data = JSONField(help_text="resource data in resource version")
+
+    objects: ClassVar[managers.ReleasedResourceBodyManager] = managers.ReleasedResourceBodyManager()
+
+    def __str__(self):
+        return f"<ReleasedResourceBody: {self.pk}>"
+
+    class Meta:
+        verbose_name = "ReleasedResourceBody"
+        verbose_name_plural = "ReleasedResourceBody"
+        unique_together = ("gateway", "content_hash")
+        db_table = "core_released_resource_body"
+
+
 class ReleasedResource(TimestampedModelMixin):
     """当前已发布版本中的资源信息"""
 
@@ -648,10 +739,30 @@ class ReleasedResource(TimestampedModelMixin):
     is_public = models.BooleanField(default=False)
     oauth2_public_client_enabled = models.BooleanField(default=False)
     oauth2_personal_client_enabled = models.BooleanField(default=False)
-    data = JSONField(help_text="resource data in resource version")
+    # 资源配置数据存储在 body 中；存量数据未关联 body 时，数据存储在 _data 中，应通过 data 属性读取
+    _data = JSONField(db_column="data", help_text="resource data in resource version")
+    body = models.ForeignKey(
+        ReleasedResourceBody,
+        null=True,
+        blank=True,
+        db_constraint=False,
+        on_delete=models.DO_NOTHING,
+        related_name="+",
+    )
 
     objects: ClassVar[managers.ReleasedResourceManager] = managers.ReleasedResourceManager()
 
+    @property
+    def data(self) -> dict:
+        if self.body_id:
+            return self.body.data
+        return self._data
+
+    @data.setter
+    def data(self, data: dict):
+        self._data = data
+        self.body = None
+
     def __str__(self):
         return f"<ReleasedResource: {self.pk}>"
 
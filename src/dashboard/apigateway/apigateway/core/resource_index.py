@@ -0,0 +1,58 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""资源版本中资源的索引，按 id、name、method + path 查找资源，避免每次查找都遍历版本中的所有资源"""
+
+from typing import Dict, Iterable, KeysView, Optional, Tuple
+
+
+class ResourceVersionIndex:
+    """资源版本数据的只读索引，索引中的资源与版本数据为同一对象，调用方如需修改，应自行 deepcopy"""
+
+    def __init__(self, resources: Iterable[dict]):
+        self._by_id: Dict[int, dict] = {}
+        self._by_name: Dict[str, dict] = {}
+        self._by_method_path: Dict[Tuple[str, str], dict] = {}
+
+        for resource in resources:
+            # 兼容缺少 id 等字段的历史版本数据
+            if "id" in resource:
+                self._by_id[resource["id"]] = resource
+            if "name" in resource:
+                self._by_name[resource["name"]] = resource
+            if "method" in resource and "path" in resource:
+                self._by_method_path[(resource["method"], resource["path"])] = resource
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    @property
+    def ids(self) -> KeysView[int]:
+        return self._by_id.keys()
+
+    @property
+    def names(self) -> KeysView[str]:
+        return self._by_name.keys()
+
+    def get_by_id(self, resource_id: int) -> Optional[dict]:
+        return self._by_id.get(resource_id)
+
+    def get_by_name(self, name: str) -> Optional[dict]:
+        return self._by_name.get(name)
+
+    def get_by_method_path(self, method: str, path: str) -> Optional[dict]:
+        return self._by_method_path.get((method, path))
@@ -16,6 +16,7 @@
 # to the current version of the project delivered to anyone in the future.
 #
 from .event import PublishEventReporter
+from .notify import notify_release_event, notify_release_event_on_commit, subscribe_release_event
 
 __all__ = [
     # constant
@@ -23,5 +24,8 @@ __all__ = [
     # class
     "PublishEventReporter",
     # functions
+    "notify_release_event",
+    "notify_release_event_on_commit",
+    "subscribe_release_event",
     # others
 ]
@@ -15,11 +15,13 @@
 # We undertake not to change the open source license (MIT license) applicable
 # to the current version of the project delivered to anyone in the future.
 #
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from apigateway.core.constants import PublishEventNameTypeEnum, PublishEventStatusTypeEnum, PublishSourceEnum
 from apigateway.core.models import PublishEvent, ReleaseHistory
 
+from .notify import notify_release_event_on_commit
+
 
 class PublishEventReporter:
     """
@@ -40,7 +42,7 @@ class PublishEventReporter:
         if publish.source == PublishSourceEnum.CLI_SYNC.value:
             return None
 
-        return PublishEvent.objects.create(
+        event = PublishEvent.objects.create(
             gateway=publish.gateway,
             stage=publish.stage,
             step=PublishEventNameTypeEnum.get_event_step(name.value),
@@ -50,6 +52,12 @@ class PublishEventReporter:
             status=status.value,
         )
 
+        # 发布已结束，通知等待发布结束的任务
+        if not event.is_running:
+            notify_release_event_on_commit(publish.id)
+
+        return event
+
     # NOTE: not used
     # @classmethod
     # def report_config_validate_doing(cls, publish: Optional[ReleaseHistory]):
@@ -120,23 +128,29 @@ class PublishEventReporter:
         cls._report_event(publish, name, status, detail)
 
     @classmethod
-    def report_distribute_config_success(cls, publish: Optional[ReleaseHistory]):
+    def report_distribute_config_success(
+        cls, publish: Optional[ReleaseHistory], phase_timings: Optional[Dict[str, float]] = None
+    ):
         """
         dashboard 下发配置成功事件上报
         """
         name = PublishEventNameTypeEnum.DISTRIBUTE_CONFIGURATION
         status = PublishEventStatusTypeEnum.SUCCESS
-        detail = None
+        detail = {"phase_timings": phase_timings} if phase_timings else None
 
         cls._report_event(publish, name, status, detail)
 
     @classmethod
-    def report_distribute_config_failure(cls, publish: Optional[ReleaseHistory], msg: str):
+    def report_distribute_config_failure(
+        cls, publish: Optional[ReleaseHistory], msg: str, phase_timings: Optional[Dict[str, float]] = None
+    ):
         """
         dashboard 下发配置失败事件上报
         """
         name = PublishEventNameTypeEnum.DISTRIBUTE_CONFIGURATION
         status = PublishEventStatusTypeEnum.FAILURE
-        detail = {"err_msg": msg}
+        detail: Dict[str, Any] = {"err_msg": msg}
+        if phase_timings:
+            detail["phase_timings"] = phase_timings
 
         cls._report_event(publish, name, status, detail)
@@ -0,0 +1,69 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""发布事件通知：发布结束时通过 redis pub/sub 通知等待方，避免等待方不断轮询 db"""
+
+import logging
+from functools import partial
+from typing import TYPE_CHECKING, Optional
+
+from django.db import transaction
+
+from apigateway.utils.redis_utils import get_default_redis_client, get_redis_key
+
+if TYPE_CHECKING:
+    from redis.client import PubSub
+
+logger = logging.getLogger(__name__)
+
+
+def get_release_event_channel(release_history_id: int) -> str:
+    return get_redis_key(f"release_event:{release_history_id}")
+
+
+def notify_release_event(release_history_id: int) -> None:
+    """通知发布已结束；通知失败不影响发布，等待方会回退为查询 db"""
+    redis_client = get_default_redis_client()
+    if redis_client is None:
+        return
+
+    try:
+        redis_client.publish(get_release_event_channel(release_history_id), "done")
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("notify release event failed, release_history_id=%s", release_history_id)
+
+
+def notify_release_event_on_commit(release_history_id: int) -> None:
+    """事务提交后再通知，确保等待方收到通知时，可从 db 中读取到最终的发布事件"""
+    transaction.on_commit(partial(notify_release_event, release_history_id))
+
+
+def subscribe_release_event(release_history_id: int) -> Optional[PubSub]:
+    """订阅发布结束通知；redis 不可用时返回 None"""
+    redis_client = get_default_redis_client()
+    if redis_client is None:
+        return None
+
+    pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+    try:
+        pubsub.subscribe(get_release_event_channel(release_history_id))
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("subscribe release event failed, release_history_id=%s", release_history_id)
+        pubsub.close()
+        return None
+
+    return pubsub
@@ -32,8 +32,10 @@ def get_gateway_released_resources(
         eligible = eligible.filter(resource_name__in=resource_names)
 
     # A gateway normally has only one released resource version, so no deduplication is needed.
-    # SELECT id, resource_id, resource_name, is_public, data
-    # FROM core_released_resource
+    # Resource data is stored in the content-addressed body table; rows written before it keep their own data.
+    # SELECT rr.id, rr.resource_id, rr.resource_name, rr.is_public, rr.data, rr.body_id, body.id, body.data
+    # FROM core_released_resource AS rr
+    # LEFT OUTER JOIN core_released_resource_body AS body ON rr.body_id = body.id
     # WHERE api_id = %(gateway_id)s
     #   AND resource_version_id IN (%(resource_version_ids)s)
     #   /* AND resource_name IN (%(resource_names)s) */
@@ -52,13 +54,18 @@ def get_gateway_released_resources(
         for resource_id, snapshot_id in candidates:
             latest_snapshot_ids.setdefault(resource_id, snapshot_id)
 
-        # SELECT id, resource_id, resource_name, is_public, data
-        # FROM core_released_resource
+        # SELECT rr.id, rr.resource_id, rr.resource_name, rr.is_public, rr.data, rr.body_id, body.id, body.data
+        # FROM core_released_resource AS rr
+        # LEFT OUTER JOIN core_released_resource_body AS body ON rr.body_id = body.id
         # WHERE api_id = %(gateway_id)s
         #   AND resource_version_id IN (%(resource_version_ids)s)
         #   /* AND resource_name IN (%(resource_names)s) */
-        #   AND id IN (%(latest_snapshot_ids)s)
+        #   AND rr.id IN (%(latest_snapshot_ids)s)
         # ORDER BY resource_name, resource_id;
         eligible = eligible.filter(id__in=list(latest_snapshot_ids.values()))
 
-    return eligible.only("resource_id", "resource_name", "is_public", "data").order_by("resource_name", "resource_id")
+    return (
+        eligible.select_related("body")
+        .only("resource_id", "resource_name", "is_public", "_data", "body__data")
+        .order_by("resource_name", "resource_id")
+    )
@@ -148,7 +148,7 @@ def get_oauth2_resource_scope_map(
     rows = (
         _get_oauth2_released_resources(oauth_client_type, resource_name)
         .filter(gateway_id__in=gateway_ids)
-        .values("gateway_id", "resource_id", "resource_version_id", "resource_name", "data")
+        .values("gateway_id", "resource_id", "resource_version_id", "resource_name", "_data", "body__data")
         .order_by("gateway_id", "resource_id", "-resource_version_id")
     )
     selected: dict[tuple[int, int], dict[str, Any]] = {}
@@ -157,7 +157,8 @@ def get_oauth2_resource_scope_map(
 
     result: dict[int, list[dict[str, Any]]] = {gateway_id: [] for gateway_id in gateway_ids}
     for row in selected.values():
-        data = row["data"] or {}
+        # 存量数据未关联 body 时，数据存储在 _data 中
+        data = row["body__data"] or row["_data"] or {}
         result[row["gateway_id"]].append(
             {
                 "id": row["resource_id"],
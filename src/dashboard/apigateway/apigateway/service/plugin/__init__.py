@@ -59,7 +59,7 @@ from .convertor import (
 )
 from .header_rewrite import HeaderRewriteConvertor
 from .normalizer import format_fault_injection_config, format_response_rewrite_config
-from .validator import PluginConfigYamlValidator
+from .validator import PluginConfigYamlValidator, PluginSchemaValidatorRegistry, plugin_schema_validator_registry
 
 __all__ = [
     # constant
@@ -92,6 +92,7 @@ __all__ = [
     "PluginConfigYamlValidator",
     "PluginConvertor",
     "PluginConvertorFactory",
+    "PluginSchemaValidatorRegistry",
     "ProxyCacheChecker",
     "ProxyCacheConvertor",
     "RedirectChecker",
@@ -107,4 +108,5 @@ __all__ = [
     "format_response_rewrite_config",
     "is_plugin_compatible_with_resource_kind",
     # others
+    "plugin_schema_validator_registry",
 ]
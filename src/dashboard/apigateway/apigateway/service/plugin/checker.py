@@ -24,12 +24,13 @@
 """
 
 import ast
+import copy
 import ipaddress
 import json
 import re
 from abc import ABC, abstractmethod
 from collections import Counter
-from typing import ClassVar, Dict, List, Optional
+from typing import Any, ClassVar, Dict, List, Optional
 
 import jsonschema
 from django.utils.translation import gettext as _
@@ -46,15 +47,16 @@ VARS_ALLOWED_COMPARISON_SYMBOLS = {"==", "~=", ">", ">=", "<", "<=", "~~", "~*",
 
 
 class BaseChecker(ABC):
-    @abstractmethod
     def check(self, payload: str):
+        self.check_data(yaml_loads(payload))
+
+    @abstractmethod
+    def check_data(self, loaded_data: Any):
         pass
 
 
 class BkCorsChecker(BaseChecker):
-    def check(self, payload: str):
-        loaded_data = yaml_loads(payload)
-
+    def check_data(self, loaded_data: Any):
         self._check_allow_origins(loaded_data.get("allow_origins"))
         self._check_allow_origins_by_regex(loaded_data.get("allow_origins_by_regex"))
         self._check_allow_methods(loaded_data["allow_methods"])
@@ -104,9 +106,7 @@ class BkCorsChecker(BaseChecker):
 
 
 class HeaderRewriteChecker(BaseChecker):
-    def check(self, payload: str):
-        loaded_data = yaml_loads(payload)
-
+    def check_data(self, loaded_data: Any):
         set_keys = [item["key"].lower() for item in loaded_data["set"]]
         set_duplicate_keys = [key for key, count in Counter(set_keys).items() if count >= 2]
         if set_duplicate_keys:
@@ -119,8 +119,7 @@ class HeaderRewriteChecker(BaseChecker):
 
 
 class QueryStringRewriteChecker(BaseChecker):
-    def check(self, payload: str):
-        loaded_data = yaml_loads(payload)
+    def check_data(self, loaded_data: Any):
         if not loaded_data:
             raise ValueError("YAML cannot be empty")
 
@@ -154,14 +153,12 @@ class BkIPRestrictionChecker(BaseChecker):
             except Exception as e:  # pylint: disable=broad-except
                 raise ValueError("line {}: {}".format(index + 1, e))
 
-    def check(self, payload: str):
+    def check_data(self, loaded_data: Any):
         """check the yaml payload is valid
         - yaml can not be empty
         - whitelist and blacklist can not be empty at the same time
         - each line of whitelist/blacklist is a valid ipv4/ipv6 or ipv4 cidr/ipv6 cidr(ignore empty line and comment)
         """
-
-        loaded_data = yaml_loads(payload)
         if not loaded_data:
             raise ValueError("yaml can not be empty")
 
@@ -191,8 +188,7 @@ class RequestValidationChecker(BaseChecker):
 
         # FIXME: check the valid json schema
 
-    def check(self, payload: str):
-        loaded_data = yaml_loads(payload)
+    def check_data(self, loaded_data: Any):
         if not loaded_data:
             raise ValueError("yaml can not be empty")
 
@@ -210,8 +206,7 @@ class RequestValidationChecker(BaseChecker):
 
 
 class UriBlockerChecker(BaseChecker):
-    def check(self, payload: str):
-        loaded_data = yaml_loads(payload)
+    def check_data(self, loaded_data: Any):
         if not loaded_data:
             raise ValueError("YAML cannot be empty")
 
@@ -241,8 +236,7 @@ class UriBlockerChecker(BaseChecker):
 
 
 class FaultInjectionChecker(BaseChecker):
-    def check(self, payload: str):
-        loaded_data = yaml_loads(payload)
+    def check_data(self, loaded_data: Any):
         if not loaded_data:
             raise ValueError("YAML cannot be empty")
 
@@ -283,8 +277,7 @@ class FaultInjectionChecker(BaseChecker):
 
 
 class ResponseRewriteChecker(BaseChecker):
-    def check(self, payload: str):
-        loaded_data = yaml_loads(payload)
+    def check_data(self, loaded_data: Any):
         if not loaded_data:
             raise ValueError("YAML cannot be empty")
 
@@ -315,8 +308,7 @@ class ResponseRewriteChecker(BaseChecker):
 
 
 class RedirectChecker(BaseChecker):
-    def check(self, payload: str):
-        loaded_data = yaml_loads(payload)
+    def check_data(self, loaded_data: Any):
         if not loaded_data:
             raise ValueError("YAML cannot be empty")
 
@@ -326,8 +318,7 @@ class RedirectChecker(BaseChecker):
 
 
 class BkAccessTokenSourceChecker(BaseChecker):
-    def check(self, payload: str):
-        loaded_data = yaml_loads(payload)
+    def check_data(self, loaded_data: Any):
         if not loaded_data:
             raise ValueError("YAML cannot be empty")
 
@@ -339,8 +330,7 @@ class BkAccessTokenSourceChecker(BaseChecker):
 class BKRequestBodyLimitChecker(BaseChecker):
     MAX_BODY_SIZE = 32 * 1024 * 1024  # 32MB
 
-    def check(self, payload: str):
-        loaded_data = yaml_loads(payload)
+    def check_data(self, loaded_data: Any):
         if not loaded_data:
             raise ValueError("YAML cannot be empty")
 
@@ -356,8 +346,7 @@ class BKUserRestrictionChecker(BaseChecker):
         if user_duplicate_keys:
             raise ValueError(_("{} has duplicate elements：{}").format(name, ", ".join(user_duplicate_keys)))
 
-    def check(self, payload: str):
-        loaded_data = yaml_loads(payload)
+    def check_data(self, loaded_data: Any):
         if not loaded_data:
             raise ValueError("YAML cannot be empty")
 
@@ -374,8 +363,7 @@ class BKUserRestrictionChecker(BaseChecker):
 
 
 class ProxyCacheChecker(BaseChecker):
-    def check(self, payload: str):
-        loaded_data = yaml_loads(payload)
+    def check_data(self, loaded_data: Any):
         if not loaded_data:
             raise ValueError("YAML cannot be empty")
 
@@ -395,8 +383,7 @@ class ProxyCacheChecker(BaseChecker):
 
 
 class AIRateLimitingChecker(BaseChecker):
-    def check(self, payload: str):
-        loaded_data = yaml_loads(payload)
+    def check_data(self, loaded_data: Any):
         if not loaded_data:
             raise ValueError("YAML cannot be empty")
 
@@ -451,8 +438,7 @@ def check_vars(vars, location):
 
 
 class BkTrafficLabelChecker(BaseChecker):
-    def check(self, payload: str):
-        loaded_data = yaml_loads(payload)
+    def check_data(self, loaded_data: Any):
         if not loaded_data:
             raise ValueError("YAML cannot be empty")
 
@@ -512,3 +498,9 @@ class PluginConfigYamlChecker:
         checker = self.type_code_to_checker.get(self.type_code)
         if checker:
             checker.check(payload)
+
+    def check_data(self, loaded_data: Any):
+        """校验已解析的插件配置；checker 会规整数据，因此使用副本校验，不影响调用方的数据"""
+        checker = self.type_code_to_checker.get(self.type_code)
+        if checker:
+            checker.check_data(copy.deepcopy(loaded_data))
@@ -15,16 +15,60 @@
 # We undertake not to change the open source license (MIT license) applicable
 # to the current version of the project delivered to anyone in the future.
 #
-from typing import Dict, Optional
+import threading
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 
-from jsonschema import ValidationError as JsonSchemaValidationError
-from jsonschema import validate
+from cachetools import LRUCache
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
 
+from apigateway.utils.payload import get_json_digest
 from apigateway.utils.yaml import yaml_loads
 
 from .checker import PluginConfigYamlChecker
 from .convertor import PluginConvertorFactory
 
+if TYPE_CHECKING:
+    from jsonschema.protocols import Validator
+
+PLUGIN_SCHEMA_VALIDATOR_CACHE_SIZE = 256
+
+
+class PluginSchemaValidatorRegistry:
+    """
+    插件 schema 校验器注册表
+
+    jsonschema.validate 每次调用都会校验 schema 本身并创建新的校验器，批量校验插件配置时耗时较多；
+    这里按 (插件类型, schema 摘要) 缓存编译后的校验器，插件类型的 schema 变化后摘要随之变化，不会使用过期的校验器
+    """
+
+    def __init__(self, maxsize: int = PLUGIN_SCHEMA_VALIDATOR_CACHE_SIZE):
+        self._validators: LRUCache = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def get_validator(self, plugin_type_code: str, schema: Dict) -> "Validator":
+        key: Tuple[str, str] = (plugin_type_code, get_json_digest(schema))
+        with self._lock:
+            validator = self._validators.get(key)
+        if validator is not None:
+            return validator
+
+        # 与 jsonschema.validate 一致：按 $schema 选择校验器，并先校验 schema 本身
+        cls = validator_for(schema)
+        cls.check_schema(schema)
+        validator = cls(schema)
+
+        with self._lock:
+            self._validators[key] = validator
+        return validator
+
+    def clear(self):
+        with self._lock:
+            self._validators.clear()
+
+
+plugin_schema_validator_registry = PluginSchemaValidatorRegistry()
+
 
 class PluginConfigYamlValidator:
     """
@@ -41,12 +85,17 @@ class PluginConfigYamlValidator:
         """
         # 校验 apisix 额外规则，这个报错的可读性更好，有一些 json schema 中的报错信息不够直观可以重复在这里处理
         checker = PluginConfigYamlChecker(plugin_type_code)
-        checker.check(payload)
+        if not schema:
+            checker.check(payload)
+            return
+
+        # yaml 解析耗时较多，只解析一次，供 checker 与 schema 校验共用
+        loaded_data = yaml_loads(payload)
+        checker.check_data(loaded_data)
 
         # 校验 schema 规则
-        if schema:
-            convertor = PluginConvertorFactory.get_convertor(plugin_type_code)
-            try:
-                validate(convertor.convert(yaml_loads(payload)), schema=schema)
-            except JsonSchemaValidationError as err:
-                raise ValueError(f"{err.message}, path {list(err.absolute_path)}")
+        convertor = PluginConvertorFactory.get_convertor(plugin_type_code)
+        validator = plugin_schema_validator_registry.get_validator(plugin_type_code, schema)
+        error = best_match(validator.iter_errors(convertor.convert(loaded_data)))
+        if error is not None:
+            raise ValueError(f"{error.message}, path {list(error.absolute_path)}")
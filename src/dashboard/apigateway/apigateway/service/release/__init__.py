@@ -16,7 +16,7 @@
 # to the current version of the project delivered to anyone in the future.
 #
 from .validation import PublishValidator, ReleaseValidationError, StageVarsValuesValidator
-from .wait import DEFAULT_WAIT_RELEASE_TIMEOUT, wait_release_done
+from .wait import DEFAULT_WAIT_RELEASE_TIMEOUT, get_release_status, wait_release_done, wait_release_status
 
 __all__ = [
     # constant
@@ -27,6 +27,8 @@ __all__ = [
     "ReleaseValidationError",
     "StageVarsValuesValidator",
     # functions
+    "get_release_status",
     "wait_release_done",
+    "wait_release_status",
     # others
 ]
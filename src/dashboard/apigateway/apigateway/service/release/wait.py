@@ -19,18 +19,72 @@
 
 import logging
 import time
-from datetime import datetime
+from typing import TYPE_CHECKING, Optional
 
 from apigateway.core.constants import ReleaseHistoryStatusEnum
 from apigateway.core.models import PublishEvent
+from apigateway.service.event import subscribe_release_event
+
+if TYPE_CHECKING:
+    from redis.client import PubSub
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_WAIT_RELEASE_TIMEOUT = 150
 
+# 等待通知的最长间隔（秒）；网关最终的加载配置事件由 core-api 写入，不会发出通知，需定期查询 db 兜底
+RELEASE_STATUS_RECHECK_INTERVAL = 2
+
+
+def get_release_status(release_history_id: int) -> str:
+    """查询发布历史当前的状态，尚无发布事件时视为 DOING"""
+    event_map = PublishEvent.objects.get_release_history_id_to_latest_publish_event_map([release_history_id])
+    latest_event = event_map.get(release_history_id)
+    if not latest_event:
+        return ReleaseHistoryStatusEnum.DOING.value
+
+    return latest_event.get_release_history_status()
+
+
+def wait_release_status(release_history_id: int, timeout: float) -> str:
+    """等待发布离开 DOING 状态，超时返回 DOING。
+
+    等待发布结束通知，收到通知或等待超过 RELEASE_STATUS_RECHECK_INTERVAL 后查询 db 中的发布状态；
+    redis 不可用时，退化为按 RELEASE_STATUS_RECHECK_INTERVAL 间隔轮询 db。
+    """
+    deadline = time.monotonic() + timeout
+    # 先订阅再查询状态，避免遗漏查询后、订阅前发出的通知
+    pubsub = subscribe_release_event(release_history_id)
+    try:
+        while True:
+            status = get_release_status(release_history_id)
+            if status != ReleaseHistoryStatusEnum.DOING.value:
+                return status
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return status
+
+            _wait_notification(pubsub, min(remaining, RELEASE_STATUS_RECHECK_INTERVAL))
+    finally:
+        if pubsub is not None:
+            pubsub.close()
+
+
+def _wait_notification(pubsub: Optional[PubSub], timeout: float) -> None:
+    if pubsub is None:
+        time.sleep(timeout)
+        return
+
+    try:
+        pubsub.get_message(timeout=timeout)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("wait release event notification failed")
+        time.sleep(timeout)
+
 
 def wait_release_done(release_history_id: int, timeout: int = DEFAULT_WAIT_RELEASE_TIMEOUT) -> str:
-    """轮询等待指定发布任务结束，用于滚动同步、下架等任务开始前等待上一轮发布收敛。
+    """等待指定发布任务结束，用于滚动同步、下架等任务开始前等待上一轮发布收敛。
 
     调用方只需要知道发布是否已经离开 DOING 状态，不需要读取完整发布事件详情时使用。
 
@@ -41,26 +95,13 @@ def wait_release_done(release_history_id: int, timeout: int = DEFAULT_WAIT_RELEA
     Returns:
         str: 发布历史的最终状态值；超时或无最终成功事件时返回 FAILURE。
     """
-    start_time = datetime.now().timestamp()
-    wait_times = 0
-    while True:
-        now = datetime.now().timestamp()
-        if now - start_time > timeout:
-            logger.warning(
-                "wait_release_done timeout after %ds, release_history_id=%d",
-                timeout,
-                release_history_id,
-            )
-            return ReleaseHistoryStatusEnum.FAILURE.value
-
-        time.sleep(1 * wait_times)
-        wait_times += 1
-
-        event_map = PublishEvent.objects.get_release_history_id_to_latest_publish_event_map([release_history_id])
-        latest_event = event_map.get(release_history_id)
-        if not latest_event:
-            continue
-
-        status = latest_event.get_release_history_status()
-        if status != ReleaseHistoryStatusEnum.DOING.value:
-            return status
+    status = wait_release_status(release_history_id, timeout)
+    if status == ReleaseHistoryStatusEnum.DOING.value:
+        logger.warning(
+            "wait_release_done timeout after %ds, release_history_id=%d",
+            timeout,
+            release_history_id,
+        )
+        return ReleaseHistoryStatusEnum.FAILURE.value
+
+    return status
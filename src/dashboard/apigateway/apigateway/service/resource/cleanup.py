@@ -97,4 +97,4 @@ def delete_gateway_resource_versions(gateway_id: int):
     OpenAPIFileResourceSchemaVersion.objects.filter(gateway_id=gateway_id).delete()
 
     # delete resource version
-    ResourceVersion.objects.filter(gateway_id=gateway_id).delete()
+    ResourceVersion.objects.delete_with_resources_cache(ResourceVersion.objects.filter(gateway_id=gateway_id))
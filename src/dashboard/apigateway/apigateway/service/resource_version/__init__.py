@@ -15,9 +15,18 @@
 # We undertake not to change the open source license (MIT license) applicable
 # to the current version of the project delivered to anyone in the future.
 #
-from .openapi_export import BaseExporter, OpenAPIExportManager, has_openapi_schema
+from .openapi_export import (
+    BaseExporter,
+    OpenAPIExportManager,
+    has_openapi_schema,
+    iter_decompressed_content,
+    resource_version_openapi_export_cache,
+)
 from .schema import (
+    calculate_used_stage_vars,
+    create_resource_schema_version_items,
     get_resource_id_to_schema_by_resource_version,
+    get_resource_name_to_id,
     get_resource_names_set,
     get_resource_schema,
     get_standard_resource_names_set,
@@ -31,8 +40,13 @@ __all__ = [
     # class
     "BaseExporter",
     "OpenAPIExportManager",
+    "iter_decompressed_content",
+    "resource_version_openapi_export_cache",
     # functions
+    "calculate_used_stage_vars",
+    "create_resource_schema_version_items",
     "get_resource_id_to_schema_by_resource_version",
+    "get_resource_name_to_id",
     "get_resource_names_set",
     "get_resource_schema",
     "get_standard_resource_names_set",
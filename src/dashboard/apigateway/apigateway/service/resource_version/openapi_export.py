@@ -18,14 +18,19 @@
 """OpenAPI export helpers for resource-version data."""
 
 import json
-from typing import TYPE_CHECKING, Any, Dict, List
+import logging
+import zlib
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
 
+from django.conf import settings
 from openapi_spec_validator.versions import OPENAPIV31
 
 from apigateway.apps.support.constants import OpenAPIFormatEnum
 from apigateway.core.constants import HTTP_METHOD_ANY, ProxyTypeEnum, ResourceKindEnum
 from apigateway.service.backend import get_backend_id_to_instance
 from apigateway.service.resource import get_gateway_resource_id_to_labels
+from apigateway.utils.payload import get_json_digest
+from apigateway.utils.redis_utils import get_default_redis_client, get_redis_key
 from apigateway.utils.yaml import yaml_dumps, yaml_export_dumps
 
 from .schema import get_resource_id_to_schema_by_resource_version
@@ -36,6 +41,11 @@ if TYPE_CHECKING:
 OPENAPI_METHOD_ANY_EXTENSION = "x-bk-apigateway-method-any"
 OPENAPI_RESOURCE_EXTENSION = "x-bk-apigateway-resource"
 
+# 流式下载时，每次输出的解压后内容大小
+OPENAPI_EXPORT_STREAM_CHUNK_SIZE = 64 * 1024
+
+logger = logging.getLogger(__name__)
+
 
 def has_openapi_schema(openapi_schema: Dict[str, Any]) -> bool:
     if "none_schema" in openapi_schema and openapi_schema["none_schema"] is True:
@@ -282,6 +292,82 @@ class BaseExporter:
         return config
 
 
+class ResourceVersionOpenAPIExportCache:
+    """
+    资源版本 openapi 导出内容的缓存
+
+    - 内容经 zlib 压缩后存储在 redis 中，各进程共享；每个资源版本对应一个 hash，field 为导出参数的摘要
+    - 资源版本数据不可变，但导出内容还包含网关当前的资源标签、后端名称，这部分数据的变化体现在 field 中
+    """
+
+    def __init__(self, ttl: int, max_entry_bytes: int):
+        self.ttl = ttl
+        self.max_entry_bytes = max_entry_bytes
+
+    def get(self, resource_version_id: int, field: str) -> Optional[bytes]:
+        redis_client = get_default_redis_client()
+        if redis_client is None:
+            return None
+
+        try:
+            return redis_client.hget(self._get_redis_key(resource_version_id), field)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("get openapi export cache failed, resource_version_id=%s", resource_version_id)
+            return None
+
+    def set(self, resource_version_id: int, field: str, payload: bytes):
+        if len(payload) > self.max_entry_bytes:
+            return
+
+        redis_client = get_default_redis_client()
+        if redis_client is None:
+            return
+
+        key = self._get_redis_key(resource_version_id)
+        try:
+            redis_client.hset(key, field, payload)
+            redis_client.expire(key, self.ttl)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("set openapi export cache failed, resource_version_id=%s", resource_version_id)
+
+    def invalidate(self, resource_version_ids: List[int]):
+        if not resource_version_ids:
+            return
+
+        redis_client = get_default_redis_client()
+        if redis_client is None:
+            return
+
+        try:
+            redis_client.delete(*[self._get_redis_key(id_) for id_ in resource_version_ids])
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("delete openapi export cache failed, resource_version_ids=%s", resource_version_ids)
+
+    def _get_redis_key(self, resource_version_id: int) -> str:
+        return get_redis_key(f"resource_version_openapi_export:{resource_version_id}")
+
+
+resource_version_openapi_export_cache = ResourceVersionOpenAPIExportCache(
+    ttl=settings.RESOURCE_VERSION_OPENAPI_EXPORT_CACHE_TTL,
+    max_entry_bytes=settings.RESOURCE_VERSION_OPENAPI_EXPORT_CACHE_MAX_ENTRY_BYTES,
+)
+
+
+def iter_decompressed_content(payload: bytes, chunk_size: int = OPENAPI_EXPORT_STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """分块解压 zlib 压缩的内容，用于流式响应，避免在内存中还原完整的导出内容"""
+    decompressor = zlib.decompressobj()
+    data = payload
+    while data:
+        chunk = decompressor.decompress(data, chunk_size)
+        if chunk:
+            yield chunk
+        data = decompressor.unconsumed_tail
+
+    tail = decompressor.flush()
+    if tail:
+        yield tail
+
+
 class OpenAPIExportManager:
     """
     资源配置导出manager
@@ -308,6 +394,65 @@ class OpenAPIExportManager:
         """
         backend_id_to_config = get_backend_id_to_instance(resource_version.gateway.id)
         resource_labels = get_gateway_resource_id_to_labels(resource_version.gateway.id)
+        return self._export_resource_version_openapi(
+            resource_version, file_type, backend_id_to_config, resource_labels
+        )
+
+    def iter_resource_version_openapi(self, resource_version: ResourceVersion, file_type: str = "") -> Iterator[bytes]:
+        """
+        根据资源版本数据导出openapi，返回分块的导出内容；命中缓存时无需重新生成
+        """
+        backend_id_to_config = get_backend_id_to_instance(resource_version.gateway.id)
+        resource_labels = get_gateway_resource_id_to_labels(resource_version.gateway.id)
+        field = self._get_export_cache_field(file_type, backend_id_to_config, resource_labels)
+
+        payload = resource_version_openapi_export_cache.get(resource_version.id, field)
+        if payload is None:
+            content = self._export_resource_version_openapi(
+                resource_version, file_type, backend_id_to_config, resource_labels
+            )
+            payload = zlib.compress(content.encode("utf-8"))
+            resource_version_openapi_export_cache.set(resource_version.id, field, payload)
+
+        return iter_decompressed_content(payload)
+
+    def warm_up_resource_version_openapi(self, resource_version: ResourceVersion, content: str, file_type: str = ""):
+        """
+        将已生成的资源版本 openapi 写入缓存
+        """
+        backend_id_to_config = get_backend_id_to_instance(resource_version.gateway.id)
+        resource_labels = get_gateway_resource_id_to_labels(resource_version.gateway.id)
+        field = self._get_export_cache_field(file_type, backend_id_to_config, resource_labels)
+        resource_version_openapi_export_cache.set(resource_version.id, field, zlib.compress(content.encode("utf-8")))
+
+    def _get_export_cache_field(
+        self, file_type: str, backend_id_to_config: Dict[int, Any], resource_labels: Dict[int, List[Dict]]
+    ) -> str:
+        # 非 json 的格式均导出为 yaml
+        if file_type != OpenAPIFormatEnum.JSON.value:
+            file_type = OpenAPIFormatEnum.YAML.value
+
+        return get_json_digest(
+            {
+                "file_type": file_type,
+                "api_version": self.api_version,
+                "include_bk_apigateway_resource": self.include_bk_apigateway_resource,
+                "title": self.title,
+                "description": self.description,
+                "backend_names": {backend_id: backend.name for backend_id, backend in backend_id_to_config.items()},
+                "labels": {
+                    resource_id: [label["name"] for label in labels] for resource_id, labels in resource_labels.items()
+                },
+            }
+        )
+
+    def _export_resource_version_openapi(
+        self,
+        resource_version: ResourceVersion,
+        file_type: str,
+        backend_id_to_config: Dict[int, Any],
+        resource_labels: Dict[int, List[Dict]],
+    ) -> str:
         resource_id_to_schema = get_resource_id_to_schema_by_resource_version(resource_version.id)
 
         resource_data_list = []
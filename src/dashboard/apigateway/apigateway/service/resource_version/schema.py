@@ -18,23 +18,31 @@
 
 """Resource-version schema lookup and schema-version creation helpers."""
 
-from typing import Set
+from typing import Dict, List, Set
 
 from cachetools import TTLCache, cached
+from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 
-from apigateway.apps.openapi.models import OpenAPIResourceSchema, OpenAPIResourceSchemaVersion
+from apigateway.apps.openapi.models import (
+    OpenAPIResourceSchema,
+    OpenAPIResourceSchemaVersion,
+    OpenAPIResourceSchemaVersionItem,
+)
 from apigateway.common.constants import CACHE_TIME_5_MINUTES
 from apigateway.common.error_codes import error_codes
 from apigateway.core.constants import ProxyTypeEnum, ResourceKindEnum
 from apigateway.core.models import ResourceVersion
 from apigateway.service.resource import get_resource_use_stage_vars
 
+RESOURCE_SCHEMA_VERSION_ITEM_BATCH_SIZE = 500
+
 
 def get_resource_schema(resource_version_id: int, resource_id: int) -> dict:
     """获取资源版本中单个资源的 OpenAPI schema，用于资源详情、文档生成等场景。
 
-    调用方同时持有 resource_version_id 和 resource_id，只需要一个资源的 schema 时使用。
+    调用方同时持有 resource_version_id 和 resource_id，只需要一个资源的 schema 时使用；
+    优先按资源读取拆分后的 schema，只有未拆分的存量版本才需解析整个版本的 schema。
 
     Args:
         resource_version_id (int): 资源版本 ID。
@@ -43,12 +51,26 @@ def get_resource_schema(resource_version_id: int, resource_id: int) -> dict:
     Returns:
         dict: 命中的 OpenAPI schema；版本 schema 不存在或资源未命中时返回空字典。
     """
-    resources_version_schema = OpenAPIResourceSchemaVersion.objects.filter(
-        resource_version_id=resource_version_id
-    ).first()
-    if resources_version_schema is None:
+    item = (
+        OpenAPIResourceSchemaVersionItem.objects.filter(
+            resource_version_id=resource_version_id, resource_id=resource_id
+        )
+        .values("schema")
+        .first()
+    )
+    if item is not None:
+        return item["schema"]
+
+    has_resource_items = (
+        OpenAPIResourceSchemaVersion.objects.filter(resource_version_id=resource_version_id)
+        .values_list("has_resource_items", flat=True)
+        .first()
+    )
+    # 版本 schema 不存在，或已拆分但资源无 schema
+    if has_resource_items is None or has_resource_items:
         return {}
 
+    resources_version_schema = OpenAPIResourceSchemaVersion.objects.get(resource_version_id=resource_version_id)
     # 筛选资源数据
     for schema_info in resources_version_schema.schema:
         if resource_id == schema_info["resource_id"]:
@@ -98,7 +120,27 @@ def get_resource_names_set(
             raise error_codes.NOT_FOUND.format(_("资源版本不存在"))
         return set()
 
-    return {resource["name"] for resource in resource_version.data}
+    return set(resource_version.resource_index.names)
+
+
+@cached(cache=TTLCache(maxsize=300, ttl=CACHE_TIME_5_MINUTES))
+def get_resource_name_to_id(resource_version_id: int) -> Dict[str, int]:
+    """获取资源版本中资源名称到资源 ID 的映射，用于按名称查找资源 ID。
+
+    版本数据不会变化，映射按版本缓存，同一版本的多次查找无需重复解析版本数据。
+
+    Args:
+        resource_version_id (int): 资源版本 ID。
+
+    Returns:
+        Dict[str, int]: 资源名称到资源 ID 的映射；资源版本不存在时返回空字典。
+    """
+    resource_version = ResourceVersion.objects.filter(id=resource_version_id).first()
+    if not resource_version:
+        return {}
+
+    resource_index = resource_version.resource_index
+    return {name: resource_index.get_by_name(name)["id"] for name in resource_index.names}
 
 
 @cached(cache=TTLCache(maxsize=300, ttl=CACHE_TIME_5_MINUTES))
@@ -131,7 +173,8 @@ def get_standard_resource_names_set(resource_version_id: int, raise_exception: b
 def get_used_stage_vars(gateway_id: int, resource_version_id: int):
     """获取资源版本中被资源引用的环境变量，用于发布校验时检查环境变量引用。
 
-    校验指定网关、指定资源版本能否发布到某个环境时使用。
+    校验指定网关、指定资源版本能否发布到某个环境时使用；优先读取创建版本时记录的结果，
+    存量版本未记录时解析版本数据计算，并回写到版本中。
 
     Args:
         gateway_id (int): 网关 ID。
@@ -140,13 +183,35 @@ def get_used_stage_vars(gateway_id: int, resource_version_id: int):
     Returns:
         dict | None: 存在资源版本时返回包含 in_path 和 in_host 的字典；资源版本不存在时返回 None。
     """
+    used_stage_vars = (
+        ResourceVersion.objects.filter(gateway_id=gateway_id, id=resource_version_id)
+        .values_list("used_stage_vars", flat=True)
+        .first()
+    )
+    if used_stage_vars is not None:
+        return used_stage_vars
+
     resource_version = ResourceVersion.objects.filter(gateway_id=gateway_id, id=resource_version_id).first()
     if not resource_version:
         return None
 
+    used_stage_vars = calculate_used_stage_vars(resource_version.data)
+    ResourceVersion.objects.filter(id=resource_version_id).update(used_stage_vars=used_stage_vars)
+    return used_stage_vars
+
+
+def calculate_used_stage_vars(resources: List[dict]) -> Dict[str, List[str]]:
+    """计算资源版本数据中被资源引用的环境变量，创建资源版本时调用，结果记录在 ResourceVersion.used_stage_vars 中。
+
+    Args:
+        resources (List[dict]): 资源版本数据。
+
+    Returns:
+        Dict[str, List[str]]: 包含 in_path 和 in_host 的字典，变量名按字母序排列。
+    """
     used_in_path = set()
     used_in_host = set()
-    for resource in resource_version.data:
+    for resource in resources:
         if resource.get("kind", ResourceKindEnum.STANDARD.value) == ResourceKindEnum.AI.value:
             continue
         if resource["proxy"]["type"] != ProxyTypeEnum.HTTP.value:
@@ -155,15 +220,16 @@ def get_used_stage_vars(gateway_id: int, resource_version_id: int):
         used_in_path.update(stage_vars["in_path"])
         used_in_host.update(stage_vars["in_host"])
     return {
-        "in_path": list(used_in_path),
-        "in_host": list(used_in_host),
+        "in_path": sorted(used_in_path),
+        "in_host": sorted(used_in_host),
     }
 
 
 def make_resource_schema_version(resource_version: ResourceVersion):
     """为资源版本创建 OpenAPI schema 快照，用于固化资源级 schema 的版本数据。
 
-    创建 ResourceVersion 后立即调用；只有资源存在 schema 时才会创建版本 schema 记录。
+    创建 ResourceVersion 后立即调用；只有资源存在 schema 时才会创建版本 schema 记录，
+    同时按资源拆分写入 OpenAPIResourceSchemaVersionItem。
 
     Args:
         resource_version (ResourceVersion): 已保存的资源版本实例，data 中应包含资源 ID。
@@ -178,13 +244,42 @@ def make_resource_schema_version(resource_version: ResourceVersion):
 
     schema_list = [
         {
-            "resource_id": resource_schema.resource.id,
+            "resource_id": resource_schema.resource_id,
             "schema": resource_schema.schema,
         }
         for resource_schema in resource_schemas
     ]
     if len(schema_list) > 0:
-        OpenAPIResourceSchemaVersion.objects.create(
+        schema_version = OpenAPIResourceSchemaVersion.objects.create(
             resource_version=resource_version,
             schema=schema_list,
         )
+        create_resource_schema_version_items(schema_version)
+
+
+def create_resource_schema_version_items(schema_version: OpenAPIResourceSchemaVersion):
+    """将版本 schema 按资源拆分写入 OpenAPIResourceSchemaVersionItem，用于创建版本 schema 及补全存量数据。
+
+    Args:
+        schema_version (OpenAPIResourceSchemaVersion): 版本 schema。
+
+    Returns:
+        None: 写入拆分后的 schema，并标记版本 schema 已拆分。
+    """
+    with transaction.atomic():
+        OpenAPIResourceSchemaVersionItem.objects.filter(
+            resource_version_id=schema_version.resource_version_id
+        ).delete()
+        OpenAPIResourceSchemaVersionItem.objects.bulk_create(
+            [
+                OpenAPIResourceSchemaVersionItem(
+                    resource_version_id=schema_version.resource_version_id,
+                    resource_id=schema_info["resource_id"],
+                    schema=schema_info["schema"],
+                )
+                for schema_info in schema_version.schema or []
+            ],
+            batch_size=RESOURCE_SCHEMA_VERSION_ITEM_BATCH_SIZE,
+        )
+        schema_version.has_resource_items = True
+        schema_version.save(update_fields=["has_resource_items"])
@@ -41,7 +41,7 @@ def _make_snapshot(
         is_public=is_public,
         oauth2_public_client_enabled=oauth2_public_client_enabled,
         oauth2_personal_client_enabled=oauth2_personal_client_enabled,
-        data={
+        _data={
             "id": resource_id,
             "name": name,
             "description": f"{name} description",
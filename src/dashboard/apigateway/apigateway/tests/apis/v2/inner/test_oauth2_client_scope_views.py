@@ -51,7 +51,7 @@ def _make_resource(gateway, *, resource_id, name, public_enabled=True):
         resource_path=f"/{name}",
         is_public=True,
         oauth2_public_client_enabled=public_enabled,
-        data={
+        _data={
             "id": resource_id,
             "name": name,
             "description": f"{name} 中文描述",
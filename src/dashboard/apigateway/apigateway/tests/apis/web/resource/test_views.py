@@ -479,7 +479,7 @@ class TestResourceRetrieveUpdateDestroyApi:
             resource_name=fake_resource.name,
             resource_method=fake_resource.method,
             resource_path=fake_resource.path,
-            data={},
+            _data={},
         )
         prod_stage = G(Stage, gateway=fake_gateway, name="prod", status=StageStatusEnum.ACTIVE.value)
         G(Release, gateway=fake_gateway, stage=prod_stage, resource_version=resource_version)
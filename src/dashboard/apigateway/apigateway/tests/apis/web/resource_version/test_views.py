@@ -597,6 +597,31 @@ class TestResourceVersionDiffApi:
             }
         }
 
+    def test_resource_version_diff_cached(
+        self,
+        mocker,
+        request_view,
+        fake_gateway,
+        fake_resource_version_v2,
+    ):
+        mock_diff = mocker.patch(
+            "apigateway.apis.web.resource_version.views.ResourceDifferHandler.diff_resource_version_data",
+            return_value={"add": [], "delete": [], "update": []},
+        )
+
+        for _ in range(2):
+            resp = request_view(
+                method="GET",
+                view_name="gateway.resource_version.diff",
+                gateway=fake_gateway,
+                path_params={"gateway_id": fake_gateway.id},
+                data={"source_resource_version_id": "", "target_resource_version_id": fake_resource_version_v2.id},
+            )
+            assert resp.status_code == 200
+
+        # 对比指定的版本时，对比结果被缓存
+        mock_diff.assert_called_once()
+
 
 class TestResourceVersionGetApi:
     def test_resource_version_get(self, request_view):
@@ -750,7 +775,7 @@ class TestResourceVersionExportApi:
         rv = G(ResourceVersion, gateway=fake_gateway, version="1.0.0", _data=json.dumps([]))
 
         mock_export = mocker.patch(
-            "apigateway.apis.web.resource_version.views.OpenAPIExportManager.export_resource_version_openapi",
+            "apigateway.apis.web.resource_version.views.OpenAPIExportManager._export_resource_version_openapi",
             return_value="openapi: '2.0'",
         )
 
@@ -764,6 +789,7 @@ class TestResourceVersionExportApi:
         assert resp.status_code == 200
         assert "bk_apigw_resources_" in resp["Content-Disposition"]
         assert ".yaml" in resp["Content-Disposition"]
+        assert b"".join(resp.streaming_content) == b"openapi: '2.0'"
         mock_export.assert_called_once()
 
     def test_export_resource_json(self, request_view, fake_gateway, mocker):
@@ -771,7 +797,7 @@ class TestResourceVersionExportApi:
         rv = G(ResourceVersion, gateway=fake_gateway, version="1.0.0", _data=json.dumps([]))
 
         mocker.patch(
-            "apigateway.apis.web.resource_version.views.OpenAPIExportManager.export_resource_version_openapi",
+            "apigateway.apis.web.resource_version.views.OpenAPIExportManager._export_resource_version_openapi",
             return_value='{"openapi": "2.0"}',
         )
 
@@ -790,7 +816,7 @@ class TestResourceVersionExportApi:
         rv = G(ResourceVersion, gateway=fake_gateway, version="1.0.0", _data=json.dumps([]))
 
         mocker.patch(
-            "apigateway.apis.web.resource_version.views.OpenAPIExportManager.export_resource_version_openapi",
+            "apigateway.apis.web.resource_version.views.OpenAPIExportManager._export_resource_version_openapi",
             return_value="openapi: '2.0'",
         )
 
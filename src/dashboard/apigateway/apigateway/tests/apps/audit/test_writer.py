@@ -0,0 +1,186 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import datetime
+
+import pytest
+from django.db import transaction
+
+from apigateway.apps.audit.models import AuditEventLog
+from apigateway.apps.audit.tasks import record_audit_event_logs
+from apigateway.apps.audit.writer import AuditEventLogWriter
+from apigateway.utils.time import now_datetime
+
+pytestmark = pytest.mark.django_db
+
+
+def _make_event(op_object_id, **kwargs):
+    return {
+        "system": "test",
+        "username": "admin",
+        "op_type": "create",
+        "op_status": "success",
+        "op_object_group": "1",
+        "op_object_type": "resource",
+        "op_object_id": op_object_id,
+        **kwargs,
+    }
+
+
+def _get_op_object_ids():
+    return set(AuditEventLog.objects.values_list("op_object_id", flat=True))
+
+
+class TestAuditEventLogManager:
+    def test_bulk_record(self, mocker):
+        mocker.patch("apigateway.apps.audit.managers.BULK_BATCH_SIZE", 2)
+        op_time = now_datetime() - datetime.timedelta(minutes=1)
+
+        AuditEventLog.objects.bulk_record([_make_event(str(i), op_time=op_time) for i in range(3)])
+
+        assert _get_op_object_ids() == {"0", "1", "2"}
+        assert set(AuditEventLog.objects.values_list("op_time", flat=True)) == {op_time}
+
+    def test_bulk_record_fallback(self, mocker):
+        mock_logger = mocker.patch("apigateway.apps.audit.managers.logger")
+
+        # 批量写入失败时逐条写入，仅丢弃无法写入的审计日志
+        AuditEventLog.objects.bulk_record([_make_event("1"), _make_event("2", invalid_field="x"), _make_event("3")])
+
+        assert _get_op_object_ids() == {"1", "3"}
+        assert mock_logger.exception.call_count == 2
+
+
+class TestAuditEventLogWriter:
+    def test_record_without_buffer(self):
+        AuditEventLogWriter().record(_make_event("1"))
+
+        assert _get_op_object_ids() == {"1"}
+
+    def test_buffered(self):
+        writer = AuditEventLogWriter()
+
+        with writer.buffered():
+            for i in range(3):
+                writer.record(_make_event(str(i)))
+            assert not AuditEventLog.objects.exists()
+
+        assert _get_op_object_ids() == {"0", "1", "2"}
+
+        # 嵌套使用时，由最外层统一写入
+        with writer.buffered():
+            with writer.buffered():
+                writer.record(_make_event("3"))
+            assert AuditEventLog.objects.count() == 3
+
+        assert AuditEventLog.objects.count() == 4
+
+    def test_buffered_keep_op_time(self):
+        writer = AuditEventLogWriter()
+
+        with writer.buffered():
+            writer.record(_make_event("1"))
+            recorded_time = now_datetime()
+
+        assert AuditEventLog.objects.get().op_time <= recorded_time
+
+    def test_buffered_discard_rolled_back(self):
+        writer = AuditEventLogWriter()
+
+        with writer.buffered():
+            with transaction.atomic():
+                writer.record(_make_event("committed"))
+
+            try:
+                with transaction.atomic():
+                    writer.record(_make_event("rolled-back"))
+                    raise ValueError("rollback")
+            except ValueError:
+                pass
+
+            writer.record(_make_event("autocommit"))
+
+        assert _get_op_object_ids() == {"committed", "autocommit"}
+
+    def test_buffered_write_on_error(self):
+        writer = AuditEventLogWriter()
+
+        with pytest.raises(ValueError), writer.buffered():
+            writer.record(_make_event("1"))
+            raise ValueError("error")
+
+        assert _get_op_object_ids() == {"1"}
+
+    def test_buffer_max_size(self, settings):
+        settings.AUDIT_LOG_BUFFER_MAX_SIZE = 2
+        writer = AuditEventLogWriter()
+
+        with writer.buffered():
+            writer.record(_make_event("1"))
+            assert not AuditEventLog.objects.exists()
+
+            writer.record(_make_event("2"))
+            assert AuditEventLog.objects.count() == 2
+
+            writer.record(_make_event("3"))
+
+        assert AuditEventLog.objects.count() == 3
+
+    def test_flush_in_transaction_not_async(self, settings, mocker):
+        settings.AUDIT_LOG_ASYNC_THRESHOLD = 1
+        mock_delay = mocker.patch("apigateway.apps.audit.writer.record_audit_event_logs.delay")
+
+        # 测试用例运行在事务中，审计日志需随事务写入
+        AuditEventLogWriter().flush([_make_event("1", op_time=now_datetime())])
+
+        mock_delay.assert_not_called()
+        assert _get_op_object_ids() == {"1"}
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAuditEventLogWriterAsync:
+    def test_flush_async(self, settings, mocker):
+        settings.AUDIT_LOG_ASYNC_THRESHOLD = 2
+        mock_delay = mocker.patch("apigateway.apps.audit.writer.record_audit_event_logs.delay")
+        op_time = now_datetime()
+        writer = AuditEventLogWriter()
+
+        writer.flush([_make_event("1", op_time=op_time)])
+        mock_delay.assert_not_called()
+
+        writer.flush([_make_event("2", op_time=op_time), _make_event("3", op_time=op_time)])
+        mock_delay.assert_called_once()
+        assert [event["op_time"] for event in mock_delay.call_args.args[0]] == [op_time.isoformat()] * 2
+        assert _get_op_object_ids() == {"1"}
+
+    def test_flush_async_fallback(self, settings, mocker):
+        settings.AUDIT_LOG_ASYNC_THRESHOLD = 1
+        mocker.patch(
+            "apigateway.apps.audit.writer.record_audit_event_logs.delay", side_effect=ConnectionError("broker down")
+        )
+
+        AuditEventLogWriter().flush([_make_event("1", op_time=now_datetime())])
+
+        assert _get_op_object_ids() == {"1"}
+
+
+def test_record_audit_event_logs():
+    op_time = now_datetime() - datetime.timedelta(minutes=1)
+
+    record_audit_event_logs([_make_event("1", op_time=op_time.isoformat())])
+
+    assert AuditEventLog.objects.get().op_time == op_time
@@ -21,9 +21,9 @@ from django.db import IntegrityError
 from django.db.models import ProtectedError
 
 from apigateway.apps.data_plane.constants import DataPlaneStatusEnum
-from apigateway.apps.data_plane.models import DataPlane, GatewayDataPlaneBinding
+from apigateway.apps.data_plane.models import DataPlane, DataPlaneReleaseManifest, GatewayDataPlaneBinding
 from apigateway.core.constants import GatewayKindEnum
-from apigateway.core.models import Gateway
+from apigateway.core.models import Gateway, Stage
 
 pytestmark = pytest.mark.django_db
 
@@ -237,3 +237,73 @@ class TestGatewayDataPlaneBindingModel:
 
         data_plane.delete()
         assert not DataPlane.objects.filter(id=data_plane.id).exists()
+
+
+class TestDataPlaneReleaseManifest:
+    KEY_PREFIX = "/bk-gateway-apisix/v2/gateway/test/prod/"
+
+    @pytest.fixture
+    def stage(self):
+        return G(Stage, gateway=G(Gateway), name="prod")
+
+    @pytest.fixture
+    def data_plane(self):
+        return G(DataPlane, name="test-plane")
+
+    def _save(self, data_plane, stage, digests, publish_id=1):
+        return DataPlaneReleaseManifest.objects.save_manifest(
+            data_plane,
+            stage,
+            self.KEY_PREFIX,
+            digests,
+            publish_id=publish_id,
+            resource_version_id=1,
+            stage_config_digest="digest",
+        )
+
+    def test_digests(self, data_plane, stage):
+        digests = {f"{self.KEY_PREFIX}route/test.prod.1": b"\x01" * 20, f"{self.KEY_PREFIX}service/s": b"\x02" * 20}
+
+        manifest = self._save(data_plane, stage, digests)
+        manifest = DataPlaneReleaseManifest.objects.get(id=manifest.id)
+
+        assert manifest.digests == digests
+        assert manifest.key_count == 2
+        assert manifest.gateway_id == stage.gateway_id
+        # 只存储 key_prefix 之后的相对 key
+        assert self.KEY_PREFIX not in manifest._digests
+
+    def test_save_manifest_replace(self, data_plane, stage):
+        self._save(data_plane, stage, {f"{self.KEY_PREFIX}route/1": b"\x01"})
+        self._save(data_plane, stage, {f"{self.KEY_PREFIX}route/2": b"\x02"}, publish_id=2)
+
+        manifest = DataPlaneReleaseManifest.objects.get(data_plane=data_plane, stage=stage)
+        assert manifest.digests == {f"{self.KEY_PREFIX}route/2": b"\x02"}
+        assert manifest.publish_id == 2
+
+    def test_patch_manifest(self, data_plane, stage):
+        self._save(data_plane, stage, {f"{self.KEY_PREFIX}route/1": b"\x01", f"{self.KEY_PREFIX}route/2": b"\x02"})
+
+        manifest = DataPlaneReleaseManifest.objects.patch_manifest(
+            data_plane,
+            stage,
+            self.KEY_PREFIX,
+            {f"{self.KEY_PREFIX}route/1": None, f"{self.KEY_PREFIX}route/3": b"\x03"},
+            publish_id=3,
+        )
+
+        assert manifest.digests == {f"{self.KEY_PREFIX}route/2": b"\x02", f"{self.KEY_PREFIX}route/3": b"\x03"}
+        assert manifest.publish_id == 3
+
+    def test_patch_manifest_without_full_manifest(self, data_plane, stage):
+        assert (
+            DataPlaneReleaseManifest.objects.patch_manifest(
+                data_plane, stage, self.KEY_PREFIX, {f"{self.KEY_PREFIX}route/1": b"\x01"}
+            )
+            is None
+        )
+
+        # key_prefix 变化时，已记录的摘要不再可用
+        self._save(data_plane, stage, {f"{self.KEY_PREFIX}route/1": b"\x01"})
+        assert DataPlaneReleaseManifest.objects.patch_manifest(data_plane, stage, "/other/", {}) is None
+        assert not DataPlaneReleaseManifest.objects.filter(data_plane=data_plane, stage=stage).exists()
@@ -0,0 +1,56 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import pytest
+from ddf import G
+from django.core.management import call_command
+
+from apigateway.apps.openapi.models import OpenAPIResourceSchemaVersion, OpenAPIResourceSchemaVersionItem
+from apigateway.service.resource_version import get_resource_schema
+
+pytestmark = pytest.mark.django_db
+
+
+class TestCommand:
+    @pytest.fixture
+    def legacy_schema_version(self, fake_resource_version):
+        return G(
+            OpenAPIResourceSchemaVersion,
+            resource_version=fake_resource_version,
+            schema=[{"resource_id": 1, "schema": {"a": 1}}, {"resource_id": 2, "schema": {"b": 2}}],
+            has_resource_items=False,
+        )
+
+    def test_backfill(self, legacy_schema_version):
+        call_command("backfill_resource_schema_version_items")
+
+        legacy_schema_version.refresh_from_db()
+        assert legacy_schema_version.has_resource_items is True
+        assert (
+            OpenAPIResourceSchemaVersionItem.objects.filter(
+                resource_version_id=legacy_schema_version.resource_version_id
+            ).count()
+            == 2
+        )
+        assert get_resource_schema(legacy_schema_version.resource_version_id, 2) == {"b": 2}
+
+    def test_backfill_dry_run(self, legacy_schema_version):
+        call_command("backfill_resource_schema_version_items", dry_run=True)
+
+        legacy_schema_version.refresh_from_db()
+        assert legacy_schema_version.has_resource_items is False
+        assert not OpenAPIResourceSchemaVersionItem.objects.exists()
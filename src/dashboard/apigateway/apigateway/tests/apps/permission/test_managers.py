@@ -266,6 +266,64 @@ class TestAppResourcePermissionManager:
             assert permission.handled_by == test["handled_by"]
             assert 180 * 24 * 3600 - 10 < (permission.expires - now_datetime()).total_seconds() < 180 * 24 * 3600
 
+    def test_bulk_create_missing_permissions(self, django_assert_num_queries):
+        resource_ids = [G(Resource, gateway=self.gateway).id for _ in range(3)]
+        existing = G(
+            models.AppResourcePermission,
+            gateway=self.gateway,
+            bk_app_code="test",
+            grant_type="apply",
+            resource_id=resource_ids[0],
+        )
+        expires = to_datetime_from_now(days=10)
+
+        with django_assert_num_queries(2):
+            created_resource_ids = models.AppResourcePermission.objects.bulk_create_missing_permissions(
+                self.gateway.id,
+                "test",
+                resource_ids,
+                defaults={"expires": expires, "grant_type": GrantTypeEnum.SYNC.value},
+            )
+
+        assert created_resource_ids == resource_ids[1:]
+        permissions = models.AppResourcePermission.objects.filter(gateway=self.gateway, bk_app_code="test")
+        assert permissions.count() == 3
+        assert permissions.get(id=existing.id).grant_type == "apply"
+        for permission in permissions.exclude(id=existing.id):
+            assert permission.grant_type == GrantTypeEnum.SYNC.value
+            assert permission.expires == expires
+
+        # 无缺失的权限时，不写入数据
+        with django_assert_num_queries(1):
+            assert (
+                models.AppResourcePermission.objects.bulk_create_missing_permissions(
+                    self.gateway.id, "test", resource_ids, defaults={}
+                )
+                == []
+            )
+
+    def test_save_permissions_multiple_resources(self):
+        resource_ids = [G(Resource, gateway=self.gateway).id for _ in range(3)]
+        G(
+            models.AppResourcePermission,
+            gateway=self.gateway,
+            bk_app_code="test",
+            grant_type="initialize",
+            expires=dummy_time.time,
+            resource_id=resource_ids[0],
+        )
+
+        models.AppResourcePermission.objects.save_permissions(
+            self.gateway, resource_ids, "test", grant_type="apply", expire_days=180, handled_by="admin"
+        )
+
+        permissions = models.AppResourcePermission.objects.filter(gateway=self.gateway, bk_app_code="test")
+        assert sorted(permissions.values_list("resource_id", flat=True)) == resource_ids
+        for permission in permissions:
+            assert permission.grant_type == "apply"
+            assert permission.handled_by == "admin"
+            assert permission.expires > to_datetime_from_now(days=179)
+
 
 class TestAppPermissionRecordManager:
     def test_filter_record(self):
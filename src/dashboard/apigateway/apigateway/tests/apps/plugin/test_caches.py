@@ -0,0 +1,44 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+from apigateway.apps.plugin.caches import ParsedPluginConfigCache
+
+
+class TestParsedPluginConfigCache:
+    def test_get_or_parse(self, mocker):
+        mock_loads = mocker.patch("apigateway.apps.plugin.caches.yaml_fast_loads", return_value={"foo": ["bar"]})
+        cache = ParsedPluginConfigCache()
+
+        config = cache.get_or_parse(1, "foo: [bar]")
+        assert config == {"foo": ["bar"]}
+        # 返回副本，调用方修改不影响缓存
+        config["foo"].append("baz")
+        assert cache.get_or_parse(1, "foo: [bar]") == {"foo": ["bar"]}
+        mock_loads.assert_called_once()
+
+        # 配置内容变化后重新解析
+        cache.get_or_parse(1, "foo: [baz]")
+        assert mock_loads.call_count == 2
+
+    def test_get_or_parse_without_id(self, mocker):
+        mock_loads = mocker.patch("apigateway.apps.plugin.caches.yaml_fast_loads", return_value={"foo": "bar"})
+        cache = ParsedPluginConfigCache()
+
+        cache.get_or_parse(None, "foo: bar")
+        cache.get_or_parse(None, "foo: bar")
+
+        assert mock_loads.call_count == 2
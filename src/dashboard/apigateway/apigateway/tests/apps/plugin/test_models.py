@@ -20,6 +20,7 @@ import json
 import pytest
 from jsonschema import validate
 
+from apigateway.apps.plugin import caches
 from apigateway.apps.plugin.models import PluginConfig
 from apigateway.schema.models import Schema
 from apigateway.service.plugin import PluginConvertorFactory
@@ -54,6 +55,20 @@ class TestPluginConfig:
             _data = convertor.convert(fake_plugin_config.config)
             validate(_data, schema=fake_plugin_config.type.schema.schema)
 
+    def test_config(self, mocker, fake_plugin_config):
+        fake_plugin_config.config = yaml_dumps({"foo": "bar"})
+        fake_plugin_config.save()
+        caches.parsed_plugin_config_cache.clear()
+        mock_loads = mocker.spy(caches, "yaml_fast_loads")
+
+        plugin_config = PluginConfig.objects.get(id=fake_plugin_config.id)
+        assert plugin_config.config == {"foo": "bar"}
+        assert PluginConfig.objects.get(id=fake_plugin_config.id).config == {"foo": "bar"}
+        assert mock_loads.call_count == 1
+
+        plugin_config.config = yaml_dumps({"foo": "baz"})
+        assert plugin_config.config == {"foo": "baz"}
+
 
 class TestPluginBinding:
     def test_get_config_with_plugin_config(self, echo_plugin, echo_plugin_stage_binding):
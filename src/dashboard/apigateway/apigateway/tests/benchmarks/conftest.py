@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+import json
+import os
+import warnings
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+BENCHMARK_DIR = Path(__file__).parent
+BASELINE_FILE = BENCHMARK_DIR / "baseline.json"
+
+# 设置该环境变量后，使用本次运行的结果更新 baseline.json，而不是与其比较
+UPDATE_BASELINE_ENV = "BK_APIGW_BENCHMARK_UPDATE_BASELINE"
+
+# 各指标允许超出基线的比例；etcd 请求数、序列化字节数与数据规模确定相关，内存受运行环境影响较大
+METRIC_TOLERANCES = {
+    "etcd_requests": 0.05,
+    "etcd_txn_count": 0.05,
+    "etcd_put_count": 0.05,
+    "etcd_delete_count": 0.05,
+    "bytes_serialized": 0.05,
+    "bytes_read": 0.05,
+    "peak_memory": 0.3,
+}
+
+
+def pytest_collection_modifyitems(config, items):
+    """基准测试耗时较长，仅在指定 --benchmark-only 时执行"""
+    if config.getoption("benchmark_only", default=False):
+        return
+
+    skip = pytest.mark.skip(reason="benchmarks only run with --benchmark-only")
+    for item in items:
+        if BENCHMARK_DIR in Path(str(item.fspath)).parents:
+            item.add_marker(skip)
+
+
+class MetricsBaseline:
+    """将基准测试的确定性指标与 baseline.json 中存储的基线比较，超出容忍范围即失败
+
+    耗时指标与运行环境相关，不存储在 baseline.json 中，使用 pytest-benchmark 的
+    --benchmark-autosave / --benchmark-compare-fail 与历史运行结果比较
+    """
+
+    def __init__(self, path: Path, update: bool):
+        self.path = path
+        self.update = update
+        self.baseline: Dict[str, Dict[str, Any]] = json.loads(path.read_text()) if path.exists() else {}
+        self.updated = False
+
+    def check(self, name: str, metrics: Dict[str, Any]):
+        if self.update:
+            self.baseline[name] = metrics
+            self.updated = True
+            return
+
+        expected_metrics = self.baseline.get(name)
+        if expected_metrics is None:
+            warnings.warn(f"no baseline for benchmark {name}, set {UPDATE_BASELINE_ENV}=1 to record it", stacklevel=2)
+            return
+
+        regressions = []
+        for metric, expected in expected_metrics.items():
+            tolerance = METRIC_TOLERANCES.get(metric)
+            actual = metrics.get(metric)
+            if tolerance is None or actual is None:
+                continue
+
+            if actual > expected * (1 + tolerance):
+                regressions.append(f"{metric}: {actual} > baseline {expected} (+{tolerance:.0%})")
+
+        assert not regressions, f"benchmark {name} regressed: " + "; ".join(regressions)
+
+    def save(self):
+        if self.updated:
+            self.path.write_text(json.dumps(self.baseline, indent=2, sort_keys=True) + "\n")
+
+
+@pytest.fixture(scope="session")
+def metrics_baseline():
+    baseline = MetricsBaseline(BASELINE_FILE, update=bool(os.environ.get(UPDATE_BASELINE_ENV)))
+    yield baseline
+    baseline.save()
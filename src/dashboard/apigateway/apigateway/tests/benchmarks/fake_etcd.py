@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+"""供基准测试使用的内存 etcd，实现 EtcdRegistry 用到的 etcd3 client 接口，并统计请求次数、读写字节数"""
+
+import bisect
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.utils.encoding import force_bytes
+
+
+@dataclass(frozen=True)
+class FakeResponseHeader:
+    revision: int
+
+
+@dataclass(frozen=True)
+class FakeKVMetadata:
+    key: bytes
+    response_header: Optional[FakeResponseHeader] = None
+
+
+@dataclass
+class FakeEtcdStats:
+    # etcd 请求数，一个事务计为一个请求
+    requests: int = 0
+    txn_count: int = 0
+    put_count: int = 0
+    delete_count: int = 0
+    # 写入的 value 字节数，即序列化后的资源大小
+    bytes_written: int = 0
+    # 读取的 value 字节数
+    bytes_read: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "etcd_requests": self.requests,
+            "etcd_txn_count": self.txn_count,
+            "etcd_put_count": self.put_count,
+            "etcd_delete_count": self.delete_count,
+            "bytes_serialized": self.bytes_written,
+            "bytes_read": self.bytes_read,
+        }
+
+
+class _FakeTransactions:
+    @staticmethod
+    def put(key, value) -> Tuple[str, bytes, bytes]:
+        return "put", force_bytes(key), force_bytes(value)
+
+    @staticmethod
+    def delete(key) -> Tuple[str, bytes, None]:
+        return "delete", force_bytes(key), None
+
+
+class FakeEtcdClient:
+    """按 key 有序存储的内存 etcd，不支持 watch、lease 等未被发布流程使用的接口
+
+    只维护当前的 revision，不保留历史版本，指定 revision 的读取返回当前的数据
+    """
+
+    transactions = _FakeTransactions()
+
+    def __init__(self):
+        self._keys: List[bytes] = []
+        self._data: Dict[bytes, bytes] = {}
+        self.revision = 1
+        self.stats = FakeEtcdStats()
+
+    def reset_stats(self):
+        self.stats = FakeEtcdStats()
+
+    def clear(self):
+        self._keys = []
+        self._data = {}
+
+    def get(self, key) -> Tuple[Optional[bytes], Optional[FakeKVMetadata]]:
+        self.stats.requests += 1
+        key = force_bytes(key)
+        value = self._data.get(key)
+        if value is None:
+            return None, None
+
+        self.stats.bytes_read += len(value)
+        return value, self._metadata(key)
+
+    def get_prefix(self, key_prefix, keys_only: bool = False) -> Iterable[Tuple[Optional[bytes], FakeKVMetadata]]:
+        self.stats.requests += 1
+        return [
+            (None if keys_only else self._read(key), self._metadata(key))
+            for key in self._get_prefix_keys(force_bytes(key_prefix))
+        ]
+
+    def get_range(self, range_start, range_end, revision=None) -> Iterable[Tuple[bytes, FakeKVMetadata]]:
+        self.stats.requests += 1
+        start = bisect.bisect_left(self._keys, force_bytes(range_start))
+        end = bisect.bisect_left(self._keys, force_bytes(range_end))
+        return [(self._read(key), self._metadata(key)) for key in self._keys[start:end]]
+
+    def put(self, key, value):
+        self.stats.requests += 1
+        self.revision += 1
+        self._put(force_bytes(key), force_bytes(value))
+
+    def delete(self, key):
+        self.stats.requests += 1
+        self.revision += 1
+        self._delete(force_bytes(key))
+
+    def delete_prefix(self, prefix):
+        self.stats.requests += 1
+        self.revision += 1
+        for key in self._get_prefix_keys(force_bytes(prefix)):
+            self._delete(key)
+
+    def transaction(self, compare, success, failure):
+        self.stats.requests += 1
+        self.stats.txn_count += 1
+        self.revision += 1
+        for op, key, value in success:
+            if op == "put":
+                self._put(key, value)
+            else:
+                self._delete(key)
+        return True, []
+
+    def _get_prefix_keys(self, key_prefix: bytes) -> List[bytes]:
+        start = bisect.bisect_left(self._keys, key_prefix)
+        keys = []
+        for key in self._keys[start:]:
+            if not key.startswith(key_prefix):
+                break
+            keys.append(key)
+        return keys
+
+    def _metadata(self, key: bytes) -> FakeKVMetadata:
+        return FakeKVMetadata(key=key, response_header=FakeResponseHeader(revision=self.revision))
+
+    def _read(self, key: bytes) -> bytes:
+        value = self._data[key]
+        self.stats.bytes_read += len(value)
+        return value
+
+    def _put(self, key: bytes, value: bytes):
+        if key not in self._data:
+            bisect.insort(self._keys, key)
+        self._data[key] = value
+        self.stats.put_count += 1
+        self.stats.bytes_written += len(value)
+
+    def _delete(self, key: bytes):
+        if self._data.pop(key, None) is not None:
+            self._keys.pop(bisect.bisect_left(self._keys, key))
+        self.stats.delete_count += 1
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+"""生成基准测试使用的网关数据：资源混合了插件、环境变量、AI 后端及 OAuth2 配置"""
+
+import json
+from typing import Any, Dict, List
+
+from ddf import G
+
+from apigateway.apps.data_plane.constants import CURRENT_DATA_PLANE_APISIX_VERSION
+from apigateway.apps.data_plane.models import DataPlane
+from apigateway.apps.plugin.constants import PluginBindingScopeEnum, PluginTypeCodeEnum
+from apigateway.apps.plugin.models import PluginBinding, PluginConfig, PluginType
+from apigateway.core.constants import (
+    BackendKindEnum,
+    ProxyTypeEnum,
+    ResourceKindEnum,
+    ResourceVersionSchemaEnum,
+)
+from apigateway.core.models import (
+    Backend,
+    BackendConfig,
+    Gateway,
+    Release,
+    ReleaseHistory,
+    ResourceVersion,
+    Stage,
+)
+from apigateway.service.contexts import GatewayAuthContext
+from apigateway.service.gateway_jwt import GatewayJWTHandler
+
+STANDARD_BACKEND_COUNT = 4
+STAGE_VARS = {"prefix": "prod", "domain": "example.com"}
+HTTP_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE", "ANY"]
+
+
+def _standard_backend_config(index: int) -> Dict[str, Any]:
+    return {
+        "type": "node",
+        "timeout": 30 + index,
+        "loadbalance": "roundrobin",
+        "hosts": [
+            {"scheme": "http", "host": f"backend-{index}.{{env.domain}}", "weight": 100},
+            {"scheme": "http", "host": f"backend-{index}-backup.example.com", "weight": 10},
+        ],
+    }
+
+
+def _ai_backend_config() -> Dict[str, Any]:
+    return {
+        "timeout": 45,
+        "instances": [
+            {
+                "name": "primary",
+                "provider": "openai-compatible",
+                "weight": 1,
+                "options": {"model": "gpt-4.1-mini", "temperature": 0.2},
+                "auth": {"header": {"Authorization": "Bearer benchmark"}},
+                "override": {"endpoint": "https://models.example.com/v1/chat/completions"},
+            }
+        ],
+    }
+
+
+def _resource_plugins(index: int) -> List[Dict[str, Any]]:
+    plugins = []
+    if index % 3 == 0:
+        plugins.append(
+            {
+                "type": PluginTypeCodeEnum.BK_HEADER_REWRITE.value,
+                "config": {
+                    "set": [{"key": "X-Resource-Index", "value": str(index)}],
+                    "remove": [{"key": "X-Debug"}],
+                },
+            }
+        )
+    if index % 4 == 0:
+        plugins.append(
+            {
+                "type": PluginTypeCodeEnum.BK_CORS.value,
+                "config": {
+                    "allow_origins": "https://example.com",
+                    "allow_methods": "GET,POST",
+                    "allow_headers": "*",
+                    "expose_headers": "",
+                    "max_age": 86400,
+                    "allow_credential": False,
+                },
+            }
+        )
+    if index % 5 == 0:
+        plugins.append(
+            {
+                "type": PluginTypeCodeEnum.BK_IP_RESTRICTION.value,
+                "config": {"whitelist": f"10.0.{index % 256}.0/24\n192.168.1.1"},
+            }
+        )
+    return plugins
+
+
+def _resource_auth_config(index: int) -> str:
+    return json.dumps(
+        {
+            "skip_auth_verification": False,
+            "auth_verified_required": index % 2 == 0,
+            "app_verified_required": True,
+            "resource_perm_required": index % 3 != 0,
+            "oauth2_public_client_enabled": index % 6 == 0,
+            "oauth2_personal_client_enabled": index % 12 == 0,
+        }
+    )
+
+
+def make_resource_config(index: int, standard_backend_ids: List[int], ai_backend_id: int) -> Dict[str, Any]:
+    """生成资源版本中的单个资源配置，结构与 ResourceVersionHandler.make_version 一致"""
+    resource_id = index + 1
+    is_ai = index % 10 == 9
+    in_path = ["prefix"] if index % 8 == 0 else []
+    path_prefix = "/{env.prefix}" if in_path else f"/v{index % 3}"
+
+    return {
+        "id": resource_id,
+        "kind": ResourceKindEnum.AI.value if is_ai else ResourceKindEnum.STANDARD.value,
+        "name": f"resource_{resource_id}",
+        "description": f"benchmark resource {resource_id}",
+        "description_en": None,
+        "method": "POST" if is_ai else HTTP_METHODS[index % len(HTTP_METHODS)],
+        "path": f"{path_prefix}/group{index % 50}/items{resource_id}/{{item_id}}/",
+        "match_subpath": index % 7 == 0,
+        "enable_websocket": index % 20 == 0,
+        "is_public": True,
+        "allow_apply_permission": True,
+        "created_time": "2026-01-01 00:00:00+0800",
+        "updated_time": "2026-01-01 00:00:00+0800",
+        "proxy": {
+            "id": resource_id,
+            "type": ProxyTypeEnum.HTTP.value,
+            "backend_id": ai_backend_id if is_ai else standard_backend_ids[index % len(standard_backend_ids)],
+            "config": json.dumps(
+                {
+                    "method": "GET" if index % 2 else "POST",
+                    "path": f"/backend/{{env.prefix}}/items/{resource_id}/",
+                    "match_subpath": index % 7 == 0,
+                    "timeout": index % 60,
+                }
+            ),
+            "schema": {"id": 4, "name": "ProxyHTTP", "type": "proxy", "version": "1"},
+        },
+        "stage_vars": {"in_path": in_path, "in_host": []},
+        "contexts": {
+            "resource_auth": {
+                "id": resource_id,
+                "scope_type": "resource",
+                "scope_id": resource_id,
+                "type": "resource_auth",
+                "config": _resource_auth_config(index),
+                "schema": {"id": 2, "name": "ContextResourceBKAuth", "type": "context", "version": "1"},
+            }
+        },
+        "disabled_stages": [],
+        "api_labels": [index % 10],
+        "plugins": _resource_plugins(index),
+    }
+
+
+class SyntheticGatewayFactory:
+    """在 db 中创建包含 resource_count 个资源的网关及其发布"""
+
+    def __init__(self, resource_count: int, apisix_version: str = CURRENT_DATA_PLANE_APISIX_VERSION):
+        self.resource_count = resource_count
+        self.apisix_version = apisix_version
+
+    def create_release(self) -> Release:
+        gateway = G(Gateway, name=f"bench-{self.resource_count}", status=1, is_public=True)
+        GatewayAuthContext().save(gateway.pk, {})
+        GatewayJWTHandler.create_jwt(gateway)
+
+        stage = G(Stage, gateway=gateway, name="prod", status=1, _vars=json.dumps(STAGE_VARS))
+        self._bind_stage_plugins(gateway, stage)
+
+        standard_backend_ids = [
+            self._create_backend(
+                gateway, stage, f"backend-{i}", BackendKindEnum.STANDARD.value, _standard_backend_config(i)
+            )
+            for i in range(STANDARD_BACKEND_COUNT)
+        ]
+        ai_backend_id = self._create_backend(gateway, stage, "model", BackendKindEnum.AI.value, _ai_backend_config())
+
+        resource_version = G(
+            ResourceVersion,
+            gateway=gateway,
+            version="1.0.0",
+            schema_version=ResourceVersionSchemaEnum.V2.value,
+        )
+        resource_version.data = [
+            make_resource_config(i, standard_backend_ids, ai_backend_id) for i in range(self.resource_count)
+        ]
+        resource_version.save()
+
+        return G(Release, gateway=gateway, stage=stage, resource_version=resource_version)
+
+    def create_release_history(self, release: Release, data_plane: DataPlane) -> ReleaseHistory:
+        return G(
+            ReleaseHistory,
+            gateway=release.gateway,
+            stage=release.stage,
+            resource_version=release.resource_version,
+            data_plane=data_plane,
+        )
+
+    def create_data_plane(self) -> DataPlane:
+        data_plane = G(
+            DataPlane, name="bench", etcd_namespace_prefix="/bk-gateway-apigw", apisix_version=self.apisix_version
+        )
+        # etcd client 由基准测试替换为内存实现，配置仅需非空
+        data_plane.etcd_configs = {"host": "127.0.0.1", "port": 2379}
+        data_plane.save()
+        return data_plane
+
+    def _create_backend(self, gateway: Gateway, stage: Stage, name: str, kind: str, config: Dict[str, Any]) -> int:
+        backend = G(Backend, gateway=gateway, name=name, kind=kind)
+        backend_config = BackendConfig(gateway=gateway, stage=stage, backend=backend)
+        # AI 后端的配置需经 setter 加密存储
+        backend_config.config = config
+        backend_config.save()
+        return backend.id
+
+    def _bind_stage_plugins(self, gateway: Gateway, stage: Stage):
+        stage_plugins = {
+            PluginTypeCodeEnum.BK_RATE_LIMIT.value: {"rates": {"__default": [{"period": 1, "tokens": 100}]}},
+            PluginTypeCodeEnum.BK_HEADER_REWRITE.value: {
+                "set": [{"key": "X-Stage", "value": "prod"}],
+                "remove": [],
+            },
+        }
+        for code, config in stage_plugins.items():
+            plugin_type, _ = PluginType.objects.get_or_create(code=code, defaults={"name": code, "is_public": True})
+            plugin_config = G(
+                PluginConfig,
+                gateway=gateway,
+                name=f"stage-{code}",
+                type=plugin_type,
+                yaml=json.dumps(config),
+            )
+            G(
+                PluginBinding,
+                gateway=gateway,
+                config=plugin_config,
+                scope_type=PluginBindingScopeEnum.STAGE.value,
+                scope_id=stage.pk,
+            )
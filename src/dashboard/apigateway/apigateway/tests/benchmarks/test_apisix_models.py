@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+"""apisix 模型构造、序列化的微基准测试：路由的构造耗时，model_dump_json 与 dump_apisix_model_json 的序列化耗时
+
+pytest --ds apigateway.settings --benchmark-only apigateway/tests/benchmarks/test_apisix_models.py
+"""
+
+import pytest
+
+from apigateway.controller.models import Labels, Plugin, Route, Timeout, dump_apisix_model_json
+from apigateway.controller.models.constants import HttpMethodEnum
+
+# 每轮构造、序列化的路由数量
+ROUTE_COUNT = 1000
+
+
+def build_route(index: int) -> Route:
+    """与 RouteConvertor 生成的标准路由结构相同"""
+    labels = Labels(
+        **{
+            "gateway.bk.tencent.com/gateway": "bench",
+            "gateway.bk.tencent.com/stage": "prod",
+            "gateway.bk.tencent.com/publish-id": 1,
+            "gateway.bk.tencent.com/apisix-version": "3.13",
+        }
+    )
+    plugins = {
+        "bk-resource-context": Plugin(
+            bk_resource_id=index,
+            bk_resource_name=f"resource-{index}",
+            bk_resource_kind="standard",
+            bk_resource_auth={
+                "verified_app_required": True,
+                "verified_user_required": False,
+                "resource_perm_required": True,
+                "skip_user_verification": False,
+            },
+        ),
+        "bk-proxy-rewrite": Plugin(uri=f"/backend/{index}", method="GET"),
+        "bk-rate-limit": Plugin(rates={"__default": [{"period": 1, "tokens": 100}]}),
+    }
+    route = Route(
+        id=f"bench.prod.{index}",
+        name=f"bench.prod.resource-{index}",
+        uris=[f"/api/bench/prod/resources/{index}", f"/api/bench/prod/resources/{index}/"],
+        methods=[HttpMethodEnum.GET],
+        plugins=plugins,
+        service_id="bench.prod.stage-backend-1",
+        labels=labels,
+    )
+    route.timeout = Timeout(connect=30, send=30, read=30)
+    return route
+
+
+def build_routes():
+    return [build_route(index) for index in range(ROUTE_COUNT)]
+
+
+def test_construct_routes(benchmark):
+    benchmark.group = "apisix-model-construct"
+
+    routes = benchmark(build_routes)
+
+    benchmark.extra_info["route_count"] = len(routes)
+
+
+@pytest.mark.parametrize(
+    "dump",
+    [lambda route: route.model_dump_json(exclude_none=True), dump_apisix_model_json],
+    ids=["model_dump_json", "dump_apisix_model_json"],
+)
+def test_dump_routes(benchmark, dump):
+    benchmark.group = "apisix-model-dump"
+    routes = build_routes()
+
+    payloads = benchmark(lambda: [dump(route) for route in routes])
+
+    assert payloads == [route.model_dump_json(exclude_none=True) for route in routes]
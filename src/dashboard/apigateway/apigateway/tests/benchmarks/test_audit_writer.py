@@ -0,0 +1,66 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""批量操作记录审计日志的基准测试：逐条写入与请求内缓存后批量写入的耗时
+
+pytest --ds apigateway.settings --benchmark-only apigateway/tests/benchmarks/test_audit_writer.py
+"""
+
+import pytest
+
+from apigateway.apps.audit.models import AuditEventLog
+from apigateway.apps.audit.writer import audit_event_log_writer
+from apigateway.service.audit import record_audit_log
+
+pytestmark = pytest.mark.django_db
+
+EVENT_COUNT = 1000
+
+
+def record_audit_logs():
+    for i in range(EVENT_COUNT):
+        record_audit_log(
+            username="admin",
+            op_type="create",
+            op_status="success",
+            op_object_group=1,
+            op_object_type="resource",
+            op_object_id=i,
+            op_object=f"resource-{i}",
+            data_after={"id": i, "name": f"resource-{i}"},
+        )
+
+
+@pytest.mark.parametrize("buffered", [False, True], ids=["direct", "buffered"])
+def test_record_audit_logs(benchmark, buffered):
+    benchmark.group = "audit-log-write"
+
+    def run():
+        if not buffered:
+            record_audit_logs()
+            return
+
+        with audit_event_log_writer.buffered():
+            record_audit_logs()
+
+    def setup():
+        AuditEventLog.objects.all().delete()
+
+    benchmark.pedantic(run, setup=setup, rounds=5)
+
+    assert AuditEventLog.objects.count() == EVENT_COUNT
+    benchmark.extra_info["event_count"] = EVENT_COUNT
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+"""发布转换中配置解析、路径渲染的微基准测试：每个资源单独解析、渲染与使用 ReleaseConvertCache 共享结果的耗时
+
+pytest --ds apigateway.settings --benchmark-only apigateway/tests/benchmarks/test_convert_cache.py
+"""
+
+import json
+
+import pytest
+
+from apigateway.controller.release_data import ReleaseConvertCache
+from apigateway.controller.uri_render import UpstreamURIRender, URIRender
+
+from .synthetic import make_resource_config
+
+# 每轮转换的资源数量
+RESOURCE_COUNT = 1000
+STAGE_VARS = {"prefix": "v1"}
+
+
+class UncachedConvert:
+    """与引入 ReleaseConvertCache 之前相同，每个资源单独解析配置、渲染路径"""
+
+    def __init__(self, stage_vars):
+        self.stage_vars = stage_vars
+
+    def load_json_config(self, config):
+        return json.loads(config)
+
+    def render_uri(self, source):
+        return URIRender().render(source, self.stage_vars)
+
+    def render_upstream_uri(self, source):
+        return UpstreamURIRender().render(source, self.stage_vars)
+
+
+def convert_resources(resources, convert):
+    """RouteConvertor 转换单个资源时的配置解析、路径渲染"""
+    for resource in resources:
+        proxy_config = convert.load_json_config(resource["proxy"]["config"])
+        convert.render_uri(resource["path"].rstrip("/"))
+        convert.render_upstream_uri(proxy_config["path"])
+        # 资源上下文插件、OAuth2 插件各解析一次认证配置
+        convert.load_json_config(resource["contexts"]["resource_auth"]["config"])
+        convert.load_json_config(resource["contexts"]["resource_auth"]["config"])
+
+
+@pytest.mark.parametrize(
+    "make_convert",
+    [UncachedConvert, ReleaseConvertCache],
+    ids=["uncached", "release_convert_cache"],
+)
+def test_convert_resources(benchmark, make_convert):
+    benchmark.group = "release-convert-cache"
+    resources = [make_resource_config(index, [1, 2, 3], 4) for index in range(RESOURCE_COUNT)]
+
+    # 每轮使用新的缓存，与一次发布的缓存生命周期一致
+    benchmark(lambda: convert_resources(resources, make_convert(STAGE_VARS)))
+
+    benchmark.extra_info["resource_count"] = RESOURCE_COUNT
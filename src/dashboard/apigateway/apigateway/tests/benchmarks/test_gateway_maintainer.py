@@ -0,0 +1,76 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""按用户查询其维护的网关的基准测试：按 _maintainers 子串匹配全表扫描并二次过滤，与使用维护者索引表查询的耗时
+
+pytest --ds apigateway.settings --benchmark-only apigateway/tests/benchmarks/test_gateway_maintainer.py
+"""
+
+import pytest
+
+from apigateway.biz.gateway import GatewayHandler
+from apigateway.core.constants import GatewayStatusEnum
+from apigateway.core.models import Gateway, GatewayMaintainer
+
+pytestmark = pytest.mark.django_db
+
+GATEWAY_COUNT = 50000
+
+USER_COUNT = 5000
+
+USERNAME = "user-42"
+
+
+def list_gateways_by_user_legacy(username):
+    """与使用维护者索引表之前相同：子串匹配会命中 user-420 等用户，需按维护者列表二次过滤"""
+    queryset = Gateway.objects.filter(_maintainers__contains=username)
+    return [gateway for gateway in queryset if gateway.has_permission(username)]
+
+
+@pytest.fixture
+def gateways():
+    # bulk_create 不会调用 save，需手动写入维护者索引
+    Gateway.objects.bulk_create(
+        [
+            Gateway(
+                name=f"bench-gateway-{i}",
+                _maintainers=f"admin;user-{i % USER_COUNT}",
+                status=GatewayStatusEnum.ACTIVE.value,
+            )
+            for i in range(GATEWAY_COUNT)
+        ],
+        batch_size=1000,
+    )
+    GatewayMaintainer.objects.bulk_create(
+        [
+            GatewayMaintainer(gateway_id=gateway_id, username=username)
+            for gateway_id, maintainers in Gateway.objects.values_list("id", "_maintainers")
+            for username in maintainers.split(";")
+        ],
+        batch_size=1000,
+    )
+
+
+@pytest.mark.parametrize("indexed", [False, True], ids=["legacy", "indexed"])
+def test_list_gateways_by_user(benchmark, gateways, indexed):
+    benchmark.group = "gateway-maintainer"
+    list_gateways = GatewayHandler.list_gateways_by_user if indexed else list_gateways_by_user_legacy
+
+    result = benchmark(list_gateways, USERNAME)
+
+    assert len(result) == GATEWAY_COUNT // USER_COUNT
+    benchmark.extra_info["gateway_count"] = GATEWAY_COUNT
@@ -0,0 +1,73 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""将网关权限同步到资源权限的基准测试：逐个资源 get_or_create 与批量创建缺失权限的耗时
+
+pytest --ds apigateway.settings --benchmark-only apigateway/tests/benchmarks/test_permission_sync.py
+"""
+
+import pytest
+from ddf import G
+
+from apigateway.apps.permission.constants import GrantTypeEnum
+from apigateway.apps.permission.models import AppGatewayPermission, AppResourcePermission
+from apigateway.biz.permission import ResourcePermissionHandler
+from apigateway.core.models import Gateway
+
+pytestmark = pytest.mark.django_db
+
+RESOURCE_COUNT = 2000
+
+BK_APP_CODE = "bench-app"
+
+
+def sync_from_gateway_permission_legacy(gateway, bk_app_code, resource_ids):
+    """与批量同步之前相同：每个缺失权限的资源执行一次 get_or_create"""
+    api_perm = AppGatewayPermission.objects.filter(bk_app_code=bk_app_code, gateway_id=gateway.id).first()
+    if not api_perm:
+        return
+
+    has_perm_resource_ids = list(
+        AppResourcePermission.objects.filter(
+            bk_app_code=bk_app_code, gateway_id=gateway.id, resource_id__in=resource_ids
+        ).values_list("resource_id", flat=True)
+    )
+    for resource_id in set(resource_ids) - set(has_perm_resource_ids):
+        AppResourcePermission.objects.get_or_create(
+            gateway=gateway,
+            resource_id=resource_id,
+            bk_app_code=bk_app_code,
+            defaults={"expires": api_perm.expires, "grant_type": GrantTypeEnum.SYNC.value},
+        )
+
+
+@pytest.mark.parametrize("bulk", [False, True], ids=["legacy", "bulk"])
+def test_sync_from_gateway_permission(benchmark, bulk):
+    benchmark.group = "permission-sync"
+    gateway = G(Gateway)
+    G(AppGatewayPermission, gateway=gateway, bk_app_code=BK_APP_CODE)
+    # 资源权限的 resource_id 不要求资源存在，无需创建资源
+    resource_ids = list(range(1, RESOURCE_COUNT + 1))
+    sync = ResourcePermissionHandler.sync_from_gateway_permission if bulk else sync_from_gateway_permission_legacy
+
+    def setup():
+        AppResourcePermission.objects.filter(gateway=gateway).delete()
+
+    benchmark.pedantic(sync, args=(gateway, BK_APP_CODE, resource_ids), setup=setup, rounds=5)
+
+    assert AppResourcePermission.objects.filter(gateway=gateway).count() == RESOURCE_COUNT
+    benchmark.extra_info["resource_count"] = RESOURCE_COUNT
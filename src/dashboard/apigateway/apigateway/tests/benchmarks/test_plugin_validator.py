@@ -0,0 +1,96 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""插件配置批量校验的微基准测试：每次调用 jsonschema.validate 与使用已编译的校验器的吞吐
+
+pytest --ds apigateway.settings --benchmark-only apigateway/tests/benchmarks/test_plugin_validator.py
+"""
+
+import pytest
+from jsonschema import ValidationError as JsonSchemaValidationError
+from jsonschema import validate
+
+from apigateway.service.plugin import (
+    PluginConfigYamlChecker,
+    PluginConfigYamlValidator,
+    PluginConvertorFactory,
+    plugin_schema_validator_registry,
+)
+from apigateway.utils.yaml import yaml_dumps, yaml_loads
+
+CONFIG_COUNT = 200
+
+PLUGIN_TYPE_CODE = "bk-header-rewrite"
+
+SCHEMA = {
+    "type": "object",
+    "minProperties": 1,
+    "additionalProperties": False,
+    "properties": {
+        "set": {
+            "type": "object",
+            "patternProperties": {"^[^:]+$": {"oneOf": [{"type": "string"}, {"type": "number"}]}},
+        },
+        "remove": {"type": "array", "items": {"type": "string", "pattern": "^[^:]+$"}},
+    },
+}
+
+
+def validate_legacy(plugin_type_code, payload, schema):
+    """与使用校验器注册表之前相同：checker 与 schema 校验各解析一次 yaml，每次重新校验 schema 并创建校验器"""
+    PluginConfigYamlChecker(plugin_type_code).check(payload)
+
+    convertor = PluginConvertorFactory.get_convertor(plugin_type_code)
+    try:
+        validate(convertor.convert(yaml_loads(payload)), schema=schema)
+    except JsonSchemaValidationError as err:
+        raise ValueError(f"{err.message}, path {list(err.absolute_path)}")
+
+
+def _make_payloads():
+    return [
+        yaml_dumps(
+            {
+                "set": [{"key": f"x-header-{index}-{i}", "value": f"value-{i}"} for i in range(3)],
+                "remove": [{"key": f"x-remove-{index}"}],
+            }
+        )
+        for index in range(CONFIG_COUNT)
+    ]
+
+
+@pytest.mark.parametrize("compiled", [False, True], ids=["legacy", "compiled"])
+def test_bulk_validate_plugin_configs(benchmark, compiled):
+    benchmark.group = "plugin-config-validate"
+    payloads = _make_payloads()
+    plugin_schema_validator_registry.clear()
+
+    if compiled:
+        validator = PluginConfigYamlValidator()
+
+        def run():
+            for payload in payloads:
+                validator.validate(PLUGIN_TYPE_CODE, payload, SCHEMA)
+
+    else:
+
+        def run():
+            for payload in payloads:
+                validate_legacy(PLUGIN_TYPE_CODE, payload, SCHEMA)
+
+    benchmark(run)
+    benchmark.extra_info["config_count"] = CONFIG_COUNT
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+"""发布链路基准测试：ReleaseData -> GatewayApisixResourceTransformer -> pydantic 模型 -> EtcdRegistry
+
+运行方式（在 src/dashboard/apigateway 目录下）：
+
+    pytest --ds apigateway.settings --benchmark-only apigateway/tests/benchmarks
+
+- etcd 请求数、序列化字节数、峰值内存与 baseline.json 比较，更新基线时设置 BK_APIGW_BENCHMARK_UPDATE_BASELINE=1
+- 耗时可使用 --benchmark-autosave 保存，再使用 --benchmark-compare --benchmark-compare-fail=mean:20% 比较
+"""
+
+import tracemalloc
+from typing import Callable
+
+import pytest
+
+from apigateway.controller.distributor.etcd import GatewayResourceDistributor
+from apigateway.controller.release_tracer import ReleasePhaseTracer
+from apigateway.controller.transformer import GatewayApisixResourceTransformer
+from apigateway.core.models import Release
+
+from .fake_etcd import FakeEtcdClient
+from .synthetic import SyntheticGatewayFactory
+
+RESOURCE_COUNTS = [100, 1000, 10000]
+# 每个规模的计时轮数，保证较大规模的基准测试在可接受的时间内完成
+ROUNDS = {100: 10, 1000: 3, 10000: 1}
+
+
+def measure_peak_memory(func: Callable) -> int:
+    """执行 func，返回执行期间 python 分配内存的峰值（字节）"""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+class ReleasePipeline:
+    def __init__(self, resource_count: int, etcd_client: FakeEtcdClient):
+        self.resource_count = resource_count
+        self.etcd_client = etcd_client
+
+        factory = SyntheticGatewayFactory(resource_count)
+        self.release_id = factory.create_release().id
+        self.data_plane = factory.create_data_plane()
+        self.publish_id = factory.create_release_history(self.get_release(), self.data_plane).id
+
+    def get_release(self) -> Release:
+        # 每次从 db 重新加载，计入加载资源版本数据的耗时
+        return Release.objects.get(id=self.release_id)
+
+    def transform(self) -> int:
+        transformer = GatewayApisixResourceTransformer(
+            self.get_release(), self.data_plane.apisix_version, publish_id=self.publish_id
+        )
+        transformer.transform()
+        return len(list(transformer.get_transformed_resources()))
+
+    def distribute(self):
+        distributor = GatewayResourceDistributor(self.get_release(), self.data_plane)
+        is_success, message = distributor.distribute(release_task_id="benchmark", publish_id=self.publish_id)
+        assert is_success, message
+
+    def reset_etcd(self):
+        self.etcd_client.clear()
+        self.etcd_client.reset_stats()
+
+
+@pytest.fixture(autouse=True)
+def frozen_publish_time(mocker):
+    # 发布时间会写入 BkRelease 等资源，固定发布时间，使写入 etcd 的数据量不受运行时刻影响
+    for module in ["bk_release", "route"]:
+        mocker.patch(f"apigateway.controller.convertor.{module}.now_str", return_value="2026-01-01 00:00:00")
+
+
+@pytest.fixture
+def fake_etcd_client(mocker):
+    etcd_client = FakeEtcdClient()
+    mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client", return_value=etcd_client)
+    return etcd_client
+
+
+@pytest.fixture(params=RESOURCE_COUNTS, ids=lambda count: f"{count}-resources")
+def pipeline(request, db, fake_etcd_client):
+    return ReleasePipeline(request.param, fake_etcd_client)
+
+
+def test_transform(benchmark, pipeline, metrics_baseline):
+    benchmark.group = "release-transform"
+    resource_count = benchmark.pedantic(pipeline.transform, rounds=ROUNDS[pipeline.resource_count])
+
+    metrics = {
+        "apisix_resources": resource_count,
+        "peak_memory": measure_peak_memory(pipeline.transform),
+    }
+    benchmark.extra_info.update(metrics)
+    metrics_baseline.check(f"transform[{pipeline.resource_count}]", metrics)
+
+
+def test_distribute_to_empty_etcd(benchmark, pipeline, metrics_baseline):
+    """首次发布：数据面中没有该网关环境的数据，全部资源均需写入"""
+    benchmark.group = "release-distribute-empty"
+    benchmark.pedantic(pipeline.distribute, setup=pipeline.reset_etcd, rounds=ROUNDS[pipeline.resource_count])
+
+    pipeline.reset_etcd()
+    metrics = {"peak_memory": measure_peak_memory(pipeline.distribute)}
+    metrics.update(pipeline.etcd_client.stats.as_dict())
+    benchmark.extra_info.update(metrics)
+    metrics_baseline.check(f"distribute_to_empty_etcd[{pipeline.resource_count}]", metrics)
+
+    # 各阶段耗时仅供参考，不与基线比较
+    pipeline.reset_etcd()
+    with ReleasePhaseTracer() as tracer:
+        pipeline.distribute()
+    benchmark.extra_info["phase_timings"] = tracer.get_timings()
+
+
+def test_distribute_to_empty_etcd_streaming(benchmark, pipeline, metrics_baseline, settings):
+    """首次发布，流式同步：路由边转换边写入，峰值内存不随资源数量线性增长"""
+    settings.RELEASE_STREAMING_SYNC_ENABLED = True
+    benchmark.group = "release-distribute-empty"
+    benchmark.pedantic(pipeline.distribute, setup=pipeline.reset_etcd, rounds=ROUNDS[pipeline.resource_count])
+
+    pipeline.reset_etcd()
+    metrics = {"peak_memory": measure_peak_memory(pipeline.distribute)}
+    metrics.update(pipeline.etcd_client.stats.as_dict())
+    benchmark.extra_info.update(metrics)
+    metrics_baseline.check(f"distribute_to_empty_etcd_streaming[{pipeline.resource_count}]", metrics)
+
+
+def test_redistribute(benchmark, pipeline, metrics_baseline):
+    """重复发布：数据面中已存在本次发布的全部数据，如发布任务重试"""
+    benchmark.group = "release-redistribute"
+    pipeline.distribute()
+    benchmark.pedantic(
+        pipeline.distribute, setup=pipeline.etcd_client.reset_stats, rounds=ROUNDS[pipeline.resource_count]
+    )
+
+    pipeline.etcd_client.reset_stats()
+    metrics = {"peak_memory": measure_peak_memory(pipeline.distribute)}
+    metrics.update(pipeline.etcd_client.stats.as_dict())
+    benchmark.extra_info.update(metrics)
+    metrics_baseline.check(f"redistribute[{pipeline.resource_count}]", metrics)
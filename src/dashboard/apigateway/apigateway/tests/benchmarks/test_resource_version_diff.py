@@ -0,0 +1,80 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+"""资源版本对比的微基准测试：逐个解析、对比所有资源与先跳过数据相同的资源、只对比变化的资源的耗时
+
+pytest --ds apigateway.settings --benchmark-only apigateway/tests/benchmarks/test_resource_version_diff.py
+"""
+
+import copy
+
+import pytest
+
+from apigateway.biz.resource_version import ResourceDifferHandler
+
+from .synthetic import make_resource_config
+
+RESOURCE_COUNT = 5000
+# 目标版本中变化的资源比例，与日常小步迭代发布的版本相近
+CHANGED_RATIO = 0.02
+
+
+def diff_resource_version_data_parse_all(source_data, target_data):
+    """与跳过数据相同的资源之前相同，所有资源都解析为 ResourceDifferHandler 后再对比"""
+    target_data_map = {item["id"]: item for item in target_data}
+    resource_update = []
+    for source_resource_data_raw in source_data:
+        source_resource_differ = ResourceDifferHandler.model_validate(source_resource_data_raw)
+        target_resource_data = target_data_map.pop(source_resource_data_raw["id"], None)
+        if not target_resource_data:
+            continue
+
+        target_resource_differ = ResourceDifferHandler.model_validate(target_resource_data)
+        source_diff_value, target_diff_value = source_resource_differ.diff(target_resource_differ)
+        if source_diff_value or target_diff_value:
+            resource_update.append((source_diff_value, target_diff_value))
+    return resource_update
+
+
+def _make_versions():
+    source_data = [make_resource_config(index, [1, 2, 3], 4) for index in range(RESOURCE_COUNT)]
+    for resource in source_data:
+        resource["doc_updated_time"] = {}
+        # 版本数据中的插件包含插件配置的 id、name
+        for plugin_index, plugin in enumerate(resource["plugins"]):
+            plugin.update(id=resource["id"] * 10 + plugin_index, name=f"{plugin['type']}-{resource['id']}")
+
+    target_data = copy.deepcopy(source_data)
+    for resource in target_data[:: int(1 / CHANGED_RATIO)]:
+        resource["description"] = "changed"
+    return source_data, target_data
+
+
+@pytest.mark.parametrize("skip_unchanged", [False, True], ids=["parse_all", "skip_unchanged"])
+def test_diff_resource_version_data(benchmark, skip_unchanged):
+    benchmark.group = "resource-version-diff"
+    source_data, target_data = _make_versions()
+
+    if skip_unchanged:
+        result = benchmark(
+            lambda: ResourceDifferHandler.diff_resource_version_data(source_data, target_data, {}, {})["update"]
+        )
+    else:
+        result = benchmark(lambda: diff_resource_version_data_parse_all(source_data, target_data))
+
+    assert len(result) == RESOURCE_COUNT * CHANGED_RATIO
+    benchmark.extra_info["resource_count"] = RESOURCE_COUNT
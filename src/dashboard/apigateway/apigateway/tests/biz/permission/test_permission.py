@@ -87,6 +87,57 @@ class TestResourcePermissionHandler:
         ResourcePermissionHandler.sync_from_gateway_permission(gateway, bk_app_code, [resource.id])
         assert AppResourcePermission.objects.filter(gateway=gateway, bk_app_code=bk_app_code).count() == 1
 
+    def test_sync_from_gateway_permission_bulk(self, django_assert_max_num_queries):
+        bk_app_code = "test"
+        gateway = G(Gateway)
+        resource_ids = [G(Resource, gateway=gateway).id for _ in range(5)]
+        api_perm = G(AppGatewayPermission, gateway=gateway, bk_app_code=bk_app_code)
+        existing = G(
+            AppResourcePermission,
+            gateway=gateway,
+            bk_app_code=bk_app_code,
+            resource_id=resource_ids[0],
+            grant_type="apply",
+            expires=now_datetime() + datetime.timedelta(days=1),
+        )
+
+        # 查询网关权限、已有资源权限，批量创建缺失的资源权限
+        with django_assert_max_num_queries(3):
+            ResourcePermissionHandler.sync_from_gateway_permission(gateway, bk_app_code, resource_ids)
+
+        permissions = AppResourcePermission.objects.filter(gateway=gateway, bk_app_code=bk_app_code)
+        assert sorted(permissions.values_list("resource_id", flat=True)) == sorted(resource_ids)
+        for permission in permissions.exclude(id=existing.id):
+            assert permission.grant_type == "sync"
+            assert permission.expires == api_perm.expires
+
+        # 已有的资源权限保持不变
+        existing_after = AppResourcePermission.objects.get(id=existing.id)
+        assert existing_after.grant_type == "apply"
+        assert existing_after.expires == existing.expires
+
+    def test_renew_resource_permissions_by_resource_ids(self):
+        bk_app_code = "test"
+        gateway_1 = G(Gateway)
+        gateway_2 = G(Gateway)
+        resource_1 = G(Resource, gateway=gateway_1)
+        resource_2 = G(Resource, gateway=gateway_2)
+        G(AppGatewayPermission, gateway=gateway_1, bk_app_code=bk_app_code, expires=now_datetime())
+        G(AppGatewayPermission, gateway=gateway_2, bk_app_code=bk_app_code, expires=now_datetime())
+
+        ResourcePermissionHandler.renew_resource_permissions_by_resource_ids(
+            bk_app_code, [resource_1.id, resource_2.id], expire_days=180
+        )
+
+        permissions = AppResourcePermission.objects.filter(bk_app_code=bk_app_code)
+        assert {(perm.gateway_id, perm.resource_id) for perm in permissions} == {
+            (gateway_1.id, resource_1.id),
+            (gateway_2.id, resource_2.id),
+        }
+        for permission in permissions:
+            assert permission.grant_type == "renew"
+            assert permission.expires > now_datetime() + datetime.timedelta(days=179)
+
     @pytest.mark.parametrize("permission_model", [AppGatewayPermission, AppResourcePermission])
     @pytest.mark.parametrize("app_code", ["public", "personal"])
     def test_validate_user_managed_permissions_rejects_oauth2_builtin(
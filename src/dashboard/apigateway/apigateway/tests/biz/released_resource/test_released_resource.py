@@ -169,7 +169,7 @@ class TestReleasedResourceHandler:
                 resource_name=f"resource-{index}",
                 resource_method="GET",
                 resource_path=f"/resource-{index}/",
-                data={},
+                _data={},
             )
             resource_ids.append(resource_id)
 
@@ -31,6 +31,7 @@ from apigateway.biz.resource_version import (
     ResourceMockProxy,
     ResourcePluginConfig,
 )
+from apigateway.biz.resource_version.diff import ResourceVersionDiffCache
 
 
 class Group(BaseModel, DiffMixin):
@@ -599,3 +600,64 @@ class TestResourceDifferHandler:
                 }
             ],
         }
+
+    @patch("apigateway.biz.resource_version.ResourceDifferHandler.model_validate")
+    def test_diff_resource_version_data_skip_unchanged(self, mock_parse_obj):
+        source_data = [{"id": 1, "name": "n1", "method": "GET", "path": "/p1"}]
+        # 与源版本相同，仅 key 的顺序不同
+        target_data = [{"path": "/p1", "method": "GET", "name": "n1", "id": 1}]
+
+        result = ResourceDifferHandler.diff_resource_version_data(source_data, target_data, {}, {})
+
+        assert result == {"add": [], "delete": [], "update": []}
+        # 资源数据相同，无需解析资源数据
+        mock_parse_obj.assert_not_called()
+
+    @patch("apigateway.biz.resource_version.ResourceDifferHandler.model_validate")
+    def test_diff_resource_version_data_doc_updated(self, mock_parse_obj):
+        class ResourceDifferMock(BaseModel, DiffMixin):
+            id: int
+            path: str
+            doc_updated_time: Dict[str, str]
+
+        mock_parse_obj.side_effect = ResourceDifferMock.model_validate
+        source_data = [{"id": 1, "path": "/p1"}]
+        target_data = [{"id": 1, "path": "/p1"}]
+
+        # 资源数据相同，但文档有更新
+        result = ResourceDifferHandler.diff_resource_version_data(
+            source_data, target_data, {1: {"zh": "2026-01-01"}}, {1: {"zh": "2026-01-02"}}
+        )
+
+        assert len(result["update"]) == 1
+        assert result["update"][0]["target"]["diff"] == {"doc_updated_time": {"zh": "2026-01-02"}}
+
+
+class TestResourceVersionDiffCache:
+    def test_get_or_diff(self, mocker):
+        cache = ResourceVersionDiffCache(maxsize=10, ttl=60)
+        differ = mocker.Mock(return_value={"add": [], "delete": [], "update": []})
+
+        assert cache.get_or_diff(1, None, 2, differ) == differ.return_value
+        assert cache.get_or_diff(1, None, 2, differ) == differ.return_value
+        assert differ.call_count == 1
+
+        # 不同的版本对、网关，分别缓存
+        cache.get_or_diff(1, 2, 3, differ)
+        cache.get_or_diff(2, 2, 3, differ)
+        assert differ.call_count == 3
+
+    def test_invalidate(self, mocker):
+        cache = ResourceVersionDiffCache(maxsize=10, ttl=60)
+        differ = mocker.Mock(return_value={})
+        cache.get_or_diff(1, 1, 2, differ)
+        cache.get_or_diff(1, 2, 3, differ)
+        cache.get_or_diff(1, 3, 4, differ)
+
+        cache.invalidate(2)
+
+        cache.get_or_diff(1, 3, 4, differ)
+        assert differ.call_count == 3
+        cache.get_or_diff(1, 1, 2, differ)
+        cache.get_or_diff(1, 2, 3, differ)
+        assert differ.call_count == 5
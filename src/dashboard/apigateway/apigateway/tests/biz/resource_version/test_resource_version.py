@@ -32,6 +32,13 @@ from apigateway.utils.time import now_datetime
 
 
 class TestResourceVersionHandler:
+    def test_get_resource_id(self, fake_resource_version):
+        resource = fake_resource_version.data[0]
+
+        assert ResourceVersionHandler.get_resource_id(fake_resource_version.id, resource["name"]) == resource["id"]
+        assert ResourceVersionHandler.get_resource_id(fake_resource_version.id, "not-exists") == -1
+        assert ResourceVersionHandler.get_resource_id(0, resource["name"]) == -1
+
     def test_make_version(self, fake_gateway, fake_resource):
         ResourceHandler.save_auth_config(
             fake_resource.id,
@@ -69,6 +76,20 @@ class TestResourceVersionHandler:
         ResourceVersionHandler.create_resource_version(gateway, {"comment": "test", "version": "1.1.0"}, "admin")
         assert ResourceVersion.objects.filter(gateway=gateway).count() == 1
 
+    def test_create_resource_version_records_used_stage_vars(self, fake_gateway, mocker):
+        mocker.patch.object(
+            ResourceVersionHandler,
+            "make_version",
+            return_value=[{"proxy": {"type": "http"}, "stage_vars": {"in_path": ["prefix"], "in_host": ["domain"]}}],
+        )
+
+        resource_version = ResourceVersionHandler.create_resource_version(
+            fake_gateway, {"comment": "test", "version": "1.1.0"}, "admin"
+        )
+
+        resource_version.refresh_from_db()
+        assert resource_version.used_stage_vars == {"in_path": ["prefix"], "in_host": ["domain"]}
+
     def test_create_resource_version_with_artifacts(self, fake_gateway, fake_resource, mocker):
         mocker.patch.object(ResourceVersionHandler, "make_version", return_value=[])
         mocker.patch(
@@ -88,6 +109,27 @@ class TestResourceVersionHandler:
         assert ResourceDocVersion.objects.filter(gateway=fake_gateway, resource_version=result).exists()
         assert OpenAPIFileResourceSchemaVersion.objects.filter(gateway=fake_gateway, resource_version=result).exists()
 
+    def test_create_resource_version_with_artifacts_warm_up_export_cache(
+        self, fake_gateway, mocker, django_capture_on_commit_callbacks
+    ):
+        mocker.patch.object(ResourceVersionHandler, "make_version", return_value=[])
+        mocker.patch(
+            "apigateway.biz.resource_version.artifacts.OpenAPIExportManager.export_resource_version_openapi",
+            return_value="openapi: 3.0.1",
+        )
+        mock_warm_up = mocker.patch(
+            "apigateway.biz.resource_version.artifacts.OpenAPIExportManager.warm_up_resource_version_openapi"
+        )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            result = ResourceVersionArtifactHandler.create_resource_version_with_artifacts(
+                gateway=fake_gateway,
+                data={"version": "20260526120002", "comment": "warm up"},
+                username="admin",
+            )
+
+        mock_warm_up.assert_called_once_with(result, "openapi: 3.0.1")
+
     def test_create_resource_version_with_artifacts_without_doc(self, fake_gateway, mocker):
         """Test that OpenAPIFileResourceSchemaVersion is created even when no ResourceDoc exists."""
         mocker.patch.object(ResourceVersionHandler, "make_version", return_value=[])
@@ -217,7 +259,7 @@ class TestResourceVersionHandler:
             resource_name=fake_resource.name,
             resource_method=fake_resource.method,
             resource_path=fake_resource.path,
-            data={},
+            _data={},
         )
 
         for stage_name, stage_status in release_stage_specs:
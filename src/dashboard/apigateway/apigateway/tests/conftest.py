@@ -43,7 +43,11 @@ from apigateway.apps.plugin.models import PluginBinding, PluginConfig, PluginTyp
 from apigateway.apps.support.models import GatewaySDK, ReleasedResourceDoc, ResourceDoc, ResourceDocVersion
 from apigateway.biz.resource import ResourceHandler
 from apigateway.biz.resource.models import ResourceAuthConfig, ResourceBackendConfig, ResourceData
-from apigateway.biz.resource_version import ResourceDocVersionHandler, ResourceVersionHandler
+from apigateway.biz.resource_version import (
+    ResourceDocVersionHandler,
+    ResourceVersionHandler,
+    resource_version_diff_cache,
+)
 from apigateway.common.factories import SchemaFactory
 from apigateway.core.constants import (
     ContextScopeTypeEnum,
@@ -70,6 +74,7 @@ from apigateway.core.models import (
 )
 from apigateway.schema.data.meta_schema import init_meta_schemas
 from apigateway.service.contexts import GatewayAuthContext
+from apigateway.service.resource_version import get_resource_name_to_id
 from apigateway.tests.utils.testing import dummy_time, get_response_json
 from apigateway.utils.yaml import yaml_dumps
 
@@ -580,7 +585,7 @@ def fake_released_resource(fake_gateway, fake_resource1, fake_resource_version,
         resource_name=fake_resource1.name,
         resource_method=fake_resource1.method,
         resource_path=fake_resource1.path,
-        data=resource_data,
+        _data=resource_data,
         is_public=resource_data.get("is_public", False),
         oauth2_public_client_enabled=auth_config.get("oauth2_public_client_enabled", False),
         oauth2_personal_client_enabled=auth_config.get("oauth2_personal_client_enabled", False),
@@ -747,6 +752,13 @@ def mock_rest_framework_settings(settings):
     settings.REST_FRAMEWORK.update({"DATETIME_FORMAT": "%Y-%m-%d %H:%M:%S"})
 
 
+@pytest.fixture(autouse=True)
+def clear_resource_version_caches():
+    # 各用例的数据在事务回滚后被清理，id 可能被复用，避免命中其它用例缓存的版本数据
+    resource_version_diff_cache.clear()
+    get_resource_name_to_id.cache_clear()
+
+
 @shared_task(name="testing.mock")
 def celery_mock_task_for_testing(celery_task_mocker=None, *args, **kwargs):
     if celery_task_mocker:
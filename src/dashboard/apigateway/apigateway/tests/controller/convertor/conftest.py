@@ -18,6 +18,8 @@
 #
 import pytest
 
+from apigateway.controller.release_data import ReleaseConvertCache
+
 
 @pytest.fixture
 def fake_release_data(mocker, fake_gateway, fake_stage):
@@ -25,6 +27,7 @@ def fake_release_data(mocker, fake_gateway, fake_stage):
     release_data = mocker.Mock()
     release_data.gateway = fake_gateway
     release_data.stage = fake_stage
+    release_data.convert_cache = ReleaseConvertCache(fake_stage.vars)
     release_data.stage_backend_configs = {}
     release_data.get_stage_plugins = mocker.Mock(return_value=[])
     release_data.jwt_private_key = "test-jwt-key"
@@ -29,7 +29,7 @@ from apigateway.controller.convertor.constants import (
 )
 from apigateway.controller.models import Route, Timeout
 from apigateway.controller.models.constants import HttpMethodEnum
-from apigateway.controller.release_data import PluginData, StageBackendConfig
+from apigateway.controller.release_data import PluginData, ReleaseConvertCache, StageBackendConfig
 from apigateway.core.constants import BackendKindEnum, BackendTypeEnum, ProxyTypeEnum, ResourceKindEnum
 
 APISIX_VERSION_3_13 = DataPlaneApisixVersionEnum.V3_13.value
@@ -98,6 +98,7 @@ class TestRouteConvertor:
         mock_data.gateway.name = "test-gateway"
         mock_data.stage.name = "test-stage"
         mock_data.stage.vars = {"env": "test"}
+        mock_data.convert_cache = ReleaseConvertCache(mock_data.stage.vars)
         mock_data.resource_configs = []
         mock_data.stage_backend_configs = {
             1: _backend_snapshot(1, BackendKindEnum.STANDARD.value),
@@ -189,6 +190,44 @@ class TestRouteConvertor:
         assert route.uris == ["/api/test-gateway/test-stage/__apigw_version"]
         assert route.methods == [HttpMethodEnum.GET]
 
+    def test_convert_with_resource_ids(self, mock_release_data, backend_service_mapping):
+        resource_1 = _standard_resource()
+        resource_2 = dict(_standard_resource(), id=2, name="another-resource")
+        mock_release_data.resource_configs = [resource_1, resource_2]
+        convertor = RouteConvertor(
+            release_data=mock_release_data,
+            backend_service_mapping=backend_service_mapping,
+            publish_id=123,
+            apisix_version=APISIX_VERSION_3_13,
+            revoke_flag=False,
+            resource_ids={2},
+        )
+
+        routes = convertor.convert()
+
+        # 只转换指定的资源，版本探测路由总是生成
+        assert [route.id for route in routes] == ["test-gateway.test-stage.2", "test-gateway.test-stage.-1"]
+
+    def test_iter_convert(self, mock_release_data, backend_service_mapping):
+        mock_release_data.resource_configs = [_standard_resource(), dict(_standard_resource(), id=2, name="another")]
+        convertor = RouteConvertor(
+            release_data=mock_release_data,
+            backend_service_mapping=backend_service_mapping,
+            publish_id=123,
+            apisix_version=APISIX_VERSION_3_13,
+            revoke_flag=False,
+        )
+
+        routes = convertor.iter_convert()
+
+        assert next(routes).id == "test-gateway.test-stage.1"
+        assert [route.id for route in routes] == ["test-gateway.test-stage.2", "test-gateway.test-stage.-1"]
+        assert [route.id for route in convertor.convert()] == [
+            "test-gateway.test-stage.1",
+            "test-gateway.test-stage.2",
+            "test-gateway.test-stage.-1",
+        ]
+
     def test_release_version_detect_route_carries_apisix_version(self, mock_release_data, backend_service_mapping):
         """The __apigw_version detect route body and labels must reflect the data plane apisix_version"""
         convertor = RouteConvertor(
@@ -26,7 +26,7 @@ from apigateway.common.constants import DEFAULT_BACKEND_HOST_FOR_MISSING
 from apigateway.controller.convertor import ServiceConvertor
 from apigateway.controller.convertor.base import GatewayResourceConvertor
 from apigateway.controller.convertor.constants import LABEL_KEY_APISIX_VERSION, LABEL_KEY_BACKEND_ID
-from apigateway.controller.release_data import PluginData, StageBackendConfig
+from apigateway.controller.release_data import PluginData, ReleaseConvertCache, StageBackendConfig
 from apigateway.core.constants import BackendKindEnum, BackendTypeEnum, LoadBalanceTypeEnum
 
 APISIX_VERSION_3_13 = DataPlaneApisixVersionEnum.V3_13.value
@@ -90,6 +90,7 @@ class TestServiceConvertor:
         release_data.stage.name = "prod"
         release_data.stage.description = "Production environment"
         release_data.stage.vars = {}
+        release_data.convert_cache = ReleaseConvertCache(release_data.stage.vars)
         release_data.stage_backend_configs = {}
         release_data.get_stage_plugins.return_value = []
         release_data.jwt_private_key = "test-key"
@@ -145,7 +146,7 @@ class TestServiceConvertor:
             convertor._build_standard_service(backend_config)
 
     def test_build_standard_service(self, mock_release_data):
-        mock_release_data.stage.vars = {"domain": "example.com"}
+        mock_release_data.stage.vars.update({"domain": "example.com"})
         backend_config = _standard_backend_config(
             1,
             "backend-service",
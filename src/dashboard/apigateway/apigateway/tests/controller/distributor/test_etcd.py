@@ -26,6 +26,7 @@ from apigateway.controller.distributor.connection import (
     check_gateway_distributor_connection,
 )
 from apigateway.controller.distributor.etcd import GatewayResourceDistributor, GlobalResourceDistributor, SyncFail
+from apigateway.controller.distributor.incremental import IncrementalReleasePlan
 
 APISIX_VERSION_3_13 = DataPlaneApisixVersionEnum.V3_13.value
 APISIX_VERSION_3_16 = DataPlaneApisixVersionEnum.V3_16.value
@@ -61,7 +62,7 @@ class TestGatewayResourceDistributor:
         mock_release.stage = mocker.Mock()
         mock_release.stage.name = "prod"
         mock_data_plane = mocker.Mock()
-        mocker.patch("apigateway.controller.distributor.etcd.new_etcd_client")
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client")
         distributor = GatewayResourceDistributor(mock_release, mock_data_plane)
         assert isinstance(distributor, BaseDistributor)
 
@@ -71,7 +72,7 @@ class TestGatewayResourceDistributor:
         mock_data_plane.id = 1
         mock_data_plane.name = "default"
         mock_etcd_client = mocker.Mock()
-        mocker.patch("apigateway.controller.distributor.etcd.new_etcd_client", return_value=mock_etcd_client)
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client", return_value=mock_etcd_client)
 
         distributor = GatewayResourceDistributor(mock_release, mock_data_plane)
         success, message = distributor.test_connection()
@@ -87,7 +88,7 @@ class TestGatewayResourceDistributor:
         mock_data_plane.name = "default"
         mock_etcd_client = mocker.Mock()
         mock_etcd_client.status.side_effect = RuntimeError("connect failed")
-        mocker.patch("apigateway.controller.distributor.etcd.new_etcd_client", return_value=mock_etcd_client)
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client", return_value=mock_etcd_client)
 
         distributor = GatewayResourceDistributor(mock_release, mock_data_plane)
         success, message = distributor.test_connection()
@@ -103,7 +104,7 @@ class TestGatewayResourceDistributor:
         mock_data_plane.name = "default"
         mock_data_plane.etcd_configs = {}
         mocker.patch(
-            "apigateway.controller.distributor.etcd.new_etcd_client",
+            "apigateway.controller.distributor.etcd.get_pooled_etcd_client",
             side_effect=RuntimeError("connect failed"),
         )
 
@@ -120,7 +121,7 @@ class TestGatewayResourceDistributor:
         mock_release.gateway = mocker.Mock()
         mock_release.gateway.name = "test-gateway"
         mock_data_plane = mocker.Mock()
-        mocker.patch("apigateway.controller.distributor.etcd.new_etcd_client")
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client")
         distributor = GatewayResourceDistributor(mock_release, mock_data_plane)
         assert distributor.gateway == mock_release.gateway
 
@@ -130,7 +131,7 @@ class TestGatewayResourceDistributor:
         mock_release.stage = mocker.Mock()
         mock_release.stage.name = "prod"
         mock_data_plane = mocker.Mock()
-        mocker.patch("apigateway.controller.distributor.etcd.new_etcd_client")
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client")
         distributor = GatewayResourceDistributor(mock_release, mock_data_plane)
         assert distributor.stage == mock_release.stage
 
@@ -149,7 +150,7 @@ class TestGatewayResourceDistributor:
         mock_release.gateway = mock_gateway
         mock_release.stage = mock_stage
         mock_data_plane = mocker.Mock()
-        mocker.patch("apigateway.controller.distributor.etcd.new_etcd_client")
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client")
         # FIXME: mock release
         distributor = GatewayResourceDistributor(mock_release, mock_data_plane)
         registry = distributor._get_registry(mock_gateway, mock_stage)
@@ -172,7 +173,7 @@ class TestGatewayResourceDistributor:
         mock_data_plane = mocker.Mock()
         mock_data_plane.id = 1
         mock_data_plane.etcd_namespace_prefix = ""
-        mocker.patch("apigateway.controller.distributor.etcd.new_etcd_client")
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client")
         distributor = GatewayResourceDistributor(mock_release, mock_data_plane)
 
         with pytest.raises(ValueError, match="etcd_namespace_prefix is empty"):
@@ -198,7 +199,7 @@ class TestGatewayResourceDistributor:
         mocker.patch("apigateway.controller.distributor.etcd.ReleaseProcedureLogger")
 
         mock_data_plane = mocker.Mock()
-        mocker.patch("apigateway.controller.distributor.etcd.new_etcd_client")
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client")
         distributor = GatewayResourceDistributor(mock_release, mock_data_plane)
         success, message = distributor.distribute(release_task_id="test-task-id", publish_id=123)
 
@@ -221,7 +222,7 @@ class TestGatewayResourceDistributor:
         mocker.patch("apigateway.controller.distributor.etcd.ReleaseProcedureLogger")
 
         mock_data_plane = mocker.Mock()
-        mocker.patch("apigateway.controller.distributor.etcd.new_etcd_client")
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client")
         distributor = GatewayResourceDistributor(mock_release, mock_data_plane)
         success, message = distributor.distribute(release_task_id="test-task-id", publish_id=123)
 
@@ -229,6 +230,115 @@ class TestGatewayResourceDistributor:
         assert "distribute gateway resources to etcd failed" in message
         assert "Test error" in message
 
+    def test_distribute_incremental(self, mocker, settings):
+        settings.INCREMENTAL_RELEASE_ENABLED = True
+        mock_release = mocker.Mock()
+        mock_release.gateway.name = "test-gateway"
+        mock_release.stage.name = "prod"
+
+        mock_route = mocker.Mock(id="test-gateway.prod.1")
+        mock_bk_release = mocker.Mock(id="bk.release.test-gateway.prod")
+        mock_transformer = mocker.patch("apigateway.controller.distributor.etcd.GatewayApisixResourceTransformer")
+        mock_transformer_instance = mock_transformer.return_value
+        mock_transformer_instance.get_stage_config_digest.return_value = "digest"
+        mock_transformer_instance.get_incremental_resources.return_value = [mock_route, mock_bk_release]
+
+        mock_planner = mocker.patch("apigateway.controller.distributor.etcd.IncrementalReleasePlanner")
+        mock_planner.return_value.plan.return_value = (
+            IncrementalReleasePlan(changed_resource_ids={1, 2}, deleted_resource_ids={3}),
+            "ok",
+        )
+
+        mock_registry = mocker.patch("apigateway.controller.distributor.etcd.EtcdRegistry")
+        mock_registry_instance = mock_registry.return_value
+        mock_registry_instance.patch_resources.return_value = []
+        mocker.patch("apigateway.controller.distributor.etcd.ReleaseProcedureLogger")
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client")
+
+        distributor = GatewayResourceDistributor(mock_release, mocker.Mock())
+        success, _ = distributor.distribute(release_task_id="test-task-id", publish_id=123)
+
+        assert success is True
+        mock_planner.return_value.plan.assert_called_once_with("digest")
+        mock_transformer_instance.transform.assert_called_once_with(resource_ids={1, 2, 3})
+        mock_registry_instance.sync_resources_by_key_prefix.assert_not_called()
+        # 资源 2 变更后不再生成路由，资源 3 已删除，均需删除其路由
+        mock_registry_instance.patch_resources.assert_called_once_with(
+            [mock_route, mock_bk_release],
+            [("route", "test-gateway.prod.2"), ("route", "test-gateway.prod.3")],
+        )
+
+    def test_distribute_incremental_fallback(self, mocker, settings):
+        settings.INCREMENTAL_RELEASE_ENABLED = True
+        mock_release = mocker.Mock()
+
+        mock_transformer = mocker.patch("apigateway.controller.distributor.etcd.GatewayApisixResourceTransformer")
+        mock_transformer.return_value.get_transformed_resources.return_value = []
+        mock_planner = mocker.patch("apigateway.controller.distributor.etcd.IncrementalReleasePlanner")
+        mock_planner.return_value.plan.return_value = (None, "stage config changed")
+
+        mock_registry = mocker.patch("apigateway.controller.distributor.etcd.EtcdRegistry")
+        mock_registry_instance = mock_registry.return_value
+        mock_registry_instance.sync_resources_by_key_prefix.return_value = []
+        mocker.patch("apigateway.controller.distributor.etcd.ReleaseProcedureLogger")
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client")
+
+        distributor = GatewayResourceDistributor(mock_release, mocker.Mock())
+        success, _ = distributor.distribute(release_task_id="test-task-id", publish_id=123)
+
+        assert success is True
+        mock_transformer.return_value.transform.assert_called_once_with()
+        mock_registry_instance.sync_resources_by_key_prefix.assert_called_once_with([])
+        mock_registry_instance.patch_resources.assert_not_called()
+
+    def test_distribute_incremental_disabled(self, mocker, settings):
+        settings.INCREMENTAL_RELEASE_ENABLED = False
+        mocker.patch("apigateway.controller.distributor.etcd.GatewayApisixResourceTransformer")
+        mock_planner = mocker.patch("apigateway.controller.distributor.etcd.IncrementalReleasePlanner")
+        mock_registry = mocker.patch("apigateway.controller.distributor.etcd.EtcdRegistry")
+        mock_registry.return_value.sync_resources_by_key_prefix.return_value = []
+        mocker.patch("apigateway.controller.distributor.etcd.ReleaseProcedureLogger")
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client")
+
+        distributor = GatewayResourceDistributor(mocker.Mock(), mocker.Mock())
+        success, _ = distributor.distribute(release_task_id="test-task-id", publish_id=123)
+
+        assert success is True
+        mock_planner.assert_not_called()
+
+    def test_distribute_streaming(self, mocker, settings):
+        settings.INCREMENTAL_RELEASE_ENABLED = False
+        settings.RELEASE_STREAMING_SYNC_ENABLED = True
+        mock_transformer = mocker.patch("apigateway.controller.distributor.etcd.GatewayApisixResourceTransformer")
+        mock_resources = mock_transformer.return_value.iter_transformed_resources.return_value
+        mock_registry = mocker.patch("apigateway.controller.distributor.etcd.EtcdRegistry")
+        mock_registry_instance = mock_registry.return_value
+        mock_registry_instance.sync_resources_by_key_prefix.return_value = []
+        mocker.patch("apigateway.controller.distributor.etcd.ReleaseProcedureLogger")
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client")
+
+        distributor = GatewayResourceDistributor(mocker.Mock(), mocker.Mock())
+        success, _ = distributor.distribute(release_task_id="test-task-id", publish_id=123)
+
+        assert success is True
+        mock_transformer.return_value.transform.assert_not_called()
+        mock_registry_instance.sync_resources_by_key_prefix.assert_called_once_with(mock_resources, streaming=True)
+
+    def test_distribute_streaming_sync_fail(self, mocker, settings):
+        settings.INCREMENTAL_RELEASE_ENABLED = False
+        settings.RELEASE_STREAMING_SYNC_ENABLED = True
+        mocker.patch("apigateway.controller.distributor.etcd.GatewayApisixResourceTransformer")
+        mock_registry = mocker.patch("apigateway.controller.distributor.etcd.EtcdRegistry")
+        mock_registry.return_value.sync_resources_by_key_prefix.return_value = ["route-1"]
+        mocker.patch("apigateway.controller.distributor.etcd.ReleaseProcedureLogger")
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client")
+
+        distributor = GatewayResourceDistributor(mocker.Mock(), mocker.Mock())
+        success, message = distributor.distribute(release_task_id="test-task-id", publish_id=123)
+
+        assert success is False
+        assert "sync resources failed" in message
+
     def test_revoke_with_delete_publish_id(self, mocker):
         """Test revoke method with DELETE_PUBLISH_ID"""
         mock_release = mocker.Mock()
@@ -250,7 +360,7 @@ class TestGatewayResourceDistributor:
 
         mock_data_plane = mocker.Mock()
         mock_data_plane.apisix_version = APISIX_VERSION_3_13
-        mocker.patch("apigateway.controller.distributor.etcd.new_etcd_client")
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client")
         distributor = GatewayResourceDistributor(mock_release, mock_data_plane)
         success, message = distributor.revoke(release_task_id="test-task-id", publish_id=DELETE_PUBLISH_ID)
 
@@ -277,13 +387,15 @@ class TestGatewayResourceDistributor:
         mocker.patch("apigateway.controller.distributor.etcd.ReleaseProcedureLogger")
 
         mock_data_plane = mocker.Mock()
-        mocker.patch("apigateway.controller.distributor.etcd.new_etcd_client")
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client")
         distributor = GatewayResourceDistributor(mock_release, mock_data_plane)
         success, message = distributor.revoke(release_task_id="test-task-id", publish_id=123)
 
         assert success is True
         assert message == "ok"
         mock_registry_instance.delete_resources_by_key_prefix.assert_called_once()
+        # key_prefix 已清空，同步时不再读取已存在的资源
+        assert mock_registry_instance.sync_resources_by_key_prefix.call_args.kwargs == {"prefix_cleared": True}
 
     def test_revoke_failure(self, mocker):
         """Test revoke method failure case"""
@@ -301,7 +413,7 @@ class TestGatewayResourceDistributor:
         mocker.patch("apigateway.controller.distributor.etcd.ReleaseProcedureLogger")
 
         mock_data_plane = mocker.Mock()
-        mocker.patch("apigateway.controller.distributor.etcd.new_etcd_client")
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client")
         distributor = GatewayResourceDistributor(mock_release, mock_data_plane)
         success, message = distributor.revoke(release_task_id="test-task-id", publish_id=123)
 
@@ -325,7 +437,7 @@ class TestGatewayResourceDistributor:
 
         mock_data_plane = mocker.Mock()
         mock_data_plane.apisix_version = APISIX_VERSION_3_16
-        mocker.patch("apigateway.controller.distributor.etcd.new_etcd_client")
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client")
         distributor = GatewayResourceDistributor(mock_release, mock_data_plane)
         distributor.distribute(release_task_id="test-task-id", publish_id=123)
 
@@ -347,7 +459,7 @@ class TestGatewayResourceDistributor:
 
         mock_data_plane = mocker.Mock()
         mock_data_plane.apisix_version = APISIX_VERSION_3_16
-        mocker.patch("apigateway.controller.distributor.etcd.new_etcd_client")
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client")
         distributor = GatewayResourceDistributor(mock_release, mock_data_plane)
         distributor.revoke(release_task_id="test-task-id", publish_id=123)
 
@@ -362,7 +474,7 @@ class TestGlobalResourceDistributor:
         mock_data_plane = mocker.Mock()
         mock_data_plane.etcd_configs = {"host": "127.0.0.1", "port": 2379}
         mock_data_plane.etcd_namespace_prefix = "/bk-gateway"
-        mocker.patch("apigateway.controller.distributor.etcd.new_etcd_client")
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client")
         distributor = GlobalResourceDistributor(mock_data_plane)
         assert isinstance(distributor, BaseDistributor)
 
@@ -375,7 +487,7 @@ class TestGlobalResourceDistributor:
 
         # Mock EtcdRegistry
         mock_etcd_registry = mocker.patch("apigateway.controller.distributor.etcd.EtcdRegistry")
-        mocker.patch("apigateway.controller.distributor.etcd.new_etcd_client", return_value=mocker.Mock())
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client", return_value=mocker.Mock())
 
         mock_data_plane = mocker.Mock()
         mock_data_plane.etcd_configs = {"host": "127.0.0.1", "port": 2379}
@@ -416,7 +528,7 @@ class TestGlobalResourceDistributor:
         mock_data_plane = mocker.Mock()
         mock_data_plane.etcd_configs = {"host": "127.0.0.1", "port": 2379}
         mock_data_plane.etcd_namespace_prefix = "/bk-gateway"
-        mocker.patch("apigateway.controller.distributor.etcd.new_etcd_client")
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client")
         distributor = GlobalResourceDistributor(mock_data_plane)
         success, message = distributor.distribute(release_task_id="test-task-id", publish_id=123)
 
@@ -435,6 +547,24 @@ class TestGlobalResourceDistributor:
         assert {"type": "route", "name": "test-route"} in call_args
         assert {"type": "service", "name": "test-service"} in call_args
 
+    def test_distribute_with_resources(self, mocker):
+        mock_transformer = mocker.patch("apigateway.controller.distributor.etcd.GlobalApisixResourceTransformer")
+        mock_registry = mocker.patch("apigateway.controller.distributor.etcd.EtcdRegistry")
+        mock_registry.return_value.sync_resources_by_key_prefix.return_value = []
+        mocker.patch("apigateway.controller.distributor.etcd.ReleaseProcedureLogger")
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client")
+
+        mock_data_plane = mocker.Mock()
+        mock_data_plane.etcd_namespace_prefix = "/bk-gateway"
+        distributor = GlobalResourceDistributor(mock_data_plane)
+        resources = [mocker.Mock()]
+        success, _ = distributor.distribute(release_task_id="test-task-id", publish_id=123, resources=resources)
+
+        assert success is True
+        # 已转换好的资源，无需再次转换
+        mock_transformer.assert_not_called()
+        mock_registry.return_value.sync_resources_by_key_prefix.assert_called_once_with(resources)
+
     def test_distribute_sync_fail(self, mocker):
         """Test distribute method when sync fails with SyncFail exception"""
         # Mock GlobalApisixResourceTransformer
@@ -453,7 +583,7 @@ class TestGlobalResourceDistributor:
         mock_data_plane = mocker.Mock()
         mock_data_plane.etcd_configs = {"host": "127.0.0.1", "port": 2379}
         mock_data_plane.etcd_namespace_prefix = "/bk-gateway"
-        mocker.patch("apigateway.controller.distributor.etcd.new_etcd_client")
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client")
         distributor = GlobalResourceDistributor(mock_data_plane)
         success, message = distributor.distribute(release_task_id="test-task-id", publish_id=123)
 
@@ -478,7 +608,7 @@ class TestGlobalResourceDistributor:
         mock_data_plane = mocker.Mock()
         mock_data_plane.etcd_configs = {"host": "127.0.0.1", "port": 2379}
         mock_data_plane.etcd_namespace_prefix = "/bk-gateway"
-        mocker.patch("apigateway.controller.distributor.etcd.new_etcd_client")
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client")
         distributor = GlobalResourceDistributor(mock_data_plane)
         success, message = distributor.distribute(release_task_id="test-task-id", publish_id=123)
 
@@ -505,7 +635,7 @@ class TestGlobalResourceDistributor:
         mock_data_plane = mocker.Mock()
         mock_data_plane.etcd_configs = {"host": "127.0.0.1", "port": 2379}
         mock_data_plane.etcd_namespace_prefix = "/bk-gateway"
-        mocker.patch("apigateway.controller.distributor.etcd.new_etcd_client")
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client")
         distributor = GlobalResourceDistributor(mock_data_plane)
         success, message = distributor.distribute(release_task_id="test-task-id", publish_id=123)
 
@@ -519,7 +649,7 @@ class TestGlobalResourceDistributor:
         mock_data_plane = mocker.Mock()
         mock_data_plane.etcd_configs = {"host": "127.0.0.1", "port": 2379}
         mock_data_plane.etcd_namespace_prefix = "/bk-gateway"
-        mocker.patch("apigateway.controller.distributor.etcd.new_etcd_client")
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client")
         distributor = GlobalResourceDistributor(mock_data_plane)
 
         with pytest.raises(NotImplementedError):
@@ -530,7 +660,7 @@ class TestGlobalResourceDistributor:
         mock_data_plane.id = 1
         mock_data_plane.etcd_configs = {"host": "127.0.0.1", "port": 2379}
         mock_data_plane.etcd_namespace_prefix = ""
-        mocker.patch("apigateway.controller.distributor.etcd.new_etcd_client")
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client")
         distributor = GlobalResourceDistributor(mock_data_plane)
 
         with pytest.raises(ValueError, match="etcd_namespace_prefix is empty"):
@@ -548,7 +678,7 @@ class TestGlobalResourceDistributor:
         mock_data_plane.apisix_version = APISIX_VERSION_3_16
         mock_data_plane.etcd_configs = {"host": "127.0.0.1", "port": 2379}
         mock_data_plane.etcd_namespace_prefix = "/bk-gateway"
-        mocker.patch("apigateway.controller.distributor.etcd.new_etcd_client")
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client")
         distributor = GlobalResourceDistributor(mock_data_plane)
         distributor.distribute(release_task_id="test-task-id", publish_id=123)
 
@@ -0,0 +1,155 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import copy
+
+import pytest
+from ddf import G
+
+from apigateway.apps.data_plane.constants import DataPlaneApisixVersionEnum
+from apigateway.apps.data_plane.models import DataPlane
+from apigateway.controller.convertor.constants import LABEL_KEY_STAGE_CONFIG_DIGEST
+from apigateway.controller.distributor.incremental import (
+    IncrementalReleasePlan,
+    IncrementalReleasePlanner,
+    get_resource_config_digests,
+)
+from apigateway.controller.models import BkRelease, Labels
+from apigateway.core.models import ReleaseHistory, ResourceVersion
+
+APISIX_VERSION = DataPlaneApisixVersionEnum.V3_13.value
+
+
+def test_get_resource_config_digests():
+    digests = get_resource_config_digests([{"id": 1, "a": 1, "b": 2}, {"id": 2, "b": 2, "a": 1}])
+
+    assert set(digests) == {1, 2}
+    # 只与内容相关，与 key 的顺序无关
+    assert get_resource_config_digests([{"b": 2, "a": 1, "id": 1}])[1] == digests[1]
+
+
+def test_incremental_release_plan():
+    plan = IncrementalReleasePlan(changed_resource_ids={1, 2}, deleted_resource_ids={3})
+
+    assert plan.affected_resource_ids == {1, 2, 3}
+    assert str(plan) == "changed=2, deleted=1"
+
+
+class TestIncrementalReleasePlanner:
+    @pytest.fixture
+    def data_plane(self):
+        return G(DataPlane, apisix_version=APISIX_VERSION)
+
+    @pytest.fixture
+    def published_resource_version(self, fake_release):
+        data = copy.deepcopy(fake_release.resource_version.data)
+        # 第一个资源在新版本中发生了变化
+        data[0]["description"] = "changed"
+        # 已删除的资源
+        data.append(dict(data[0], id=999999))
+        resource_version = G(ResourceVersion, gateway=fake_release.gateway, version="1.0.0")
+        resource_version.data = data
+        resource_version.save()
+        return resource_version
+
+    @pytest.fixture
+    def previous_history(self, fake_release, data_plane):
+        return G(ReleaseHistory, gateway=fake_release.gateway, stage=fake_release.stage, data_plane=data_plane)
+
+    def _make_published(self, publish_id, digest="digest", apisix_version=APISIX_VERSION, resource_version="1.0.0"):
+        return BkRelease(
+            id="bk.release.test.prod",
+            publish_id=publish_id,
+            publish_time="2026-01-01 00:00:00",
+            apisix_version=apisix_version,
+            resource_version=resource_version,
+            labels=Labels(**{LABEL_KEY_STAGE_CONFIG_DIGEST: digest}),
+        )
+
+    def _make_planner(self, mocker, release, data_plane, published, publish_id):
+        registry = mocker.Mock()
+        registry.get_resource.return_value = published
+        return IncrementalReleasePlanner(release, data_plane, registry, publish_id)
+
+    def test_plan(self, mocker, fake_release, data_plane, published_resource_version, previous_history):
+        current_history = G(
+            ReleaseHistory, gateway=fake_release.gateway, stage=fake_release.stage, data_plane=data_plane
+        )
+        planner = self._make_planner(
+            mocker, fake_release, data_plane, self._make_published(previous_history.id), current_history.id
+        )
+
+        plan, reason = planner.plan("digest")
+
+        assert reason == "ok"
+        assert plan.changed_resource_ids == {fake_release.resource_version.data[0]["id"]}
+        assert plan.deleted_resource_ids == {999999}
+
+    @pytest.mark.parametrize(
+        "published_kwargs, digest, expected_reason",
+        [
+            ({"digest": "old"}, "digest", "stage config changed"),
+            ({"apisix_version": "3.11"}, "digest", "apisix version changed"),
+            ({"resource_version": "not-exists"}, "digest", "published resource version not-exists not found"),
+        ],
+    )
+    def test_plan_fallback(
+        self,
+        mocker,
+        fake_release,
+        data_plane,
+        published_resource_version,
+        previous_history,
+        published_kwargs,
+        digest,
+        expected_reason,
+    ):
+        current_history = G(
+            ReleaseHistory, gateway=fake_release.gateway, stage=fake_release.stage, data_plane=data_plane
+        )
+        published = self._make_published(previous_history.id, **published_kwargs)
+        planner = self._make_planner(mocker, fake_release, data_plane, published, current_history.id)
+
+        assert planner.plan(digest) == (None, expected_reason)
+
+    def test_plan_no_release_history(self, mocker, fake_release, data_plane):
+        planner = self._make_planner(mocker, fake_release, data_plane, self._make_published(1), -1)
+
+        assert planner.plan("digest") == (None, "publish has no release history")
+        planner.registry.get_resource.assert_not_called()
+
+    def test_plan_no_published(self, mocker, fake_release, data_plane):
+        planner = self._make_planner(mocker, fake_release, data_plane, None, 10)
+
+        assert planner.plan("digest") == (None, "no release marker found in data plane")
+
+    def test_plan_previous_publish_failed(
+        self, mocker, fake_release, data_plane, published_resource_version, previous_history
+    ):
+        # 上一次发布失败，BkRelease 仍为更早的发布写入
+        failed_history = G(
+            ReleaseHistory, gateway=fake_release.gateway, stage=fake_release.stage, data_plane=data_plane
+        )
+        current_history = G(
+            ReleaseHistory, gateway=fake_release.gateway, stage=fake_release.stage, data_plane=data_plane
+        )
+        assert failed_history.id < current_history.id
+        planner = self._make_planner(
+            mocker, fake_release, data_plane, self._make_published(previous_history.id), current_history.id
+        )
+
+        assert planner.plan("digest") == (None, "previous publish to the data plane was not applied completely")
@@ -0,0 +1,93 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import threading
+from unittest.mock import Mock
+
+from apigateway.controller.distributor.parallel import ParallelDistributeExecutor
+
+
+def _make_data_planes(count):
+    data_planes = []
+    for i in range(count):
+        data_plane = Mock(id=i + 1)
+        data_plane.name = f"dp-{i + 1}"
+        data_planes.append(data_plane)
+    return data_planes
+
+
+class TestParallelDistributeExecutor:
+    def test_default_settings(self, settings):
+        settings.DATA_PLANE_DISTRIBUTE_MAX_WORKERS = 3
+        settings.DATA_PLANE_DISTRIBUTE_TIMEOUT = 10
+
+        executor = ParallelDistributeExecutor()
+
+        assert executor.max_workers == 3
+        assert executor.timeout == 10
+
+    def test_run_empty(self):
+        assert ParallelDistributeExecutor(max_workers=2, timeout=1).run([], Mock()) == []
+
+    def test_run_concurrently(self):
+        data_planes = _make_data_planes(3)
+        # 所有数据面同时到达屏障才能继续，串行执行将超时
+        barrier = threading.Barrier(3, timeout=5)
+
+        def distribute(data_plane):
+            barrier.wait()
+            return True, f"ok-{data_plane.name}"
+
+        results = ParallelDistributeExecutor(max_workers=3, timeout=5).run(data_planes, distribute)
+
+        assert [result.data_plane for result in results] == data_planes
+        assert all(result.is_success for result in results)
+        assert [result.message for result in results] == ["ok-dp-1", "ok-dp-2", "ok-dp-3"]
+
+    def test_run_partial_failure(self):
+        data_planes = _make_data_planes(3)
+
+        def distribute(data_plane):
+            if data_plane.id == 2:
+                return False, "sync failed"
+            if data_plane.id == 3:
+                raise RuntimeError("connect failed")
+            return True, "ok"
+
+        results = ParallelDistributeExecutor(max_workers=2, timeout=5).run(data_planes, distribute)
+
+        assert [result.is_success for result in results] == [True, False, False]
+        assert results[1].message == "sync failed"
+        assert results[2].message == "RuntimeError: connect failed"
+
+    def test_run_timeout(self):
+        data_planes = _make_data_planes(2)
+        release = threading.Event()
+
+        def distribute(data_plane):
+            if data_plane.id == 1:
+                release.wait(5)
+            return True, "ok"
+
+        try:
+            results = ParallelDistributeExecutor(max_workers=2, timeout=0.2).run(data_planes, distribute)
+        finally:
+            release.set()
+
+        assert results[0].is_success is False
+        assert results[0].message == "distribute to data_plane[dp-1] timeout"
+        assert results[1].is_success is True
@@ -0,0 +1,47 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关 (BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from apigateway.controller.drift import DriftCheckResult, DriftCheckResultEnum
+
+
+@pytest.fixture
+def mock_check_release_drift(mocker):
+    return mocker.patch("apigateway.controller.management.commands.detect_release_drift.check_release_drift")
+
+
+def test_detect_release_drift(mock_check_release_drift, capsys, mocker):
+    manifest = mocker.Mock()
+    mock_check_release_drift.return_value = [
+        DriftCheckResult(manifest, DriftCheckResultEnum.CLEAN),
+        DriftCheckResult(manifest, DriftCheckResultEnum.REPAIRED, repaired_count=2),
+    ]
+
+    call_command("detect_release_drift", "--gateway-names", "foo", "--repair")
+
+    mock_check_release_drift.assert_called_once_with(repair=True, data_plane_names=None, gateway_names=["foo"])
+    assert "checked 2 stages: {'clean': 1, 'repaired': 1}" in capsys.readouterr().out
+
+
+def test_detect_release_drift_failed(mock_check_release_drift, mocker):
+    mock_check_release_drift.return_value = [DriftCheckResult(mocker.Mock(), DriftCheckResultEnum.ERROR)]
+
+    with pytest.raises(CommandError):
+        call_command("detect_release_drift")
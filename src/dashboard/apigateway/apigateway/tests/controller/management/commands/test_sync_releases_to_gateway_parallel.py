@@ -1,28 +1,78 @@
-from unittest import mock
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import json
 
 import pytest
 from ddf import G
+from django.core.management import call_command
+from django.core.management.base import CommandError
 
-from apigateway.controller.management.commands.sync_releases_to_gateway_parallel import sync_gateway
+from apigateway.controller.resync import GatewayResyncOutcome, ResyncStatusEnum
+from apigateway.core.constants import GatewayStatusEnum
 from apigateway.core.models import Gateway
 
-pytestmark = pytest.mark.django_db
 
+class TestCommand:
+    @pytest.fixture
+    def gateways(self):
+        return [
+            G(Gateway, name="sync-gw-1", status=GatewayStatusEnum.ACTIVE.value),
+            G(Gateway, name="sync-gw-2", status=GatewayStatusEnum.ACTIVE.value),
+        ]
 
-class TestSyncGateway:
-    @mock.patch("apigateway.controller.management.commands.sync_releases_to_gateway_parallel.logger")
-    @mock.patch(
-        "apigateway.controller.management.commands.sync_releases_to_gateway_parallel.publish.trigger_gateway_publish"
-    )
-    @mock.patch("django.db.connection.close")
-    def test_returns_gateway_name_when_publish_raises(self, mock_close, mock_trigger_gateway_publish, mock_logger):
-        gateway = G(Gateway, name="test-gateway")
-        mock_trigger_gateway_publish.side_effect = RuntimeError("boom")
+    @pytest.fixture
+    def mock_sync(self, mocker):
+        def sync(gateway):
+            status = ResyncStatusEnum.FAILED if gateway.name == "sync-gw-2" else ResyncStatusEnum.SUCCESS
+            return GatewayResyncOutcome(gateway.id, gateway.name, status)
 
-        result = sync_gateway(gateway)
+        return mocker.patch("apigateway.controller.resync.sync_gateway", side_effect=sync)
 
-        assert result == gateway.name
-        mock_close.assert_called_once()
-        mock_logger.exception.assert_called_once_with(
-            "syncing release for gateway %s failed with exception", gateway.name
+    def _call(self, checkpoint, *args):
+        call_command(
+            "sync_releases_to_gateway_parallel",
+            "--gateway-names",
+            "sync-gw-1",
+            "sync-gw-2",
+            "--concurrency",
+            "2",
+            "--checkpoint",
+            checkpoint,
+            *args,
         )
+
+    def test_handle_resume(self, tmp_path, gateways, mock_sync):
+        checkpoint = str(tmp_path / "checkpoint.json")
+
+        with pytest.raises(CommandError, match="failed gateway: sync-gw-2"):
+            self._call(checkpoint)
+        with open(checkpoint) as fp:
+            assert {outcome["gateway_name"] for outcome in json.load(fp)["outcomes"]} == {"sync-gw-1", "sync-gw-2"}
+
+        # 再次执行时，跳过已同步成功的网关，只重新同步失败的网关
+        mock_sync.reset_mock()
+        mock_sync.side_effect = lambda gateway: GatewayResyncOutcome(
+            gateway.id, gateway.name, ResyncStatusEnum.SUCCESS
+        )
+        self._call(checkpoint)
+        assert [call.args[0].name for call in mock_sync.call_args_list] == ["sync-gw-2"]
+
+        # --restart 忽略检查点，重新同步所有网关
+        mock_sync.reset_mock()
+        self._call(checkpoint, "--restart")
+        assert mock_sync.call_count == 2
@@ -0,0 +1,80 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import fakeredis
+import pytest
+
+from apigateway.controller.constants import COALESCED_ROLLING_UPDATE_RELEASE_TASK_NAME
+from apigateway.controller.publisher.coalesce import PublishCoalescer
+
+
+class TestPublishCoalescer:
+    @pytest.fixture
+    def redis_client(self, mocker):
+        client = fakeredis.FakeRedis()
+        mocker.patch("apigateway.controller.publisher.coalesce.get_default_redis_client", return_value=client)
+        return client
+
+    @pytest.fixture
+    def mock_send_task(self, mocker):
+        return mocker.patch("apigateway.controller.publisher.coalesce.current_app.send_task")
+
+    def test_enabled(self):
+        assert PublishCoalescer(window_seconds=3).enabled is True
+        assert PublishCoalescer(window_seconds=0).enabled is False
+
+    def test_submit_coalesce(self, redis_client, mock_send_task):
+        coalescer = PublishCoalescer(window_seconds=3)
+
+        assert coalescer.submit("backend_update", "admin", 1, 2) is True
+        assert coalescer.submit("backend_update", "admin", 1, 2) is False
+        assert coalescer.submit("plugin_update", "admin", 1, 2) is False
+        # another stage is scheduled separately
+        assert coalescer.submit("backend_update", "admin", 1, 3) is True
+
+        assert mock_send_task.call_count == 2
+        mock_send_task.assert_any_call(
+            COALESCED_ROLLING_UPDATE_RELEASE_TASK_NAME,
+            kwargs={"source": "backend_update", "author": "admin", "gateway_id": 1, "stage_id": 2},
+            countdown=3,
+        )
+
+    def test_pop_pending(self, redis_client, mock_send_task):
+        coalescer = PublishCoalescer(window_seconds=3)
+        for _ in range(3):
+            coalescer.submit("backend_update", "admin", 1, 2)
+
+        assert coalescer.pop_pending(1, 2) == 3
+
+        # the trigger after popping schedules a new task, so the last change is always released
+        assert coalescer.submit("backend_update", "admin", 1, 2) is True
+        assert mock_send_task.call_count == 2
+
+    def test_marker_timeout(self, redis_client, mock_send_task):
+        coalescer = PublishCoalescer(window_seconds=3)
+        coalescer.submit("backend_update", "admin", 1, 2)
+
+        assert 0 < redis_client.ttl(coalescer._get_marker_key(1, 2)) <= coalescer.marker_timeout
+
+    def test_submit_without_redis(self, mocker, mock_send_task):
+        mocker.patch("apigateway.controller.publisher.coalesce.get_default_redis_client", return_value=None)
+        coalescer = PublishCoalescer(window_seconds=3)
+
+        assert coalescer.submit("backend_update", "admin", 1, 2) is True
+        assert coalescer.submit("backend_update", "admin", 1, 2) is True
+        assert mock_send_task.call_args.kwargs["countdown"] == 0
+        assert coalescer.pop_pending(1, 2) == 1
@@ -26,6 +26,7 @@ from apigateway.controller.publisher.publish import (
     _trigger_revoke_deleting,
     _trigger_revoke_disable,
     _trigger_rolling_update,
+    coalesced_rolling_update_release,
     trigger_gateway_publish,
 )
 from apigateway.core.constants import (
@@ -333,6 +334,34 @@ class TestTriggerRollingUpdate:
         delay.assert_not_called()
 
 
+class TestCoalescedRollingUpdateRelease:
+    def test_run(self, mocker):
+        mock_pop_pending = mocker.patch(
+            "apigateway.controller.publisher.publish.publish_coalescer.pop_pending", return_value=5
+        )
+        release = Mock(spec=Release)
+        mock_filter = mocker.patch("apigateway.controller.publisher.publish.Release.objects.filter")
+        mock_filter.return_value.prefetch_related.return_value = [release]
+        mock_trigger = mocker.patch(
+            "apigateway.controller.publisher.publish._trigger_rolling_update", return_value=True
+        )
+
+        assert coalesced_rolling_update_release("backend_update", "admin", 1, 2) is True
+
+        mock_pop_pending.assert_called_once_with(1, 2)
+        mock_filter.assert_called_once_with(gateway_id=1, stage_id=2)
+        mock_trigger.assert_called_once_with(PublishSourceEnum.BACKEND_UPDATE, "admin", [release])
+
+    def test_no_release(self, mocker):
+        mocker.patch("apigateway.controller.publisher.publish.publish_coalescer.pop_pending", return_value=1)
+        mock_filter = mocker.patch("apigateway.controller.publisher.publish.Release.objects.filter")
+        mock_filter.return_value.prefetch_related.return_value = []
+        mock_trigger = mocker.patch("apigateway.controller.publisher.publish._trigger_rolling_update")
+
+        assert coalesced_rolling_update_release("backend_update", "admin", 1, 2) is True
+        mock_trigger.assert_not_called()
+
+
 class TestTriggerRevokeDisable:
     """Test _trigger_revoke_disable function"""
 
@@ -698,6 +727,40 @@ class TestTriggerGatewayPublish:
         assert result is True
         mock_trigger_rolling_update.assert_called_once()
 
+    def test_trigger_gateway_publish_rolling_update_coalesce(self, mocker, mock_release):
+        mock_release.gateway_id = 1
+        mock_release.stage_id = 2
+        mock_filter = mocker.patch("apigateway.controller.publisher.publish.Release.objects.filter")
+        mock_filter.return_value.prefetch_related.return_value.all.return_value = [mock_release]
+        mocker.patch("apigateway.controller.publisher.publish.publish_coalescer.window_seconds", 3)
+        mock_submit = mocker.patch("apigateway.controller.publisher.publish.publish_coalescer.submit")
+        mock_on_commit = mocker.patch(
+            "apigateway.controller.publisher.publish.transaction.on_commit", side_effect=lambda func: func()
+        )
+        mock_trigger_rolling_update = mocker.patch("apigateway.controller.publisher.publish._trigger_rolling_update")
+
+        result = trigger_gateway_publish(PublishSourceEnum.BACKEND_UPDATE, "test_user", gateway_id=1)
+
+        assert result is True
+        mock_on_commit.assert_called_once()
+        mock_submit.assert_called_once_with("backend_update", "test_user", 1, 2)
+        mock_trigger_rolling_update.assert_not_called()
+
+    def test_trigger_gateway_publish_rolling_update_coalesce_sync_mode(self, mocker, mock_release):
+        mock_filter = mocker.patch("apigateway.controller.publisher.publish.Release.objects.filter")
+        mock_filter.return_value.prefetch_related.return_value.all.return_value = [mock_release]
+        mocker.patch("apigateway.controller.publisher.publish.publish_coalescer.window_seconds", 3)
+        mock_submit = mocker.patch("apigateway.controller.publisher.publish.publish_coalescer.submit")
+        mock_trigger_rolling_update = mocker.patch(
+            "apigateway.controller.publisher.publish._trigger_rolling_update", return_value=True
+        )
+
+        result = trigger_gateway_publish(PublishSourceEnum.BACKEND_UPDATE, "test_user", gateway_id=1, is_sync=True)
+
+        assert result is True
+        mock_submit.assert_not_called()
+        mock_trigger_rolling_update.assert_called_once()
+
     @patch("apigateway.controller.publisher.publish._trigger_revoke_disable")
     @patch("apigateway.controller.publisher.publish.Release.objects.filter")
     def test_trigger_gateway_publish_revoke_disable(
@@ -36,6 +36,12 @@ class TestRegistry:
             def sync_resources_by_key_prefix(self, resources):
                 pass
 
+            def patch_resources(self, resources, deleted_resources):
+                pass
+
+            def get_resource(self, resource_type, id):
+                pass
+
             def delete_resources_by_key_prefix(self):
                 pass
 
@@ -121,6 +127,12 @@ class TestRegistry:
             def sync_resources_by_key_prefix(self, resources):
                 return []
 
+            def patch_resources(self, resources, deleted_resources):
+                return []
+
+            def get_resource(self, resource_type, id):
+                return None
+
             def delete_resources_by_key_prefix(self):
                 pass
 
@@ -21,7 +21,7 @@ import pytest
 
 from apigateway.controller.models import BaseUpstream, Labels, Service
 from apigateway.controller.registry.base import Registry
-from apigateway.controller.registry.etcd import EtcdRegistry
+from apigateway.controller.registry.etcd import EtcdRegistry, get_payload_digest, limit_etcd_write_rate
 
 
 class TestEtcdRegistry:
@@ -32,6 +32,14 @@ class TestEtcdRegistry:
         """Create a mock etcd client"""
         return mocker.Mock()
 
+    def _make_service(self, id_: str = "service-1", name: str = "test-service") -> Service:
+        return Service(
+            id=id_,
+            name=name,
+            labels=Labels(gateway="test", stage="prod"),
+            upstream=BaseUpstream(),
+        )
+
     def test_registry_type(self):
         """Test registry type"""
         assert EtcdRegistry.registry_type == "etcd"
@@ -54,16 +62,6 @@ class TestEtcdRegistry:
         assert registry._etcd_client == mock_client
         mock_get_client.assert_called_once()
 
-    def test_delete_by_key(self, mock_etcd_client):
-        """Test _delete_by_key method"""
-        mock_etcd_client.delete.return_value = True
-
-        registry = EtcdRegistry("/test/", etcd_client=mock_etcd_client)
-        result = registry._delete_by_key("/test/service/svc-1")
-
-        assert result is True
-        mock_etcd_client.delete.assert_called_once_with("/test/service/svc-1")
-
     def test_apply_resource(self, mock_etcd_client, mocker):
         """Test apply_resource method"""
         labels = Labels(gateway="test", stage="prod")
@@ -95,43 +93,378 @@ class TestEtcdRegistry:
         mock_kv = mocker.Mock()
         mock_kv.key = b"/test/service/old-service"
         mock_etcd_client.get_prefix.return_value = [(None, mock_kv)]
+        mock_etcd_client.get_range.return_value = [(b"{}", mock_kv)]
 
-        labels = Labels(gateway="test", stage="prod")
-        upstream = BaseUpstream()
-        service = Service(
-            id="service-1",
-            name="test-service",
-            labels=labels,
-            upstream=upstream,
-        )
+        service = self._make_service()
+        payload = service.model_dump_json(exclude_none=True)
 
         registry = EtcdRegistry("/test/", etcd_client=mock_etcd_client)
         failed = registry.sync_resources_by_key_prefix([service])
 
         assert failed == []
-        # Should apply the new resource
-        mock_etcd_client.put.assert_called()
-        # Should delete the old resource
-        mock_etcd_client.delete.assert_called_once_with("/test/service/old-service")
+        mock_etcd_client.get_prefix.assert_called_once_with("/test/", keys_only=True)
+        # Should apply the new resource and delete the old resource in one transaction
+        mock_etcd_client.transactions.put.assert_called_once_with("/test/service/service-1", payload)
+        mock_etcd_client.transactions.delete.assert_called_once_with("/test/service/old-service")
+        mock_etcd_client.transaction.assert_called_once()
+        mock_etcd_client.put.assert_not_called()
+        mock_etcd_client.delete.assert_not_called()
+
+        assert registry.sync_stats.put == 1
+        assert registry.sync_stats.deleted == 1
+        assert registry.sync_stats.unchanged == 0
+        assert registry.sync_stats.txn_count == 1
+        assert registry.sync_stats.payload_bytes_written == len(payload.encode())
+
+    def test_sync_resources_by_key_prefix_unchanged(self, mock_etcd_client, mocker):
+        """Test unchanged resources are not written again"""
+        service = self._make_service()
+
+        mock_kv = mocker.Mock()
+        mock_kv.key = b"/test/service/service-1"
+        mock_etcd_client.get_prefix.return_value = [(None, mock_kv)]
+        mock_etcd_client.get_range.return_value = [(service.model_dump_json(exclude_none=True).encode(), mock_kv)]
+
+        registry = EtcdRegistry("/test/", etcd_client=mock_etcd_client)
+        failed = registry.sync_resources_by_key_prefix([service])
+
+        assert failed == []
+        mock_etcd_client.transaction.assert_not_called()
+        assert registry.sync_stats.unchanged == 1
+        assert registry.sync_stats.put == 0
+        assert registry.sync_stats.deleted == 0
+        assert registry.sync_stats.payload_bytes_written == 0
+
+    def test_sync_resources_by_key_prefix_prefix_cleared(self, mock_etcd_client):
+        """Test existing resources are not read when key_prefix has been cleared"""
+        registry = EtcdRegistry("/test/", etcd_client=mock_etcd_client)
+        failed = registry.sync_resources_by_key_prefix([self._make_service()], prefix_cleared=True)
+
+        assert failed == []
+        mock_etcd_client.get_prefix.assert_not_called()
+        mock_etcd_client.get_range.assert_not_called()
+        assert registry.sync_stats.put == 1
+
+    def test_sync_resources_by_key_prefix_batches(self, mock_etcd_client, settings):
+        """Test changes are split into size-bounded transactions"""
+        settings.ETCD_SYNC_TXN_MAX_OPS = 2
+        mock_etcd_client.get_prefix.return_value = []
+
+        services = [self._make_service(f"service-{i}", f"test-service-{i}") for i in range(5)]
+
+        registry = EtcdRegistry("/test/", etcd_client=mock_etcd_client)
+        failed = registry.sync_resources_by_key_prefix(services)
+
+        assert failed == []
+        assert mock_etcd_client.transaction.call_count == 3
+        assert registry.sync_stats.put == 5
+        assert registry.sync_stats.txn_count == 3
+
+    def test_sync_resources_by_key_prefix_max_bytes(self, mock_etcd_client):
+        """Test transactions are bounded by txn_max_bytes"""
+        mock_etcd_client.get_prefix.return_value = []
+
+        services = [self._make_service(f"service-{i}", f"test-service-{i}") for i in range(3)]
+
+        registry = EtcdRegistry("/test/", etcd_client=mock_etcd_client, txn_max_bytes=1)
+        registry.sync_resources_by_key_prefix(services)
+
+        assert mock_etcd_client.transaction.call_count == 3
+
+    def test_sync_resources_by_key_prefix_duplicated_key(self, mock_etcd_client):
+        """Test the same key is never put twice in one transaction"""
+        mock_etcd_client.get_prefix.return_value = []
+        mock_etcd_client.transactions.put.side_effect = lambda key, value: ("put", key, value)
+
+        service = self._make_service()
+        renamed_service = self._make_service(name="renamed")
+
+        registry = EtcdRegistry("/test/", etcd_client=mock_etcd_client)
+        registry.sync_resources_by_key_prefix([service, renamed_service])
+
+        txn_calls = mock_etcd_client.transaction.call_args_list
+        assert [call.kwargs["success"] for call in txn_calls] == [
+            [("put", "/test/service/service-1", service.model_dump_json(exclude_none=True))],
+            [("put", "/test/service/service-1", renamed_service.model_dump_json(exclude_none=True))],
+        ]
+
+    def test_sync_resources_by_key_prefix_txn_error(self, mock_etcd_client):
+        """Test the failed batch and all following batches are returned when a transaction raises"""
+        mock_etcd_client.get_prefix.return_value = []
+        mock_etcd_client.transaction.side_effect = [None, Exception("request is too large"), None]
+
+        services = [self._make_service(f"service-{i}", f"test-service-{i}") for i in range(5)]
+
+        registry = EtcdRegistry("/test/", etcd_client=mock_etcd_client, txn_max_ops=2)
+        failed = registry.sync_resources_by_key_prefix(services)
+
+        assert failed == services[2:]
+        # Stop committing after the failed batch
+        assert mock_etcd_client.transaction.call_count == 2
+        assert registry.sync_stats.put == 2
+        assert registry.sync_stats.txn_count == 1
+
+    def test_sync_resources_by_key_prefix_streaming(self, mock_etcd_client, mocker):
+        """Test resources are consumed lazily and committed batch by batch in streaming mode"""
+        mock_kv = mocker.Mock()
+        mock_kv.key = b"/test/service/old-service"
+        mock_etcd_client.get_prefix.return_value = [(None, mock_kv)]
+        mock_etcd_client.get_range.return_value = [(b"{}", mock_kv)]
+
+        services = [self._make_service(f"service-{i}", f"test-service-{i}") for i in range(5)]
+        committed_txn_counts = []
+
+        def iter_services():
+            for service in services:
+                committed_txn_counts.append(mock_etcd_client.transaction.call_count)
+                yield service
+
+        registry = EtcdRegistry("/test/", etcd_client=mock_etcd_client, txn_max_ops=2)
+        failed = registry.sync_resources_by_key_prefix(iter_services(), streaming=True)
+
+        assert failed == []
+        # 批次凑满后即写入，不等待全部资源生成
+        assert committed_txn_counts == [0, 0, 0, 1, 1]
+        assert mock_etcd_client.transaction.call_count == 3
+        # 待同步资源全部生成后，才删除不存在的资源
+        mock_etcd_client.transactions.delete.assert_called_once_with("/test/service/old-service")
+        assert registry.sync_stats.put == 5
+        assert registry.sync_stats.deleted == 1
+
+    def test_sync_resources_by_key_prefix_streaming_txn_error(self, mock_etcd_client):
+        """Test only the failed batch is returned and no more resources are produced in streaming mode"""
+        mock_etcd_client.get_prefix.return_value = []
+        mock_etcd_client.transaction.side_effect = [None, Exception("request is too large"), None]
+
+        services = [self._make_service(f"service-{i}", f"test-service-{i}") for i in range(6)]
+        produced = []
+
+        def iter_services():
+            for service in services:
+                produced.append(service)
+                yield service
+
+        registry = EtcdRegistry("/test/", etcd_client=mock_etcd_client, txn_max_ops=2)
+        failed = registry.sync_resources_by_key_prefix(iter_services(), streaming=True)
+
+        assert failed == services[2:4]
+        # 第二个批次满后即写入，后续资源不再生成
+        assert produced == services[:5]
+        assert mock_etcd_client.transaction.call_count == 2
+        assert registry.sync_stats.put == 2
+
+    def test_patch_resources(self, mock_etcd_client, mocker):
+        manager = mocker.Mock()
+        manager.attach_mock(mock_etcd_client.transactions.put, "put")
+        manager.attach_mock(mock_etcd_client.transactions.delete, "delete")
+
+        service = self._make_service()
+        registry = EtcdRegistry("/test/", etcd_client=mock_etcd_client)
+        failed = registry.patch_resources([service], [("route", "test.prod.1")])
+
+        assert failed == []
+        # 只写入指定的资源，不读取 key_prefix 下已存在的资源
+        mock_etcd_client.get_prefix.assert_not_called()
+        # 删除操作先于写入操作
+        assert [c[0] for c in manager.mock_calls] == ["delete", "put"]
+        mock_etcd_client.transactions.delete.assert_called_once_with("/test/route/test.prod.1")
+        mock_etcd_client.transactions.put.assert_called_once_with(
+            "/test/service/service-1", service.model_dump_json(exclude_none=True)
+        )
+        assert registry.sync_stats.put == 1
+        assert registry.sync_stats.deleted == 1
+        assert registry.sync_stats.txn_count == 1
 
-    def test_get_exist_keys_by_key_prefix(self, mock_etcd_client, mocker):
-        """Test _get_exist_keys_by_key_prefix method"""
+    def test_patch_resources_txn_error(self, mock_etcd_client):
+        mock_etcd_client.transaction.side_effect = RuntimeError("txn failed")
+
+        service = self._make_service()
+        registry = EtcdRegistry("/test/", etcd_client=mock_etcd_client)
+
+        assert registry.patch_resources([service], []) == [service]
+
+    def test_sync_resources_by_key_prefix_record_digests(self, mock_etcd_client):
+        mock_etcd_client.get_prefix.return_value = []
+        services = [self._make_service(f"service-{i}", f"test-service-{i}") for i in range(2)]
+
+        registry = EtcdRegistry("/test/", etcd_client=mock_etcd_client)
+        registry.sync_resources_by_key_prefix(services)
+        assert registry.published_digests is None
+
+        registry = EtcdRegistry("/test/", etcd_client=mock_etcd_client, record_digests=True)
+        registry.sync_resources_by_key_prefix(services)
+
+        assert registry.published_digests.is_full is True
+        assert registry.published_digests.is_complete is True
+        assert registry.published_digests.digests == {
+            f"/test/service/{service.id}": get_payload_digest(service.model_dump_json(exclude_none=True))
+            for service in services
+        }
+
+    def test_sync_resources_by_key_prefix_record_digests_streaming_txn_error(self, mock_etcd_client):
+        mock_etcd_client.get_prefix.return_value = []
+        mock_etcd_client.transaction.side_effect = Exception("request is too large")
+        services = [self._make_service(f"service-{i}", f"test-service-{i}") for i in range(3)]
+
+        registry = EtcdRegistry("/test/", etcd_client=mock_etcd_client, txn_max_ops=1, record_digests=True)
+        registry.sync_resources_by_key_prefix(iter(services), streaming=True)
+
+        # 后续资源不再生成，摘要不完整
+        assert registry.published_digests.is_complete is False
+
+    def test_patch_resources_record_digests(self, mock_etcd_client):
+        service = self._make_service()
+
+        registry = EtcdRegistry("/test/", etcd_client=mock_etcd_client, record_digests=True)
+        registry.patch_resources([service], [("route", "test.prod.1")])
+
+        assert registry.published_digests.is_full is False
+        assert registry.published_digests.is_complete is True
+        assert registry.published_digests.digests == {
+            "/test/route/test.prod.1": None,
+            "/test/service/service-1": get_payload_digest(service.model_dump_json(exclude_none=True)),
+        }
+
+    def test_repair_keys(self, mock_etcd_client):
+        service = self._make_service()
+
+        registry = EtcdRegistry("/test/", etcd_client=mock_etcd_client)
+        failed = registry.repair_keys([service], ["/test/route/manual"])
+
+        assert failed == []
+        mock_etcd_client.transactions.delete.assert_called_once_with("/test/route/manual")
+        mock_etcd_client.transactions.put.assert_called_once_with(
+            "/test/service/service-1", service.model_dump_json(exclude_none=True)
+        )
+        assert registry.sync_stats.put == 1
+        assert registry.sync_stats.deleted == 1
+
+    def test_scan_digests_by_key_prefix(self, mock_etcd_client, mocker):
+        kvs = {}
+        for i in range(3):
+            kv = mocker.Mock()
+            kv.key = f"/test/route/route-{i}".encode()
+            kv.response_header.revision = 10
+            kvs[kv.key] = kv
+
+        mock_etcd_client.get_prefix.return_value = [(None, kv) for kv in reversed(list(kvs.values()))]
+        mock_etcd_client.get_range.side_effect = lambda range_start, range_end, revision: [
+            (b"{}", kv) for key, kv in sorted(kvs.items()) if range_start.encode() <= key < range_end
+        ]
+
+        registry = EtcdRegistry("/test/", etcd_client=mock_etcd_client, range_page_size=2)
+        digests, revision = registry.scan_digests_by_key_prefix()
+
+        assert revision == 10
+        assert digests == {key.decode(): get_payload_digest("{}") for key in kvs}
+        # 各分页均读取首个请求所在 revision 的快照
+        assert [call.kwargs for call in mock_etcd_client.get_range.call_args_list] == [{"revision": 10}] * 2
+
+    def test_scan_digests_by_key_prefix_empty(self, mock_etcd_client):
+        mock_etcd_client.get_prefix.return_value = []
+
+        registry = EtcdRegistry("/test/", etcd_client=mock_etcd_client)
+
+        assert registry.scan_digests_by_key_prefix() == ({}, None)
+        mock_etcd_client.get_range.assert_not_called()
+
+    def test_limit_etcd_write_rate(self, mock_etcd_client, mocker):
+        mock_bucket = mocker.patch("apigateway.controller.registry.etcd.TokenBucket")
+        mock_etcd_client.get_prefix.return_value = []
+        services = [self._make_service(f"service-{i}", f"test-service-{i}") for i in range(3)]
+        registry = EtcdRegistry("/test/", etcd_client=mock_etcd_client, txn_max_ops=2)
+
+        with limit_etcd_write_rate(100):
+            registry.sync_resources_by_key_prefix(services)
+            registry.apply_resource(services[0])
+
+        # 按每个事务中的 key 数量获取令牌
+        assert [call.args for call in mock_bucket.return_value.acquire.call_args_list] == [(2,), (1,), (1,)]
+
+        # 上下文之外不再限速
+        registry.sync_resources_by_key_prefix(services)
+        assert mock_bucket.return_value.acquire.call_count == 3
+
+    def test_limit_etcd_write_rate_unlimited(self, mocker):
+        mock_bucket = mocker.patch("apigateway.controller.registry.etcd.TokenBucket")
+
+        with limit_etcd_write_rate(0):
+            pass
+
+        mock_bucket.assert_not_called()
+
+    def test_get_resource(self, mock_etcd_client, mocker):
+        service = self._make_service()
+        mock_etcd_client.get.return_value = (service.model_dump_json(exclude_none=True).encode(), mocker.Mock())
+
+        registry = EtcdRegistry("/test/", etcd_client=mock_etcd_client)
+        result = registry.get_resource(Service, "service-1")
+
+        assert result == service
+        mock_etcd_client.get.assert_called_once_with("/test/service/service-1")
+
+    def test_get_resource_not_exist(self, mock_etcd_client):
+        mock_etcd_client.get.return_value = (None, None)
+
+        registry = EtcdRegistry("/test/", etcd_client=mock_etcd_client)
+
+        assert registry.get_resource(Service, "service-1") is None
+
+    def test_get_exist_digests_by_key_prefix(self, mock_etcd_client, mocker):
+        """Test _get_exist_digests_by_key_prefix method"""
         mock_kv1 = mocker.Mock()
         mock_kv1.key = b"/test/service/svc-1"
         mock_kv2 = mocker.Mock()
         mock_kv2.key = b"/test/route/route-1"
 
-        mock_etcd_client.get_prefix.return_value = [
-            (None, mock_kv1),
-            (None, mock_kv2),
+        mock_etcd_client.get_prefix.return_value = [(None, mock_kv1), (None, mock_kv2)]
+        mock_etcd_client.get_range.return_value = [
+            (b'{"id": "route-1"}', mock_kv2),
+            (b'{"id": "svc-1"}', mock_kv1),
+        ]
+
+        registry = EtcdRegistry("/test/", etcd_client=mock_etcd_client)
+        digests = registry._get_exist_digests_by_key_prefix()
+
+        assert digests == {
+            "/test/service/svc-1": get_payload_digest('{"id": "svc-1"}'),
+            "/test/route/route-1": get_payload_digest('{"id": "route-1"}'),
+        }
+        mock_etcd_client.get_range.assert_called_once_with("/test/route/route-1", b"/test/service/svc-1\x00")
+
+    def test_get_exist_digests_by_key_prefix_multi_pages(self, mock_etcd_client, mocker):
+        """Test values are read page by page with a moving start key"""
+        kvs = {}
+        for i in range(5):
+            kv = mocker.Mock()
+            kv.key = f"/test/route/route-{i}".encode()
+            kvs[kv.key] = kv
+
+        mock_etcd_client.get_prefix.return_value = [(None, kv) for kv in reversed(list(kvs.values()))]
+
+        def get_range(range_start, range_end):
+            return [(b"{}", kv) for key, kv in sorted(kvs.items()) if range_start.encode() <= key < range_end]
+
+        mock_etcd_client.get_range.side_effect = get_range
+
+        registry = EtcdRegistry("/test/", etcd_client=mock_etcd_client, range_page_size=2)
+        digests = registry._get_exist_digests_by_key_prefix()
+
+        assert digests == {key.decode(): get_payload_digest("{}") for key in kvs}
+        assert [call.args for call in mock_etcd_client.get_range.call_args_list] == [
+            ("/test/route/route-0", b"/test/route/route-1\x00"),
+            ("/test/route/route-2", b"/test/route/route-3\x00"),
+            ("/test/route/route-4", b"/test/route/route-4\x00"),
         ]
 
+    def test_get_exist_digests_by_key_prefix_empty(self, mock_etcd_client):
+        """Test no range request is sent when key_prefix is empty"""
+        mock_etcd_client.get_prefix.return_value = []
+
         registry = EtcdRegistry("/test/", etcd_client=mock_etcd_client)
-        keys = registry._get_exist_keys_by_key_prefix()
 
-        assert len(keys) == 2
-        assert "/test/service/svc-1" in keys
-        assert "/test/route/route-1" in keys
+        assert registry._get_exist_digests_by_key_prefix() == {}
+        mock_etcd_client.get_range.assert_not_called()
 
     def test_delete_resources_by_key_prefix(self, mock_etcd_client):
         """Test delete_resources_by_key_prefix method"""
@@ -21,7 +21,11 @@ from ddf import G
 from django.test import override_settings
 
 from apigateway.apps.permission.models import AppResourcePermission
-from apigateway.controller.tasks.clean_task import delete_old_app_resource_permission_records
+from apigateway.controller.tasks.clean_task import (
+    delete_old_app_resource_permission_records,
+    delete_unreferenced_released_resource_bodies,
+)
+from apigateway.core.models import ReleasedResource, ReleasedResourceBody
 from apigateway.utils.time import to_datetime_from_now
 
 pytestmark = pytest.mark.django_db
@@ -81,3 +85,17 @@ class TestDeleteOldAppResourcePermissionRecords:
         assert AppResourcePermission.objects.filter(id=other_app_recent_permission.id).exists()
         assert AppResourcePermission.objects.filter(id=not_expired_permission.id).exists()
         assert AppResourcePermission.objects.filter(id=permanent_permission.id).exists()
+
+
+class TestDeleteUnreferencedReleasedResourceBodies:
+    def test_delete(self, fake_gateway):
+        old_time = to_datetime_from_now(days=-2)
+        referenced = G(ReleasedResourceBody, gateway=fake_gateway, content_hash="referenced")
+        G(ReleasedResource, gateway=fake_gateway, body=referenced, _data={})
+        unreferenced = G(ReleasedResourceBody, gateway=fake_gateway, content_hash="unreferenced")
+        recent = G(ReleasedResourceBody, gateway=fake_gateway, content_hash="recent")
+        ReleasedResourceBody.objects.filter(id__in=[referenced.id, unreferenced.id]).update(updated_time=old_time)
+
+        delete_unreferenced_released_resource_bodies()
+
+        assert set(ReleasedResourceBody.objects.values_list("id", flat=True)) == {referenced.id, recent.id}
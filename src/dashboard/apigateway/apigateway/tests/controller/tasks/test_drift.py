@@ -0,0 +1,80 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关 (BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import pytest
+from ddf import G
+
+from apigateway.apps.data_plane.constants import DataPlaneStatusEnum
+from apigateway.apps.data_plane.models import DataPlane, DataPlaneReleaseManifest
+from apigateway.controller.drift import DriftCheckResult, DriftCheckResultEnum
+from apigateway.controller.metrics import release_drift_stages_gauge
+from apigateway.controller.tasks.drift import check_release_drift, detect_release_drift
+from apigateway.core.constants import StageStatusEnum
+from apigateway.core.models import Gateway, Stage
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def manifests():
+    data_plane = G(DataPlane, name="drift-plane", status=DataPlaneStatusEnum.ACTIVE.value)
+    inactive_data_plane = G(DataPlane, name="drift-inactive-plane", status=DataPlaneStatusEnum.INACTIVE.value)
+    gateway = G(Gateway, name="drift-gateway")
+
+    result = {}
+    for name, plane, status in [
+        ("prod", data_plane, StageStatusEnum.ACTIVE.value),
+        ("test", data_plane, StageStatusEnum.ACTIVE.value),
+        ("inactive", data_plane, StageStatusEnum.INACTIVE.value),
+        ("other", inactive_data_plane, StageStatusEnum.ACTIVE.value),
+    ]:
+        stage = G(Stage, gateway=gateway, name=name, status=status)
+        result[name] = G(
+            DataPlaneReleaseManifest, data_plane=plane, gateway=gateway, stage=stage, resource_version_id=1
+        )
+    return result
+
+
+class FakeReconciler:
+    def __init__(self, manifest):
+        self.manifest = manifest
+
+    def check(self, repair):
+        result = DriftCheckResultEnum.CLEAN if self.manifest.stage.name == "prod" else DriftCheckResultEnum.REPAIRED
+        return DriftCheckResult(self.manifest, result, message=f"repair={repair}")
+
+
+def test_check_release_drift(mocker, manifests):
+    mocker.patch("apigateway.controller.tasks.drift.ReleaseDriftReconciler", FakeReconciler)
+
+    results = check_release_drift(repair=True)
+
+    # 只检测启用的数据面中，启用的环境
+    assert [result.manifest.stage.name for result in results] == ["prod", "test"]
+    assert all(result.message == "repair=True" for result in results)
+    assert release_drift_stages_gauge.labels(data_plane="drift-plane")._value.get() == 1
+
+    assert check_release_drift(repair=False, gateway_names=["not-exists"]) == []
+
+
+def test_detect_release_drift(mocker, settings):
+    settings.RELEASE_DRIFT_AUTO_REPAIR_ENABLED = True
+    mock_check = mocker.patch("apigateway.controller.tasks.drift.check_release_drift", return_value=[])
+
+    detect_release_drift()
+
+    mock_check.assert_called_once_with(repair=True)
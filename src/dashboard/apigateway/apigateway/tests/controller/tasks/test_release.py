@@ -20,16 +20,19 @@ from unittest.mock import Mock
 
 import pytest
 
-from apigateway.controller.tasks.release import _release_gateway, update_release_data_after_success
+from apigateway.common.constants import RELEASE_GATEWAY_INTERVAL_SECOND
+from apigateway.controller.tasks.release import (
+    RELEASE_STATUS_CHECK_MAX_COUNTDOWN,
+    _release_gateway,
+    update_release_data_after_success,
+)
 from apigateway.core.constants import ReleaseHistoryStatusEnum
 
 
 def test_update_release_success_reconciles_without_reversing_publish_on_failure(mocker):
-    latest_event = Mock()
-    latest_event.get_release_history_status.return_value = ReleaseHistoryStatusEnum.SUCCESS.value
     mocker.patch(
-        "apigateway.controller.tasks.release.PublishEvent.objects.get_release_history_id_to_latest_publish_event_map",
-        return_value={1: latest_event},
+        "apigateway.controller.tasks.release.get_release_status",
+        return_value=ReleaseHistoryStatusEnum.SUCCESS.value,
     )
     gateway = Mock(id=10)
     stage = Mock(id=20)
@@ -83,6 +86,79 @@ def test_update_release_success_reconciles_without_reversing_publish_on_failure(
     )
 
 
+class TestUpdateReleaseDataAfterSuccessContinuation:
+    @pytest.fixture
+    def release_get(self, mocker):
+        return mocker.patch("apigateway.controller.tasks.release.Release.objects.get")
+
+    def _call(self, **kwargs):
+        update_release_data_after_success(
+            publish_id=1, release_id=30, resource_version_id=40, author="admin", comment="", **kwargs
+        )
+
+    def test_reschedule_when_doing(self, mocker, release_get):
+        mocker.patch(
+            "apigateway.controller.tasks.release.get_release_status",
+            return_value=ReleaseHistoryStatusEnum.DOING.value,
+        )
+        mocker.patch("apigateway.controller.tasks.release.time.time", return_value=1000)
+        apply_async = mocker.patch("apigateway.controller.tasks.release.update_release_data_after_success.apply_async")
+
+        self._call(deadline=2000, check_times=3)
+
+        apply_async.assert_called_once_with(
+            kwargs={
+                "publish_id": 1,
+                "release_id": 30,
+                "resource_version_id": 40,
+                "author": "admin",
+                "comment": "",
+                "deadline": 2000,
+                "check_times": 4,
+            },
+            countdown=RELEASE_STATUS_CHECK_MAX_COUNTDOWN,
+        )
+        release_get.assert_not_called()
+
+    def test_first_check_sets_deadline(self, mocker, release_get):
+        mocker.patch(
+            "apigateway.controller.tasks.release.get_release_status",
+            return_value=ReleaseHistoryStatusEnum.DOING.value,
+        )
+        mocker.patch("apigateway.controller.tasks.release.time.time", return_value=1000)
+        apply_async = mocker.patch("apigateway.controller.tasks.release.update_release_data_after_success.apply_async")
+
+        self._call()
+
+        assert apply_async.call_args.kwargs["kwargs"]["deadline"] == 1000 + 10 * RELEASE_GATEWAY_INTERVAL_SECOND
+        assert apply_async.call_args.kwargs["countdown"] == 1
+
+    def test_timeout(self, mocker, release_get):
+        mocker.patch(
+            "apigateway.controller.tasks.release.get_release_status",
+            return_value=ReleaseHistoryStatusEnum.DOING.value,
+        )
+        mocker.patch("apigateway.controller.tasks.release.time.time", return_value=1000)
+        apply_async = mocker.patch("apigateway.controller.tasks.release.update_release_data_after_success.apply_async")
+
+        self._call(deadline=1001, check_times=1)
+
+        apply_async.assert_not_called()
+        release_get.assert_not_called()
+
+    def test_failure(self, mocker, release_get):
+        mocker.patch(
+            "apigateway.controller.tasks.release.get_release_status",
+            return_value=ReleaseHistoryStatusEnum.FAILURE.value,
+        )
+        apply_async = mocker.patch("apigateway.controller.tasks.release.update_release_data_after_success.apply_async")
+
+        self._call()
+
+        apply_async.assert_not_called()
+        release_get.assert_not_called()
+
+
 def test_release_gateway_raises_when_distribution_returns_failure(mocker):
     distributor = Mock()
     distributor.distribute.return_value = False, "etcd sync failed"
@@ -97,4 +173,5 @@ def test_release_gateway_raises_when_distribution_returns_failure(mocker):
     with pytest.raises(RuntimeError, match="etcd sync failed"):
         _release_gateway(distributor, release_history, procedure_logger)
 
-    report_failure.assert_called_once_with(release_history, "etcd sync failed")
+    report_failure.assert_called_once_with(release_history, "etcd sync failed", phase_timings=mocker.ANY)
+    assert "total" in report_failure.call_args.kwargs["phase_timings"]
@@ -78,6 +78,28 @@ class TestDistributeGlobalResources:
         distributor_1.distribute.assert_called_once()
         distributor_2.distribute.assert_called_once()
 
+    def test_should_transform_once_per_apisix_version(self, mocker):
+        data_plane_1 = mocker.Mock(id=1, apisix_version="3.13")
+        data_plane_2 = mocker.Mock(id=2, apisix_version="3.13")
+        data_plane_3 = mocker.Mock(id=3, apisix_version="3.16")
+        mocker.patch(
+            "apigateway.controller.tasks.syncing.DataPlane.objects.get_active_data_planes",
+            return_value=[data_plane_1, data_plane_2, data_plane_3],
+        )
+        mock_transform = mocker.patch(
+            "apigateway.controller.tasks.syncing.transform_global_resources",
+            side_effect=lambda apisix_version: [apisix_version],
+        )
+        distributor_cls = mocker.patch("apigateway.controller.tasks.syncing.GlobalResourceDistributor")
+        distributor_cls.return_value.distribute.return_value = (True, "ok")
+
+        result = distribute_global_resources()
+
+        assert result is True
+        assert [c.args for c in mock_transform.call_args_list] == [("3.13",), ("3.16",)]
+        resources = sorted(c.kwargs["resources"][0] for c in distributor_cls.return_value.distribute.call_args_list)
+        assert resources == ["3.13", "3.13", "3.16"]
+
     def test_should_return_false_when_no_active_data_plane(self, mocker):
         mocker.patch(
             "apigateway.controller.tasks.syncing.DataPlane.objects.get_active_data_planes",
@@ -0,0 +1,155 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import pytest
+from ddf import G
+
+from apigateway.apps.data_plane.models import DataPlaneReleaseManifest
+from apigateway.controller.distributor.etcd import GatewayResourceDistributor
+from apigateway.controller.drift import DriftCheckResultEnum, DriftReport, ReleaseDriftReconciler, detect_drift
+from apigateway.controller.registry.etcd import EtcdRegistry
+from apigateway.core.models import ReleaseHistory, ResourceVersion
+from apigateway.tests.benchmarks.fake_etcd import FakeEtcdClient
+from apigateway.tests.benchmarks.synthetic import SyntheticGatewayFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_drift_report():
+    report = DriftReport(missing_keys=["a"], modified_keys=["b", "c"], revision=3)
+
+    assert report.drifted_count == 3
+    assert report.is_drifted is True
+    assert str(report) == "missing=1, modified=2, extra=0, revision=3"
+    assert DriftReport().is_drifted is False
+
+
+class TestReleaseDrift:
+    @pytest.fixture
+    def etcd_client(self, mocker):
+        etcd_client = FakeEtcdClient()
+        mocker.patch("apigateway.controller.distributor.etcd.get_pooled_etcd_client", return_value=etcd_client)
+        return etcd_client
+
+    @pytest.fixture
+    def published(self, settings, etcd_client):
+        """发布一个包含 5 个资源的网关环境，并记录摘要"""
+        settings.RELEASE_DRIFT_DETECTION_ENABLED = True
+        factory = SyntheticGatewayFactory(5)
+        release = factory.create_release()
+        data_plane = factory.create_data_plane()
+        publish_id = factory.create_release_history(release, data_plane).id
+
+        is_success, message = GatewayResourceDistributor(release, data_plane).distribute("task", publish_id)
+        assert is_success, message
+
+        return DataPlaneReleaseManifest.objects.get(data_plane=data_plane, stage=release.stage)
+
+    def _make_reconciler(self, manifest, etcd_client):
+        return ReleaseDriftReconciler(DataPlaneReleaseManifest.objects.get(id=manifest.id), etcd_client=etcd_client)
+
+    def _get_route_keys(self, manifest):
+        # 排除版本探测路由，其配置包含发布时间，修复时重新生成的配置与原配置不同
+        return sorted(key for key in manifest.digests if "/route/" in key and not key.endswith(".-1"))
+
+    def test_manifest_recorded(self, published, etcd_client):
+        registry = EtcdRegistry(published.key_prefix, etcd_client=etcd_client)
+
+        assert published.digests == registry.scan_digests_by_key_prefix()[0]
+        assert published.resource_version_id == published.stage.release.resource_version_id
+        assert published.stage_config_digest
+
+    def test_detect_drift(self, published, etcd_client):
+        missing_key, modified_key = self._get_route_keys(published)[:2]
+        etcd_client.delete(missing_key)
+        etcd_client.put(modified_key, "{}")
+        etcd_client.put(f"{published.key_prefix}route/manual", "{}")
+
+        report = detect_drift(published, EtcdRegistry(published.key_prefix, etcd_client=etcd_client))
+
+        assert report.missing_keys == [missing_key]
+        assert report.modified_keys == [modified_key]
+        assert report.extra_keys == [f"{published.key_prefix}route/manual"]
+        assert report.revision == etcd_client.revision
+
+    def test_check_clean(self, published, etcd_client):
+        result = self._make_reconciler(published, etcd_client).check(repair=True)
+
+        assert result.result == DriftCheckResultEnum.CLEAN
+        assert result.repaired_count == 0
+
+    def test_check_without_repair(self, published, etcd_client):
+        etcd_client.delete(self._get_route_keys(published)[0])
+
+        result = self._make_reconciler(published, etcd_client).check(repair=False)
+
+        assert result.result == DriftCheckResultEnum.DRIFTED
+        assert result.report.drifted_count == 1
+
+    def test_check_repair(self, published, etcd_client):
+        missing_key, modified_key = self._get_route_keys(published)[:2]
+        expected_payload, _ = etcd_client.get(missing_key)
+        etcd_client.delete(missing_key)
+        etcd_client.put(modified_key, "{}")
+        etcd_client.put(f"{published.key_prefix}route/manual", "{}")
+        etcd_client.reset_stats()
+
+        result = self._make_reconciler(published, etcd_client).check(repair=True)
+
+        assert result.result == DriftCheckResultEnum.REPAIRED
+        assert result.repaired_count == 3
+        # 只写入、删除漂移的 key
+        assert etcd_client.stats.put_count == 2
+        assert etcd_client.stats.delete_count == 1
+        assert etcd_client.get(missing_key)[0] == expected_payload
+        assert self._make_reconciler(published, etcd_client).check().result == DriftCheckResultEnum.CLEAN
+
+    def test_check_repair_skipped_after_new_publish(self, published, etcd_client):
+        etcd_client.delete(self._get_route_keys(published)[0])
+        G(ReleaseHistory, gateway=published.gateway, stage=published.stage, data_plane=published.data_plane)
+
+        result = self._make_reconciler(published, etcd_client).check(repair=True)
+
+        assert result.result == DriftCheckResultEnum.REPAIR_SKIPPED
+        assert result.message == "new publish found after manifest recorded"
+
+    def test_check_repair_skipped_resource_version_changed(self, published, etcd_client):
+        etcd_client.delete(self._get_route_keys(published)[0])
+        release = published.stage.release
+        release.resource_version = G(ResourceVersion, gateway=published.gateway, version="2.0.0")
+        release.save()
+
+        result = self._make_reconciler(published, etcd_client).check(repair=True)
+
+        assert result.result == DriftCheckResultEnum.REPAIR_SKIPPED
+        assert result.message == "resource version changed since manifest recorded"
+
+    def test_check_error(self, published, mocker):
+        etcd_client = mocker.Mock()
+        etcd_client.get_prefix.side_effect = RuntimeError("etcd unavailable")
+
+        result = self._make_reconciler(published, etcd_client).check(repair=True)
+
+        assert result.result == DriftCheckResultEnum.ERROR
+        assert result.message == "RuntimeError: etcd unavailable"
+
+    def test_revoke_deletes_manifest(self, published, etcd_client):
+        distributor = GatewayResourceDistributor(published.stage.release, published.data_plane)
+
+        distributor.revoke("task", publish_id=published.publish_id)
+
+        assert not DataPlaneReleaseManifest.objects.filter(id=published.id).exists()
@@ -20,7 +20,8 @@ import dataclasses
 import pytest
 from django_dynamic_fixture import G
 
-from apigateway.controller.release_data import PluginData, ReleaseData, StageBackendConfig
+from apigateway.controller.release_data import PluginData, ReleaseConvertCache, ReleaseData, StageBackendConfig
+from apigateway.controller.uri_render import UpstreamURIRender, URIRender
 from apigateway.core.constants import BackendKindEnum
 from apigateway.core.models import Backend, BackendConfig
 
@@ -102,6 +103,44 @@ class TestPluginData:
         assert PluginData._type_code_to_name == expected_mappings
 
 
+class TestReleaseConvertCache:
+    def test_load_json_config(self):
+        cache = ReleaseConvertCache({})
+        config = '{"path": "/echo/", "timeout": 30}'
+
+        result = cache.load_json_config(config)
+
+        assert result == {"path": "/echo/", "timeout": 30}
+        # 相同的配置只解析一次，返回同一个对象
+        assert cache.load_json_config('{"path": "/echo/", "timeout": 30}') is result
+        assert cache.load_json_config('{"path": "/other/"}') == {"path": "/other/"}
+
+    @pytest.mark.parametrize(
+        "source",
+        [
+            "/api/{env.prefix}/users/",
+            "http://{env.domain}:8080",
+            "/api/{env.not_exists}/{id}/",
+        ],
+    )
+    def test_render(self, source):
+        stage_vars = {"prefix": "v1", "domain": "example.com"}
+        cache = ReleaseConvertCache(stage_vars)
+
+        assert cache.render_uri(source) == URIRender().render(source, stage_vars)
+        assert cache.render_upstream_uri(source) == UpstreamURIRender().render(source, stage_vars)
+        # 命中缓存时结果不变
+        assert cache.render_uri(source) == URIRender().render(source, stage_vars)
+
+    def test_release_data_convert_cache(self, mocker):
+        release = mocker.Mock()
+        release.stage.vars = {"prefix": "v1"}
+        release_data = ReleaseData(release)
+
+        assert release_data.convert_cache is release_data.convert_cache
+        assert release_data.convert_cache.render_uri("/{env.prefix}/") == "/v1/"
+
+
 class TestReleaseData:
     """Test ReleaseData class"""
 
@@ -0,0 +1,86 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import pytest
+
+from apigateway.controller.models import Labels, Service
+from apigateway.controller.registry.etcd import EtcdRegistry
+from apigateway.controller.release_tracer import OTHER_PHASE, ReleasePhaseTracer, trace_phase
+
+
+@pytest.fixture
+def perf_counter(mocker):
+    """每次调用 perf_counter 前进 1 秒"""
+    counter = iter(range(1000))
+    return mocker.patch("apigateway.controller.release_tracer.time.perf_counter", side_effect=lambda: next(counter))
+
+
+class TestReleasePhaseTracer:
+    def test_trace_phase_without_tracer(self):
+        with trace_phase("serialize"), trace_phase("etcd_write"):
+            pass
+
+    def test_nested_phases(self, mocker, perf_counter):
+        phase_histogram = mocker.patch("apigateway.controller.release_tracer.release_phase_duration_histogram")
+        duration_histogram = mocker.patch("apigateway.controller.release_tracer.release_duration_histogram")
+
+        # perf_counter: tracer 开始 0, convert_routes 1 ~ (validate_routes 2 ~ 3) ~ 4, etcd_write 5 ~ 6, 结束 7
+        with ReleasePhaseTracer() as tracer:
+            with trace_phase("convert_routes"), trace_phase("validate_routes"):
+                pass
+            with trace_phase("etcd_write"):
+                pass
+
+        assert tracer.get_timings() == {
+            "convert_routes": 2,
+            "validate_routes": 1,
+            "etcd_write": 1,
+            OTHER_PHASE: 3,
+            "total": 7,
+        }
+        phase_histogram.labels.assert_any_call(phase="convert_routes")
+        phase_histogram.labels.return_value.observe.assert_any_call(2)
+        duration_histogram.observe.assert_called_once_with(7)
+
+    def test_phase_accumulated(self, perf_counter):
+        with ReleasePhaseTracer() as tracer:
+            for _ in range(3):
+                with trace_phase("serialize"):
+                    pass
+
+        assert tracer.get_timings()["serialize"] == 3
+
+    def test_phase_with_exception(self, perf_counter):
+        with pytest.raises(ValueError), ReleasePhaseTracer() as tracer, trace_phase("etcd_write"):
+            raise ValueError()
+
+        assert tracer.get_timings()["etcd_write"] == 1
+        # 退出上下文后不再记录
+        with trace_phase("etcd_write"):
+            pass
+        assert tracer.get_timings()["etcd_write"] == 1
+
+    def test_registry_phases(self, mocker):
+        etcd_client = mocker.MagicMock()
+        etcd_client.get_prefix.return_value = []
+        registry = EtcdRegistry(key_prefix="/test/", etcd_client=etcd_client)
+        resource = Service(id="test.prod.1", name="test", labels=Labels(gateway="test", stage="prod"))
+
+        with ReleasePhaseTracer() as tracer:
+            registry.sync_resources_by_key_prefix([resource])
+
+        assert {"etcd_read", "serialize", "etcd_write"} <= set(tracer.get_timings())
@@ -0,0 +1,152 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import json
+import threading
+from unittest import mock
+
+import pytest
+from ddf import G
+
+from apigateway.controller.resync import (
+    BulkResyncEngine,
+    GatewayResyncOutcome,
+    ResyncCheckpoint,
+    ResyncStatusEnum,
+    sync_gateway,
+)
+from apigateway.core.models import Gateway
+
+
+def _make_gateways(count):
+    gateways = []
+    for i in range(count):
+        gateway = mock.Mock(id=i + 1)
+        gateway.name = f"gw-{i + 1}"
+        gateways.append(gateway)
+    return gateways
+
+
+class TestSyncGateway:
+    @pytest.mark.parametrize(
+        "ok, expected_status, expected_message",
+        [
+            (True, ResyncStatusEnum.SUCCESS, ""),
+            (False, ResyncStatusEnum.FAILED, "publish failed"),
+        ],
+    )
+    @mock.patch("apigateway.controller.resync.publish.trigger_gateway_publish")
+    @mock.patch("django.db.connection.close")
+    def test_sync_gateway(self, mock_close, mock_trigger_gateway_publish, ok, expected_status, expected_message):
+        gateway = G(Gateway, name="test-gateway")
+        mock_trigger_gateway_publish.return_value = ok
+
+        outcome = sync_gateway(gateway)
+
+        assert outcome.gateway_id == gateway.id
+        assert outcome.status == expected_status
+        assert outcome.message == expected_message
+        mock_close.assert_called_once()
+
+    @mock.patch("apigateway.controller.resync.logger")
+    @mock.patch("apigateway.controller.resync.publish.trigger_gateway_publish")
+    @mock.patch("django.db.connection.close")
+    def test_sync_gateway_raises(self, mock_close, mock_trigger_gateway_publish, mock_logger):
+        gateway = G(Gateway, name="test-gateway")
+        mock_trigger_gateway_publish.side_effect = RuntimeError("boom")
+
+        outcome = sync_gateway(gateway)
+
+        assert outcome.status == ResyncStatusEnum.FAILED
+        assert outcome.message == "RuntimeError: boom"
+        mock_close.assert_called_once()
+        mock_logger.exception.assert_called_once_with(
+            "syncing release for gateway %s failed with exception", gateway.name
+        )
+
+
+class TestResyncCheckpoint:
+    def test_record_and_load(self, tmp_path):
+        path = str(tmp_path / "checkpoint.json")
+        checkpoint = ResyncCheckpoint(path)
+        checkpoint.record(GatewayResyncOutcome(1, "gw-1", ResyncStatusEnum.SUCCESS, duration=1.5))
+        checkpoint.record(GatewayResyncOutcome(2, "gw-2", ResyncStatusEnum.FAILED, "publish failed"))
+
+        with open(path) as fp:
+            assert len(json.load(fp)["outcomes"]) == 2
+
+        loaded = ResyncCheckpoint.load(path)
+        assert loaded.outcomes == checkpoint.outcomes
+        assert loaded.is_synced(1) is True
+        # 失败的网关需要重新同步
+        assert loaded.is_synced(2) is False
+        assert loaded.is_synced(3) is False
+
+    def test_load_not_exists(self, tmp_path):
+        checkpoint = ResyncCheckpoint.load(str(tmp_path / "not-exists.json"))
+
+        assert checkpoint.outcomes == {}
+
+    def test_in_memory(self):
+        checkpoint = ResyncCheckpoint()
+        checkpoint.record(GatewayResyncOutcome(1, "gw-1", ResyncStatusEnum.SUCCESS))
+
+        assert checkpoint.is_synced(1) is True
+
+
+class TestBulkResyncEngine:
+    def test_run(self, mocker):
+        mock_limit = mocker.patch("apigateway.controller.resync.limit_etcd_write_rate")
+        gateways = _make_gateways(3)
+        checkpoint = ResyncCheckpoint()
+        checkpoint.record(GatewayResyncOutcome(1, "gw-1", ResyncStatusEnum.SUCCESS))
+        checkpoint.record(GatewayResyncOutcome(2, "gw-2", ResyncStatusEnum.FAILED))
+
+        def sync(gateway):
+            return GatewayResyncOutcome(gateway.id, gateway.name, ResyncStatusEnum.SUCCESS)
+
+        notified = []
+        outcomes = BulkResyncEngine(
+            concurrency=2, etcd_write_rate=100, checkpoint=checkpoint, sync=sync, on_outcome=notified.append
+        ).run(gateways)
+
+        assert [outcome.status for outcome in outcomes] == [
+            ResyncStatusEnum.SKIPPED,
+            ResyncStatusEnum.SUCCESS,
+            ResyncStatusEnum.SUCCESS,
+        ]
+        assert len(notified) == 3
+        assert checkpoint.is_synced(2) is True
+        assert checkpoint.is_synced(3) is True
+        mock_limit.assert_called_once_with(100)
+
+    def test_run_concurrently(self):
+        gateways = _make_gateways(3)
+        # 所有网关同时到达屏障才能继续，串行执行将超时
+        barrier = threading.Barrier(3, timeout=5)
+
+        def sync(gateway):
+            barrier.wait()
+            return GatewayResyncOutcome(gateway.id, gateway.name, ResyncStatusEnum.SUCCESS)
+
+        outcomes = BulkResyncEngine(concurrency=3, etcd_write_rate=0, checkpoint=ResyncCheckpoint(), sync=sync).run(
+            gateways
+        )
+
+        # 结果顺序与输入一致
+        assert [outcome.gateway_id for outcome in outcomes] == [1, 2, 3]
+        assert all(outcome.is_success for outcome in outcomes)
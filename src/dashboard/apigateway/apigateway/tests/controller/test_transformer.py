@@ -21,14 +21,20 @@ from unittest.mock import Mock
 import pytest
 
 from apigateway.apps.data_plane.constants import DataPlaneApisixVersionEnum
-from apigateway.controller.convertor.constants import LABEL_KEY_APISIX_VERSION, LABEL_KEY_BACKEND_ID
-from apigateway.controller.release_data import StageBackendConfig
+from apigateway.controller.convertor.constants import (
+    LABEL_KEY_APISIX_VERSION,
+    LABEL_KEY_BACKEND_ID,
+    LABEL_KEY_STAGE_CONFIG_DIGEST,
+)
+from apigateway.controller.models import dump_apisix_model_json
+from apigateway.controller.release_data import ReleaseConvertCache, StageBackendConfig
 from apigateway.controller.transformer import (
     BaseTransformer,
     GatewayApisixResourceTransformer,
     GlobalApisixResourceTransformer,
 )
 from apigateway.core.constants import BackendKindEnum, BackendTypeEnum, ProxyTypeEnum, ResourceKindEnum
+from apigateway.tests.benchmarks.synthetic import SyntheticGatewayFactory
 
 APISIX_VERSION_3_13 = DataPlaneApisixVersionEnum.V3_13.value
 APISIX_VERSION_3_16 = DataPlaneApisixVersionEnum.V3_16.value
@@ -184,6 +190,7 @@ class TestGatewayApisixResourceConvertor:
         release_data.gateway = mock_release.gateway
         release_data.stage = mock_release.stage
         release_data.stage.vars = {}
+        release_data.convert_cache = ReleaseConvertCache(release_data.stage.vars)
         release_data.resource_version = mock_release.resource_version
         release_data.stage_backend_configs = {
             10: StageBackendConfig(
@@ -317,7 +324,7 @@ class TestGatewayApisixResourceConvertor:
         mock_service_convertor.assert_called_once_with(mock_release_data, 123, APISIX_VERSION_3_13, True)
         expected_mapping = {123: "service-1", 456: "service-2"}
         mock_route_convertor.assert_called_once_with(
-            mock_release_data, expected_mapping, 123, APISIX_VERSION_3_13, True
+            mock_release_data, expected_mapping, 123, APISIX_VERSION_3_13, True, resource_ids=None
         )
         mock_bk_release_convertor.assert_called_once_with(mock_release_data, 123, APISIX_VERSION_3_13)
 
@@ -355,6 +362,89 @@ class TestGatewayApisixResourceConvertor:
         assert mock_route_convertor.call_args.args[3] == APISIX_VERSION_3_16
         assert mock_bk_release_convertor.call_args.args[2] == APISIX_VERSION_3_16
 
+    def test_get_stage_config_digest(self, mock_release, mocker):
+        mock_release_data = mocker.Mock()
+        mock_release_data.stage.vars = {"env": "prod"}
+        mocker.patch("apigateway.controller.transformer.ReleaseData", return_value=mock_release_data)
+
+        mock_service = Mock()
+        mock_service.model_dump.return_value = {"id": "service-1"}
+        mock_service_convertor = mocker.patch("apigateway.controller.transformer.ServiceConvertor")
+        mock_service_convertor.return_value.convert.return_value = [mock_service]
+
+        transformer = GatewayApisixResourceTransformer(mock_release, APISIX_VERSION_3_13, publish_id=123)
+        digest = transformer.get_stage_config_digest()
+
+        # service 的 labels 中包含 publish_id，不计入摘要
+        mock_service.model_dump.assert_called_once_with(mode="json", exclude={"labels"})
+        assert transformer.get_stage_config_digest() == digest
+        mock_service_convertor.return_value.convert.assert_called_once()
+
+        # 环境变量变化时，摘要变化
+        mock_release_data.stage.vars = {"env": "test"}
+        another_transformer = GatewayApisixResourceTransformer(mock_release, APISIX_VERSION_3_13, publish_id=124)
+        assert another_transformer.get_stage_config_digest() != digest
+
+    def test_transform_incremental(self, mock_release, mocker):
+        mock_release_data = mocker.Mock()
+        mock_release_data.stage.vars = {}
+        mocker.patch("apigateway.controller.transformer.ReleaseData", return_value=mock_release_data)
+
+        mock_service = Mock()
+        mock_service.id = "service-1"
+        mock_service.labels.get_label.return_value = "1"
+        mock_service.model_dump.return_value = {"id": "service-1"}
+        mock_service_convertor = mocker.patch("apigateway.controller.transformer.ServiceConvertor")
+        mock_service_convertor.return_value.convert.return_value = [mock_service]
+
+        mock_route = Mock()
+        mock_route_convertor = mocker.patch("apigateway.controller.transformer.RouteConvertor")
+        mock_route_convertor.return_value.convert.return_value = [mock_route]
+
+        mock_bk_release = Mock()
+        mock_bk_release_convertor = mocker.patch("apigateway.controller.transformer.BkReleaseConvertor")
+        mock_bk_release_convertor.return_value.convert.return_value = [mock_bk_release]
+
+        transformer = GatewayApisixResourceTransformer(mock_release, APISIX_VERSION_3_13, publish_id=123)
+        digest = transformer.get_stage_config_digest()
+        transformer.transform(resource_ids={1, 2})
+
+        # service 只转换一次
+        mock_service_convertor.return_value.convert.assert_called_once()
+        assert mock_route_convertor.call_args.kwargs == {"resource_ids": {1, 2}}
+        mock_bk_release.labels.add_label.assert_called_once_with(LABEL_KEY_STAGE_CONFIG_DIGEST, digest)
+
+        assert list(transformer.get_incremental_resources()) == [mock_route, mock_bk_release]
+        assert list(transformer.get_transformed_resources()) == [mock_service, mock_route, mock_bk_release]
+
+    def test_iter_transformed_resources(self, mock_release, mocker):
+        mock_release_data = mocker.Mock()
+        mock_release_data.stage.vars = {}
+        mocker.patch("apigateway.controller.transformer.ReleaseData", return_value=mock_release_data)
+
+        mock_service = Mock()
+        mock_service.id = "service-1"
+        mock_service.labels.get_label.return_value = "1"
+        mock_service_convertor = mocker.patch("apigateway.controller.transformer.ServiceConvertor")
+        mock_service_convertor.return_value.convert.return_value = [mock_service]
+
+        routes = [Mock(), Mock()]
+        mock_route_convertor = mocker.patch("apigateway.controller.transformer.RouteConvertor")
+        mock_route_convertor.return_value.iter_convert.return_value = iter(routes)
+
+        mock_bk_release = Mock()
+        mock_bk_release_convertor = mocker.patch("apigateway.controller.transformer.BkReleaseConvertor")
+        mock_bk_release_convertor.return_value.convert.return_value = [mock_bk_release]
+
+        transformer = GatewayApisixResourceTransformer(mock_release, APISIX_VERSION_3_13, publish_id=123)
+        resources = transformer.iter_transformed_resources()
+
+        assert list(resources) == [mock_service, *routes, mock_bk_release]
+        assert mock_route_convertor.call_args.args[1] == {1: "service-1"}
+        mock_route_convertor.return_value.convert.assert_not_called()
+        # 流式转换不保留路由
+        assert transformer._converted_routes == []
+
     def test_backend_service_mapping(self, mock_release, mocker):
         """Test backend service mapping creation and edge cases"""
         mock_release_data = mocker.Mock()
@@ -423,3 +513,26 @@ class TestGatewayApisixResourceConvertor:
         del mock_release_invalid.resource_version
         with pytest.raises(AttributeError):
             GatewayApisixResourceTransformer(mock_release_invalid, APISIX_VERSION_3_13)
+
+
+class TestSerializeDifferential:
+    """写入 etcd 的内容需与 model_dump_json 完全相同，且能通过模型的完整校验"""
+
+    def test_same_payload(self):
+        # 资源混合了插件、环境变量、AI 后端及 OAuth2 配置
+        factory = SyntheticGatewayFactory(60)
+        release = factory.create_release()
+        data_plane = factory.create_data_plane()
+
+        transformer = GatewayApisixResourceTransformer(release, data_plane.apisix_version, publish_id=1)
+        transformer.transform()
+        resources = list(transformer.get_transformed_resources())
+
+        assert len([resource for resource in resources if resource.kind == "route"]) > 60
+        for resource in resources:
+            payload = dump_apisix_model_json(resource)
+            assert payload == resource.model_dump_json(exclude_none=True)
+            # 重新校验构造的模型，序列化结果不变
+            validated = type(resource).model_validate_json(payload)
+            assert validated == resource
+            assert dump_apisix_model_json(validated) == payload
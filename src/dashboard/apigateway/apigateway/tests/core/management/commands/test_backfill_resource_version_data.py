@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+import pytest
+from ddf import G
+from django.core.management import call_command
+
+from apigateway.core.models import ResourceVersion
+from apigateway.utils.payload import get_json_digest
+
+pytestmark = pytest.mark.django_db
+
+
+class TestCommand:
+    def test_backfill(self, settings):
+        settings.RESOURCE_VERSION_DATA_COMPRESS_ENABLED = False
+        legacy = G(ResourceVersion, _data='[{"id": 1}, {"id": 2}]', resource_count=None, content_hash="")
+
+        call_command("backfill_resource_version_data")
+
+        legacy.refresh_from_db()
+        assert legacy.resource_count == 2
+        assert legacy.content_hash == get_json_digest([{"id": 1}, {"id": 2}])
+        assert not legacy._data.startswith("zlib:")
+
+    def test_backfill_compress(self, settings):
+        resource_version = G(ResourceVersion)
+        resource_version.data = [{"id": 1}]
+        resource_version.save()
+
+        settings.RESOURCE_VERSION_DATA_COMPRESS_ENABLED = True
+        call_command("backfill_resource_version_data")
+
+        resource_version.refresh_from_db()
+        assert resource_version._data.startswith("zlib:")
+        assert resource_version.data == [{"id": 1}]
+
+        # 关闭压缩后，恢复为未压缩格式
+        settings.RESOURCE_VERSION_DATA_COMPRESS_ENABLED = False
+        call_command("backfill_resource_version_data")
+
+        resource_version.refresh_from_db()
+        assert resource_version._data == '[{"id": 1}]'
+
+    def test_backfill_dry_run(self):
+        legacy = G(ResourceVersion, _data='[{"id": 1}]', resource_count=None, content_hash="")
+
+        call_command("backfill_resource_version_data", dry_run=True)
+
+        legacy.refresh_from_db()
+        assert legacy.resource_count is None
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+import pytest
+from ddf import G
+from django.core.management import call_command
+
+from apigateway.core.models import ReleasedResource, ReleasedResourceBody
+
+pytestmark = pytest.mark.django_db
+
+
+class TestCommand:
+    def test_migrate(self, fake_gateway):
+        data = {"id": 1, "name": "foo"}
+        r1 = G(ReleasedResource, gateway=fake_gateway, resource_version_id=1, resource_id=1, _data=data)
+        r2 = G(ReleasedResource, gateway=fake_gateway, resource_version_id=2, resource_id=1, _data=data)
+
+        call_command("migrate_released_resource_body")
+
+        r1.refresh_from_db()
+        r2.refresh_from_db()
+        assert r1.body_id == r2.body_id
+        assert r1._data == {}
+        assert r1.data == data
+        assert ReleasedResourceBody.objects.filter(gateway=fake_gateway).count() == 1
+
+    def test_dry_run(self, fake_gateway):
+        released = G(ReleasedResource, gateway=fake_gateway, _data={"id": 1})
+
+        call_command("migrate_released_resource_body", dry_run=True)
+
+        released.refresh_from_db()
+        assert released.body_id is None
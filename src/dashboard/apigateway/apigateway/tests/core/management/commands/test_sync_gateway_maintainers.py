@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+import pytest
+from ddf import G
+from django.core.management import call_command
+
+from apigateway.core.models import Gateway, GatewayMaintainer
+
+pytestmark = pytest.mark.django_db
+
+
+def _get_usernames(gateway):
+    return set(GatewayMaintainer.objects.filter(gateway=gateway).values_list("username", flat=True))
+
+
+class TestCommand:
+    def test_sync(self):
+        gateway = G(Gateway, _maintainers="admin;foo")
+        # 模拟索引缺失及多余的记录
+        GatewayMaintainer.objects.filter(gateway=gateway, username="foo").delete()
+        G(GatewayMaintainer, gateway=gateway, username="bar")
+
+        call_command("sync_gateway_maintainers")
+
+        assert _get_usernames(gateway) == {"admin", "foo"}
+
+    def test_sync_by_gateway_id(self):
+        gateway_1 = G(Gateway, _maintainers="admin")
+        gateway_2 = G(Gateway, _maintainers="admin")
+        GatewayMaintainer.objects.all().delete()
+
+        call_command("sync_gateway_maintainers", gateway_id=gateway_1.id)
+
+        assert _get_usernames(gateway_1) == {"admin"}
+        assert _get_usernames(gateway_2) == set()
+
+    def test_sync_dry_run(self):
+        gateway = G(Gateway, _maintainers="admin")
+        GatewayMaintainer.objects.all().delete()
+
+        call_command("sync_gateway_maintainers", dry_run=True)
+
+        assert _get_usernames(gateway) == set()
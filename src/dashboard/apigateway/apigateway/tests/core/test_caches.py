@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+import pytest
+
+from apigateway.core.caches import ResourceVersionResourcesCache, cached_resource_version_resources
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+@pytest.fixture
+def fake_redis(mocker):
+    client = FakeRedis()
+    mocker.patch("apigateway.core.caches.get_default_redis_client", return_value=client)
+    return client
+
+
+@pytest.fixture
+def resources():
+    return {1: {"id": 1, "name": "foo"}, 2: {"id": 2, "name": "bar"}}
+
+
+class TestResourceVersionResourcesCache:
+    def test_get_or_load(self, mocker, fake_redis, resources):
+        cache = ResourceVersionResourcesCache(local_max_bytes=1024 * 1024, redis_max_entry_bytes=1024)
+        loader = mocker.Mock(return_value=resources)
+
+        assert cache.get_or_load(10, 1, loader) == resources
+        # 进程内缓存命中
+        assert cache.get_or_load(10, 1, loader) is resources
+        loader.assert_called_once()
+        assert len(fake_redis.data) == 1
+
+        # 其它进程从 redis 共享缓存中读取，key 仍为 int 类型的资源 id
+        other = ResourceVersionResourcesCache(local_max_bytes=1024 * 1024, redis_max_entry_bytes=1024)
+        assert other.get_or_load(10, 1, loader) == resources
+        loader.assert_called_once()
+
+    def test_get_or_load_not_found(self, mocker, fake_redis):
+        cache = ResourceVersionResourcesCache(local_max_bytes=1024, redis_max_entry_bytes=1024)
+        loader = mocker.Mock(return_value={})
+
+        assert cache.get_or_load(10, 1, loader) == {}
+        assert cache.get_or_load(10, 1, loader) == {}
+        loader.assert_called_once()
+        assert fake_redis.data == {}
+
+    def test_local_max_bytes(self, mocker, fake_redis, resources):
+        cache = ResourceVersionResourcesCache(local_max_bytes=10, redis_max_entry_bytes=1024)
+        loader = mocker.Mock(return_value=resources)
+
+        cache.get_or_load(10, 1, loader)
+
+        assert len(cache._local) == 0
+        assert len(fake_redis.data) == 1
+
+    def test_redis_max_entry_bytes(self, mocker, fake_redis, resources):
+        cache = ResourceVersionResourcesCache(local_max_bytes=1024 * 1024, redis_max_entry_bytes=10)
+
+        cache.get_or_load(10, 1, mocker.Mock(return_value=resources))
+
+        assert fake_redis.data == {}
+
+    def test_redis_unavailable(self, mocker, resources):
+        mocker.patch("apigateway.core.caches.get_default_redis_client", return_value=None)
+        cache = ResourceVersionResourcesCache(local_max_bytes=1024 * 1024, redis_max_entry_bytes=1024)
+
+        assert cache.get_or_load(10, 1, mocker.Mock(return_value=resources)) == resources
+        cache.invalidate([(10, 1)])
+
+    def test_redis_error(self, mocker, resources):
+        client = mocker.Mock()
+        client.get.side_effect = RuntimeError("connection lost")
+        client.set.side_effect = RuntimeError("connection lost")
+        mocker.patch("apigateway.core.caches.get_default_redis_client", return_value=client)
+        cache = ResourceVersionResourcesCache(local_max_bytes=1024 * 1024, redis_max_entry_bytes=1024)
+
+        assert cache.get_or_load(10, 1, mocker.Mock(return_value=resources)) == resources
+
+    def test_invalidate(self, mocker, fake_redis, resources):
+        cache = ResourceVersionResourcesCache(local_max_bytes=1024 * 1024, redis_max_entry_bytes=1024)
+        loader = mocker.Mock(return_value=resources)
+        cache.get_or_load(10, 1, loader)
+        cache.get_or_load(10, 2, loader)
+
+        cache.invalidate([(10, 1)])
+
+        assert (10, 1) not in cache._local
+        assert (10, 2) in cache._local
+        assert len(fake_redis.data) == 1
+
+        cache.get_or_load(10, 1, loader)
+        assert loader.call_count == 3
+
+
+def test_cached_resource_version_resources(mocker, fake_redis):
+    mock_cache = mocker.patch("apigateway.core.caches.resource_version_resources_cache")
+    func = mocker.Mock(return_value={1: {"id": 1}})
+
+    wrapper = cached_resource_version_resources(func)
+    wrapper("manager", 10, 1)
+
+    assert mock_cache.get_or_load.call_args.args[:2] == (10, 1)
+    mock_cache.get_or_load.call_args.args[2]()
+    func.assert_called_once_with("manager", 10, 1)
@@ -30,8 +30,10 @@ from apigateway.core.constants import (
 from apigateway.core.managers import get_released_resource_oauth2_flags
 from apigateway.core.models import (
     Gateway,
+    GatewayMaintainer,
     Release,
     ReleasedResource,
+    ReleasedResourceBody,
     Resource,
     ResourceVersion,
     Stage,
@@ -82,6 +84,36 @@ def test_get_released_resource_oauth2_flags_with_missing_config():
     assert get_released_resource_oauth2_flags({}) == (False, False)
 
 
+class TestGatewayMaintainerManager:
+    def test_sync_maintainers(self):
+        gateway = G(Gateway)
+        GatewayMaintainer.objects.filter(gateway=gateway).delete()
+
+        GatewayMaintainer.objects.sync_maintainers(gateway.id, ["admin", "foo", ""])
+        assert set(GatewayMaintainer.objects.filter(gateway=gateway).values_list("username", flat=True)) == {
+            "admin",
+            "foo",
+        }
+
+        GatewayMaintainer.objects.sync_maintainers(gateway.id, ["foo", "bar"])
+        assert set(GatewayMaintainer.objects.filter(gateway=gateway).values_list("username", flat=True)) == {
+            "foo",
+            "bar",
+        }
+
+        GatewayMaintainer.objects.sync_maintainers(gateway.id, [])
+        assert not GatewayMaintainer.objects.filter(gateway=gateway).exists()
+
+    def test_filter_gateway_ids(self):
+        gateway_1 = G(Gateway, _maintainers="admin;foo")
+        gateway_2 = G(Gateway, _maintainers="admin")
+        G(Gateway, _maintainers="admin1;foo1")
+
+        assert set(GatewayMaintainer.objects.filter_gateway_ids("admin")) == {gateway_1.id, gateway_2.id}
+        assert list(GatewayMaintainer.objects.filter_gateway_ids("foo")) == [gateway_1.id]
+        assert list(GatewayMaintainer.objects.filter_gateway_ids("fo")) == []
+
+
 class TestStageManager:
     @pytest.fixture(autouse=True)
     def setup_fixtures(self):
@@ -183,6 +215,18 @@ class TestResourceVersionManager:
         assert resources[resource_id]["oauth2_personal_client_enabled"] is True
         ResourceVersion.objects.get_resources.cache_clear()
 
+    def test_delete_with_resources_cache(self, mocker):
+        mock_invalidate = mocker.patch("apigateway.core.managers.resource_version_resources_cache.invalidate")
+        gateway = G(Gateway)
+        rv1 = G(ResourceVersion, gateway=gateway)
+        rv2 = G(ResourceVersion, gateway=gateway)
+
+        ResourceVersion.objects.delete_with_resources_cache(ResourceVersion.objects.filter(id=rv1.id))
+
+        assert not ResourceVersion.objects.filter(id=rv1.id).exists()
+        assert ResourceVersion.objects.filter(id=rv2.id).exists()
+        mock_invalidate.assert_called_once_with([(gateway.id, rv1.id)])
+
     def test_get_id_to_fields_map(self):
         gateway = G(Gateway)
         rv1 = G(ResourceVersion, gateway=gateway, version="1.0.1")
@@ -460,6 +504,39 @@ class TestReleasedResourceManager:
         assert released.oauth2_public_client_enabled is False
         assert released.oauth2_personal_client_enabled is False
 
+    def test_save_released_resource_deduplicates_bodies(self, fake_gateway):
+        resource = self._make_resource_snapshot()
+        changed = dict(self._make_resource_snapshot(), id=102, name="changed")
+        rv1 = G(ResourceVersion, gateway=fake_gateway)
+        rv1.data = [resource]
+        rv1.save()
+        rv2 = G(ResourceVersion, gateway=fake_gateway)
+        rv2.data = [resource, changed]
+        rv2.save()
+
+        ReleasedResource.objects.save_released_resource(rv1)
+        ReleasedResource.objects.save_released_resource(rv2)
+
+        assert ReleasedResourceBody.objects.filter(gateway=fake_gateway).count() == 2
+        released = ReleasedResource.objects.filter(resource_id=101).order_by("resource_version_id")
+        assert [r.body_id for r in released][0] == [r.body_id for r in released][1]
+        assert all(r._data == {} for r in released)
+        assert [r.data for r in released] == [resource, resource]
+        assert ReleasedResource.objects.get(resource_id=102).data == changed
+
+    def test_save_bodies(self, fake_gateway):
+        existing = G(ReleasedResourceBody, gateway=fake_gateway, content_hash="a", data={"id": 1})
+
+        hash_to_id = ReleasedResourceBody.objects.save_bodies(fake_gateway.id, {"a": {"id": 1}, "b": {"id": 2}})
+
+        assert hash_to_id["a"] == existing.id
+        assert ReleasedResourceBody.objects.get(id=hash_to_id["b"]).data == {"id": 2}
+
+    def test_data_legacy(self, fake_gateway):
+        released = G(ReleasedResource, gateway=fake_gateway, _data={"id": 1}, body=None)
+
+        assert released.data == {"id": 1}
+
     def test_filter_latest_released_resources(self, fake_gateway):
         r1 = G(Resource, gateway=fake_gateway)
         r2 = G(Resource, gateway=fake_gateway)
@@ -469,7 +546,7 @@ class TestReleasedResourceManager:
             resource_id=r1.id,
             resource_version_id=1,
             gateway=fake_gateway,
-            data={
+            _data={
                 "id": r1.id,
                 "name": "test1-1",
                 "method": r1.method,
@@ -493,7 +570,7 @@ class TestReleasedResourceManager:
             resource_id=r1.id,
             resource_version_id=2,
             gateway=fake_gateway,
-            data={
+            _data={
                 "id": r1.id,
                 "name": "test1-2",
                 "method": r1.method,
@@ -517,7 +594,7 @@ class TestReleasedResourceManager:
             resource_id=r2.id,
             resource_version_id=2,
             gateway=fake_gateway,
-            data={
+            _data={
                 "id": r2.id,
                 "name": "test2-1",
                 "method": r2.method,
@@ -28,6 +28,7 @@ from apigateway.core.constants import (
     PublishEventStatusEnum,
     ResourceKindEnum,
 )
+from apigateway.utils.payload import get_json_digest
 
 pytestmark = pytest.mark.django_db
 
@@ -104,6 +105,30 @@ class TestGateway:
         with pytest.raises(ValueError, match="repository is required"):
             gateway.extra_info = {"language": "python"}
 
+    def test_save_sync_maintainers(self, django_assert_num_queries):
+        gateway = G(models.Gateway, _maintainers="admin;foo")
+        assert set(models.GatewayMaintainer.objects.filter(gateway=gateway).values_list("username", flat=True)) == {
+            "admin",
+            "foo",
+        }
+
+        gateway = models.Gateway.objects.get(id=gateway.id)
+        gateway.maintainers = ["admin", "bar"]
+        gateway.save()
+        assert set(models.GatewayMaintainer.objects.filter(gateway=gateway).values_list("username", flat=True)) == {
+            "admin",
+            "bar",
+        }
+
+        # 维护者未变化，或未更新维护者字段时，不同步维护者索引
+        gateway = models.Gateway.objects.get(id=gateway.id)
+        with django_assert_num_queries(1):
+            gateway.save()
+
+        gateway.maintainers = ["admin"]
+        gateway.save(update_fields=["description"])
+        assert models.GatewayMaintainer.objects.filter(gateway=gateway).count() == 2
+
     # def test_extra_info_setter_non_programmable_gateway(self):
     #     # Test for non-programmable gateway
     #     gateway = G(models.Gateway, kind=models.GatewayKindEnum.NORMAL.value)
@@ -188,3 +213,57 @@ class TestPublishEvent:
     def test_is_running(self, name, status, expected):
         gateway = G(models.PublishEvent, name=name, status=status)
         assert gateway.is_running == expected
+
+
+class TestResourceVersion:
+    @pytest.mark.parametrize("compress", [False, True])
+    def test_data(self, settings, compress):
+        settings.RESOURCE_VERSION_DATA_COMPRESS_ENABLED = compress
+        data = [{"id": 1, "name": "foo"}, {"id": 2, "name": "bar"}]
+
+        resource_version = G(models.ResourceVersion)
+        resource_version.data = data
+        resource_version.save()
+
+        resource_version = models.ResourceVersion.objects.get(id=resource_version.id)
+        assert resource_version._data.startswith("zlib:") == compress
+        assert resource_version.data == data
+        assert resource_version.resource_count == 2
+        assert resource_version.content_hash == get_json_digest(data)
+
+    def test_data_plain_json(self):
+        # 存量数据为未压缩的 json
+        resource_version = G(models.ResourceVersion, _data='[{"id": 1}]')
+
+        assert resource_version.data == [{"id": 1}]
+
+    def test_data_memoized(self, mocker):
+        resource_version = G(models.ResourceVersion, _data='[{"id": 1}]')
+        mock_load = mocker.patch("apigateway.core.models.load_json_payload", return_value=[{"id": 1}])
+
+        assert resource_version.data is resource_version.data
+        mock_load.assert_called_once()
+
+        # _data 变化后重新解析
+        resource_version._data = '[{"id": 2}]'
+        _ = resource_version.data
+        assert mock_load.call_count == 2
+
+    def test_resource_index(self):
+        resource_version = G(models.ResourceVersion, _data='[{"id": 1, "name": "foo", "method": "GET", "path": "/"}]')
+
+        index = resource_version.resource_index
+        assert index is resource_version.resource_index
+        assert index.get_by_name("foo") is resource_version.data[0]
+
+        # 版本数据变化后重建索引
+        resource_version.data = [{"id": 2, "name": "bar", "method": "GET", "path": "/"}]
+        assert resource_version.resource_index is not index
+        assert resource_version.resource_index.get_by_method_path("GET", "/")["id"] == 2
+
+    def test_get_resource_count(self):
+        resource_version = G(models.ResourceVersion, _data='[{"id": 1}]', resource_count=None)
+        assert resource_version.get_resource_count() == 1
+
+        resource_version.resource_count = 10
+        assert resource_version.get_resource_count() == 10
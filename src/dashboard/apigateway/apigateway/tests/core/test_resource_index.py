@@ -0,0 +1,41 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+from apigateway.core.resource_index import ResourceVersionIndex
+
+
+class TestResourceVersionIndex:
+    def test_lookup(self):
+        resources = [
+            {"id": 1, "name": "foo", "method": "GET", "path": "/foo/"},
+            {"id": 2, "name": "bar", "method": "POST", "path": "/foo/"},
+            # 历史版本数据可能缺少部分字段
+            {"name": "legacy"},
+        ]
+
+        index = ResourceVersionIndex(resources)
+
+        assert len(index) == 2
+        assert set(index.ids) == {1, 2}
+        assert set(index.names) == {"foo", "bar", "legacy"}
+        assert index.get_by_id(1) is resources[0]
+        assert index.get_by_id(3) is None
+        assert index.get_by_name("bar") is resources[1]
+        assert index.get_by_name("legacy") is resources[2]
+        assert index.get_by_name("baz") is None
+        assert index.get_by_method_path("POST", "/foo/") is resources[1]
+        assert index.get_by_method_path("PUT", "/foo/") is None
@@ -69,3 +69,22 @@ class TestPublishEventReporter:
         assert result.name == PublishEventNameTypeEnum.DISTRIBUTE_CONFIGURATION.value
         assert result.status == PublishEventStatusTypeEnum.FAILURE.value
         assert result.detail == {"err_msg": msg}
+
+    def test_report_event_notify_when_release_done(self, mocker, fake_release_history):
+        notify = mocker.patch("apigateway.service.event.event.notify_release_event_on_commit")
+
+        PublishEventReporter.report_distribute_config_doing(fake_release_history)
+        notify.assert_not_called()
+
+        PublishEventReporter.report_distribute_config_failure(fake_release_history, "error")
+        notify.assert_called_once_with(fake_release_history.id)
+
+    def test_report_distribute_config_phase_timings(self, fake_release_history):
+        PublishEventReporter.report_distribute_config_success(fake_release_history, phase_timings={"total": 1.0})
+        PublishEventReporter.report_distribute_config_failure(
+            fake_release_history, "error", phase_timings={"total": 2.0}
+        )
+
+        success_event, failure_event = PublishEvent.objects.filter(publish_id=fake_release_history.id).order_by("id")
+        assert success_event.detail == {"phase_timings": {"total": 1.0}}
+        assert failure_event.detail == {"err_msg": "error", "phase_timings": {"total": 2.0}}
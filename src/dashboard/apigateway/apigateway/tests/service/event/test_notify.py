@@ -0,0 +1,85 @@
+#  -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+from apigateway.service.event.notify import (
+    get_release_event_channel,
+    notify_release_event,
+    notify_release_event_on_commit,
+    subscribe_release_event,
+)
+
+
+def test_get_release_event_channel(settings):
+    settings.REDIS_PREFIX = "apigw::"
+
+    assert get_release_event_channel(1) == "apigw::release_event:1"
+
+
+class TestNotifyReleaseEvent:
+    def test_notify(self, mocker):
+        client = mocker.Mock()
+        mocker.patch("apigateway.service.event.notify.get_default_redis_client", return_value=client)
+
+        notify_release_event(1)
+
+        client.publish.assert_called_once_with(get_release_event_channel(1), "done")
+
+    def test_redis_unavailable(self, mocker):
+        mocker.patch("apigateway.service.event.notify.get_default_redis_client", return_value=None)
+
+        notify_release_event(1)
+
+    def test_publish_error(self, mocker):
+        client = mocker.Mock()
+        client.publish.side_effect = RuntimeError("connection lost")
+        mocker.patch("apigateway.service.event.notify.get_default_redis_client", return_value=client)
+
+        notify_release_event(1)
+
+    def test_notify_on_commit(self, mocker):
+        on_commit = mocker.patch("apigateway.service.event.notify.transaction.on_commit")
+        notify = mocker.patch("apigateway.service.event.notify.notify_release_event")
+
+        notify_release_event_on_commit(1)
+
+        notify.assert_not_called()
+        on_commit.call_args.args[0]()
+        notify.assert_called_once_with(1)
+
+
+class TestSubscribeReleaseEvent:
+    def test_subscribe(self, mocker):
+        client = mocker.Mock()
+        mocker.patch("apigateway.service.event.notify.get_default_redis_client", return_value=client)
+
+        pubsub = subscribe_release_event(1)
+
+        assert pubsub is client.pubsub.return_value
+        pubsub.subscribe.assert_called_once_with(get_release_event_channel(1))
+
+    def test_redis_unavailable(self, mocker):
+        mocker.patch("apigateway.service.event.notify.get_default_redis_client", return_value=None)
+
+        assert subscribe_release_event(1) is None
+
+    def test_subscribe_error(self, mocker):
+        client = mocker.Mock()
+        client.pubsub.return_value.subscribe.side_effect = RuntimeError("connection lost")
+        mocker.patch("apigateway.service.event.notify.get_default_redis_client", return_value=client)
+
+        assert subscribe_release_event(1) is None
+        client.pubsub.return_value.close.assert_called_once_with()
@@ -16,11 +16,49 @@
 # to the current version of the project delivered to anyone in the future.
 #
 import pytest
+from jsonschema.exceptions import SchemaError
 
-from apigateway.service.plugin import PluginConfigYamlValidator
+from apigateway.service.plugin import (
+    PluginConfigYamlChecker,
+    PluginConfigYamlValidator,
+    PluginSchemaValidatorRegistry,
+    plugin_schema_validator_registry,
+)
+from apigateway.service.plugin import checker as checker_module
+from apigateway.service.plugin import validator as validator_module
+from apigateway.service.plugin.checker import BaseChecker
 from apigateway.utils.yaml import yaml_dumps
 
 
+@pytest.fixture(autouse=True)
+def clear_plugin_schema_validator_registry():
+    plugin_schema_validator_registry.clear()
+    yield
+    plugin_schema_validator_registry.clear()
+
+
+class TestPluginSchemaValidatorRegistry:
+    def test_get_validator(self):
+        registry = PluginSchemaValidatorRegistry()
+        schema = {"type": "object", "properties": {"foo": {"type": "string"}}}
+
+        validator = registry.get_validator("bk-mock", schema)
+        assert validator.is_valid({"foo": "bar"})
+        assert not validator.is_valid({"foo": 1})
+
+        # schema 内容相同时复用已编译的校验器，与 schema 是否为同一对象无关
+        assert registry.get_validator("bk-mock", dict(schema)) is validator
+        assert registry.get_validator("bk-cors", schema) is not validator
+
+        # schema 变化后使用新的校验器
+        changed_schema = {"type": "object", "properties": {"foo": {"type": "integer"}}}
+        assert registry.get_validator("bk-mock", changed_schema).is_valid({"foo": 1})
+
+    def test_get_validator_invalid_schema(self):
+        with pytest.raises(SchemaError):
+            PluginSchemaValidatorRegistry().get_validator("bk-mock", {"type": "foo"})
+
+
 class TestPluginConfigYamlValidator:
     def test_validate(self, mocker, fake_plugin_bk_header_rewrite, fake_plugin_type_bk_header_rewrite_schema):
         validator = PluginConfigYamlValidator()
@@ -45,3 +83,29 @@ class TestPluginConfigYamlValidator:
         )
         with pytest.raises(ValueError):
             validator.validate("bk-header-rewrite", yaml_dumps({"set": [], "remove": [{"key": "foo:bar"}]}), None)
+
+    def test_validate_parse_yaml_once(self, mocker, fake_plugin_type_bk_header_rewrite_schema):
+        mock_yaml_loads = mocker.spy(validator_module, "yaml_loads")
+        mock_checker_yaml_loads = mocker.spy(checker_module, "yaml_loads")
+
+        PluginConfigYamlValidator().validate(
+            "bk-header-rewrite",
+            yaml_dumps({"set": [{"key": "foo", "value": "bar"}], "remove": []}),
+            fake_plugin_type_bk_header_rewrite_schema.schema,
+        )
+
+        assert mock_yaml_loads.call_count == 1
+        mock_checker_yaml_loads.assert_not_called()
+
+    def test_validate_checker_not_affect_schema_validation(self, mocker):
+        """checker 会规整数据，不应影响 schema 校验使用的数据"""
+
+        class ClearChecker(BaseChecker):
+            def check_data(self, loaded_data):
+                loaded_data.clear()
+
+        mocker.patch.dict(PluginConfigYamlChecker.type_code_to_checker, {"api-breaker": ClearChecker()})
+
+        PluginConfigYamlValidator().validate(
+            "api-breaker", yaml_dumps({"foo": "bar"}), {"type": "object", "required": ["foo"]}
+        )
@@ -17,6 +17,7 @@
 #
 from unittest.mock import patch
 
+import pytest
 from ddf import G
 
 from apigateway.core.constants import (
@@ -25,9 +26,82 @@ from apigateway.core.constants import (
     ReleaseHistoryStatusEnum,
 )
 from apigateway.core.models import PublishEvent
-from apigateway.service.release import wait_release_done
+from apigateway.service.release import wait_release_done, wait_release_status
+from apigateway.service.release.wait import RELEASE_STATUS_RECHECK_INTERVAL
 
 
+@pytest.fixture
+def no_subscribe(mocker):
+    return mocker.patch("apigateway.service.release.wait.subscribe_release_event", return_value=None)
+
+
+class TestWaitReleaseStatus:
+    def test_no_event(self, fake_release_history, no_subscribe):
+        with patch("apigateway.service.release.wait.time.sleep"):
+            result = wait_release_status(fake_release_history.id, timeout=0)
+
+        assert result == ReleaseHistoryStatusEnum.DOING.value
+
+    def test_wake_up_by_notification(self, mocker, fake_release_history):
+        pubsub = mocker.Mock()
+
+        def get_message(timeout):
+            # 等待期间发布结束，收到通知后重新查询状态
+            G(
+                PublishEvent,
+                publish=fake_release_history,
+                name=PublishEventNameTypeEnum.DISTRIBUTE_CONFIGURATION.value,
+                status=PublishEventStatusTypeEnum.FAILURE.value,
+            )
+            return {"type": "message", "data": b"done"}
+
+        pubsub.get_message.side_effect = get_message
+        mocker.patch("apigateway.service.release.wait.subscribe_release_event", return_value=pubsub)
+        sleep = mocker.patch("apigateway.service.release.wait.time.sleep")
+
+        result = wait_release_status(fake_release_history.id, timeout=10)
+
+        assert result == ReleaseHistoryStatusEnum.FAILURE.value
+        pubsub.get_message.assert_called_once_with(timeout=RELEASE_STATUS_RECHECK_INTERVAL)
+        pubsub.close.assert_called_once_with()
+        sleep.assert_not_called()
+
+    def test_recheck_without_notification(self, mocker, fake_release_history):
+        # 最终事件由 core-api 写入，没有通知，需定期查询 db
+        pubsub = mocker.Mock()
+
+        def get_message(timeout):
+            if pubsub.get_message.call_count == 2:
+                G(
+                    PublishEvent,
+                    publish=fake_release_history,
+                    name=PublishEventNameTypeEnum.LOAD_CONFIGURATION.value,
+                    status=PublishEventStatusTypeEnum.SUCCESS.value,
+                )
+
+        pubsub.get_message.side_effect = get_message
+        mocker.patch("apigateway.service.release.wait.subscribe_release_event", return_value=pubsub)
+
+        result = wait_release_status(fake_release_history.id, timeout=10)
+
+        assert result == ReleaseHistoryStatusEnum.SUCCESS.value
+        assert pubsub.get_message.call_count == 2
+
+    def test_redis_unavailable(self, fake_release_history, no_subscribe):
+        with patch("apigateway.service.release.wait.time.sleep") as sleep:
+            sleep.side_effect = lambda seconds: G(
+                PublishEvent,
+                publish=fake_release_history,
+                name=PublishEventNameTypeEnum.LOAD_CONFIGURATION.value,
+                status=PublishEventStatusTypeEnum.SUCCESS.value,
+            )
+            result = wait_release_status(fake_release_history.id, timeout=10)
+
+        assert result == ReleaseHistoryStatusEnum.SUCCESS.value
+        sleep.assert_called_once_with(RELEASE_STATUS_RECHECK_INTERVAL)
+
+
+@pytest.mark.usefixtures("no_subscribe")
 class TestWaitReleaseDone:
     def test_success(self, fake_release_history):
         """发布成功时返回 SUCCESS"""
@@ -0,0 +1,110 @@
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+import zlib
+
+import pytest
+
+from apigateway.service.resource_version import (
+    OpenAPIExportManager,
+    iter_decompressed_content,
+    resource_version_openapi_export_cache,
+)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def hget(self, key, field):
+        return self.data.get(key, {}).get(field)
+
+    def hset(self, key, field, value):
+        self.data.setdefault(key, {})[field] = value
+
+    def expire(self, key, ttl):
+        pass
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+@pytest.fixture
+def fake_redis(mocker):
+    client = FakeRedis()
+    mocker.patch("apigateway.service.resource_version.openapi_export.get_default_redis_client", return_value=client)
+    return client
+
+
+def test_iter_decompressed_content():
+    content = b"openapi: 3.0.1\n" * 1000
+
+    chunks = list(iter_decompressed_content(zlib.compress(content), chunk_size=1024))
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 1024 for chunk in chunks)
+    assert b"".join(chunks) == content
+
+
+class TestOpenAPIExportManager:
+    def test_iter_resource_version_openapi(self, mocker, fake_redis, fake_resource_version):
+        exporter = OpenAPIExportManager(api_version=fake_resource_version.version)
+        mock_export = mocker.patch.object(exporter, "_export_resource_version_openapi", return_value="openapi: 3.0.1")
+
+        assert b"".join(exporter.iter_resource_version_openapi(fake_resource_version, "yaml")) == b"openapi: 3.0.1"
+        # 重复导出时读取缓存
+        assert b"".join(exporter.iter_resource_version_openapi(fake_resource_version, "yaml")) == b"openapi: 3.0.1"
+        mock_export.assert_called_once()
+
+        # 导出格式不同，需重新生成
+        exporter.iter_resource_version_openapi(fake_resource_version, "json")
+        assert mock_export.call_count == 2
+
+    def test_iter_resource_version_openapi_labels_changed(self, mocker, fake_redis, fake_resource_version):
+        exporter = OpenAPIExportManager(api_version=fake_resource_version.version)
+        mock_export = mocker.patch.object(exporter, "_export_resource_version_openapi", return_value="openapi: 3.0.1")
+        mock_labels = mocker.patch(
+            "apigateway.service.resource_version.openapi_export.get_gateway_resource_id_to_labels",
+            return_value={1: [{"id": 1, "name": "foo"}]},
+        )
+
+        exporter.iter_resource_version_openapi(fake_resource_version)
+        mock_labels.return_value = {1: [{"id": 1, "name": "bar"}]}
+        exporter.iter_resource_version_openapi(fake_resource_version)
+
+        assert mock_export.call_count == 2
+
+    def test_iter_resource_version_openapi_without_redis(self, mocker, fake_resource_version):
+        mocker.patch("apigateway.service.resource_version.openapi_export.get_default_redis_client", return_value=None)
+        exporter = OpenAPIExportManager(api_version=fake_resource_version.version)
+
+        content = b"".join(exporter.iter_resource_version_openapi(fake_resource_version))
+
+        assert content.decode("utf-8") == exporter.export_resource_version_openapi(fake_resource_version)
+
+    def test_warm_up_resource_version_openapi(self, mocker, fake_redis, fake_resource_version):
+        exporter = OpenAPIExportManager(api_version=fake_resource_version.version)
+        mock_export = mocker.patch.object(exporter, "_export_resource_version_openapi")
+
+        exporter.warm_up_resource_version_openapi(fake_resource_version, "openapi: 3.0.1")
+
+        assert b"".join(exporter.iter_resource_version_openapi(fake_resource_version, "yaml")) == b"openapi: 3.0.1"
+        mock_export.assert_not_called()
+
+        resource_version_openapi_export_cache.invalidate([fake_resource_version.id])
+        assert fake_redis.data == {}
@@ -20,11 +20,13 @@ import json
 import pytest
 from ddf import G
 
-from apigateway.apps.openapi.models import OpenAPIResourceSchemaVersion
+from apigateway.apps.openapi.models import OpenAPIResourceSchemaVersion, OpenAPIResourceSchemaVersionItem
 from apigateway.core.constants import ResourceKindEnum
 from apigateway.core.models import ResourceVersion
 from apigateway.service.resource_version import (
+    calculate_used_stage_vars,
     get_resource_id_to_schema_by_resource_version,
+    get_resource_name_to_id,
     get_resource_names_set,
     get_resource_schema,
     get_standard_resource_names_set,
@@ -69,6 +71,19 @@ def test_get_resource_schema_returns_matching_schema(fake_resource_version):
     }
 
 
+def test_get_resource_schema_reads_resource_items(mocker, fake_resource_version, fake_resource_schema):
+    fake_resource_version.data = [{"id": fake_resource_schema.resource_id}, {"id": 0}]
+    make_resource_schema_version(fake_resource_version)
+    mock_get = mocker.spy(OpenAPIResourceSchemaVersion.objects, "get")
+
+    assert (
+        get_resource_schema(fake_resource_version.id, fake_resource_schema.resource_id) == fake_resource_schema.schema
+    )
+    # 已拆分的版本中，资源无 schema 时无需解析整个版本的 schema
+    assert get_resource_schema(fake_resource_version.id, 0) == {}
+    mock_get.assert_not_called()
+
+
 def test_get_resource_id_to_schema_by_resource_version_returns_empty_without_schema(fake_resource_version):
     assert get_resource_id_to_schema_by_resource_version(fake_resource_version.id) == {}
 
@@ -105,6 +120,13 @@ def test_get_resource_names_set_returns_names(fake_resource_version):
     }
 
 
+def test_get_resource_name_to_id(fake_resource_version):
+    assert get_resource_name_to_id(0) == {}
+    assert get_resource_name_to_id(fake_resource_version.id) == {
+        resource["name"]: resource["id"] for resource in fake_resource_version.data
+    }
+
+
 def test_get_standard_resource_names_set_filters_ai_and_treats_empty_kind_as_standard(fake_resource_version):
     fake_resource_version.data = [
         {"name": "legacy-resource"},
@@ -253,6 +275,45 @@ def test_get_used_stage_vars_skips_ai_resources(fake_gateway):
     }
 
 
+def test_get_used_stage_vars_returns_recorded(mocker, fake_gateway):
+    resource_version = G(
+        ResourceVersion,
+        gateway=fake_gateway,
+        _data="[]",
+        used_stage_vars={"in_path": ["prefix"], "in_host": []},
+    )
+    mock_calculate = mocker.patch("apigateway.service.resource_version.schema.calculate_used_stage_vars")
+
+    assert get_used_stage_vars(fake_gateway.id, resource_version.id) == {"in_path": ["prefix"], "in_host": []}
+    mock_calculate.assert_not_called()
+
+
+def test_get_used_stage_vars_records_legacy(fake_gateway):
+    resource_version = G(
+        ResourceVersion,
+        gateway=fake_gateway,
+        _data=json.dumps(
+            [{"proxy": {"type": "http", "config": '{"path": "/users/{env.prefix}", "upstreams": {}}'}}],
+        ),
+        used_stage_vars=None,
+    )
+
+    get_used_stage_vars(fake_gateway.id, resource_version.id)
+
+    resource_version.refresh_from_db()
+    assert resource_version.used_stage_vars == {"in_path": ["prefix"], "in_host": []}
+
+
+def test_calculate_used_stage_vars():
+    resources = [
+        {"proxy": {"type": "http"}, "stage_vars": {"in_path": ["b", "a"], "in_host": ["c"]}},
+        {"proxy": {"type": "http"}, "stage_vars": {"in_path": ["a"], "in_host": []}},
+        {"proxy": {"type": "mock"}, "stage_vars": {"in_path": ["d"], "in_host": []}},
+    ]
+
+    assert calculate_used_stage_vars(resources) == {"in_path": ["a", "b"], "in_host": ["c"]}
+
+
 def test_get_used_stage_vars_returns_none_for_missing_resource_version(fake_gateway):
     assert get_used_stage_vars(fake_gateway.id, 0) is None
 
@@ -261,3 +322,7 @@ def test_make_resource_schema_version(fake_resource_version, fake_resource_schem
     make_resource_schema_version(fake_resource_version)
 
     assert OpenAPIResourceSchemaVersion.objects.filter(resource_version_id=fake_resource_version.id).exists()
+    assert OpenAPIResourceSchemaVersion.objects.get(resource_version_id=fake_resource_version.id).has_resource_items
+    assert OpenAPIResourceSchemaVersionItem.objects.filter(
+        resource_version_id=fake_resource_version.id, resource_id=fake_resource_schema.resource_id
+    ).exists()
@@ -1,7 +1,7 @@
 from ddf import G
 
 from apigateway.core.constants import StageStatusEnum
-from apigateway.core.models import Gateway, Release, ReleasedResource, ResourceVersion, Stage
+from apigateway.core.models import Gateway, Release, ReleasedResource, ReleasedResourceBody, ResourceVersion, Stage
 from apigateway.service.gateway_released_resource import get_gateway_released_resources
 
 
@@ -17,7 +17,7 @@ def _make_released_resource(gateway, resource_version, *, resource_id, name):
         is_public=False,
         oauth2_public_client_enabled=False,
         oauth2_personal_client_enabled=False,
-        data={
+        _data={
             "id": resource_id,
             "name": name,
             "description": f"{name} description",
@@ -112,6 +112,20 @@ def test_orders_by_name_then_resource_id():
     ]
 
 
+def test_reads_deduplicated_body():
+    gateway = G(Gateway, name="released-resource-body-gateway")
+    version = G(ResourceVersion, gateway=gateway, version="1.0.0", _data="[]")
+    _release(gateway, version, "prod")
+    released = _make_released_resource(gateway, version, resource_id=1, name="resource")
+    released.body = G(ReleasedResourceBody, gateway=gateway, content_hash="hash", data={"description": "from body"})
+    released._data = {}
+    released.save()
+
+    result = list(get_gateway_released_resources(gateway_id=gateway.id))
+
+    assert result[0].data == {"description": "from body"}
+
+
 def test_single_version_page_uses_three_queries(django_assert_num_queries):
     gateway = G(Gateway, name="query-budget-gateway")
     version = G(ResourceVersion, gateway=gateway, version="1.0.0", _data="[]")
@@ -4,7 +4,7 @@ from apigateway.apps.mcp_server.constants import MCPServerStatusEnum
 from apigateway.apps.mcp_server.models import MCPServer
 from apigateway.common.tenant.constants import TenantModeEnum
 from apigateway.core.constants import GatewayStatusEnum, StageStatusEnum
-from apigateway.core.models import Gateway, Release, ReleasedResource, ResourceVersion, Stage
+from apigateway.core.models import Gateway, Release, ReleasedResource, ReleasedResourceBody, ResourceVersion, Stage
 from apigateway.service.oauth2_client_scope import (
     get_oauth2_mcp_server_scope_gateways,
     get_oauth2_mcp_server_scope_map,
@@ -71,7 +71,7 @@ def _make_released_resource(
         is_public=is_public,
         oauth2_public_client_enabled=public_enabled,
         oauth2_personal_client_enabled=personal_enabled,
-        data=data,
+        _data=data,
     )
 
 
@@ -126,6 +126,18 @@ def test_resource_scope_uses_only_release_referenced_versions():
     assert [item["id"] for item in scope_map[gateway.id]] == [referenced.resource_id]
 
 
+def test_resource_scope_reads_deduplicated_body():
+    gateway = _make_gateway("scope-body-gateway")
+    released = _make_released_resource(gateway, resource_id=1, name="body_resource", personal_enabled=True)
+    released.body = G(ReleasedResourceBody, gateway=gateway, content_hash="hash", data={"description": "from body"})
+    released._data = {}
+    released.save()
+
+    scope_map = get_oauth2_resource_scope_map(gateway_ids=[gateway.id], oauth_client_type="personal")
+
+    assert scope_map[gateway.id][0]["description"] == "from body"
+
+
 def test_resource_scope_requires_public_and_switch_in_same_snapshot():
     gateway = _make_gateway("scope-snapshot-gateway")
     _make_released_resource(
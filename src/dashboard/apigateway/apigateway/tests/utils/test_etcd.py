@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+import pytest
+
+from apigateway.utils.etcd import EtcdClientPool, get_etcd_config_fingerprint
+
+
+class TestGetEtcdConfigFingerprint:
+    def test_same_content(self):
+        assert get_etcd_config_fingerprint({"host": "a", "port": 2379}) == get_etcd_config_fingerprint(
+            {"port": 2379, "host": "a"}
+        )
+
+    def test_different_content(self):
+        assert get_etcd_config_fingerprint({"host": "a", "port": 2379}) != get_etcd_config_fingerprint(
+            {"host": "b", "port": 2379}
+        )
+
+
+class TestEtcdClientPool:
+    @pytest.fixture
+    def mock_new_etcd_client(self, mocker):
+        return mocker.patch(
+            "apigateway.utils.etcd.new_etcd_client",
+            side_effect=lambda etcd_config: mocker.Mock(name=etcd_config["host"]),
+        )
+
+    @pytest.fixture
+    def mock_monotonic(self, mocker):
+        return mocker.patch("apigateway.utils.etcd.time.monotonic", return_value=1000)
+
+    def test_get_reuse(self, mock_new_etcd_client, mock_monotonic):
+        pool = EtcdClientPool(idle_timeout=600, health_check_interval=30)
+
+        client = pool.get({"host": "a", "port": 2379})
+
+        assert pool.get({"port": 2379, "host": "a"}) is client
+        assert pool.get({"host": "b", "port": 2379}) is not client
+        assert mock_new_etcd_client.call_count == 2
+        assert len(pool) == 2
+
+    def test_get_health_check(self, mock_new_etcd_client, mock_monotonic):
+        pool = EtcdClientPool(idle_timeout=600, health_check_interval=30)
+        client = pool.get({"host": "a"})
+
+        # checked recently, no status call
+        mock_monotonic.return_value = 1010
+        assert pool.get({"host": "a"}) is client
+        client.status.assert_not_called()
+
+        mock_monotonic.return_value = 1100
+        assert pool.get({"host": "a"}) is client
+        client.status.assert_called_once()
+
+    def test_get_reconnect_on_failure(self, mock_new_etcd_client, mock_monotonic):
+        pool = EtcdClientPool(idle_timeout=600, health_check_interval=30)
+        client = pool.get({"host": "a"})
+        client.status.side_effect = Exception("connection refused")
+
+        mock_monotonic.return_value = 1100
+        new_client = pool.get({"host": "a"})
+
+        assert new_client is not client
+        client.close.assert_called_once()
+        assert mock_new_etcd_client.call_count == 2
+
+    def test_evict_idle(self, mock_new_etcd_client, mock_monotonic):
+        pool = EtcdClientPool(idle_timeout=600, health_check_interval=30)
+        client_a = pool.get({"host": "a"})
+
+        mock_monotonic.return_value = 2000
+        pool.get({"host": "b"})
+
+        client_a.close.assert_called_once()
+        assert len(pool) == 1
+
+    def test_discard(self, mock_new_etcd_client, mock_monotonic):
+        pool = EtcdClientPool(idle_timeout=600, health_check_interval=30)
+        client = pool.get({"host": "a"})
+
+        pool.discard({"host": "a"})
+        pool.discard({"host": "not-exists"})
+
+        client.close.assert_called_once()
+        assert pool.get({"host": "a"}) is not client
+
+    def test_clear(self, mock_new_etcd_client, mock_monotonic):
+        pool = EtcdClientPool(idle_timeout=600, health_check_interval=30)
+        client = pool.get({"host": "a"})
+
+        pool.clear()
+
+        client.close.assert_called_once()
+        assert len(pool) == 0
+
+    def test_reset_after_fork(self, mocker, mock_new_etcd_client, mock_monotonic):
+        pool = EtcdClientPool(idle_timeout=600, health_check_interval=30)
+        client = pool.get({"host": "a"})
+
+        mocker.patch("apigateway.utils.etcd.os.getpid", return_value=-1)
+
+        assert pool.get({"host": "a"}) is not client
+        client.close.assert_not_called()
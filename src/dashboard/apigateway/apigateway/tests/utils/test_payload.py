@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+import json
+
+from apigateway.utils.payload import (
+    compress_payload,
+    decompress_payload,
+    dump_json_payload,
+    get_json_digest,
+    is_compressed_payload,
+    load_json_payload,
+)
+
+
+def test_compress_payload():
+    text = json.dumps([{"id": i, "name": f"resource-{i}"} for i in range(100)])
+
+    payload = compress_payload(text)
+
+    assert is_compressed_payload(payload)
+    assert len(payload) < len(text)
+    assert decompress_payload(payload) == text
+
+
+def test_decompress_payload_plain():
+    assert decompress_payload('[{"id": 1}]') == '[{"id": 1}]'
+
+
+def test_dump_and_load_json_payload():
+    data = [{"id": 1, "name": "中文"}]
+
+    assert dump_json_payload(data) == json.dumps(data)
+    assert not is_compressed_payload(dump_json_payload(data))
+    assert is_compressed_payload(dump_json_payload(data, compress=True))
+
+    assert load_json_payload(dump_json_payload(data)) == data
+    assert load_json_payload(dump_json_payload(data, compress=True)) == data
+
+
+def test_get_json_digest():
+    digest = get_json_digest([{"id": 1, "a": 1, "b": 2}])
+
+    assert len(digest) == 64
+    assert get_json_digest([{"b": 2, "id": 1, "a": 1}]) == digest
+    assert get_json_digest([{"id": 1, "a": 1, "b": 3}]) != digest
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+#
+import pytest
+
+from apigateway.utils.rate_limit import TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket:
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0, capacity=1)
+
+    def test_acquire(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, capacity=20, clock=clock, sleep=clock.sleep)
+
+        # 初始令牌数为 capacity，允许突发
+        assert bucket.acquire(20) == 0
+        # 令牌不足时，等待补充所需的令牌
+        assert bucket.acquire(5) == pytest.approx(0.5)
+        assert clock.sleeps == [pytest.approx(0.5)]
+
+        clock.now += 10
+        # 令牌最多积累 capacity 个
+        assert bucket.acquire(20) == 0
+        assert bucket.acquire(1) == pytest.approx(0.1)
+
+    def test_acquire_more_than_capacity(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, capacity=5, clock=clock, sleep=clock.sleep)
+
+        assert bucket.acquire(100) == 0
+        assert bucket.acquire(100) == pytest.approx(0.5)
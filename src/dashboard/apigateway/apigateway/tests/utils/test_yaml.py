@@ -16,6 +16,7 @@
 # We undertake not to change the open source license (MIT license) applicable
 # to the current version of the project delivered to anyone in the future.
 #
+import pytest
 import yaml
 from django.core.serializers.pyyaml import DjangoSafeDumper
 from django.test import TestCase
@@ -23,6 +24,7 @@ from django.test import TestCase
 from apigateway.utils.yaml import (
     multiline_str_presenter,
     yaml_dumps,
+    yaml_fast_loads,
     yaml_loads,
 )
 
@@ -107,3 +109,27 @@ def test_multiline_str_presenter():
     data = {"colors": "green\nblue"}
     result = yaml.dump(data, Dumper=DjangoSafeDumper)
     assert "|" in result
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "set:\n- key: foo\n  value: bar\nremove: []\n",
+        '{"rate": 1.5, "keys": ["a", "b"], "enabled": true, "extra": null}',
+        # yaml 1.1 与 1.2 解析结果不同的标量
+        "a: yes\nb: on\nc: 017\nd: 0o17\ne: 1:20\nf: +.5\ng: 1e5\nh: 0x1f",
+        "a: 2001-12-14\nb: .inf\nc: ~\nd: TRUE\ne: -10\nf: 10.5",
+        "x: &anchor {b: 1}\ny: *anchor\n<<: {c: 2}",
+        "a: |\n  multi\n  line\n",
+    ],
+)
+def test_yaml_fast_loads(content):
+    assert yaml_fast_loads(content) == yaml_loads(content)
+
+
+def test_yaml_fast_loads_duplicate_key():
+    with pytest.raises(Exception, match="duplicate key"):
+        yaml_fast_loads("a: 1\na: 2")
+
+    with pytest.raises(Exception, match="duplicate key"):
+        yaml_fast_loads('{"a": 1, "a": 2}')
@@ -15,6 +15,13 @@
 # We undertake not to change the open source license (MIT license) applicable
 # to the current version of the project delivered to anyone in the future.
 #
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Dict
 
 from django.conf import settings
@@ -24,6 +31,8 @@ from .etcd_monkeypatch import Etcd3Client
 if TYPE_CHECKING:
     import etcd3
 
+logger = logging.getLogger(__name__)
+
 
 def client(
     host="localhost",
@@ -72,12 +81,154 @@ def new_etcd_client(etcd_config: Dict[str, Any]) -> etcd3.Etcd3Client:
     return client(**etcd_config)
 
 
+def get_etcd_config_fingerprint(etcd_config: Dict[str, Any]) -> str:
+    """
+    Get the fingerprint of an ETCD configuration, configurations with the same content share the same fingerprint.
+    """
+    content = json.dumps(etcd_config, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class _PooledClient:
+    client: Any
+    created_at: float
+    last_used_at: float
+    last_checked_at: float
+
+
+class EtcdClientPool:
+    """
+    A process-wide pool of ETCD clients, keyed by the fingerprint of the ETCD configuration.
+
+    - a pooled client is health checked by `status()` when it has not been checked for `health_check_interval`
+      seconds, and is rebuilt when the check fails
+    - clients that have not been used for `idle_timeout` seconds are closed and evicted
+    - gRPC channels can not be shared across processes, so the pool is reset after fork
+    """
+
+    def __init__(self, idle_timeout: int, health_check_interval: int):
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+
+        self._lock = threading.Lock()
+        self._clients: Dict[str, _PooledClient] = {}
+        self._pid = os.getpid()
+
+    def get(self, etcd_config: Dict[str, Any]) -> etcd3.Etcd3Client:
+        """
+        Get a healthy ETCD client for the configuration, reuse the pooled one when possible.
+        """
+        fingerprint = get_etcd_config_fingerprint(etcd_config)
+        now = time.monotonic()
+
+        with self._lock:
+            self._reset_if_forked()
+            self._evict_idle(now)
+
+            pooled = self._clients.get(fingerprint)
+            if pooled is not None and not self._is_healthy(pooled, now):
+                self._close(self._clients.pop(fingerprint))
+                pooled = None
+
+            if pooled is None:
+                pooled = _PooledClient(
+                    client=new_etcd_client(etcd_config),
+                    created_at=now,
+                    last_used_at=now,
+                    last_checked_at=now,
+                )
+                self._clients[fingerprint] = pooled
+
+            pooled.last_used_at = now
+            return pooled.client
+
+    def discard(self, etcd_config: Dict[str, Any]):
+        """
+        Close and remove the pooled client of the configuration, the next `get` will reconnect.
+        """
+        fingerprint = get_etcd_config_fingerprint(etcd_config)
+        with self._lock:
+            pooled = self._clients.pop(fingerprint, None)
+            if pooled is not None:
+                self._close(pooled)
+
+    def clear(self):
+        """
+        Close and remove all pooled clients.
+        """
+        with self._lock:
+            for pooled in self._clients.values():
+                self._close(pooled)
+            self._clients.clear()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def _reset_if_forked(self):
+        pid = os.getpid()
+        if pid == self._pid:
+            return
+
+        # the channels inherited from the parent process are unusable, drop them without closing
+        self._clients = {}
+        self._pid = pid
+
+    def _evict_idle(self, now: float):
+        idle_fingerprints = [
+            fingerprint
+            for fingerprint, pooled in self._clients.items()
+            if now - pooled.last_used_at > self.idle_timeout
+        ]
+        for fingerprint in idle_fingerprints:
+            self._close(self._clients.pop(fingerprint))
+
+    def _is_healthy(self, pooled: _PooledClient, now: float) -> bool:
+        if now - pooled.last_checked_at < self.health_check_interval:
+            return True
+
+        try:
+            pooled.client.status()
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("pooled etcd client is unhealthy, reconnecting", exc_info=True)
+            return False
+
+        pooled.last_checked_at = now
+        return True
+
+    def _close(self, pooled: _PooledClient):
+        try:
+            pooled.client.close()
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("close pooled etcd client failed", exc_info=True)
+
+
+etcd_client_pool = EtcdClientPool(
+    idle_timeout=settings.ETCD_CLIENT_POOL_IDLE_TIMEOUT,
+    health_check_interval=settings.ETCD_CLIENT_POOL_HEALTH_CHECK_INTERVAL,
+)
+
+
+def get_pooled_etcd_client(etcd_config: Dict[str, Any]) -> etcd3.Etcd3Client:
+    """
+    Get an ETCD client from the process-wide pool, back-to-back releases to the same data plane
+    reuse the warm connection instead of creating a new one.
+
+    Args:
+        etcd_config: ETCD configuration dictionary, see new_etcd_client
+
+    Returns:
+        An Etcd3Client instance, it is shared and should not be closed by the caller
+    """
+    return etcd_client_pool.get(etcd_config)
+
+
 def get_etcd_client() -> etcd3.Etcd3Client:
     """
     Get ETCD client using default settings.ETCD_CONFIG.
 
     This function is kept for backward compatibility with existing code that doesn't
-    specify a data plane. Use new_etcd_client(etcd_config) when working with
+    specify a data plane. Use get_pooled_etcd_client(etcd_config) when working with
     multi-data-plane configurations.
     """
-    return new_etcd_client(settings.ETCD_CONFIG)
+    return get_pooled_etcd_client(settings.ETCD_CONFIG)
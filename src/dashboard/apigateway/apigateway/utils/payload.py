@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+#
+
+"""
+大字段 json 数据的存储编码
+
+- 压缩格式为 `zlib:` 前缀 + zlib 压缩后的 base64 文本，可直接存储在 TextField 中
+- 未压缩的 json 文本可直接读取，存量数据无需迁移即可兼容
+"""
+
+import base64
+import hashlib
+import json
+import zlib
+from typing import Any
+
+COMPRESSED_PAYLOAD_PREFIX = "zlib:"
+COMPRESS_LEVEL = 6
+
+
+def is_compressed_payload(payload: str) -> bool:
+    return payload.startswith(COMPRESSED_PAYLOAD_PREFIX)
+
+
+def compress_payload(text: str) -> str:
+    compressed = zlib.compress(text.encode("utf-8"), COMPRESS_LEVEL)
+    return COMPRESSED_PAYLOAD_PREFIX + base64.b64encode(compressed).decode("ascii")
+
+
+def decompress_payload(payload: str) -> str:
+    if not is_compressed_payload(payload):
+        return payload
+
+    compressed = base64.b64decode(payload[len(COMPRESSED_PAYLOAD_PREFIX) :])
+    return zlib.decompress(compressed).decode("utf-8")
+
+
+def dump_json_payload(data: Any, compress: bool = False) -> str:
+    text = json.dumps(data)
+    return compress_payload(text) if compress else text
+
+
+def load_json_payload(payload: str) -> Any:
+    return json.loads(decompress_payload(payload))
+
+
+def get_json_digest(data: Any) -> str:
+    """获取 json 数据的摘要，与 key 的顺序、存储时是否压缩无关"""
+    text = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
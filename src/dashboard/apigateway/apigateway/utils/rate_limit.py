@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+# TencentBlueKing is pleased to support the open source community by making
+# 蓝鲸智云 - API 网关(BlueKing - APIGateway) available.
+# Copyright (C) Tencent. All rights reserved.
+# Licensed under the MIT License (the "License"); you may not use this file except
+# in compliance with the License. You may obtain a copy of the License at
+#
+#     http://opensource.org/licenses/MIT
+#
+# Unless required by applicable law or agreed to in writing, software distributed under
+# the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+# either express or implied. See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# We undertake not to change the open source license (MIT license) applicable
+# to the current version of the project delivered to anyone in the future.
+import threading
+import time
+from typing import Callable
+
+
+class TokenBucket:
+    """线程安全的令牌桶，限制每秒消耗的令牌数
+
+    - 令牌以 rate 个每秒的速度补充，最多积累 capacity 个，允许短时间的突发
+    - 单次获取的令牌数超过 capacity 时，按 capacity 计算，避免永远无法获取
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0:
+            raise ValueError("rate should be greater than 0")
+
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1) -> float:
+        """获取令牌，令牌不足时阻塞等待，返回等待的秒数
+
+        令牌不足时先预占（令牌数可为负），再在锁外等待补足，后续的获取者会排在其后等待
+        """
+        tokens = min(tokens, self.capacity)
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+
+            wait_seconds = -self._tokens / self.rate
+
+        self._sleep(wait_seconds)
+        return wait_seconds
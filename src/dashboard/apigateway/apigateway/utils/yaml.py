@@ -16,8 +16,11 @@
 # We undertake not to change the open source license (MIT license) applicable
 # to the current version of the project delivered to anyone in the future.
 #
+import json
+import re
 from collections import OrderedDict
 
+import yaml as pyyaml
 from ruamel.yaml import YAML
 from ruamel.yaml import resolver as yaml_resolver
 from ruamel.yaml.compat import StringIO
@@ -81,6 +84,84 @@ def yaml_loads(content):
     return _yaml.load(content)
 
 
+class _FastLoadFallback(Exception):
+    """内容中存在 libyaml 与 yaml_loads 解析结果可能不一致的部分，需回退到 yaml_loads"""
+
+
+# 与 yaml_loads 解析结果一致的 yaml 1.2 标量类型；其它以数字、符号开头的标量（如八进制、十六进制、时间戳、.inf），
+# 以及合并键 `<<`，yaml 1.1 与 1.2 的解析结果可能不同，回退到 yaml_loads
+_FAST_LOAD_SCALAR_RESOLVERS = [
+    ("tag:yaml.org,2002:null", re.compile(r"^(?:~|null|Null|NULL|)$")),
+    ("tag:yaml.org,2002:bool", re.compile(r"^(?:true|True|TRUE|false|False|FALSE)$")),
+    ("tag:yaml.org,2002:int", re.compile(r"^[-+]?(?:0|[1-9][0-9]*)$")),
+    ("tag:yaml.org,2002:float", re.compile(r"^-?(?:0|[1-9][0-9]*)\.[0-9]+(?:[eE][-+]?[0-9]+)?$")),
+]
+_FAST_LOAD_AMBIGUOUS_SCALAR = re.compile(r"^(?:[-+.0-9]|<<$)")
+
+_CSafeLoader = getattr(pyyaml, "CSafeLoader", None)
+
+if _CSafeLoader is not None:
+
+    class _FastLoader(_CSafeLoader):  # type: ignore[valid-type,misc]
+        def resolve(self, kind, value, implicit):
+            if kind is pyyaml.ScalarNode and implicit[0]:
+                for tag, regexp in _FAST_LOAD_SCALAR_RESOLVERS:
+                    if regexp.match(value):
+                        return tag
+                if _FAST_LOAD_AMBIGUOUS_SCALAR.match(value):
+                    raise _FastLoadFallback()
+                return self.DEFAULT_SCALAR_TAG
+            return super().resolve(kind, value, implicit)
+
+        def construct_mapping(self, node, deep=False):
+            # yaml_loads 遇到重复的 key 会报错
+            keys = [key_node.value for key_node, _ in node.value]
+            if len(keys) != len(set(keys)):
+                raise _FastLoadFallback()
+            return super().construct_mapping(node, deep=deep)
+
+
+def _json_object_pairs_hook(pairs):
+    result = dict(pairs)
+    if len(result) != len(pairs):
+        raise _FastLoadFallback()
+    return result
+
+
+def _json_parse_constant(value):
+    raise _FastLoadFallback()
+
+
+def yaml_fast_loads(content):
+    """
+    解析 yaml，结果与 yaml_loads 的数据一致（mapping/sequence 为 dict/list），用于读取已保存的配置
+
+    - 内容为 json 时，直接使用 json 解析
+    - 否则使用 libyaml（C 实现）解析；libyaml 按 yaml 1.1 推断标量类型，这里只推断 yaml 1.1、1.2 一致的类型，
+      遇到可能不一致的内容时回退到 yaml_loads
+    """
+    if not content:
+        return yaml_loads(content)
+
+    try:
+        if content.lstrip()[:1] in ("{", "["):
+            try:
+                return json.loads(
+                    content,
+                    object_pairs_hook=_json_object_pairs_hook,
+                    parse_constant=_json_parse_constant,
+                )
+            except json.JSONDecodeError:
+                pass
+
+        if _CSafeLoader is not None:
+            return pyyaml.load(content, Loader=_FastLoader)  # noqa: S506
+    except _FastLoadFallback, pyyaml.YAMLError:
+        pass
+
+    return yaml_loads(content)
+
+
 def _multiline_string_representer(dumper, data):
     node = dumper.represent_str(data)
 